@@ -0,0 +1,6 @@
+"""Performance benchmarks for Cognition.
+
+Not part of the test suite: run the load benchmark with
+``python -m benchmarks.load --help`` and the micro-benchmarks with
+``pytest benchmarks/test_micro.py``. See ``benchmarks/README.md``.
+"""
@@ -0,0 +1,566 @@
+"""End-to-end load benchmark for the message streaming path.
+
+Starts the real server (``server.app.main:app`` under uvicorn) in a
+subprocess for each persistence backend, from a temporary directory that is
+also its ``HOME`` so no local config leaks in. It registers a
+``scripted_mock`` provider ahead of any other so turns never leave the
+machine, and drives concurrent sessions through the Python SDK. The run
+fails if any turn reports a different provider. Provider latency is whatever the latency profile
+says, so with the default zero-delay profile the numbers are pure server
+overhead.
+
+Reported per backend:
+
+- time to first token and turn latency (p50/p95/p99)
+- events and tokens streamed per second
+- server CPU time per output token and server RSS growth
+
+Results are written as JSON and can be compared against a previous run;
+the process exits non-zero when a metric regresses past its threshold::
+
+    python -m benchmarks.load --backends memory,sqlite --sessions 50 --turns 3 \\
+        --tool-calls 2 --output bench.json --baseline main.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import asdict, dataclass, field, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from client.sdk import CognitionClient
+
+RESULT_SCHEMA_VERSION = 1
+BACKENDS = ("memory", "sqlite", "postgres")
+BENCH_PROVIDER = "scripted_mock"
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# metric -> (higher is better, default relative threshold, absolute noise floor)
+METRICS: dict[str, tuple[bool, float, float]] = {
+    "ttft_ms.p50": (False, 0.10, 2.0),
+    "ttft_ms.p95": (False, 0.15, 2.0),
+    "turn_ms.p50": (False, 0.10, 2.0),
+    "turn_ms.p95": (False, 0.15, 2.0),
+    "turn_ms.p99": (False, 0.25, 5.0),
+    "events_per_s": (True, 0.10, 0.0),
+    "tokens_per_s": (True, 0.10, 0.0),
+    "server_cpu_us_per_token": (False, 0.15, 1.0),
+    "rss_growth_mb": (False, 0.25, 5.0),
+}
+
+
+@dataclass
+class LoadConfig:
+    """Shape of one load run.
+
+    Attributes:
+        sessions: Sessions driven concurrently.
+        turns: Turns per session, sent one after another.
+        tool_calls: Parallel tool calls the model makes in each turn.
+        tokens: Tokens in each final reply.
+        ttft_ms: Simulated provider time to first token.
+        inter_token_ms: Simulated provider delay between chunks.
+        warmup_turns: Turns run before measuring, to compile graphs.
+    """
+
+    sessions: int = 20
+    turns: int = 3
+    tool_calls: int = 1
+    tokens: int = 200
+    ttft_ms: float = 0.0
+    inter_token_ms: float = 0.0
+    warmup_turns: int = 2
+
+    def latency_profile(self) -> dict[str, Any]:
+        """The ``scripted_mock`` profile that produces this run's turns."""
+        script: list[dict[str, Any]] = []
+        if self.tool_calls:
+            script.append(
+                {
+                    "tool_calls": [
+                        {"name": "ls", "args": {"path": "/"}} for _ in range(self.tool_calls)
+                    ]
+                }
+            )
+        return {
+            "ttft_ms": self.ttft_ms,
+            "inter_token_ms": self.inter_token_ms,
+            "response_tokens": self.tokens,
+            "script": script,
+        }
+
+
+@dataclass
+class TurnSample:
+    """Client-side measurements of one turn."""
+
+    ttft_ms: float | None
+    turn_ms: float
+    events: int
+    tokens: int
+    ok: bool
+    provider: str | None = None
+
+
+@dataclass
+class ProcessSample:
+    """Cumulative CPU seconds and resident memory of the server process."""
+
+    cpu_s: float
+    rss_bytes: int
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than its threshold allows."""
+
+    backend: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    threshold: float
+
+
+@dataclass
+class _Server:
+    base_url: str
+    pid: int
+    log: list[str] = field(default_factory=list)
+
+
+# ---------------------------------------------------------------------------
+# Server process
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def sample_process(pid: int) -> ProcessSample:
+    """Read a process's CPU time and RSS from ``/proc`` (Linux only)."""
+    stat = Path(f"/proc/{pid}/stat").read_text()
+    # Fields after the parenthesised command name; utime and stime are 14 and 15.
+    fields = stat[stat.rindex(")") + 2 :].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu_s = (int(fields[11]) + int(fields[12])) / ticks
+    rss_pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    return ProcessSample(cpu_s, rss_pages * os.sysconf("SC_PAGE_SIZE"))
+
+
+def server_env(backend: str, workspace: Path, postgres_uri: str | None) -> dict[str, str]:
+    """Environment for a benchmark server: no rate limits, no network, quiet logs.
+
+    ``HOME`` is the workspace, so user-level config is not picked up, and the
+    project root is on ``PYTHONPATH`` because the server runs from there too.
+    """
+    pythonpath = os.pathsep.join(p for p in (str(PROJECT_ROOT), os.environ.get("PYTHONPATH")) if p)
+    env = {
+        **os.environ,
+        "HOME": str(workspace),
+        "PYTHONPATH": pythonpath,
+        "COGNITION_WORKSPACE_ROOT": str(workspace),
+        "COGNITION_PERSISTENCE_BACKEND": backend,
+        "COGNITION_LOG_LEVEL": "warning",
+        "COGNITION_RATE_LIMIT_PER_MINUTE": "1000000",
+        "COGNITION_RATE_LIMIT_BURST": "1000000",
+        "COGNITION_RATE_LIMIT_SCOPE_PER_MINUTE": "0",
+        "COGNITION_RATE_LIMIT_SCOPE_TOKENS_PER_MINUTE": "0",
+        "COGNITION_SCOPING_ENABLED": "false",
+        "COGNITION_GRAPH_WARMUP_ENABLED": "false",
+        "COGNITION_OTEL_ENABLED": "false",
+        "COGNITION_MODEL_CATALOG_URL": "http://127.0.0.1:9/catalog.json",
+        "COGNITION_MODEL_CATALOG_SNAPSHOT_PATH": "",
+    }
+    if backend == "sqlite":
+        env["COGNITION_PERSISTENCE_URI"] = str(workspace / ".cognition" / "state.db")
+    elif backend == "postgres" and postgres_uri:
+        env["COGNITION_PERSISTENCE_URI"] = postgres_uri
+    return env
+
+
+@contextlib.asynccontextmanager
+async def run_server(
+    env: dict[str, str], cwd: Path, timeout: float = 60.0
+) -> AsyncIterator[_Server]:
+    """Run uvicorn in a subprocess from ``cwd`` until the block exits."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "server.app.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    server = _Server(base_url=base_url, pid=proc.pid)
+
+    async def drain() -> None:
+        assert proc.stderr is not None
+        async for line in proc.stderr:
+            server.log.append(line.decode(errors="replace").rstrip())
+            del server.log[:-200]
+
+    drainer = asyncio.create_task(drain())
+    try:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(timeout=1.0) as http:
+            while True:
+                if proc.returncode is not None:
+                    raise RuntimeError(
+                        f"Server exited with code {proc.returncode}:\n" + "\n".join(server.log)
+                    )
+                with contextlib.suppress(httpx.TransportError):
+                    if (await http.get(f"{base_url}/ready")).status_code == 200:
+                        break
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Server not ready after {timeout:.0f}s")
+                await asyncio.sleep(0.05)
+        yield server
+    finally:
+        if proc.returncode is None:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=10)
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+        drainer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await drainer
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+
+async def run_turn(client: CognitionClient, session_id: str, content: str) -> TurnSample:
+    """Send one message and time its stream."""
+    started = time.perf_counter()
+    ttft_ms: float | None = None
+    events = tokens = 0
+    ok = False
+    provider: str | None = None
+    async for event in client.send_message(session_id, content):
+        events += 1
+        if event.event == "token" and ttft_ms is None:
+            ttft_ms = (time.perf_counter() - started) * 1000
+        elif event.event == "usage":
+            tokens += int(event.data.get("output_tokens") or 0)
+            provider = event.data.get("provider")
+        elif event.event == "done":
+            ok = True
+    return TurnSample(ttft_ms, (time.perf_counter() - started) * 1000, events, tokens, ok, provider)
+
+
+def check_provider(samples: Sequence[TurnSample]) -> None:
+    """Raise unless every completed turn ran on the benchmark provider.
+
+    A turn served by a real provider (picked up from the environment or a
+    config file) would measure that provider instead of the server.
+    """
+    others = sorted({str(s.provider) for s in samples if s.ok and s.provider != BENCH_PROVIDER})
+    if others:
+        raise RuntimeError(
+            f"Benchmark turns ran on {', '.join(others)} instead of {BENCH_PROVIDER}"
+        )
+
+
+async def drive(client: CognitionClient, config: LoadConfig) -> list[TurnSample]:
+    """Run ``config.turns`` turns in each of ``config.sessions`` sessions at once."""
+    sessions = await client.create_sessions(config.sessions, concurrency=config.sessions)
+
+    async def converse(session_id: str) -> list[TurnSample]:
+        samples = []
+        for turn in range(config.turns):
+            try:
+                samples.append(await run_turn(client, session_id, f"Turn {turn}: go"))
+            except Exception:
+                samples.append(TurnSample(None, 0.0, 0, 0, ok=False))
+        return samples
+
+    per_session = await asyncio.gather(*(converse(s.id) for s in sessions))
+    return [sample for samples in per_session for sample in samples]
+
+
+def percentiles(values: Sequence[float]) -> dict[str, float]:
+    """p50/p95/p99 of ``values`` by nearest rank, rounded to 0.01."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 2)
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99)}
+
+
+def summarise(
+    samples: Sequence[TurnSample],
+    wall_s: float,
+    before: ProcessSample,
+    after: ProcessSample,
+) -> dict[str, Any]:
+    """Aggregate one backend's turn samples and server process samples."""
+    ok = [s for s in samples if s.ok]
+    tokens = sum(s.tokens for s in ok)
+    events = sum(s.events for s in samples)
+    cpu_s = after.cpu_s - before.cpu_s
+    return {
+        "turns": len(samples),
+        "failed_turns": len(samples) - len(ok),
+        "wall_s": round(wall_s, 3),
+        "ttft_ms": percentiles([s.ttft_ms for s in ok if s.ttft_ms is not None]),
+        "turn_ms": percentiles([s.turn_ms for s in ok]),
+        "events_per_s": round(events / wall_s, 1) if wall_s else 0.0,
+        "tokens_per_s": round(tokens / wall_s, 1) if wall_s else 0.0,
+        "server_cpu_s": round(cpu_s, 3),
+        "server_cpu_us_per_token": round(cpu_s * 1e6 / tokens, 2) if tokens else 0.0,
+        "rss_start_mb": round(before.rss_bytes / 2**20, 1),
+        "rss_end_mb": round(after.rss_bytes / 2**20, 1),
+        "rss_growth_mb": round((after.rss_bytes - before.rss_bytes) / 2**20, 1),
+    }
+
+
+async def bench_backend(
+    backend: str, config: LoadConfig, postgres_uri: str | None = None
+) -> dict[str, Any]:
+    """Benchmark one persistence backend against a fresh server."""
+    if backend == "postgres" and not postgres_uri:
+        return {"skipped": "no Postgres URI (--postgres-uri or COGNITION_BENCH_POSTGRES_URI)"}
+
+    with tempfile.TemporaryDirectory(prefix=f"cognition-bench-{backend}-") as tmp:
+        workspace = Path(tmp)
+        (workspace / ".cognition").mkdir()
+        async with (
+            run_server(server_env(backend, workspace, postgres_uri), cwd=workspace) as server,
+            CognitionClient(server.base_url, max_connections=config.sessions + 10) as client,
+        ):
+            async with httpx.AsyncClient(base_url=server.base_url) as http:
+                response = await http.post(
+                    "/models/providers",
+                    json={
+                        "id": "bench",
+                        "provider": BENCH_PROVIDER,
+                        "model": "bench",
+                        # Ahead of any provider configured from the environment.
+                        "priority": -1000,
+                        "extra": config.latency_profile(),
+                    },
+                )
+                response.raise_for_status()
+            if config.warmup_turns:
+                check_provider(
+                    await drive(client, replace(config, sessions=1, turns=config.warmup_turns))
+                )
+
+            before = sample_process(server.pid)
+            started = time.perf_counter()
+            samples = await drive(client, config)
+            wall_s = time.perf_counter() - started
+            after = sample_process(server.pid)
+            check_provider(samples)
+
+    return summarise(samples, wall_s, before, after)
+
+
+# ---------------------------------------------------------------------------
+# Results and regressions
+# ---------------------------------------------------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _metric(results: dict[str, Any], name: str) -> float | None:
+    value: Any = results
+    for part in name.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return float(value) if isinstance(value, int | float) else None
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    thresholds: dict[str, float] | None = None,
+) -> list[Regression]:
+    """Find metrics in ``current`` that regressed against ``baseline``.
+
+    A metric regresses when it got worse by more than its relative threshold
+    and by more than its absolute noise floor. Backends or metrics missing
+    from either run are ignored.
+    """
+    thresholds = thresholds or {}
+    regressions: list[Regression] = []
+    for backend, result in current.get("backends", {}).items():
+        base = baseline.get("backends", {}).get(backend)
+        if not base or "skipped" in base or "skipped" in result:
+            continue
+        for metric, (higher_is_better, default, floor) in METRICS.items():
+            old, new = _metric(base, metric), _metric(result, metric)
+            if old is None or new is None:
+                continue
+            worse_by = old - new if higher_is_better else new - old
+            threshold = thresholds.get(metric, default)
+            if worse_by <= floor:
+                continue
+            change = worse_by / old if old else float("inf")
+            if change > threshold:
+                regressions.append(Regression(backend, metric, old, new, change, threshold))
+    return regressions
+
+
+def _parse_thresholds(values: Sequence[str]) -> dict[str, float]:
+    thresholds: dict[str, float] = {}
+    for value in values:
+        metric, sep, ratio = value.partition("=")
+        if not sep or metric not in METRICS:
+            raise argparse.ArgumentTypeError(
+                f"Expected METRIC=RATIO with METRIC one of {', '.join(METRICS)}: {value}"
+            )
+        thresholds[metric] = float(ratio)
+    return thresholds
+
+
+def _print_summary(results: dict[str, Any]) -> None:
+    for backend, result in results["backends"].items():
+        if "skipped" in result:
+            print(f"{backend:>8}: skipped ({result['skipped']})")
+            continue
+        print(
+            f"{backend:>8}: {result['turns']} turns ({result['failed_turns']} failed) "
+            f"in {result['wall_s']}s | "
+            f"ttft p50/p95 {result['ttft_ms']['p50']}/{result['ttft_ms']['p95']} ms | "
+            f"turn p50/p95/p99 {result['turn_ms']['p50']}/{result['turn_ms']['p95']}/"
+            f"{result['turn_ms']['p99']} ms | {result['events_per_s']} events/s | "
+            f"{result['server_cpu_us_per_token']} us cpu/token | "
+            f"rss +{result['rss_growth_mb']} MB"
+        )
+
+
+async def run(config: LoadConfig, backends: Sequence[str], postgres_uri: str | None) -> dict:
+    """Benchmark ``backends`` one after another and return the result document."""
+    results: dict[str, Any] = {}
+    for backend in backends:
+        results[backend] = await bench_backend(backend, config, postgres_uri)
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": asdict(config),
+        "backends": results,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="memory,sqlite", help="Comma-separated backends")
+    parser.add_argument("--sessions", type=int, default=LoadConfig.sessions)
+    parser.add_argument("--turns", type=int, default=LoadConfig.turns)
+    parser.add_argument("--tool-calls", type=int, default=LoadConfig.tool_calls)
+    parser.add_argument("--tokens", type=int, default=LoadConfig.tokens)
+    parser.add_argument("--ttft-ms", type=float, default=LoadConfig.ttft_ms)
+    parser.add_argument("--inter-token-ms", type=float, default=LoadConfig.inter_token_ms)
+    parser.add_argument("--warmup-turns", type=int, default=LoadConfig.warmup_turns)
+    parser.add_argument(
+        "--postgres-uri",
+        default=os.environ.get("COGNITION_BENCH_POSTGRES_URI"),
+        help="Database for the postgres backend (it is skipped without one)",
+    )
+    parser.add_argument("--output", type=Path, help="Write the result JSON here")
+    parser.add_argument("--baseline", type=Path, help="Result JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        metavar="METRIC=RATIO",
+        help="Override a regression threshold, e.g. turn_ms.p95=0.2",
+    )
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = sorted(set(backends) - set(BACKENDS))
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(unknown)}")
+    try:
+        thresholds = _parse_thresholds(args.threshold)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    config = LoadConfig(
+        sessions=args.sessions,
+        turns=args.turns,
+        tool_calls=args.tool_calls,
+        tokens=args.tokens,
+        ttft_ms=args.ttft_ms,
+        inter_token_ms=args.inter_token_ms,
+        warmup_turns=args.warmup_turns,
+    )
+    results = asyncio.run(run(config, backends, args.postgres_uri))
+    _print_summary(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != results["config"]:
+            print("warning: baseline was run with a different configuration", file=sys.stderr)
+        regressions = compare(baseline, results, thresholds)
+        for r in regressions:
+            print(
+                f"REGRESSION {r.backend} {r.metric}: {r.baseline} -> {r.current} "
+                f"({r.change:+.0%}, threshold {r.threshold:.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
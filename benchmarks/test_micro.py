@@ -0,0 +1,310 @@
+"""Micro-benchmarks for the per-event and per-turn hot helpers.
+
+Each helper runs once per streamed chunk, SSE event or listed session, so a
+small regression is multiplied thousands of times per turn. Inputs are
+synthetic but sized like a busy production turn.
+
+Run with pytest-benchmark (not collected by the default ``tests/`` run)::
+
+    pytest benchmarks/test_micro.py --benchmark-autosave
+    pytest benchmarks/test_micro.py --benchmark-compare --benchmark-compare-fail=mean:15%
+
+See ``benchmarks/README.md``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sqlite3
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import tool
+
+from server.app.agent.cognition_agent import RuntimeContext
+from server.app.agent.runtime import (
+    _completed_step_events,
+    _content_to_str,
+    _extract_todos_from_update,
+)
+from server.app.api.scoping import SessionScope
+from server.app.api.sse import EventBuffer, SSEStream
+from server.app.settings import Settings
+from server.app.storage.config_registry import SqliteConfigRegistry
+from server.app.storage.message_projection import project_checkpoint_messages
+
+pytest.importorskip("pytest_benchmark")
+
+_rng = random.Random(1234)
+_WORDS = ("the", "agent", "reads", "files", "runs", "tests", "and", "edits", "code", "until")
+
+
+def _text(words: int) -> str:
+    return " ".join(_rng.choice(_WORDS) for _ in range(words))
+
+
+@pytest.fixture(scope="module")
+def run() -> Iterator[Callable[[Awaitable[Any]], Any]]:
+    """Run coroutines to completion on one loop shared by the module."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+# ---------------------------------------------------------------------------
+# agent/runtime.py
+# ---------------------------------------------------------------------------
+
+# A 500-token reply streamed as Bedrock Converse deltas: the first block of
+# each content block carries "type", the rest only "text".
+_BEDROCK_DELTAS: list[Any] = [
+    [{"type": "text", "text": _text(2), "index": 0}]
+    if i % 50 == 0
+    else [{"text": f" {_text(2)}", "index": 0}]
+    for i in range(250)
+]
+_OPENAI_DELTAS: list[Any] = [f" {_text(2)}" for _ in range(250)]
+
+_TODOS_BEFORE = [
+    {"content": f"Step {i}: {_text(8)}", "status": "completed" if i < 10 else "pending"}
+    for i in range(25)
+]
+_TODOS_AFTER = [
+    {**todo, "status": "completed" if i < 11 else "in_progress" if i == 11 else "pending"}
+    for i, todo in enumerate(_TODOS_BEFORE)
+]
+_TODO_UPDATE = {
+    "TodoListMiddleware.after_model": {"todos": _TODOS_AFTER},
+    "model": {"messages": [AIMessage(_text(20))]},
+}
+
+
+def test_content_to_str_bedrock_deltas(benchmark: Any) -> None:
+    def stream() -> int:
+        return sum(len(_content_to_str(delta)) for delta in _BEDROCK_DELTAS)
+
+    assert benchmark(stream) > 0
+
+
+def test_content_to_str_plain_deltas(benchmark: Any) -> None:
+    def stream() -> int:
+        return sum(len(_content_to_str(delta)) for delta in _OPENAI_DELTAS)
+
+    assert benchmark(stream) > 0
+
+
+def test_extract_todos_from_update(benchmark: Any) -> None:
+    todos = benchmark(_extract_todos_from_update, _TODO_UPDATE)
+    assert todos is not None and len(todos) == 25
+
+
+def test_completed_step_events(benchmark: Any) -> None:
+    events = benchmark(_completed_step_events, _TODOS_BEFORE, _TODOS_AFTER)
+    assert [e.step_number for e in events] == [11]
+
+
+# ---------------------------------------------------------------------------
+# api/sse.py
+# ---------------------------------------------------------------------------
+
+_TOKEN_EVENT = {"content": " the build", "session_id": "4f1c" * 8}
+_TOOL_RESULT_EVENT = {
+    "tool_call_id": "call_" + "a" * 24,
+    "output": "\n".join(_text(12) for _ in range(60)),  # ~4 KB of file listing
+    "exit_code": 0,
+}
+
+
+def test_format_token_event(benchmark: Any) -> None:
+    frame = benchmark(SSEStream.format_event, "token", _TOKEN_EVENT, "1842-3fa9c2d1")
+    assert frame.endswith("\n\n")
+
+
+def test_format_tool_result_event(benchmark: Any) -> None:
+    frame = benchmark(SSEStream.format_event, "tool_result", _TOOL_RESULT_EVENT, "1843-7bd0e4a2")
+    assert frame.endswith("\n\n")
+
+
+@pytest.fixture(scope="module")
+def event_buffer(run: Callable[[Awaitable[Any]], Any]) -> EventBuffer:
+    """A full 5000-event replay buffer, the size a long turn retains."""
+    buffer = EventBuffer(max_size=5000)
+    for i in range(5000):
+        run(buffer.add(f"{i}-{i:08x}", "token", _TOKEN_EVENT))
+    return buffer
+
+
+@pytest.mark.parametrize("position", [4990, 2500])
+def test_event_buffer_get_events_after(
+    benchmark: Any,
+    run: Callable[[Awaitable[Any]], Any],
+    event_buffer: EventBuffer,
+    position: int,
+) -> None:
+    last_event_id = f"{position}-{position:08x}"
+    events = benchmark(lambda: run(event_buffer.get_events_after(last_event_id)))
+    assert len(events) == 4999 - position
+
+
+# ---------------------------------------------------------------------------
+# storage/message_projection.py
+# ---------------------------------------------------------------------------
+
+
+def _checkpoint_messages(turns: int) -> list[Any]:
+    messages: list[Any] = [SystemMessage(_text(200))]
+    for turn in range(turns):
+        messages.append(HumanMessage(_text(30)))
+        calls = [
+            {"name": "read_file", "args": {"path": f"/src/mod_{turn}_{i}.py"}, "id": f"c{turn}{i}"}
+            for i in range(3)
+        ]
+        messages.append(AIMessage("", tool_calls=calls))
+        messages.extend(ToolMessage(_text(150), tool_call_id=c["id"]) for c in calls)
+        messages.append(AIMessage(_text(120)))
+    return messages
+
+
+_CHECKPOINT = _checkpoint_messages(40)  # 241 messages
+
+
+def test_project_checkpoint_messages(benchmark: Any) -> None:
+    projected = benchmark(project_checkpoint_messages, "session-1", _CHECKPOINT)
+    assert len(projected) == len(_CHECKPOINT)
+
+
+# ---------------------------------------------------------------------------
+# storage/config_registry.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="module")
+def config_registry(
+    tmp_path_factory: pytest.TempPathFactory, run: Callable[[Awaitable[Any]], Any]
+) -> Iterator[SqliteConfigRegistry]:
+    """A registry holding 10,000 skill rows spread over global, org and user scopes."""
+    db_path = str(tmp_path_factory.mktemp("registry") / "config.db")
+    registry = SqliteConfigRegistry(db_path)
+    run(registry.initialize_schema())
+
+    now = datetime.now(UTC).isoformat()
+    scopes = [{}, {"org": "acme"}, {"org": "acme", "user": "alice"}, {"user": "bob"}]
+    rows = []
+    for i in range(10_000):
+        scope = scopes[i % len(scopes)]
+        definition = {
+            "name": f"skill-{i // 4}",
+            "description": _text(15),
+            "content": _text(120),
+            "enabled": True,
+        }
+        rows.append(
+            (
+                "skill",
+                f"skill-{i // 4}",
+                json.dumps(scope, sort_keys=True),
+                json.dumps(definition),
+                now,
+                now,
+            )
+        )
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO config_entities (entity_type, name, scope, definition, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    conn.close()
+
+    yield registry
+    run(registry.close())
+
+
+def test_sqlite_list_entities_10k(
+    benchmark: Any,
+    run: Callable[[Awaitable[Any]], Any],
+    config_registry: SqliteConfigRegistry,
+) -> None:
+    scope = {"org": "acme", "user": "alice"}
+    skills = benchmark(lambda: run(config_registry._list_entities("skill", scope)))
+    assert len(skills) == 2500
+
+
+# ---------------------------------------------------------------------------
+# agent/cognition_agent.py
+# ---------------------------------------------------------------------------
+
+
+def _make_tool(index: int) -> Any:
+    @tool(f"tool_{index}")
+    def _impl(path: str, limit: int = 100) -> str:
+        """Read part of a file."""
+        with open(path) as handle:
+            return "".join(handle.readlines()[:limit])
+
+    return _impl
+
+
+class _Middleware:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.max_retries = 3
+        self.enabled = True
+
+
+_FROM_PARAMS: dict[str, Any] = {
+    "project_path": Path("/workspace/project"),
+    "model": "anthropic.claude-sonnet",
+    "store": None,
+    "system_prompt": _text(1500),
+    "memory": ["AGENTS.md", ".cognition/memory.md"],
+    "skills": [f"/skills/skill-{i}" for i in range(12)],
+    "subagents": [{"name": f"agent-{i}", "system_prompt": _text(200)} for i in range(6)],
+    "interrupt_on": {"execute": True, "write_file": True},
+    "response_format": None,
+    "tool_token_limit_before_evict": 20_000,
+    "middleware": [_Middleware(f"mw-{i}") for i in range(6)],
+    "tools": [_make_tool(i) for i in range(30)],
+    "settings": Settings(),
+    "scope": {"user": "alice", "org": "acme", "project": "cognition"},
+    "subagent_spec_hash": "f" * 64,
+    "mcp_configs": None,
+}
+
+
+def test_runtime_context_from_params(benchmark: Any) -> None:
+    def build() -> int:
+        return hash(RuntimeContext.from_params(**_FROM_PARAMS))
+
+    benchmark(build)
+
+
+# ---------------------------------------------------------------------------
+# api/scoping.py
+# ---------------------------------------------------------------------------
+
+_SESSION_SCOPES = [
+    {
+        "user": f"user-{i % 200}",
+        "org": f"org-{i % 20}",
+        "project": f"project-{i % 50}",
+        "team": f"team-{i % 10}",
+    }
+    for i in range(5_000)
+]
+
+
+def test_session_scope_matches(benchmark: Any) -> None:
+    scope = SessionScope({"user": "user-7", "org": "org-7"})
+
+    def filter_sessions() -> int:
+        return sum(1 for scopes in _SESSION_SCOPES if scope.matches(scopes))
+
+    assert benchmark(filter_sessions) == 25
@@ -11,18 +11,21 @@ import os
 import subprocess
 import sys
 import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import httpx
 import typer
 from rich.console import Console
 from rich.live import Live
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from client.cli.render import MarkdownStream
+from client.sdk import CognitionAPIError, CognitionClient
+
 app = typer.Typer(
     name="cognition-cli",
     help="CLI client for Cognition",
@@ -33,51 +36,14 @@ app.add_typer(session_app, name="session")
 
 console = Console()
 
+T = TypeVar("T")
+
 # Configuration
 DEFAULT_SERVER_URL = "http://localhost:8000"
 STATE_FILE = Path(".cognition-cli-state.json")
 LOG_DIR = Path.home() / ".cognition" / "logs"
 
 
-class SSEParser:
-    """Parser for Server-Sent Events (SSE).
-
-    Correctly handles multi-line data and paired event/data lines.
-    """
-
-    def __init__(self) -> None:
-        self._current_event: str | None = None
-        self._current_data: list[str] = []
-
-    def parse_line(self, line: str) -> tuple[str, dict] | None:
-        """Parse a single line of SSE stream.
-
-        Returns:
-            Tuple of (event_type, data_dict) if an event is complete, else None.
-        """
-        line = line.strip()
-        if not line:
-            # Empty line signals end of event
-            if self._current_event and self._current_data:
-                try:
-                    data = json.loads("".join(self._current_data))
-                    event = (self._current_event, data)
-                    self._current_event = None
-                    self._current_data = []
-                    return event
-                except json.JSONDecodeError:
-                    self._current_event = None
-                    self._current_data = []
-            return None
-
-        if line.startswith("event: "):
-            self._current_event = line[7:].strip()
-        elif line.startswith("data: "):
-            self._current_data.append(line[6:].strip())
-
-        return None
-
-
 def get_server_url() -> str:
     """Get the server URL from environment or default."""
     return os.getenv("COGNITION_SERVER_URL", DEFAULT_SERVER_URL)
@@ -193,20 +159,21 @@ def load_state() -> dict[str, Any]:
     return {}
 
 
+async def _with_client(call: Callable[[CognitionClient], Awaitable[T]]) -> T:
+    async with CognitionClient(get_server_url()) as client:
+        return await call(client)
+
+
 @session_app.command("create")
 def create_session(
     title: str | None = typer.Option(None, "--title", "-t", help="Session title"),
 ) -> None:
     """Create a new agent session."""
     ensure_engine()
-    url = f"{get_server_url()}/sessions"
 
     try:
-        response = httpx.post(url, json={"title": title})
-        response.raise_for_status()
-        data = response.json()
-
-        session_id = data["id"]
+        session = asyncio.run(_with_client(lambda client: client.create_session(title)))
+        session_id = session.id
         save_state(session_id)
 
         console.print(f"[bold green]✓ Session created:[/bold green] {session_id}")
@@ -221,14 +188,9 @@ def create_session(
 def list_sessions() -> None:
     """List all sessions in the current workspace."""
     ensure_engine()
-    url = f"{get_server_url()}/sessions"
 
     try:
-        response = httpx.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        sessions = data.get("sessions", [])
+        sessions = asyncio.run(_with_client(lambda client: client.list_sessions())).sessions
         if not sessions:
             console.print("No active sessions found.")
             return
@@ -242,12 +204,12 @@ def list_sessions() -> None:
         current_id = load_state().get("current_session_id")
 
         for s in sessions:
-            marker = "*" if s["id"] == current_id else " "
+            marker = "*" if s.id == current_id else " "
             table.add_row(
-                f"{marker}{s['id'][:8]}",
-                s.get("title") or "Untitled",
-                str(s.get("message_count", 0)),
-                s.get("updated_at", "")[:16].replace("T", " "),
+                f"{marker}{s.id[:8]}",
+                s.title or "Untitled",
+                str(s.message_count),
+                s.updated_at[:16].replace("T", " "),
             )
 
         console.print(table)
@@ -257,116 +219,96 @@ def list_sessions() -> None:
         raise typer.Exit(1) from None
 
 
+def _render_tty_event(
+    stream: MarkdownStream,
+    event_type: str,
+    data: dict[str, Any],
+    stats_callback: Callable[[dict[str, Any]], None] | None,
+) -> None:
+    if event_type == "token":
+        stream.append(data.get("content", ""))
+    elif event_type == "tool_call":
+        stream.print(
+            f"[bold yellow]⚡ EXEC:[/bold yellow] [italic]{data['name']}({data['args']})[/italic]"
+        )
+    elif event_type == "tool_result":
+        output = data.get("output", "")
+        if len(output) > 100:
+            output = output[:100] + "..."
+        stream.print(f"   [dim cyan]└─ RETURN: {output.strip()}[/dim cyan]")
+    elif event_type == "usage" and stats_callback:
+        stats_callback(data)
+    elif event_type == "error":
+        stream.print(f"\n[bold red]TERMINAL_ERROR:[/bold red] {data['message']}")
+    elif event_type == "reconnected":
+        stream.print("[dim yellow]↻ Connection dropped, stream resumed[/dim yellow]")
+
+
+def _render_plain_event(
+    event_type: str,
+    data: dict[str, Any],
+    stats_callback: Callable[[dict[str, Any]], None] | None,
+) -> None:
+    if event_type == "token":
+        sys.stdout.write(data.get("content", ""))
+        sys.stdout.flush()
+    elif event_type == "tool_call":
+        print(f"\nEXEC: {data['name']}")
+    elif event_type == "tool_result":
+        print(f"RETURN: {str(data['output'])[:50]}...")
+    elif event_type == "usage" and stats_callback:
+        stats_callback(data)
+
+
 async def stream_chat(
-    session_id: str, message: str, stats_callback: Callable[[dict[str, Any]], None] | None = None
+    session_id: str,
+    message: str,
+    stats_callback: Callable[[dict[str, Any]], None] | None = None,
+    client: CognitionClient | None = None,
 ) -> None:
-    """Stream a chat message and display tokens with high-fidelity word-by-word printing."""
-    url = f"{get_server_url()}/sessions/{session_id}/messages"
+    """Stream a chat message and render the reply as it arrives.
 
-    accumulated_text = ""
-    parser = SSEParser()
+    If the connection drops before the turn is done, the SDK reattaches to
+    the session's event stream with ``Last-Event-ID`` rather than re-sending
+    the message; the server keeps running the turn in the meantime.
 
+    Args:
+        session_id: Session to send the message to.
+        message: Message content.
+        stats_callback: Called with the payload of ``usage`` events.
+        client: Client to send through; a short-lived one is opened if omitted.
+    """
+    if client is None:
+        async with CognitionClient(get_server_url()) as owned:
+            await stream_chat(session_id, message, stats_callback, owned)
+        return
+
+    is_tty = sys.stdout.isatty()
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            async with client.stream("POST", url, json={"content": message}) as response:
-                if response.status_code != 200:
-                    error_data = await response.aread()
-                    try:
-                        error_json = json.loads(error_data)
-                        msg = error_json.get("detail", error_data.decode())
-                    except Exception:
-                        msg = error_data.decode()
-                    console.print(f"[bold red]Error:[/bold red] {msg}")
-                    return
-
-                # Print header for raw stream
-                console.print("\n[bold magenta]»»» AGENT_COGNITION_INBOUND[/bold magenta]")
-
-                # Check if we are in a TTY for Live display
-                is_tty = sys.stdout.isatty()
-
-                if is_tty:
-                    # Use Live for smooth updates in terminal
-                    with Live(Markdown(""), refresh_per_second=15, auto_refresh=False) as live:
-                        async for line in response.aiter_lines():
-                            event = parser.parse_line(line)
-                            if not event:
-                                continue
-
-                            event_type, data = event
-
-                            if event_type == "token":
-                                if not live.is_started:
-                                    live.start()
-                                content = data.get("content", "")
-                                accumulated_text += content
-                                live.update(Markdown(accumulated_text))
-                                live.refresh()
-
-                            elif event_type == "tool_call":
-                                if live.is_started:
-                                    live.stop()
-                                console.print(
-                                    f"[bold yellow]⚡ EXEC:[/bold yellow] [italic]{data['name']}({data['args']})[/italic]"
-                                )
-
-                            elif event_type == "tool_result":
-                                if live.is_started:
-                                    live.stop()
-                                output = data.get("output", "")
-                                if len(output) > 100:
-                                    output = output[:100] + "..."
-                                console.print(
-                                    f"   [dim cyan]└─ RETURN: {output.strip()}[/dim cyan]"
-                                )
-
-                            elif event_type == "usage" and stats_callback:
-                                stats_callback(data)
-
-                            elif event_type == "error":
-                                if live.is_started:
-                                    live.stop()
-                                console.print(
-                                    f"\n[bold red]TERMINAL_ERROR:[/bold red] {data['message']}"
-                                )
-                                live.start()
-
-                            elif event_type == "done":
-                                if not live.is_started:
-                                    live.start()
-                                live.update(Markdown(accumulated_text))
-                                live.refresh()
-                                break
-                else:
-                    # Fallback to simple printing for non-TTY
-                    async for line in response.aiter_lines():
-                        event = parser.parse_line(line)
-                        if not event:
-                            continue
-
-                        event_type, data = event
-                        if event_type == "token":
-                            content = data.get("content", "")
-                            accumulated_text += content
-                            sys.stdout.write(content)
-                            sys.stdout.flush()
-                        elif event_type == "tool_call":
-                            print(f"\nEXEC: {data['name']}")
-                        elif event_type == "tool_result":
-                            print(f"RETURN: {str(data['output'])[:50]}...")
-                        elif event_type == "usage" and stats_callback:
-                            stats_callback(data)
-                        elif event_type == "done":
-                            print("\n--- END ---")
-                            break
-
-                print()  # Add spacing at the end
+        with Live(console=console, auto_refresh=False, transient=True) as live:
+            stream = MarkdownStream(live)
+            connected = False
+            try:
+                async for event in client.send_message(session_id, message):
+                    if not connected:
+                        # Print header for raw stream
+                        stream.print("\n[bold magenta]»»» AGENT_COGNITION_INBOUND[/bold magenta]")
+                        connected = True
+                    if is_tty:
+                        _render_tty_event(stream, event.event, event.data, stats_callback)
+                    else:
+                        _render_plain_event(event.event, event.data, stats_callback)
+            except CognitionAPIError as e:
+                stream.print(f"[bold red]Error:[/bold red] {e.detail}")
+                return
+            stream.flush()
+            if not is_tty:
+                print("\n--- END ---")
 
     except Exception as e:
         console.print(f"\n[bold red]COMM_LINK_FAILURE:[/bold red] {e}")
-
-
-from collections.abc import Callable
+    finally:
+        print()  # Add spacing at the end
 
 
 @app.command("chat")
@@ -388,11 +330,11 @@ def chat(
 
     if not active_session_id:
         console.print("[yellow]No active session found. Creating one...[/yellow]")
-        url = f"{get_server_url()}/sessions"
         try:
-            response = httpx.post(url, json={"title": "CLI Auto-Created"})
-            response.raise_for_status()
-            active_session_id = response.json()["id"]
+            session = asyncio.run(
+                _with_client(lambda client: client.create_session("CLI Auto-Created"))
+            )
+            active_session_id = session.id
             save_state(active_session_id)
             console.print(f"[bold green]✓ Session created:[/bold green] {active_session_id}")
         except Exception as e:
@@ -0,0 +1,97 @@
+"""Incremental terminal rendering for streamed agent replies."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from rich.console import RenderableType
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.text import Text
+
+_FENCES = ("```", "~~~")
+
+
+class MarkdownStream:
+    """Render a Markdown reply as it streams in, without re-rendering it all.
+
+    Text up to the last blank line outside a code fence is a finished block:
+    it is printed once above the live region and never parsed again. Only
+    the unfinished tail is re-rendered, and at most ``fps`` times a second,
+    so the cost per token stays constant however long the reply gets.
+
+    Args:
+        live: Live display the tail is drawn in. Printing through its console
+            keeps finished blocks above the live region.
+        fps: Maximum redraws of the tail per second.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        live: Live,
+        fps: float = 12.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._live = live
+        self._interval = 1.0 / fps
+        self._clock = clock
+        self._lines: list[str] = []  # complete lines of the unfinished tail
+        self._partial = ""  # text after the last newline
+        self._in_fence = False
+        self._block_end = 0  # lines[:block_end] form finished blocks
+        self._last_render = float("-inf")
+        self._dirty = False
+
+    def append(self, text: str) -> None:
+        """Add streamed text and redraw if the frame interval has passed."""
+        if not text:
+            return
+        *complete, self._partial = (self._partial + text).split("\n")
+        for line in complete:
+            self._lines.append(line)
+            stripped = line.lstrip()
+            if stripped.startswith(_FENCES):
+                self._in_fence = not self._in_fence
+            elif not stripped and not self._in_fence:
+                self._block_end = len(self._lines)
+
+        if self._block_end:
+            self._commit(self._block_end)
+        self._dirty = True
+        if self._clock() - self._last_render >= self._interval:
+            self.render()
+
+    def render(self) -> None:
+        """Redraw the unfinished tail now."""
+        if self._dirty:
+            tail = "\n".join([*self._lines, self._partial])
+            self._live.update(Markdown(tail) if tail.strip() else Text(""), refresh=True)
+            self._dirty = False
+        self._last_render = self._clock()
+
+    def flush(self) -> None:
+        """Print everything received so far and clear the live region."""
+        if self._partial:
+            self._lines.append(self._partial)
+            self._partial = ""
+        self._commit(len(self._lines))
+        self._in_fence = False
+        self.render()
+
+    def print(self, renderable: RenderableType) -> None:
+        """Print a non-reply line (tool calls, errors) after the text so far."""
+        self.flush()
+        self._live.console.print(renderable)
+
+    def _commit(self, end: int) -> None:
+        block = "\n".join(self._lines[:end])
+        del self._lines[:end]
+        self._block_end = 0
+        if block.strip():
+            self._live.console.print(Markdown(block))
+        self._dirty = True
+
+
+__all__ = ["MarkdownStream"]
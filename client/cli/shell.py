@@ -12,7 +12,6 @@ import sys
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import httpx
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.history import FileHistory
@@ -22,6 +21,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from client.sdk import CognitionClient
+
 if TYPE_CHECKING:
     pass
 
@@ -62,6 +63,8 @@ class CognitionShell:
         self.server_url = server_url
         self.stream_chat_fn = stream_chat_fn
         self.stats = SessionStats()
+        # One pooled client for the whole shell session.
+        self.client = CognitionClient(server_url)
 
         # Cache for model completions
         self.available_models: list[str] = []
@@ -123,36 +126,34 @@ class CognitionShell:
     async def fetch_models(self) -> None:
         """Fetch available models from the engine."""
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(f"{self.server_url}/config")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    providers = data.get("llm", {}).get("available_providers", [])
-                    models = []
-                    for p in providers:
-                        models.extend(p.get("models", []))
-                    self.available_models = models
-                    self.stats.model = data.get("llm", {}).get("model", "UNKNOWN")
-                    self.stats.provider = data.get("llm", {}).get("provider", "UNKNOWN")
+            llm = (await self.client.get_config()).llm
+            models = []
+            for p in llm.get("available_providers", []):
+                models.extend(p.get("models", []))
+            self.available_models = models
+            self.stats.model = llm.get("model", "UNKNOWN")
+            self.stats.provider = llm.get("provider", "UNKNOWN")
         except Exception:
             pass
 
     async def switch_model(self, model_id: str) -> None:
         """Update the current session to use a different model."""
-        url = f"{self.server_url}/sessions/{self.session_id}"
-
         try:
-            async with httpx.AsyncClient() as client:
-                # Update session config
-                resp = await client.patch(url, json={"config": {"model": model_id}})
-                resp.raise_for_status()
-                self.stats.model = model_id
-                console.print(f"[bold green]✓ BRAIN_LINK UPDATED: {model_id}[/bold green]")
+            # Update session config
+            await self.client.update_session(self.session_id, config={"model": model_id})
+            self.stats.model = model_id
+            console.print(f"[bold green]✓ BRAIN_LINK UPDATED: {model_id}[/bold green]")
         except Exception as e:
             console.print(f"[bold red]✗ BRAIN_LINK FAILURE:[/bold red] {e}")
 
     async def run(self) -> None:
         """Run the interactive shell loop."""
+        try:
+            await self._run()
+        finally:
+            await self.client.aclose()
+
+    async def _run(self) -> None:
         await self.fetch_models()
 
         # Initial display
@@ -221,7 +222,9 @@ class CognitionShell:
                         break
 
                 # Execute chat and update HUD on completion
-                await self.stream_chat_fn(self.session_id, user_input, self.stats.update)
+                await self.stream_chat_fn(
+                    self.session_id, user_input, self.stats.update, client=self.client
+                )
 
                 # Reset error counter on success
                 consecutive_errors = 0
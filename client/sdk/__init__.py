@@ -0,0 +1,41 @@
+"""Async Python SDK for the Cognition REST API.
+
+Example::
+
+    from client.sdk import CognitionClient
+
+    async with CognitionClient("http://localhost:8000") as client:
+        sessions = await client.create_sessions(100, concurrency=20)
+        results = await client.fan_out(
+            [(s.id, "Summarise the README") for s in sessions], concurrency=20
+        )
+"""
+
+from client.sdk.client import DEFAULT_BASE_URL, CognitionAPIError, CognitionClient
+from client.sdk.models import (
+    ConfigResponse,
+    MessageList,
+    MessageResponse,
+    SessionConfig,
+    SessionList,
+    SessionResponse,
+    TurnResult,
+    UsageResponse,
+)
+from client.sdk.sse import SSEParser, StreamEvent
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "CognitionAPIError",
+    "CognitionClient",
+    "ConfigResponse",
+    "MessageList",
+    "MessageResponse",
+    "SSEParser",
+    "SessionConfig",
+    "SessionList",
+    "SessionResponse",
+    "StreamEvent",
+    "TurnResult",
+    "UsageResponse",
+]
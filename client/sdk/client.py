@@ -0,0 +1,456 @@
+"""Async client for the Cognition REST API.
+
+A single :class:`CognitionClient` owns one pooled ``httpx.AsyncClient`` that
+every call shares, so batch jobs reuse warm connections instead of paying a
+TCP (and TLS) handshake per request. HTTP/2 is negotiated when the ``h2``
+package is installed, multiplexing concurrent streams over one connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from types import TracebackType
+from typing import Any, Literal, overload
+
+import httpx
+
+from client.sdk.models import (
+    ConfigResponse,
+    MessageList,
+    SessionConfig,
+    SessionList,
+    SessionResponse,
+    TurnResult,
+    UsageResponse,
+)
+from client.sdk.sse import SSEParser, StreamEvent
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+
+
+class CognitionAPIError(Exception):
+    """The server answered a request with an error status.
+
+    Attributes:
+        status_code: HTTP status code.
+        detail: Error detail from the response body.
+    """
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _error_detail(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+        return str(body.get("detail") or body.get("error") or response.text)
+    except (ValueError, AttributeError):
+        return response.text
+
+
+class CognitionClient:
+    """Pooled async client for a Cognition server.
+
+    Use as an async context manager, or call :meth:`aclose` when done::
+
+        async with CognitionClient("http://localhost:8000") as client:
+            session = await client.create_session(title="eval")
+            async for event in client.send_message(session.id, "Hello"):
+                ...
+
+    Args:
+        base_url: Server URL.
+        scope: Session scope sent as ``X-Cognition-Scope-<key>`` headers.
+        headers: Extra headers sent with every request.
+        timeout: Connect/write/pool timeout in seconds. Streams never time
+            out on reads, since a turn can think for a long time.
+        http2: Negotiate HTTP/2. Defaults to on when ``h2`` is installed.
+        max_connections: Size of the connection pool; all connections are
+            kept alive between requests.
+        max_reconnects: Consecutive attempts to resume a dropped stream.
+        backoff: First reconnect delay in seconds, doubled on every failed
+            attempt. A ``retry:`` hint from the server takes precedence.
+        max_backoff: Upper bound on the reconnect delay.
+        transport: Custom transport, mainly for tests.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        scope: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float = 30.0,
+        http2: bool | None = None,
+        max_connections: int = 100,
+        max_reconnects: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+
+        request_headers = dict(headers or {})
+        for key, value in (scope or {}).items():
+            request_headers[f"X-Cognition-Scope-{key.replace('_', '-')}"] = value
+
+        self.max_reconnects = max_reconnects
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._stream_timeout = httpx.Timeout(timeout, read=None)
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=request_headers,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Server URL requests are sent to."""
+        return str(self._http.base_url).rstrip("/")
+
+    async def __aenter__(self) -> CognitionClient:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._http.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        response = await self._http.request(method, path, **kwargs)
+        if response.is_error:
+            raise CognitionAPIError(response.status_code, _error_detail(response))
+        return response
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        title: str | None = None,
+        *,
+        agent_name: str = "default",
+        metadata: Mapping[str, str] | None = None,
+    ) -> SessionResponse:
+        """Create a session."""
+        body: dict[str, Any] = {"title": title, "agent_name": agent_name}
+        if metadata is not None:
+            body["metadata"] = dict(metadata)
+        response = await self._request("POST", "/sessions", json=body)
+        return SessionResponse.model_validate(response.json())
+
+    async def get_session(self, session_id: str) -> SessionResponse:
+        """Fetch a session."""
+        response = await self._request("GET", f"/sessions/{session_id}")
+        return SessionResponse.model_validate(response.json())
+
+    async def list_sessions(self, metadata: Mapping[str, str] | None = None) -> SessionList:
+        """List sessions, optionally only those whose metadata matches."""
+        params = {f"metadata.{key}": value for key, value in (metadata or {}).items()}
+        response = await self._request("GET", "/sessions", params=params)
+        return SessionList.model_validate(response.json())
+
+    async def update_session(
+        self,
+        session_id: str,
+        *,
+        title: str | None = None,
+        agent_name: str | None = None,
+        metadata: Mapping[str, str] | None = None,
+        config: SessionConfig | Mapping[str, Any] | None = None,
+    ) -> SessionResponse:
+        """Update a session's title, agent, metadata or LLM configuration."""
+        body: dict[str, Any] = {}
+        if title is not None:
+            body["title"] = title
+        if agent_name is not None:
+            body["agent_name"] = agent_name
+        if metadata is not None:
+            body["metadata"] = dict(metadata)
+        if isinstance(config, SessionConfig):
+            body["config"] = config.model_dump(mode="json", exclude_none=True)
+        elif config is not None:
+            body["config"] = dict(config)
+        response = await self._request("PATCH", f"/sessions/{session_id}", json=body)
+        return SessionResponse.model_validate(response.json())
+
+    async def delete_session(self, session_id: str) -> None:
+        """Delete a session and its messages."""
+        await self._request("DELETE", f"/sessions/{session_id}")
+
+    async def abort_session(self, session_id: str) -> None:
+        """Abort the session's in-progress turn."""
+        await self._request("POST", f"/sessions/{session_id}/abort")
+
+    async def list_messages(
+        self, session_id: str, *, limit: int = 50, offset: int = 0
+    ) -> MessageList:
+        """List a page of a session's messages."""
+        response = await self._request(
+            "GET",
+            f"/sessions/{session_id}/messages",
+            params={"limit": limit, "offset": offset},
+        )
+        return MessageList.model_validate(response.json())
+
+    async def get_session_usage(self, session_id: str) -> UsageResponse:
+        """Fetch a session's token usage and cost."""
+        response = await self._request("GET", f"/sessions/{session_id}/usage")
+        return UsageResponse.model_validate(response.json())
+
+    async def get_config(self) -> ConfigResponse:
+        """Fetch the server's configuration."""
+        response = await self._request("GET", "/config")
+        return ConfigResponse.model_validate(response.json())
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def send_message(
+        self,
+        session_id: str,
+        content: str,
+        *,
+        model: str | None = None,
+        parent_id: str | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Send a message and iterate over the turn's events.
+
+        If the connection drops mid-turn, the stream is resumed from the
+        session's event log with ``Last-Event-ID`` (the message is never
+        re-sent); a ``reconnected`` event marks the seam. Iteration ends
+        after ``done``, or when the server closes the stream after an
+        ``interrupt`` or ``error`` event.
+
+        Raises:
+            CognitionAPIError: The server rejected the message, or the turn
+                could no longer be found when resuming.
+            httpx.TransportError: The connection could not be restored.
+        """
+        body: dict[str, Any] = {"content": content}
+        if model is not None:
+            body["model"] = model
+        if parent_id is not None:
+            body["parent_id"] = parent_id
+        return self._stream(session_id, "POST", f"/sessions/{session_id}/messages", body)
+
+    def resume_session(
+        self,
+        session_id: str,
+        *,
+        decision: Literal["approve", "edit", "reject"],
+        tool_call_id: str,
+        tool_name: str,
+        args: Mapping[str, Any] | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Answer an approval interrupt and iterate over the resumed turn."""
+        body: dict[str, Any] = {
+            "decision": decision,
+            "tool_call_id": tool_call_id,
+            "tool_name": tool_name,
+        }
+        if args is not None:
+            body["args"] = dict(args)
+        return self._stream(session_id, "POST", f"/sessions/{session_id}/resume", body)
+
+    def events(
+        self, session_id: str, last_event_id: str | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        """Attach to the session's current or most recent turn.
+
+        Args:
+            session_id: Session to attach to.
+            last_event_id: Replay only events after this one.
+        """
+        return self._stream(
+            session_id, "GET", f"/sessions/{session_id}/events", last_event_id=last_event_id
+        )
+
+    async def _stream(
+        self,
+        session_id: str,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        last_event_id: str | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        parser = SSEParser()
+        parser.last_event_id = last_event_id
+        started = False
+        failures = 0
+        while True:
+            headers = {"Last-Event-ID": parser.last_event_id} if parser.last_event_id else {}
+            request = self._http.build_request(
+                method,
+                path,
+                json=body,
+                headers=headers,
+                timeout=self._stream_timeout,
+            )
+            try:
+                response = await self._http.send(request, stream=True)
+                try:
+                    if response.is_error:
+                        await response.aread()
+                        raise CognitionAPIError(response.status_code, _error_detail(response))
+                    started = True
+                    async for chunk in response.aiter_bytes():
+                        for event in parser.feed(chunk):
+                            failures = 0
+                            yield event
+                            if event.event == "done":
+                                return
+                finally:
+                    await response.aclose()
+                # The server closes the stream itself once the turn ends.
+                return
+            except httpx.TransportError:
+                # Before the turn has started nothing is known to have run,
+                # so only an established stream is resumed.
+                failures += 1
+                if not started or failures > self.max_reconnects:
+                    raise
+
+            delay = parser.retry_ms / 1000 if parser.retry_ms else self.backoff
+            await asyncio.sleep(min(self.max_backoff, delay * 2 ** (failures - 1)))
+            parser.reset()
+            method, path, body = "GET", f"/sessions/{session_id}/events", None
+
+    async def chat(
+        self,
+        session_id: str,
+        content: str,
+        *,
+        model: str | None = None,
+    ) -> TurnResult:
+        """Send a message and collect the whole turn."""
+        result = TurnResult(session_id=session_id)
+        parts: list[str] = []
+        async for event in self.send_message(session_id, content, model=model):
+            data = event.data
+            if event.event == "token":
+                parts.append(data.get("content", ""))
+            elif event.event == "tool_call":
+                result.tool_calls.append(data)
+            elif event.event == "usage":
+                result.usage = data
+            elif event.event == "interrupt":
+                result.interrupt = data
+            elif event.event == "error":
+                result.error = data
+            elif event.event == "reconnected":
+                result.reconnects += 1
+            elif event.event == "done":
+                result.message_id = data.get("message_id")
+                result.timing = data.get("timing")
+                result.completed = True
+        result.content = "".join(parts)
+        return result
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+
+    async def create_sessions(
+        self,
+        titles: int | Sequence[str | None],
+        *,
+        concurrency: int = 10,
+        agent_name: str = "default",
+        metadata: Mapping[str, str] | None = None,
+    ) -> list[SessionResponse]:
+        """Create many sessions, at most ``concurrency`` requests at a time.
+
+        Args:
+            titles: A title per session, or a number of untitled sessions.
+            concurrency: Maximum requests in flight.
+            agent_name: Agent every session is bound to.
+            metadata: Metadata attached to every session.
+
+        Returns:
+            The sessions, in the order of ``titles``.
+        """
+        if isinstance(titles, int):
+            titles = [None] * titles
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create(title: str | None) -> SessionResponse:
+            async with semaphore:
+                return await self.create_session(title, agent_name=agent_name, metadata=metadata)
+
+        return list(await asyncio.gather(*(create(title) for title in titles)))
+
+    @overload
+    async def fan_out(
+        self,
+        messages: Iterable[tuple[str, str]],
+        *,
+        concurrency: int = ...,
+        model: str | None = ...,
+        return_exceptions: Literal[False] = ...,
+    ) -> list[TurnResult]: ...
+
+    @overload
+    async def fan_out(
+        self,
+        messages: Iterable[tuple[str, str]],
+        *,
+        concurrency: int = ...,
+        model: str | None = ...,
+        return_exceptions: Literal[True],
+    ) -> list[TurnResult | BaseException]: ...
+
+    async def fan_out(
+        self,
+        messages: Iterable[tuple[str, str]],
+        *,
+        concurrency: int = 10,
+        model: str | None = None,
+        return_exceptions: bool = False,
+    ) -> list[TurnResult] | list[TurnResult | BaseException]:
+        """Run turns in many sessions, at most ``concurrency`` at a time.
+
+        Args:
+            messages: ``(session_id, content)`` pairs.
+            concurrency: Maximum turns in flight.
+            model: Model override for every turn.
+            return_exceptions: Return a failed turn's exception in its slot
+                instead of raising the first one.
+
+        Returns:
+            One result per pair, in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(session_id: str, content: str) -> TurnResult:
+            async with semaphore:
+                return await self.chat(session_id, content, model=model)
+
+        return await asyncio.gather(
+            *(run(session_id, content) for session_id, content in messages),
+            return_exceptions=return_exceptions,
+        )
+
+
+__all__ = ["CognitionAPIError", "CognitionClient", "DEFAULT_BASE_URL"]
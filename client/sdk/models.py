@@ -0,0 +1,68 @@
+"""Typed models for the Cognition client SDK.
+
+Request and response bodies are the server's own API models, re-exported so
+client and server can never drift apart. Importing them does not load the
+server runtime.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from server.app.api.models import (
+    ConfigResponse,
+    MessageList,
+    MessageResponse,
+    SessionList,
+    SessionResponse,
+    UsageResponse,
+)
+from server.app.models import SessionConfig
+
+
+@dataclass
+class TurnResult:
+    """The outcome of one agent turn, collected from its event stream.
+
+    Attributes:
+        session_id: Session the turn ran in.
+        content: Concatenated ``token`` content of the reply.
+        message_id: ID of the persisted assistant message, from ``done``.
+        usage: Payload of the turn's ``usage`` event, if any.
+        tool_calls: Payloads of the turn's ``tool_call`` events.
+        interrupt: Payload of the ``interrupt`` event if the turn is waiting
+            for approval.
+        error: Payload of the ``error`` event if the turn failed.
+        reconnects: Times the stream was resumed after a dropped connection.
+        completed: Whether the ``done`` event arrived.
+        timing: Server-side phase timing of the turn, from ``done``.
+    """
+
+    session_id: str
+    content: str = ""
+    message_id: str | None = None
+    usage: dict[str, Any] | None = None
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    interrupt: dict[str, Any] | None = None
+    error: dict[str, Any] | None = None
+    reconnects: int = 0
+    completed: bool = False
+    timing: dict[str, Any] | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the turn ran to completion without an error."""
+        return self.completed and self.error is None
+
+
+__all__ = [
+    "ConfigResponse",
+    "MessageList",
+    "MessageResponse",
+    "SessionConfig",
+    "SessionList",
+    "SessionResponse",
+    "TurnResult",
+    "UsageResponse",
+]
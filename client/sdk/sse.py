@@ -0,0 +1,95 @@
+"""Incremental Server-Sent Events parsing for the Cognition client."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """A single event from a Cognition SSE stream.
+
+    Attributes:
+        event: Event type (``token``, ``tool_call``, ``usage``, ``done``, ...).
+        data: Decoded JSON payload.
+        id: Event ID the server attached, used to resume with ``Last-Event-ID``.
+    """
+
+    event: str
+    data: dict[str, Any] = field(default_factory=dict)
+    id: str | None = None
+
+
+class SSEParser:
+    """Incremental parser for Server-Sent Events (SSE).
+
+    Fed raw byte chunks as they arrive, in whatever sizes the transport
+    delivers them; only complete lines are decoded. Handles multi-line data,
+    comments, and remembers the last ``id:`` and ``retry:`` seen so a dropped
+    stream can be resumed with ``Last-Event-ID``.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._event: str | None = None
+        self._data: list[bytes] = []
+        self._id: str | None = None
+        self.last_event_id: str | None = None
+        self.retry_ms: int | None = None
+
+    def feed(self, chunk: bytes) -> list[StreamEvent]:
+        """Consume a chunk and return the events it completes.
+
+        Returns:
+            The completed events, possibly none.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        events: list[StreamEvent] = []
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+            if not line:
+                # Empty line signals end of event
+                event = self._dispatch()
+                if event is not None:
+                    events.append(event)
+                continue
+
+            name, _, value = line.partition(b":")
+            if value.startswith(b" "):
+                value = value[1:]
+            if name == b"data":
+                self._data.append(value)
+            elif name == b"event":
+                self._event = value.decode()
+            elif name == b"id":
+                self._id = self.last_event_id = value.decode() or None
+            elif name == b"retry" and value.isdigit():
+                self.retry_ms = int(value)
+            # Lines starting with ":" are comments (keepalives).
+        del buffer[:start]
+        return events
+
+    def reset(self) -> None:
+        """Drop any partial event, keeping the resume position."""
+        self._buffer.clear()
+        self._event = None
+        self._data = []
+        self._id = None
+
+    def _dispatch(self) -> StreamEvent | None:
+        event_type, data, event_id = self._event, self._data, self._id
+        self._event, self._data, self._id = None, [], None
+        if not event_type or not data:
+            return None
+        try:
+            return StreamEvent(event_type, json.loads(b"\n".join(data)), event_id)
+        except json.JSONDecodeError:
+            return None
+
+
+__all__ = ["SSEParser", "StreamEvent"]
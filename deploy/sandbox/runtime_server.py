@@ -2,33 +2,74 @@
 #
 # Implements the agent-sandbox HTTP protocol on port 8888:
 #   POST /execute        - run a shell command, return stdout/stderr/exit_code
+#   POST /execute/stream - run a shell command, stream stdout/stderr as SSE
 #   POST /upload         - upload a file into the sandbox
 #   GET  /download/{path}- download a file from the sandbox
 #   GET  /list/{path}    - list directory contents
 #   GET  /exists/{path}  - check if a path exists
 #   GET  /               - health check
 #
+# Batch file transfer used by langchain-k8s-sandbox:
+#   POST /upload/batch   - tar stream in, one file per member (member name = path)
+#   POST /download/batch - JSON {"paths": [...]} in, tar stream out; per-path
+#                          errors are returned in the X-File-Errors header
+#   POST /checksums      - JSON {"paths": [...]} in, sha256 per path out
+#
+# Commands run as asyncio subprocesses in their own process group, so a long
+# build never blocks the event loop (health checks and file transfers keep
+# answering). Each command has a timeout after which the whole process group is
+# killed, captured output is capped per stream, and at most
+# COGNITION_EXECUTE_MAX_CONCURRENCY commands run at once (the rest queue):
+#   COGNITION_EXECUTE_TIMEOUT_SECONDS   default timeout when the request has none (1800)
+#   COGNITION_EXECUTE_MAX_OUTPUT_BYTES  stdout/stderr kept per stream (1 MiB)
+#   COGNITION_EXECUTE_MAX_CONCURRENCY   concurrent commands (4)
+# A timed-out command reports exit code 124, like timeout(1).
+#
 # Working directory is /workspace (emptyDir mount from SandboxTemplate).
 # Path security is enforced by CognitionKubernetesSandboxBackend upstream;
 # this server does not restrict paths within the sandbox itself.
 #
 # Compatible with k8s-agent-sandbox==0.3.10
 
+import asyncio
+import codecs
+import contextlib
+import hashlib
+import json
 import os
-import subprocess
+import shutil
+import signal
+import tarfile
+import tempfile
 import urllib.parse
-from typing import Any
+from collections.abc import AsyncGenerator, Iterator
+from typing import IO, Any
 
-from fastapi import FastAPI, File, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from starlette.responses import Response
 
 WORKSPACE = os.environ.get("COGNITION_WORKSPACE_ROOT", "/workspace")
+CHUNK_SIZE = 1024 * 1024
+# Upload bodies larger than this are spooled to disk instead of memory.
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+EXECUTE_TIMEOUT = float(os.environ.get("COGNITION_EXECUTE_TIMEOUT_SECONDS", "1800"))
+MAX_OUTPUT_BYTES = int(os.environ.get("COGNITION_EXECUTE_MAX_OUTPUT_BYTES", str(1024 * 1024)))
+MAX_CONCURRENCY = int(os.environ.get("COGNITION_EXECUTE_MAX_CONCURRENCY", "4"))
+TIMEOUT_EXIT_CODE = 124
+# Idle SSE streams get a comment line this often so proxies keep them open.
+HEARTBEAT_SECONDS = 15.0
+READ_SIZE = 64 * 1024
+
+_slots = asyncio.Semaphore(MAX_CONCURRENCY)
+_running = 0
 
 
 class ExecuteRequest(BaseModel):
     command: str
+    timeout: float | None = None
 
 
 class ExecuteResponse(BaseModel):
@@ -37,6 +78,243 @@ class ExecuteResponse(BaseModel):
     exit_code: int
 
 
+class PathsRequest(BaseModel):
+    paths: list[str]
+
+
+def _resolve(path: str) -> str:
+    return os.path.join(WORKSPACE, path.lstrip("/")) if not os.path.isabs(path) else path
+
+
+def _error_code(exc: OSError) -> str:
+    if isinstance(exc, IsADirectoryError):
+        return "is_directory"
+    if isinstance(exc, PermissionError):
+        return "permission_denied"
+    if isinstance(exc, FileNotFoundError):
+        return "file_not_found"
+    return "invalid_path"
+
+
+def _sha256(full: str) -> str | None:
+    if not os.path.isfile(full):
+        return None
+    digest = hashlib.sha256()
+    try:
+        with open(full, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _extract_tar(fileobj: IO[bytes]) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    with tarfile.open(fileobj=fileobj, mode="r|") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            source = tar.extractfile(member)
+            if source is None:
+                continue
+            full = _resolve(member.name)
+            try:
+                os.makedirs(os.path.dirname(full) or ".", exist_ok=True)
+                with open(full, "wb") as f:
+                    shutil.copyfileobj(source, f, CHUNK_SIZE)
+                results.append({"path": member.name, "error": None})
+            except OSError as e:
+                results.append({"path": member.name, "error": _error_code(e)})
+    return results
+
+
+def _iter_member(name: str, f: IO[bytes]) -> Iterator[bytes]:
+    size = os.fstat(f.fileno()).st_size
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = 0o644
+    info.mtime = int(os.fstat(f.fileno()).st_mtime)
+    yield info.tobuf(format=tarfile.PAX_FORMAT)
+    remaining = size
+    while remaining > 0:
+        chunk = f.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            # File shrank while streaming; keep the archive well-formed.
+            chunk = b"\0" * min(CHUNK_SIZE, remaining)
+        remaining -= len(chunk)
+        yield chunk
+    if pad := -size % tarfile.BLOCKSIZE:
+        yield b"\0" * pad
+
+
+def _iter_tar(files: list[tuple[str, str]]) -> Iterator[bytes]:
+    # Hand-rolled tar writer so large files are streamed in CHUNK_SIZE pieces
+    # rather than buffered whole by tarfile.addfile().
+    for name, full in files:
+        try:
+            with open(full, "rb") as f:
+                yield from _iter_member(name, f)
+        except FileNotFoundError:
+            # Removed between the existence check and the read.
+            continue
+    yield b"\0" * (2 * tarfile.BLOCKSIZE)
+
+
+class _Capped:
+    """Keeps at most ``limit`` bytes of a stream and counts the rest."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.kept = 0
+        self.omitted = 0
+
+    def take(self, chunk: bytes) -> bytes:
+        room = max(0, self.limit - self.kept)
+        kept = chunk[:room]
+        self.kept += len(kept)
+        self.omitted += len(chunk) - len(kept)
+        return kept
+
+    def notice(self) -> str:
+        return f"\n[output truncated: {self.omitted} bytes omitted]" if self.omitted else ""
+
+
+def _timeout(request: ExecuteRequest) -> float:
+    return request.timeout if request.timeout and request.timeout > 0 else EXECUTE_TIMEOUT
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+async def _pump(name: str, reader: asyncio.StreamReader, queue: asyncio.Queue) -> None:
+    while chunk := await reader.read(READ_SIZE):
+        await queue.put((name, chunk))
+    await queue.put((name, None))
+
+
+async def _run_command(command: str, timeout: float) -> AsyncGenerator[tuple[str, Any], None]:
+    """Run ``command`` and yield its events in order.
+
+    Yields ``("stdout" | "stderr", bytes)`` as output arrives, ``("heartbeat",
+    None)`` after HEARTBEAT_SECONDS of silence, and finally ``("exit",
+    (exit_code, timed_out))``. Closing the generator early kills the command.
+    """
+    global _running
+    async with _slots:
+        process = await asyncio.create_subprocess_exec(
+            "sh",
+            "-c",
+            command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=WORKSPACE,
+            env={**os.environ, "HOME": "/home/sandbox"},
+            start_new_session=True,
+        )
+        # Counted once spawned: the finally below is what decrements it.
+        _running += 1
+        # Bounded so a slow reader applies backpressure to the command.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        pumps = [
+            asyncio.create_task(_pump("stdout", process.stdout, queue)),  # type: ignore[arg-type]
+            asyncio.create_task(_pump("stderr", process.stderr, queue)),  # type: ignore[arg-type]
+        ]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        timed_out = False
+        try:
+            open_streams = len(pumps)
+            while open_streams:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                try:
+                    name, chunk = await asyncio.wait_for(queue.get(), min(remaining, HEARTBEAT_SECONDS))
+                except TimeoutError:
+                    yield "heartbeat", None
+                    continue
+                if chunk is None:
+                    open_streams -= 1
+                else:
+                    yield name, chunk
+            if not timed_out:
+                try:
+                    await asyncio.wait_for(process.wait(), max(0.0, deadline - loop.time()))
+                except TimeoutError:
+                    timed_out = True
+            if timed_out:
+                _kill_group(process)
+                await process.wait()
+            yield "exit", (TIMEOUT_EXIT_CODE if timed_out else process.returncode, timed_out)
+        finally:
+            if process.returncode is None:
+                _kill_group(process)
+                await process.wait()
+            for pump in pumps:
+                pump.cancel()
+            _running -= 1
+
+
+async def _collect(command: str, timeout: float) -> ExecuteResponse:
+    out: dict[str, bytearray] = {"stdout": bytearray(), "stderr": bytearray()}
+    caps = {name: _Capped(MAX_OUTPUT_BYTES) for name in out}
+    exit_code, timed_out = 1, False
+    async with contextlib.aclosing(_run_command(command, timeout)) as events:
+        async for kind, value in events:
+            if kind in out:
+                out[kind] += caps[kind].take(value)
+            elif kind == "exit":
+                exit_code, timed_out = value
+    stderr = out["stderr"].decode(errors="replace") + caps["stderr"].notice()
+    if timed_out:
+        stderr += f"\nCommand timed out after {timeout:g}s"
+    return ExecuteResponse(
+        stdout=out["stdout"].decode(errors="replace") + caps["stdout"].notice(),
+        stderr=stderr,
+        exit_code=exit_code,
+    )
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+async def _sse(command: str, timeout: float) -> AsyncGenerator[bytes, None]:
+    caps = {name: _Capped(MAX_OUTPUT_BYTES) for name in ("stdout", "stderr")}
+    # Incremental decoders so multi-byte characters split across reads survive.
+    decoders = {name: codecs.getincrementaldecoder("utf-8")("replace") for name in caps}
+    async with contextlib.aclosing(_run_command(command, timeout)) as events:
+        async for kind, value in events:
+            if kind in caps:
+                if text := decoders[kind].decode(caps[kind].take(value)):
+                    yield _sse_event(kind, {"data": text})
+            elif kind == "heartbeat":
+                yield b": keepalive\n\n"
+            else:
+                exit_code, timed_out = value
+                for name, decoder in decoders.items():
+                    if text := decoder.decode(b"", final=True):
+                        yield _sse_event(name, {"data": text})
+                yield _sse_event(
+                    "exit",
+                    {
+                        "exit_code": exit_code,
+                        "timed_out": timed_out,
+                        "omitted_bytes": {name: cap.omitted for name, cap in caps.items()},
+                    },
+                )
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
 app = FastAPI(
     title="Cognition Sandbox Runtime",
     description="K8s sandbox runtime for Cognition agent sessions",
@@ -45,27 +323,40 @@ app = FastAPI(
 
 
 @app.get("/", summary="Health check")
-async def health_check() -> dict[str, str]:
-    return {"status": "ok", "workspace": WORKSPACE}
+async def health_check() -> dict[str, Any]:
+    return {
+        "status": "ok",
+        "workspace": WORKSPACE,
+        "executions": {"running": _running, "limit": MAX_CONCURRENCY},
+    }
 
 
 @app.post("/execute", summary="Execute a shell command", response_model=ExecuteResponse)
-async def execute_command(request: ExecuteRequest) -> ExecuteResponse:
+async def execute_command(request: ExecuteRequest, raw: Request) -> Response:
+    collect = asyncio.create_task(_collect(request.command, _timeout(request)))
+    disconnect = asyncio.create_task(_wait_for_disconnect(raw))
+    await asyncio.wait({collect, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    disconnect.cancel()
+    if not collect.done():
+        # Caller went away (e.g. its own timeout); don't leave the command running.
+        collect.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await collect
+        return Response(status_code=499)
     try:
-        process = subprocess.run(
-            ["sh", "-c", request.command],
-            capture_output=True,
-            text=True,
-            cwd=WORKSPACE,
-            env={**os.environ, "HOME": "/home/sandbox"},
-        )
-        return ExecuteResponse(
-            stdout=process.stdout,
-            stderr=process.stderr,
-            exit_code=process.returncode,
-        )
+        result = collect.result()
     except Exception as e:
-        return ExecuteResponse(stdout="", stderr=str(e), exit_code=1)
+        result = ExecuteResponse(stdout="", stderr=str(e), exit_code=1)
+    return JSONResponse(status_code=200, content=result.model_dump())
+
+
+@app.post("/execute/stream", summary="Execute a shell command, streaming output as SSE")
+async def execute_stream(request: ExecuteRequest) -> StreamingResponse:
+    return StreamingResponse(
+        _sse(request.command, _timeout(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/upload", summary="Upload a file")
@@ -81,10 +372,56 @@ async def upload_file(file: UploadFile = File(...)) -> JSONResponse:
         return JSONResponse(status_code=500, content={"message": str(e)})
 
 
+@app.post("/upload/batch", summary="Upload files from a tar stream")
+async def upload_batch(request: Request) -> JSONResponse:
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        async for chunk in request.stream():
+            # Past SPOOL_MAX_BYTES the spool is a file on disk; write off the loop.
+            if spool.tell() + len(chunk) > SPOOL_MAX_BYTES:
+                await asyncio.to_thread(spool.write, chunk)
+            else:
+                spool.write(chunk)
+        spool.seek(0)
+        try:
+            results = await asyncio.to_thread(_extract_tar, spool)
+        except tarfile.TarError as e:
+            return JSONResponse(status_code=400, content={"message": f"Invalid tar stream: {e}"})
+    return JSONResponse(status_code=200, content={"results": results})
+
+
+@app.post("/download/batch", summary="Download files as a tar stream")
+async def download_batch(request: PathsRequest) -> Response:
+    found: list[tuple[str, str]] = []
+    errors: dict[str, str] = {}
+    for path in request.paths:
+        full = _resolve(path)
+        if os.path.isdir(full):
+            errors[path] = "is_directory"
+        elif not os.path.isfile(full):
+            errors[path] = "file_not_found"
+        elif not os.access(full, os.R_OK):
+            errors[path] = "permission_denied"
+        else:
+            found.append((path, full))
+    return StreamingResponse(
+        _iter_tar(found),
+        media_type="application/x-tar",
+        headers={"X-File-Errors": json.dumps(errors)},
+    )
+
+
+@app.post("/checksums", summary="SHA-256 of files, null if missing")
+async def checksums(request: PathsRequest) -> JSONResponse:
+    digests = await asyncio.to_thread(
+        lambda: {path: _sha256(_resolve(path)) for path in request.paths}
+    )
+    return JSONResponse(status_code=200, content={"checksums": digests})
+
+
 @app.get("/download/{encoded_path:path}", summary="Download a file")
 async def download_file(encoded_path: str) -> Response:
     path = urllib.parse.unquote(encoded_path)
-    full = os.path.join(WORKSPACE, path.lstrip("/")) if not os.path.isabs(path) else path
+    full = _resolve(path)
     if os.path.isfile(full):
         return FileResponse(path=full, media_type="application/octet-stream", filename=os.path.basename(full))
     return JSONResponse(status_code=404, content={"message": "File not found"})
@@ -93,7 +430,7 @@ async def download_file(encoded_path: str) -> Response:
 @app.get("/list/{encoded_path:path}", summary="List directory")
 async def list_files(encoded_path: str) -> JSONResponse:
     path = urllib.parse.unquote(encoded_path)
-    full = os.path.join(WORKSPACE, path.lstrip("/")) if not os.path.isabs(path) else path
+    full = _resolve(path)
     if not os.path.isdir(full):
         return JSONResponse(status_code=404, content={"message": "Not a directory"})
     try:
@@ -115,5 +452,5 @@ async def list_files(encoded_path: str) -> JSONResponse:
 @app.get("/exists/{encoded_path:path}", summary="Check path exists")
 async def exists(encoded_path: str) -> JSONResponse:
     path = urllib.parse.unquote(encoded_path)
-    full = os.path.join(WORKSPACE, path.lstrip("/")) if not os.path.isabs(path) else path
+    full = _resolve(path)
     return JSONResponse(status_code=200, content={"path": path, "exists": os.path.exists(full)})
@@ -7,34 +7,157 @@ command execution.
 
 Design decisions:
 - Lazy initialization: Sandbox CR is created on first ``execute()``, not in ``__init__``.
-  This avoids paying for sandboxes in sessions that never execute code.
+  This avoids paying for sandboxes in sessions that never execute code. Callers
+  that know a command is coming can call ``claim()`` ahead of time (e.g. in a
+  worker thread) so provisioning overlaps other work; a concurrent ``execute()``
+  waits for the in-flight claim instead of creating a second sandbox.
+- Shared clients: one SDK ``SandboxClient`` per router URL and port, and one
+  Kubernetes API client for TTL patches, are reused across sandboxes.
 - Labels: Generic dict passed through to the Sandbox CR. Callers (Cognition) populate
   these with user/org/project/session IDs for multi-tenant scoping.
 - TTL: Applied via the Sandbox CR's ``spec.shutdownTime`` field after creation,
   since the SDK's ``create_sandbox()`` does not expose a TTL parameter.
-- File operations: Inherited from ``BaseSandbox`` — all file ops pipe shell commands
-  through ``execute()``. Native SDK file transfer is a future optimization.
+- File transfer: ``upload_files``/``download_files`` stream tar archives to the
+  runtime server's ``/upload/batch`` and ``/download/batch`` endpoints through the
+  sandbox router, one request per batch. Large uploads are skipped when the
+  remote SHA-256 already matches. ``ls`` uses ``/list``. Runtime images without
+  these endpoints fall back to the base64-over-``execute()`` path.
 - Sync only (v1): ``aexecute()`` is provided by ``SandboxBackendProtocol`` via
   ``asyncio.to_thread()`` wrapping this sync ``execute()``.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import posixpath
 import shlex
-from datetime import UTC
-from typing import Any
-
+import tarfile
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+from typing import Any, cast
+
+import httpx
 import structlog
 from deepagents.backends.protocol import (
     ExecuteResponse,
     FileDownloadResponse,
+    FileInfo,
+    FileOperationError,
     FileUploadResponse,
+    LsResult,
 )
 from deepagents.backends.sandbox import BaseSandbox
 
 logger = structlog.get_logger(__name__)
 
 
+_clients: dict[tuple[str, int], Any] = {}
+_clients_lock = threading.Lock()
+_custom_objects_api: Any | None = None
+
+
+def _shared_client(router_url: str, server_port: int) -> Any:
+    """Return the ``SandboxClient`` for a router, creating it on first use.
+
+    Raises:
+        RuntimeError: If the k8s-agent-sandbox SDK is not installed.
+    """
+    try:
+        from k8s_agent_sandbox import SandboxClient
+        from k8s_agent_sandbox.models import SandboxDirectConnectionConfig
+    except ImportError as e:
+        raise RuntimeError(
+            "k8s-agent-sandbox is required for K8sSandbox. "
+            "Install with: pip install langchain-k8s-sandbox[k8s]"
+        ) from e
+
+    key = (router_url, server_port)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            connection_config = SandboxDirectConnectionConfig(
+                api_url=router_url,
+                server_port=server_port,
+            )
+            client = SandboxClient(connection_config=connection_config)
+            _clients[key] = client
+        return client
+
+
+def _shared_custom_objects_api() -> Any:
+    """Return a Kubernetes ``CustomObjectsApi``, loading cluster config once.
+
+    Tries in-cluster config first (production), then falls back to
+    ``~/.kube/config`` (local dev / CI).
+    """
+    global _custom_objects_api
+    with _clients_lock:
+        if _custom_objects_api is None:
+            from kubernetes import client as k8s_client
+            from kubernetes.config import ConfigException
+
+            try:
+                from kubernetes.config import load_incluster_config
+
+                load_incluster_config()
+            except ConfigException:
+                from kubernetes.config import load_kube_config
+
+                load_kube_config()
+            _custom_objects_api = k8s_client.CustomObjectsApi()
+        return _custom_objects_api
+
+
+class NativeTransferUnavailableError(Exception):
+    """The sandbox runtime does not implement the batch file transfer endpoints."""
+
+
+def iter_tar(files: Iterable[tuple[str, bytes]], chunk_size: int) -> Iterator[bytes]:
+    """Yield a tar archive of ``files`` in pieces of at most ``chunk_size`` bytes.
+
+    Member names are the target paths, unchanged. Content is sliced rather than
+    copied into an archive buffer, so the request body never holds more than
+    one chunk beyond the caller's own data.
+    """
+    mtime = int(time.time())
+    for name, content in files:
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        info.mode = 0o644
+        info.mtime = mtime
+        yield info.tobuf(format=tarfile.PAX_FORMAT)
+        view = memoryview(content)
+        for start in range(0, len(content), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+        if pad := -len(content) % tarfile.BLOCKSIZE:
+            yield b"\0" * pad
+    yield b"\0" * (2 * tarfile.BLOCKSIZE)
+
+
+class _ChunkReader:
+    """Minimal file object over an iterator of byte chunks, for ``tarfile`` stream mode."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer.extend(chunk)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
 class K8sSandbox(BaseSandbox):
     """deepagents sandbox backend using kubernetes-sigs/agent-sandbox.
 
@@ -50,6 +173,15 @@ class K8sSandbox(BaseSandbox):
             Prevents resource leaks from abandoned sessions.
         server_port: Port the sandbox runtime listens on inside the pod.
         warm_pool: Optional SandboxWarmPool CR name for pre-warmed allocation.
+        transfer_chunk_size: Bytes per chunk when streaming file transfers.
+        checksum_min_bytes: Uploads at least this large are skipped when the
+            remote file's SHA-256 already matches. Smaller files are always sent,
+            since the checksum round trip would cost more than the transfer.
+        transfer_timeout: Timeout in seconds for file transfer requests.
+        latency_observer: Called with ``("claim", seconds)`` once the Sandbox CR
+            is created and configured, and ``("ready", seconds)`` when the
+            sandbox first answers a command, both measured from the start of
+            the claim.
     """
 
     def __init__(
@@ -61,6 +193,10 @@ class K8sSandbox(BaseSandbox):
         ttl: int | None = None,
         server_port: int = 8888,
         warm_pool: str | None = None,
+        transfer_chunk_size: int = 1024 * 1024,
+        checksum_min_bytes: int = 64 * 1024,
+        transfer_timeout: float = 300.0,
+        latency_observer: Callable[[str, float], None] | None = None,
     ) -> None:
         self._template = template
         self._namespace = namespace
@@ -69,10 +205,20 @@ class K8sSandbox(BaseSandbox):
         self._ttl = ttl
         self._server_port = server_port
         self._warm_pool = warm_pool
+        self._transfer_chunk_size = transfer_chunk_size
+        self._checksum_min_bytes = checksum_min_bytes
+        self._transfer_timeout = transfer_timeout
+        self._latency_observer = latency_observer
 
         self._sandbox_id = f"k8s-{id(self):x}"
         self._sandbox: Any | None = None
         self._client: Any | None = None
+        # Serializes claim and terminate so a background claim and the first
+        # execute() never create two sandboxes.
+        self._lock = threading.Lock()
+        self._claim_started: float | None = None
+        self._http: httpx.Client | None = None
+        self._native_transfer = True
 
     @property
     def id(self) -> str:
@@ -92,77 +238,104 @@ class K8sSandbox(BaseSandbox):
         if self._sandbox is not None:
             return self._sandbox
 
-        try:
-            from k8s_agent_sandbox import SandboxClient
-            from k8s_agent_sandbox.models import SandboxDirectConnectionConfig
-        except ImportError as e:
-            raise RuntimeError(
-                "k8s-agent-sandbox is required for K8sSandbox. "
-                "Install with: pip install langchain-k8s-sandbox[k8s]"
-            ) from e
-
-        connection_config = SandboxDirectConnectionConfig(
-            api_url=self._router_url,
-            server_port=self._server_port,
-        )
-        self._client = SandboxClient(connection_config=connection_config)
+        with self._lock:
+            if self._sandbox is not None:
+                return self._sandbox
 
-        create_kwargs: dict[str, Any] = {
-            "template": self._template,
-            "namespace": self._namespace,
-            "labels": self._labels,
-        }
+            self._client = _shared_client(self._router_url, self._server_port)
 
-        logger.info(
-            "Creating K8s sandbox",
-            template=self._template,
-            namespace=self._namespace,
-            labels=self._labels,
-            ttl=self._ttl,
-        )
+            create_kwargs: dict[str, Any] = {
+                "template": self._template,
+                "namespace": self._namespace,
+                "labels": self._labels,
+            }
 
-        self._sandbox = self._client.create_sandbox(**create_kwargs)
+            logger.info(
+                "Creating K8s sandbox",
+                template=self._template,
+                namespace=self._namespace,
+                labels=self._labels,
+                ttl=self._ttl,
+            )
 
-        sandbox_name = getattr(self._sandbox, "sandbox_id", None) or getattr(
-            self._sandbox, "claim_name", None
-        )
-        if sandbox_name:
-            self._sandbox_id = str(sandbox_name)
+            started = time.monotonic()
+            sandbox = self._client.create_sandbox(**create_kwargs)
+
+            sandbox_name = getattr(sandbox, "sandbox_id", None) or getattr(
+                sandbox, "claim_name", None
+            )
+            if sandbox_name:
+                self._sandbox_id = str(sandbox_name)
+
+            if self._ttl is not None:
+                self._apply_shutdown_time(self._sandbox_id)
 
-        if self._ttl is not None:
-            self._apply_shutdown_time(self._sandbox_id)
+            self._claim_started = started
+            self._sandbox = sandbox
+            self._observe("claim", time.monotonic() - started)
 
         logger.info("K8s sandbox created", sandbox_id=self._sandbox_id)
         return self._sandbox
 
+    def claim(self, timeout: int = 60) -> bool:
+        """Create the sandbox now and wait until it answers a command.
+
+        Blocking; run it in a worker thread to provision ahead of the first
+        ``execute()``. A no-op round trip if the sandbox already exists.
+
+        Returns:
+            True once the sandbox runs commands, False if the readiness check failed.
+
+        Raises:
+            RuntimeError: If the SDK is missing or sandbox creation fails.
+        """
+        sandbox = self._ensure_sandbox()
+        if self._claim_started is None:
+            return True
+        try:
+            result = sandbox.commands.run("true", timeout=timeout)
+        except Exception as e:
+            logger.warning(
+                "K8s sandbox readiness check failed", sandbox_id=self._sandbox_id, error=str(e)
+            )
+            return False
+        if result.exit_code != 0:
+            return False
+        self._mark_ready()
+        return True
+
+    def _mark_ready(self) -> None:
+        started, self._claim_started = self._claim_started, None
+        if started is not None:
+            self._observe("ready", time.monotonic() - started)
+
+    def _observe(self, phase: str, seconds: float) -> None:
+        logger.info(
+            "K8s sandbox latency",
+            sandbox_id=self._sandbox_id,
+            phase=phase,
+            seconds=round(seconds, 3),
+        )
+        if self._latency_observer is None:
+            return
+        try:
+            self._latency_observer(phase, seconds)
+        except Exception as e:
+            logger.warning("K8s sandbox latency observer failed", error=str(e))
+
     def _apply_shutdown_time(self, sandbox_name: str) -> None:
         """Set spec.shutdownTime on the Sandbox CR for automatic cleanup.
 
         The SDK's ``create_sandbox()`` does not expose a TTL parameter, so we
         patch the Sandbox CR directly using the Kubernetes API.
 
-        Tries in-cluster config first (production), then falls back to
-        ``~/.kube/config`` (local dev / CI).
-
         Args:
             sandbox_name: Name of the Sandbox CR to patch.
         """
-        from datetime import datetime, timedelta
+        from datetime import timedelta
 
         try:
-            from kubernetes import client as k8s_client
-            from kubernetes.config import ConfigException
-
-            try:
-                from kubernetes.config import load_incluster_config
-
-                load_incluster_config()
-            except ConfigException:
-                from kubernetes.config import load_kube_config
-
-                load_kube_config()
-
-            api = k8s_client.CustomObjectsApi()
+            api = _shared_custom_objects_api()
             shutdown_time = (datetime.now(UTC) + timedelta(seconds=self._ttl or 0)).strftime(
                 "%Y-%m-%dT%H:%M:%SZ"
             )
@@ -213,6 +386,7 @@ class K8sSandbox(BaseSandbox):
                 exit_code=-1,
                 truncated=False,
             )
+        self._mark_ready()
 
         output = result.stdout
         if result.stderr:
@@ -234,22 +408,169 @@ class K8sSandbox(BaseSandbox):
             truncated=False,
         )
 
+    def _runtime(self) -> httpx.Client:
+        """HTTP client for the sandbox runtime server, routed by sandbox id."""
+        self._ensure_sandbox()
+        if self._http is None:
+            self._http = httpx.Client(base_url=self._router_url, timeout=self._transfer_timeout)
+        return self._http
+
+    def _runtime_headers(self) -> dict[str, str]:
+        return {
+            "X-Sandbox-ID": self._sandbox_id,
+            "X-Sandbox-Namespace": self._namespace,
+            "X-Sandbox-Port": str(self._server_port),
+        }
+
+    @staticmethod
+    def _check_response(response: httpx.Response) -> None:
+        # FastAPI's default 404/405 means the runtime image predates the
+        # endpoint; other errors are real failures.
+        if response.status_code == 405 or (
+            response.status_code == 404
+            and response.headers.get("content-type", "").startswith("application/json")
+            and "detail" in response.json()
+        ):
+            raise NativeTransferUnavailableError(str(response.url))
+        response.raise_for_status()
+
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-        """Upload files to the sandbox via base64 encoding through execute().
+        """Upload files to the sandbox in one streamed tar request.
 
-        v1 uses BaseSandbox's default approach of piping through execute().
-        v2 may use the SDK's native file upload API when available.
+        Files of at least ``checksum_min_bytes`` whose remote SHA-256 already
+        matches are not sent. Falls back to base64 through ``execute()`` when
+        the runtime does not support batch transfer.
         """
+        if not files:
+            return []
+        if self._native_transfer:
+            try:
+                return self._upload_files_native(files)
+            except NativeTransferUnavailableError:
+                logger.info("Sandbox runtime lacks batch upload, using execute()")
+                self._native_transfer = False
+            except httpx.HTTPError as e:
+                logger.warning("K8s sandbox batch upload failed", error=str(e))
+                return [
+                    FileUploadResponse(path=path, error=cast(FileOperationError, f"Error: {e}"))
+                    for path, _ in files
+                ]
         return self._upload_files_via_execute(files)
 
+    def _upload_files_native(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        client = self._runtime()
+        headers = self._runtime_headers()
+
+        unchanged: set[str] = set()
+        large = {
+            path: hashlib.sha256(content).hexdigest()
+            for path, content in files
+            if len(content) >= self._checksum_min_bytes
+        }
+        if large:
+            response = client.post("/checksums", json={"paths": list(large)}, headers=headers)
+            self._check_response(response)
+            remote = response.json().get("checksums", {})
+            unchanged = {path for path, digest in large.items() if remote.get(path) == digest}
+
+        results: dict[str, FileUploadResponse] = {
+            path: FileUploadResponse(path=path) for path in unchanged
+        }
+        pending = [(path, content) for path, content in files if path not in unchanged]
+        if pending:
+            response = client.post(
+                "/upload/batch",
+                content=iter_tar(pending, self._transfer_chunk_size),
+                headers={**headers, "Content-Type": "application/x-tar"},
+            )
+            self._check_response(response)
+            for item in response.json().get("results", []):
+                results[item["path"]] = FileUploadResponse(path=item["path"], error=item["error"])
+
+        if unchanged:
+            logger.debug("Skipped unchanged uploads", count=len(unchanged))
+        return [
+            results.get(path, FileUploadResponse(path=path, error="invalid_path"))
+            for path, _ in files
+        ]
+
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-        """Download files from the sandbox via base64 encoding through execute().
+        """Download files from the sandbox as one streamed tar response.
 
-        v1 uses BaseSandbox's default approach of piping through execute().
-        v2 may use the SDK's native file download API when available.
+        Falls back to base64 through ``execute()`` when the runtime does not
+        support batch transfer.
         """
+        if not paths:
+            return []
+        if self._native_transfer:
+            try:
+                return self._download_files_native(paths)
+            except NativeTransferUnavailableError:
+                logger.info("Sandbox runtime lacks batch download, using execute()")
+                self._native_transfer = False
+            except (httpx.HTTPError, tarfile.TarError) as e:
+                logger.warning("K8s sandbox batch download failed", error=str(e))
+                return [
+                    FileDownloadResponse(path=path, error=cast(FileOperationError, f"Error: {e}"))
+                    for path in paths
+                ]
         return self._download_files_via_execute(paths)
 
+    def _download_files_native(self, paths: list[str]) -> list[FileDownloadResponse]:
+        client = self._runtime()
+        contents: dict[str, bytes] = {}
+        with client.stream(
+            "POST", "/download/batch", json={"paths": paths}, headers=self._runtime_headers()
+        ) as response:
+            if response.status_code in (404, 405):
+                response.read()
+            self._check_response(response)
+            errors: dict[str, str] = json.loads(response.headers.get("X-File-Errors") or "{}")
+            reader = _ChunkReader(response.iter_bytes(self._transfer_chunk_size))
+            with tarfile.open(fileobj=cast(Any, reader), mode="r|") as tar:
+                for member in tar:
+                    extracted = tar.extractfile(member)
+                    if extracted is not None:
+                        contents[member.name] = extracted.read()
+
+        return [
+            FileDownloadResponse(path=path, content=contents[path])
+            if path in contents
+            else FileDownloadResponse(
+                path=path, error=cast(FileOperationError, errors.get(path, "file_not_found"))
+            )
+            for path in paths
+        ]
+
+    def ls(self, path: str) -> LsResult:
+        """List a directory through the runtime server's ``/list`` endpoint."""
+        if not self._native_transfer:
+            return super().ls(path)
+        try:
+            response = self._runtime().get(
+                f"/list/{urllib.parse.quote(path, safe='')}", headers=self._runtime_headers()
+            )
+        except httpx.HTTPError as e:
+            logger.warning("K8s sandbox list failed", error=str(e))
+            return super().ls(path)
+        if response.status_code == 404:
+            # Missing directory: same empty listing as BaseSandbox.ls().
+            return LsResult(entries=[])
+        if response.status_code != 200:
+            return super().ls(path)
+
+        entries: list[FileInfo] = []
+        for item in response.json():
+            info: FileInfo = {
+                "path": posixpath.join(path, item["name"]),
+                "is_dir": item.get("type") == "directory",
+                "size": int(item.get("size", 0)),
+            }
+            if item.get("mod_time") is not None:
+                info["modified_at"] = datetime.fromtimestamp(item["mod_time"], UTC).isoformat()
+            entries.append(info)
+        return LsResult(entries=entries)
+
     def _upload_files_via_execute(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload files by base64-encoding and piping through execute()."""
         import base64
@@ -282,18 +603,40 @@ class K8sSandbox(BaseSandbox):
                 results.append(FileDownloadResponse(path=file_path, error="file_not_found"))
         return results
 
+    def health_check(self, timeout: int = 10) -> bool:
+        """Check that the sandbox pod still runs commands.
+
+        Returns True without a round trip if no sandbox has been created yet.
+        """
+        if self._sandbox is None:
+            return True
+        try:
+            result = self._sandbox.commands.run("true", timeout=timeout)
+        except Exception as e:
+            logger.warning(
+                "K8s sandbox health check failed", sandbox_id=self._sandbox_id, error=str(e)
+            )
+            return False
+        return bool(result.exit_code == 0)
+
     def terminate(self) -> None:
         """Terminate the sandbox and clean up resources.
 
         Safe to call multiple times. Subsequent ``execute()`` calls after
-        terminate will create a new sandbox.
+        terminate will create a new sandbox. Waits for an in-flight ``claim()``
+        so the sandbox it creates is not leaked.
         """
-        if self._sandbox is not None:
-            try:
-                self._sandbox.terminate()
-                logger.info("K8s sandbox terminated", sandbox_id=self._sandbox_id)
-            except Exception as e:
-                logger.warning("K8s sandbox terminate failed", error=str(e))
-            finally:
-                self._sandbox = None
-                self._client = None
+        with self._lock:
+            if self._sandbox is not None:
+                try:
+                    self._sandbox.terminate()
+                    logger.info("K8s sandbox terminated", sandbox_id=self._sandbox_id)
+                except Exception as e:
+                    logger.warning("K8s sandbox terminate failed", error=str(e))
+                finally:
+                    self._sandbox = None
+                    self._client = None
+                    self._claim_started = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import tarfile
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from langchain_k8s_sandbox.sandbox import K8sSandbox
+from langchain_k8s_sandbox import sandbox as sandbox_module
+from langchain_k8s_sandbox.sandbox import K8sSandbox, iter_tar
 
 
 class TestK8sSandboxInit:
@@ -187,9 +197,106 @@ class TestK8sSandboxTerminate:
         assert sb._sandbox is None
 
 
-class TestK8sSandboxUploadDownload:
+@pytest.fixture
+def fake_sdk() -> Iterator[MagicMock]:
+    """Patch in a fake k8s-agent-sandbox SDK whose clients create slow sandboxes."""
+    client_cls = MagicMock()
+
+    def create_sandbox(**kwargs: Any) -> MagicMock:
+        time.sleep(0.05)
+        sandbox = MagicMock(sandbox_id=f"sb-{len(client_cls.created)}")
+        sandbox.commands.run.return_value = MagicMock(stdout="", stderr="", exit_code=0)
+        client_cls.created.append(sandbox)
+        return sandbox
+
+    client_cls.created = []
+    client_cls.return_value.create_sandbox.side_effect = create_sandbox
+    sandbox_module._clients.clear()
+    with patch.dict(
+        "sys.modules",
+        {
+            "k8s_agent_sandbox": MagicMock(SandboxClient=client_cls),
+            "k8s_agent_sandbox.models": MagicMock(),
+        },
+    ):
+        yield client_cls
+    sandbox_module._clients.clear()
+
+
+class TestK8sSandboxClaim:
+    def test_sdk_client_is_shared_across_sandboxes(self, fake_sdk: MagicMock) -> None:
+        K8sSandbox(router_url="http://r:8080").claim()
+        K8sSandbox(router_url="http://r:8080").claim()
+        K8sSandbox(router_url="http://other:8080").claim()
+
+        assert fake_sdk.call_count == 2
+        assert len(fake_sdk.created) == 3
+
+    def test_concurrent_claim_and_execute_create_one_sandbox(self, fake_sdk: MagicMock) -> None:
+        sb = K8sSandbox()
+        claim = threading.Thread(target=sb.claim)
+        claim.start()
+        time.sleep(0.01)
+
+        result = sb.execute("echo hi")
+        claim.join()
+
+        assert result.exit_code == 0
+        assert len(fake_sdk.created) == 1
+
+    def test_reports_claim_then_ready_latency(self, fake_sdk: MagicMock) -> None:
+        observed: list[tuple[str, float]] = []
+        sb = K8sSandbox(latency_observer=lambda phase, s: observed.append((phase, s)))
+
+        assert sb.claim() is True
+        sb.execute("echo again")
+
+        assert [phase for phase, _ in observed] == ["claim", "ready"]
+        assert observed[0][1] >= 0.05
+        assert observed[1][1] >= observed[0][1]
+
+    def test_lazy_execute_reports_ready_on_first_command(self, fake_sdk: MagicMock) -> None:
+        observed: list[str] = []
+        sb = K8sSandbox(latency_observer=lambda phase, s: observed.append(phase))
+
+        sb.execute("echo hi")
+        sb.execute("echo hi")
+
+        assert observed == ["claim", "ready"]
+
+    def test_failed_readiness_check(self, fake_sdk: MagicMock) -> None:
+        sb = K8sSandbox()
+        sb._ensure_sandbox().commands.run.side_effect = ConnectionError("not ready")
+
+        assert sb.claim() is False
+
+
+class TestK8sSandboxHealthCheck:
+    def test_healthy_before_first_use(self) -> None:
+        assert K8sSandbox().health_check() is True
+
+    def test_healthy_when_command_succeeds(self) -> None:
+        sb = K8sSandbox()
+        mock_sandbox = MagicMock()
+        mock_sandbox.commands.run.return_value = MagicMock(exit_code=0)
+        sb._sandbox = mock_sandbox
+
+        assert sb.health_check() is True
+        mock_sandbox.commands.run.assert_called_once_with("true", timeout=10)
+
+    def test_unhealthy_when_pod_unreachable(self) -> None:
+        sb = K8sSandbox()
+        mock_sandbox = MagicMock()
+        mock_sandbox.commands.run.side_effect = ConnectionError("pod gone")
+        sb._sandbox = mock_sandbox
+
+        assert sb.health_check() is False
+
+
+class TestK8sSandboxExecuteTransferFallback:
     def test_upload_files_success(self) -> None:
         sb = K8sSandbox()
+        sb._native_transfer = False
         mock_sandbox = MagicMock()
         mock_result = MagicMock()
         mock_result.stdout = ""
@@ -206,6 +313,7 @@ class TestK8sSandboxUploadDownload:
 
     def test_upload_files_failure(self) -> None:
         sb = K8sSandbox()
+        sb._native_transfer = False
         mock_sandbox = MagicMock()
         mock_result = MagicMock()
         mock_result.stdout = ""
@@ -221,6 +329,7 @@ class TestK8sSandboxUploadDownload:
 
     def test_download_files_success(self) -> None:
         sb = K8sSandbox()
+        sb._native_transfer = False
         mock_sandbox = MagicMock()
         import base64
 
@@ -238,6 +347,7 @@ class TestK8sSandboxUploadDownload:
 
     def test_download_files_not_found(self) -> None:
         sb = K8sSandbox()
+        sb._native_transfer = False
         mock_sandbox = MagicMock()
         mock_result = MagicMock()
         mock_result.stdout = ""
@@ -250,3 +360,121 @@ class TestK8sSandboxUploadDownload:
         results = sb.download_files(["/nonexistent.py"])
         assert len(results) == 1
         assert results[0].error == "file_not_found"
+
+
+class FakeRuntime:
+    """In-memory stand-in for the runtime server's batch transfer endpoints."""
+
+    def __init__(self, files: dict[str, bytes] | None = None, batch: bool = True) -> None:
+        self.files = dict(files or {})
+        self.batch = batch
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if not self.batch and path in ("/upload/batch", "/download/batch", "/checksums"):
+            return httpx.Response(404, json={"detail": "Not Found"})
+        if path == "/checksums":
+            paths = json.loads(request.content)["paths"]
+            sums = {
+                p: hashlib.sha256(self.files[p]).hexdigest() if p in self.files else None
+                for p in paths
+            }
+            return httpx.Response(200, json={"checksums": sums})
+        if path == "/upload/batch":
+            results = []
+            with tarfile.open(fileobj=io.BytesIO(request.read()), mode="r|") as tar:
+                for member in tar:
+                    extracted = tar.extractfile(member)
+                    assert extracted is not None
+                    self.files[member.name] = extracted.read()
+                    results.append({"path": member.name, "error": None})
+            return httpx.Response(200, json={"results": results})
+        if path == "/download/batch":
+            paths = json.loads(request.content)["paths"]
+            found = [(p, self.files[p]) for p in paths if p in self.files]
+            errors = {p: "file_not_found" for p in paths if p not in self.files}
+            return httpx.Response(
+                200,
+                content=b"".join(iter_tar(found, 7)),
+                headers={"X-File-Errors": json.dumps(errors)},
+            )
+        if path.startswith("/list/"):
+            return httpx.Response(
+                200, json=[{"name": "a.py", "size": 3, "type": "file", "mod_time": 0.0}]
+            )
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+
+def _native_sandbox(runtime: FakeRuntime, **kwargs: object) -> K8sSandbox:
+    sb = K8sSandbox(**kwargs)  # type: ignore[arg-type]
+    sb._sandbox = MagicMock()
+    sb._sandbox_id = "sandbox-abc"
+    sb._http = httpx.Client(base_url="http://router", transport=httpx.MockTransport(runtime))
+    return sb
+
+
+class TestK8sSandboxNativeTransfer:
+    def test_iter_tar_round_trip(self) -> None:
+        files = [("/workspace/a.py", b"x" * 1500), ("rel/b.txt", b"")]
+        data = b"".join(iter_tar(files, chunk_size=256))
+
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:") as tar:
+            names = tar.getnames()
+            content = tar.extractfile("/workspace/a.py").read()  # type: ignore[union-attr]
+        assert names == ["/workspace/a.py", "rel/b.txt"]
+        assert content == b"x" * 1500
+
+    def test_upload_batches_files_in_one_request(self) -> None:
+        runtime = FakeRuntime()
+        sb = _native_sandbox(runtime)
+
+        results = sb.upload_files([("/workspace/a.py", b"a"), ("/workspace/b.py", b"b")])
+
+        assert [r.error for r in results] == [None, None]
+        assert runtime.files == {"/workspace/a.py": b"a", "/workspace/b.py": b"b"}
+        assert [r.url.path for r in runtime.requests] == ["/upload/batch"]
+        assert runtime.requests[0].headers["X-Sandbox-ID"] == "sandbox-abc"
+        sb._sandbox.commands.run.assert_not_called()
+
+    def test_unchanged_large_files_are_skipped(self) -> None:
+        big = b"z" * 100
+        runtime = FakeRuntime({"/workspace/big.bin": big})
+        sb = _native_sandbox(runtime, checksum_min_bytes=50)
+
+        results = sb.upload_files([("/workspace/big.bin", big), ("/workspace/new.py", b"n")])
+
+        assert [r.error for r in results] == [None, None]
+        assert [r.url.path for r in runtime.requests] == ["/checksums", "/upload/batch"]
+        with tarfile.open(fileobj=io.BytesIO(runtime.requests[1].content)) as tar:
+            assert tar.getnames() == ["/workspace/new.py"]
+
+    def test_download_streams_tar_and_reports_missing(self) -> None:
+        runtime = FakeRuntime({"/workspace/a.py": b"print('a')" * 10})
+        sb = _native_sandbox(runtime)
+
+        results = sb.download_files(["/workspace/a.py", "/workspace/missing.py"])
+
+        assert results[0].content == b"print('a')" * 10
+        assert results[1].error == "file_not_found"
+
+    def test_falls_back_to_execute_on_old_runtime(self) -> None:
+        runtime = FakeRuntime(batch=False)
+        sb = _native_sandbox(runtime)
+        sb._sandbox.commands.run.return_value = MagicMock(stdout="", stderr="", exit_code=0)
+
+        results = sb.upload_files([("/workspace/a.py", b"a")])
+
+        assert results[0].error is None
+        assert sb._native_transfer is False
+        sb._sandbox.commands.run.assert_called_once()
+
+    def test_ls_uses_list_endpoint(self) -> None:
+        sb = _native_sandbox(FakeRuntime())
+
+        result = sb.ls("/workspace")
+
+        assert result.entries is not None
+        assert result.entries[0]["path"] == "/workspace/a.py"
+        assert result.entries[0]["is_dir"] is False
@@ -11,42 +11,58 @@ Both backends provide:
 - Multi-step ReAct loop with automatic tool chaining
 
 Agent Caching:
-Only the compiled agent graph is cached — it is immutable after compilation and safe
-to share across sessions. The sandbox backend is stateful (holds sandbox CR, connection)
-and must be created fresh per session to prevent cross-session termination bugs.
-Use invalidate_agent_cache() or clear_agent_cache() to force recompilation.
-Cache keys are RuntimeContext instances that track which config inputs affect the
-compiled graph, enabling targeted invalidation instead of all-or-nothing clears.
+The compiled agent graph is cached, but it is not shared across sessions: it
+closes over the sandbox backend it was built with. Sandbox handles come from the
+sandbox registry, one per session workspace, and are reused across that
+workspace's turns. Each cache entry remembers the handle its graph was compiled
+with, and a graph is only reused with that same handle;
+invalidate_agent_cache_for_sandbox() drops every graph bound to a handle once
+it is discarded. Use invalidate_agent_cache() or clear_agent_cache() to force
+recompilation. Cache keys are RuntimeContext instances that track which config
+inputs affect the compiled graph, enabling targeted invalidation instead of
+all-or-nothing clears.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import importlib
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
+from dataclasses import fields as dataclass_fields
+from functools import cached_property
 from pathlib import Path
-from typing import Any, NamedTuple, cast
+from types import CodeType
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
 import structlog
-from deepagents import create_deep_agent as _create_deep_agent
 
 logger = structlog.get_logger(__name__)
 
-from server.app.agent.mcp_adapter import create_mcp_tools  # noqa: E402
-from server.app.agent.mcp_client import McpManager, McpServerConfig  # noqa: E402
-from server.app.agent.middleware import (  # noqa: E402
-    CognitionObservabilityMiddleware,
-    CognitionStreamingMiddleware,
-    ToolSecurityMiddleware,
-)
 from server.app.agent.prompts import SYSTEM_PROMPT  # noqa: E402
-from server.app.agent.sandbox_backend import create_sandbox_backend  # noqa: E402
-from server.app.agent.tools import BrowserTool, InspectPackageTool, SearchTool  # noqa: E402
+from server.app.agent.sandbox_registry import get_sandbox_registry  # noqa: E402
+from server.app.agent.subagent_index import hash_subagent_specs  # noqa: E402
+from server.app.observability.turn_timing import current_turn_timing, turn_phase  # noqa: E402
 from server.app.settings import Settings, get_settings  # noqa: E402
 from server.app.storage.config_store import ConfigStore  # noqa: E402
 
+if TYPE_CHECKING:
+    from server.app.agent.mcp_client import McpServerConfig
+
 DeepAgentResponseFormat = Any
-create_deep_agent: Any = _create_deep_agent
+
+
+def create_deep_agent(**kwargs: Any) -> Any:
+    """Build a Deep Agents graph, importing ``deepagents`` on first use.
+
+    ``deepagents`` pulls in LangGraph and every bundled provider integration,
+    which dominates server import time. Deferring it to the first graph compile
+    keeps startup fast; graph warmup pays the cost in the background.
+    """
+    from deepagents import create_deep_agent as _create_deep_agent
+
+    return _create_deep_agent(**kwargs)
 
 
 @dataclass
@@ -81,31 +97,106 @@ class CognitionContext:
         )
 
 
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _code_digest(code: CodeType) -> str:
+    """Hash a code object's bytecode and constants, recursing into nested code.
+
+    ``repr()`` of a nested code object embeds its memory address, so nested
+    functions are hashed structurally to keep digests stable across processes.
+    Set constants (``x in {"a", "b"}``) are sorted, since their iteration
+    order depends on string hash randomization.
+    """
+    h = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            h.update(_code_digest(const).encode())
+        elif isinstance(const, (frozenset, set)):
+            h.update(repr(sorted(map(repr, const))).encode())
+        else:
+            h.update(repr(const).encode())
+    h.update(repr(code.co_names).encode())
+    return h.hexdigest()
+
+
+def _callable_digest(fn: Any) -> str:
+    code = getattr(fn, "__code__", None)
+    if isinstance(code, CodeType):
+        return _code_digest(code)
+    return ""
+
+
+def _tool_fingerprint(tool: Any) -> str:
+    """Identify a tool by name and the code that implements it."""
+    name = getattr(tool, "name", None) or type(tool).__qualname__
+    fn = getattr(tool, "func", None) or getattr(tool, "coroutine", None)
+    if fn is None:
+        fn = getattr(type(tool), "_run", None) or getattr(type(tool), "_arun", None)
+    if fn is None and callable(tool):
+        fn = tool
+    return f"{name}:{_callable_digest(fn)}"
+
+
+def _middleware_fingerprint(middleware: Any) -> str:
+    """Identify a middleware instance by class and simple constructor state."""
+    cls = type(middleware)
+    state = {
+        key: value
+        for key, value in sorted(getattr(middleware, "__dict__", {}).items())
+        if not key.startswith("_") and isinstance(value, (str, int, float, bool, type(None)))
+    }
+    return f"{cls.__module__}.{cls.__qualname__}:{state!r}"
+
+
+def _sequence_hash(items: Sequence[str]) -> str:
+    return _sha256("\n".join(items))
+
+
 @dataclass(frozen=True)
 class RuntimeContext:
     """Tracks which config inputs produced a cached agent graph.
 
-    Replaces the MD5 hash approach. Because the dataclass is frozen and
-    contains only hashable fields, it can be used directly as a dict key.
-    Targeted invalidation is now possible: clearing all entries whose
-    ``scope`` matches a given dict, or whose ``agent_name`` matches.
+    Because the dataclass is frozen and contains only hashable fields, it can be
+    used directly as a dict key. Tools, middleware, subagents and the system
+    prompt are captured by content hash rather than by count, so editing a
+    tool's code or a subagent's prompt produces a new key. ``fingerprint``
+    condenses the context into one stable digest that is comparable across
+    sessions, processes and replicas (see ``graph_warmup``). It leaves out
+    ``project_path``: the workspace stays in the cache key because the graph
+    is bound to that workspace's sandbox, but it does not change the graph's
+    shape. Targeted invalidation is possible by clearing all entries whose
+    ``scope`` matches.
     """
 
-    project_path: str
+    project_path: str = field(metadata={"fingerprint": False})
     model_key: str
     store_type: str
-    system_prompt: str
+    system_prompt_hash: str
     memory: tuple[str, ...]
     skills: tuple[str, ...]
-    subagent_count: int
+    subagent_spec_hash: str
     interrupt_on_keys: tuple[str, ...]
     response_format: str
     tool_token_limit_before_evict: int | None
-    middleware_count: int
-    tools_count: int
+    middleware_hash: str
+    tools_hash: str
+    mcp_hash: str
     sandbox_backend: str
     scope: tuple[tuple[str, str], ...]
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """Stable content hash of every input that shapes the compiled graph."""
+        return _sha256(
+            "\x1f".join(
+                f"{f.name}={getattr(self, f.name)!r}"
+                for f in dataclass_fields(self)
+                if f.metadata.get("fingerprint", True)
+            )
+        )
+
     @classmethod
     def from_params(
         cls,
@@ -123,15 +214,17 @@ class RuntimeContext:
         tools: Sequence[Any] | None,
         settings: Settings,
         scope: dict[str, str] | None,
+        subagent_spec_hash: str | None = None,
+        mcp_configs: Sequence[Any] | None = None,
     ) -> RuntimeContext:
         return cls(
             project_path=str(project_path.resolve()),
             model_key=_model_cache_key(model),
             store_type=store.__class__.__name__ if store else "None",
-            system_prompt=system_prompt or "default",
+            system_prompt_hash=_sha256(system_prompt or "default"),
             memory=tuple(sorted(memory)) if memory else (),
             skills=tuple(sorted(skills)) if skills else (),
-            subagent_count=len(subagents) if subagents else 0,
+            subagent_spec_hash=subagent_spec_hash or hash_subagent_specs(subagents),
             interrupt_on_keys=tuple(sorted(interrupt_on.keys())) if interrupt_on else (),
             response_format=(
                 response_format
@@ -141,36 +234,80 @@ class RuntimeContext:
             if response_format
             else "None",
             tool_token_limit_before_evict=tool_token_limit_before_evict,
-            middleware_count=len(middleware) if middleware else 0,
-            tools_count=len(tools) if tools else 0,
+            middleware_hash=_sequence_hash([_middleware_fingerprint(m) for m in middleware or ()]),
+            tools_hash=_sequence_hash(sorted(_tool_fingerprint(t) for t in tools or ())),
+            mcp_hash=_sequence_hash(
+                sorted(
+                    f"{c.name}:{c.url}:{c.enabled}"
+                    for c in mcp_configs or ()
+                    if getattr(c, "enabled", True)
+                )
+            ),
             sandbox_backend=settings.sandbox_backend,
             scope=tuple(sorted((scope or {}).items())),
         )
 
 
-_agent_cache: dict[RuntimeContext, Any] = {}
+class _CachedGraph(NamedTuple):
+    agent: Any
+    sandbox_backend: Any
+
+
+_agent_cache: dict[RuntimeContext, _CachedGraph] = {}
+
+
+_MODEL_BASE_URL_ATTRS = ("base_url", "openai_api_base", "anthropic_api_url", "endpoint_url")
+
+
+def _plain(value: Any) -> str | int | float | bool | None:
+    return value if isinstance(value, (str, int, float, bool)) else None
 
 
 def _model_cache_key(model: Any) -> str:
+    """Key a chat model on provider, model id and the parameters it was built with."""
     if model is None:
         return "None"
-    type_name = type(model).__name__
-    model_id = (
-        getattr(model, "model_name", None)
-        or getattr(model, "model_id", None)
-        or getattr(model, "model", None)
+    if isinstance(model, str):
+        return model
+    provider = type(model).__name__
+    model_id = next(
+        (
+            value
+            for attr in ("model_name", "model_id", "model")
+            if (value := _plain(getattr(model, attr, None)))
+        ),
+        None,
     )
-    if model_id:
-        return f"{type_name}:{model_id}"
-    return type_name
+    base_url = next(
+        (value for attr in _MODEL_BASE_URL_ATTRS if (value := _plain(getattr(model, attr, None)))),
+        None,
+    )
+    build = {
+        "temperature": _plain(getattr(model, "temperature", None)),
+        "max_tokens": _plain(getattr(model, "max_tokens", None)),
+        "base_url": base_url,
+    }
+    return f"{provider}:{model_id}:{sorted(build.items())!r}"
 
 
-def get_cached_agent(ctx: RuntimeContext) -> Any | None:
-    return _agent_cache.get(ctx)
+def get_cached_agent(ctx: RuntimeContext, sandbox_backend: Any = None) -> Any | None:
+    """Return the graph cached for ``ctx`` if it was built on ``sandbox_backend``.
 
+    The compiled graph holds the sandbox handle it was built with. An entry
+    built on another handle (the old one was discarded and the workspace got a
+    new one) is dropped instead of reused.
+    """
+    entry = _agent_cache.get(ctx)
+    if entry is None:
+        return None
+    if entry.sandbox_backend is not sandbox_backend:
+        del _agent_cache[ctx]
+        return None
+    return entry.agent
 
-def cache_agent(ctx: RuntimeContext, agent: Any) -> None:
-    _agent_cache[ctx] = agent
+
+def cache_agent(ctx: RuntimeContext, agent: Any, sandbox_backend: Any = None) -> None:
+    _agent_cache[ctx] = _CachedGraph(agent, sandbox_backend)
 
 
 def invalidate_agent_cache(ctx: RuntimeContext) -> None:
@@ -186,6 +323,25 @@ def invalidate_agent_cache_for_scope(scope: dict[str, str]) -> int:
     return len(to_remove)
 
 
+def invalidate_agent_cache_for_sandbox(sandbox_backend: Any) -> int:
+    """Drop every cached graph bound to ``sandbox_backend``."""
+    to_remove = [
+        ctx for ctx, entry in _agent_cache.items() if entry.sandbox_backend is sandbox_backend
+    ]
+    for ctx in to_remove:
+        del _agent_cache[ctx]
+    return len(to_remove)
+
+
+def invalidate_agent_cache_for_workspace(project_path: str | Path) -> int:
+    """Drop every cached graph compiled for the workspace at ``project_path``."""
+    resolved = str(Path(project_path).resolve())
+    to_remove = [ctx for ctx in _agent_cache if ctx.project_path == resolved]
+    for ctx in to_remove:
+        del _agent_cache[ctx]
+    return len(to_remove)
+
+
 def clear_agent_cache() -> None:
     _agent_cache.clear()
 
@@ -197,6 +353,7 @@ def get_agent_cache_stats() -> dict[str, int]:
 class CognitionAgentResult(NamedTuple):
     agent: Any
     sandbox_backend: Any | None = None
+    fingerprint: str | None = None
 
 
 @dataclass
@@ -225,6 +382,7 @@ class CognitionAgentParams:
     mcp_configs: Sequence[McpServerConfig] | None = None
     scope: dict[str, str] | None = None
     config_store: ConfigStore | None = None
+    subagent_spec_hash: str | None = None
 
 
 def _create_sandbox(
@@ -233,6 +391,8 @@ def _create_sandbox(
     settings: Settings,
     k8s_labels: dict[str, str] | None,
 ) -> Any:
+    from server.app.agent.sandbox_backend import create_sandbox_backend
+
     return create_sandbox_backend(
         root_dir=project_path,
         sandbox_id=sandbox_id,
@@ -251,16 +411,90 @@ def _create_sandbox(
     )
 
 
+def _sandbox_labels(sandbox_id: str, scope: dict[str, str] | None) -> dict[str, str] | None:
+    if not scope:
+        return None
+    labels: dict[str, str] = {}
+    if "user" in scope:
+        labels["cognition.io/user"] = scope["user"]
+    if "org" in scope:
+        labels["cognition.io/org"] = scope["org"]
+    if "project" in scope:
+        labels["cognition.io/project"] = scope["project"]
+    labels["cognition.io/session"] = sandbox_id
+    return labels
+
+
+async def acquire_sandbox(
+    project_path: str | Path,
+    settings: Settings,
+    scope: dict[str, str] | None = None,
+) -> Any:
+    """Return the session workspace's sandbox handle from the registry."""
+    project_path = Path(project_path).resolve()
+    sandbox_id = f"cognition-{project_path.name}"
+    labels = _sandbox_labels(sandbox_id, scope)
+    return await get_sandbox_registry().acquire(
+        sandbox_id, lambda: _create_sandbox(project_path, sandbox_id, settings, labels)
+    )
+
+
+_preclaims: set[asyncio.Task[Any]] = set()
+
+
+def start_sandbox_preclaim(
+    project_path: str | Path,
+    settings: Settings,
+    scope: dict[str, str] | None = None,
+) -> asyncio.Task[Any] | None:
+    """Start provisioning the session's sandbox in the background.
+
+    Only Kubernetes sandboxes are claimed ahead of time, and only when
+    ``k8s_sandbox_preclaim`` is enabled. The handle comes from the sandbox
+    registry, so the agent built for the session's next turn uses the sandbox
+    being claimed here; its first command waits for an unfinished claim.
+
+    Returns:
+        A task resolving to the sandbox backend (None if the claim failed), or
+        None when pre-claiming does not apply.
+    """
+    if settings.sandbox_backend != "kubernetes" or not settings.k8s_sandbox_preclaim:
+        return None
+
+    async def _claim() -> Any:
+        try:
+            backend = await acquire_sandbox(project_path, settings, scope)
+            await asyncio.to_thread(backend.preclaim)
+            return backend
+        except Exception as e:
+            logger.warning("Sandbox pre-claim failed", project_path=str(project_path), error=str(e))
+            return None
+
+    task = asyncio.create_task(_claim())
+    _preclaims.add(task)
+    task.add_done_callback(_preclaims.discard)
+    return task
+
+
 def _inject_subagent_middleware(subagents: list[Any], middleware: list[Any]) -> list[Any]:
     """Inject Cognition security/observability middleware into subagent specs.
 
     Without this, blocked tools can be called through subagents without audit
-    logging or prevention — a security bypass.
+    logging or prevention — a security bypass. Prompt caching is carried over
+    too, so subagents on Bedrock cache their own prompts.
     """
+    from server.app.agent.middleware import (
+        CognitionObservabilityMiddleware,
+        PromptCacheMiddleware,
+        ToolSecurityMiddleware,
+    )
+
     security_middleware = [
         m
         for m in middleware
-        if isinstance(m, (ToolSecurityMiddleware, CognitionObservabilityMiddleware))
+        if isinstance(
+            m, (ToolSecurityMiddleware, CognitionObservabilityMiddleware, PromptCacheMiddleware)
+        )
     ]
     if not security_middleware:
         return subagents
@@ -291,18 +525,6 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
     settings = params.settings or get_settings()
     project_path = Path(params.project_path).resolve()
 
-    sandbox_id = f"cognition-{project_path.name}"
-    k8s_labels: dict[str, str] | None = None
-    if params.scope:
-        k8s_labels = {}
-        if "user" in params.scope:
-            k8s_labels["cognition.io/user"] = params.scope["user"]
-        if "org" in params.scope:
-            k8s_labels["cognition.io/org"] = params.scope["org"]
-        if "project" in params.scope:
-            k8s_labels["cognition.io/project"] = params.scope["project"]
-        k8s_labels["cognition.io/session"] = sandbox_id
-
     config_store = params.config_store
     if config_store is None:
         try:
@@ -312,32 +534,41 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
         except RuntimeError:
             config_store = None
 
-    runtime_ctx = RuntimeContext.from_params(
-        project_path=project_path,
-        model=getattr(params.model, "model_name", None)
-        or getattr(params.model, "model_id", None)
-        or getattr(params.model, "model", None)
-        or str(params.model),
-        store=params.store,
-        system_prompt=params.system_prompt,
-        memory=params.memory,
-        skills=params.skills,
-        subagents=params.subagents,
-        interrupt_on=params.interrupt_on,
-        response_format=params.response_format,
-        tool_token_limit_before_evict=params.tool_token_limit_before_evict,
-        middleware=params.middleware,
-        tools=params.tools,
-        settings=settings,
-        scope=params.scope,
-    )
+    with turn_phase("graph_lookup"):
+        runtime_ctx = RuntimeContext.from_params(
+            project_path=project_path,
+            model=params.model,
+            store=params.store,
+            system_prompt=params.system_prompt,
+            memory=params.memory,
+            skills=params.skills,
+            subagents=params.subagents,
+            interrupt_on=params.interrupt_on,
+            response_format=params.response_format,
+            tool_token_limit_before_evict=params.tool_token_limit_before_evict,
+            middleware=params.middleware,
+            tools=params.tools,
+            settings=settings,
+            scope=params.scope,
+            subagent_spec_hash=params.subagent_spec_hash if params.subagents is not None else None,
+            mcp_configs=params.mcp_configs,
+        )
 
-    cached_agent = get_cached_agent(runtime_ctx)
-    if cached_agent is not None:
-        sandbox_backend = _create_sandbox(project_path, sandbox_id, settings, k8s_labels)
-        return CognitionAgentResult(agent=cached_agent, sandbox_backend=sandbox_backend)
+    # One handle per session workspace, reused across turns. A cached graph is
+    # only reused if it was built with this same handle.
+    with turn_phase("sandbox_acquire"):
+        sandbox_backend = await acquire_sandbox(project_path, settings, params.scope)
 
-    sandbox_backend = _create_sandbox(project_path, sandbox_id, settings, k8s_labels)
+    cached_agent = get_cached_agent(runtime_ctx, sandbox_backend)
+    timing = current_turn_timing()
+    if timing is not None:
+        timing.graph_cache_hit = cached_agent is not None
+    if cached_agent is not None:
+        return CognitionAgentResult(
+            agent=cached_agent,
+            sandbox_backend=sandbox_backend,
+            fingerprint=runtime_ctx.fingerprint,
+        )
 
     defaults_resolved = False
     agent_defaults: Any = None
@@ -426,11 +657,22 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
     agent_middleware = list(params.middleware) if params.middleware else []
     blocked_tools = list(settings.blocked_tools) if hasattr(settings, "blocked_tools") else []
 
+    from server.app.agent.middleware import (
+        CognitionObservabilityMiddleware,
+        CognitionStreamingMiddleware,
+        PromptCacheMiddleware,
+        ToolSecurityMiddleware,
+    )
+    from server.app.agent.tools import BrowserTool, InspectPackageTool, SearchTool
+
     built_in_tools = [BrowserTool(), SearchTool(), InspectPackageTool()]
     agent_tools = list(params.tools) if params.tools else []
     agent_tools.extend(built_in_tools)
 
     if params.mcp_configs:
+        from server.app.agent.mcp_adapter import create_mcp_tools
+        from server.app.agent.mcp_client import McpManager
+
         mcp_manager = McpManager()
         for config in params.mcp_configs:
             if config.enabled:
@@ -440,8 +682,9 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
                     logger.warning("Failed to add MCP server", server=config.name, error=str(e))
 
         try:
-            await mcp_manager.connect_all()
-            all_mcp_tools = await mcp_manager.get_all_tools()
+            with turn_phase("tool_build"):
+                await mcp_manager.connect_all()
+                all_mcp_tools = await mcp_manager.get_all_tools()
             for server_name, tool_infos in all_mcp_tools.items():
                 mcp_tools = create_mcp_tools(mcp_manager.clients[server_name], tool_infos)
                 agent_tools.extend(mcp_tools)
@@ -456,6 +699,10 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
             ToolSecurityMiddleware(blocked_tools=blocked_tools),
         ]
     )
+    # Last of ours: Deep Agents appends memory after this, so the cache marker
+    # ends the static part of the system prompt.
+    if settings.prompt_cache_enabled:
+        agent_middleware.append(PromptCacheMiddleware())
 
     agent_subagents = [
         {**s, "description": s.get("description", "")} if isinstance(s, dict) else s
@@ -497,10 +744,13 @@ async def create_cognition_agent(params: CognitionAgentParams) -> CognitionAgent
     if agent_tool_token_limit_before_evict is not None:
         create_kwargs["tool_token_limit_before_evict"] = agent_tool_token_limit_before_evict
 
-    agent = cast(Any, create_deep_agent)(**create_kwargs)
+    with turn_phase("graph_compile"):
+        agent = cast(Any, create_deep_agent)(**create_kwargs)
 
-    result = CognitionAgentResult(agent=agent, sandbox_backend=sandbox_backend)
-    cache_agent(runtime_ctx, agent)
+    result = CognitionAgentResult(
+        agent=agent, sandbox_backend=sandbox_backend, fingerprint=runtime_ctx.fingerprint
+    )
+    cache_agent(runtime_ctx, agent, sandbox_backend)
 
     return result
 
@@ -0,0 +1,239 @@
+"""Warmup manifest for compiled agent graphs.
+
+Compiling a Deep Agents graph costs hundreds of milliseconds, and after a
+rollout every replica starts with an empty graph cache. The manifest records
+which graph fingerprints (``RuntimeContext.fingerprint``) were recently used,
+together with a session that can reproduce each one, so a fresh process can
+precompile the hot graphs before traffic arrives. A fingerprint does not
+depend on the session workspace, so every session with the same agent
+configuration adds to the same entry; warmup compiles each hot configuration
+for the session that used it last.
+
+A compiled graph is bound to its session workspace's sandbox handle, so it
+cannot be shared between sessions: warmup makes the first turn of each
+recorded session warm when that session returns, and sessions created after
+a rollout still compile their first graph cold. Warmup does not register the
+recorded sessions; a session is registered when its next turn arrives.
+
+The manifest is a small JSON file. When several replicas share the workspace
+volume, each save merges with what is already on disk, so the manifest reflects
+traffic across the whole deployment.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class WarmupEntry:
+    """One hot graph fingerprint and a session that reproduces it."""
+
+    fingerprint: str
+    session_id: str
+    project_path: str
+    scope: dict[str, str] = field(default_factory=dict)
+    hits: int = 0
+    last_used: float = 0.0
+
+
+class GraphWarmer(Protocol):
+    async def warm_graph(
+        self, session_id: str, project_path: str, scope: dict[str, str] | None = None
+    ) -> str | None: ...
+
+
+class GraphWarmupManifest:
+    """Bounded, recency-ordered record of hot compiled-graph fingerprints."""
+
+    def __init__(self, path: Path, max_entries: int = 50) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: dict[str, WarmupEntry] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def record(
+        self,
+        fingerprint: str,
+        *,
+        session_id: str,
+        project_path: str,
+        scope: dict[str, str] | None = None,
+    ) -> None:
+        """Mark ``fingerprint`` as used now. In-memory only; see :meth:`save`."""
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            entry = WarmupEntry(
+                fingerprint=fingerprint,
+                session_id=session_id,
+                project_path=project_path,
+                scope=dict(scope or {}),
+            )
+            self._entries[fingerprint] = entry
+        else:
+            entry.session_id = session_id
+            entry.project_path = project_path
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._dirty = True
+
+    def hot_entries(self, limit: int | None = None) -> list[WarmupEntry]:
+        """Return entries ordered most recently used first."""
+        entries = sorted(self._entries.values(), key=lambda e: (e.last_used, e.hits), reverse=True)
+        return entries[:limit] if limit is not None else entries
+
+    def _read_file(self) -> dict[str, WarmupEntry]:
+        try:
+            raw = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Ignoring unreadable graph warmup manifest", path=str(self.path), error=str(e)
+            )
+            return {}
+
+        entries: dict[str, WarmupEntry] = {}
+        for item in raw.get("entries", []) if isinstance(raw, dict) else []:
+            try:
+                entry = WarmupEntry(**item)
+            except TypeError:
+                continue
+            entries[entry.fingerprint] = entry
+        return entries
+
+    def load(self) -> None:
+        """Merge the on-disk manifest into memory."""
+        self._merge(self._read_file())
+
+    def _merge(self, other: dict[str, WarmupEntry]) -> None:
+        for fingerprint, theirs in other.items():
+            ours = self._entries.get(fingerprint)
+            if ours is None:
+                self._entries[fingerprint] = theirs
+            elif theirs.last_used > ours.last_used:
+                theirs.hits = max(theirs.hits, ours.hits)
+                self._entries[fingerprint] = theirs
+            else:
+                ours.hits = max(theirs.hits, ours.hits)
+
+    def _trim(self) -> None:
+        keep = self.hot_entries(self.max_entries)
+        self._entries = {e.fingerprint: e for e in keep}
+
+    def save(self) -> None:
+        """Merge with the on-disk manifest, trim, and write atomically."""
+        self._merge(self._read_file())
+        self._trim()
+        payload = {
+            "version": MANIFEST_VERSION,
+            "entries": [asdict(e) for e in self.hot_entries()],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    async def asave(self) -> None:
+        """Save from a worker thread; no-op if nothing was recorded."""
+        if self._dirty:
+            await asyncio.to_thread(self.save)
+
+
+async def warm_compiled_graphs(
+    manifest: GraphWarmupManifest,
+    warmer: GraphWarmer,
+    limit: int | None = None,
+) -> int:
+    """Precompile the hottest graphs in ``manifest``.
+
+    Entries are warmed sequentially so startup does not contend with live
+    traffic for CPU. Failures are logged and skipped.
+
+    Returns:
+        Number of graphs compiled (or found already cached).
+    """
+    warmed = 0
+    started = time.perf_counter()
+    for entry in manifest.hot_entries(limit):
+        try:
+            fingerprint = await warmer.warm_graph(
+                entry.session_id, entry.project_path, entry.scope or None
+            )
+        except Exception as e:
+            logger.warning(
+                "Graph warmup failed",
+                fingerprint=entry.fingerprint[:12],
+                session_id=entry.session_id,
+                error=str(e),
+            )
+            continue
+        if fingerprint is None:
+            continue
+        if fingerprint != entry.fingerprint:
+            # Config changed since the entry was recorded; the fresh graph is
+            # still worth having, and the next save records its fingerprint.
+            logger.debug(
+                "Graph fingerprint drifted since recorded",
+                recorded=entry.fingerprint[:12],
+                current=fingerprint[:12],
+            )
+        warmed += 1
+    logger.info(
+        "Graph warmup complete",
+        warmed=warmed,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return warmed
+
+
+async def run_periodic_flush(manifest: GraphWarmupManifest, interval_seconds: float) -> None:
+    """Persist the manifest every ``interval_seconds`` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await manifest.asave()
+        except Exception as e:
+            logger.warning("Failed to persist graph warmup manifest", error=str(e))
+
+
+_manifest: GraphWarmupManifest | None = None
+
+
+def get_graph_warmup_manifest() -> GraphWarmupManifest | None:
+    return _manifest
+
+
+def set_graph_warmup_manifest(manifest: GraphWarmupManifest | None) -> None:
+    global _manifest
+    _manifest = manifest
+
+
+__all__ = [
+    "GraphWarmupManifest",
+    "WarmupEntry",
+    "get_graph_warmup_manifest",
+    "run_periodic_flush",
+    "set_graph_warmup_manifest",
+    "warm_compiled_graphs",
+]
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import time
-from typing import Any
+from typing import Any, Literal
 
 from langchain.agents.middleware.types import AgentMiddleware
 from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.messages import SystemMessage
 
 from server.app.observability import LLM_CALL_DURATION, TOOL_CALL_COUNT, get_logger
+from server.app.observability.turn_timing import record_tool_duration
 
 logger = get_logger(__name__)
 
@@ -106,8 +108,9 @@ class CognitionObservabilityMiddleware(AgentMiddleware):
             LLM_CALL_DURATION.labels(provider=provider, model=model_name).observe(duration)
 
     async def awrap_tool_call(self, request: Any, handler: Any) -> Any:
-        """Track tool call frequency and success rate."""
+        """Track tool call frequency, success rate and execution time."""
         tool_name = request.tool_call.get("name", "unknown")
+        start = time.perf_counter()
         try:
             result = await handler(request)
             TOOL_CALL_COUNT.labels(tool_name=tool_name, status="success").inc()
@@ -115,6 +118,8 @@ class CognitionObservabilityMiddleware(AgentMiddleware):
         except Exception:
             TOOL_CALL_COUNT.labels(tool_name=tool_name, status="error").inc()
             raise
+        finally:
+            record_tool_duration(tool_name, time.perf_counter() - start)
 
 
 class CognitionStreamingMiddleware(AgentMiddleware):
@@ -145,3 +150,94 @@ class CognitionStreamingMiddleware(AgentMiddleware):
             logger.debug("Dispatched 'idle' status event")
         except Exception as e:
             logger.debug(f"Failed to dispatch status event: {e}")
+
+
+PromptCacheStyle = Literal["cache_control", "cache_point"]
+
+# Bedrock rewrites every cache_control to a plain ephemeral marker; a TTL is
+# only accepted by some models, so none is requested.
+_CACHE_CONTROL = {"type": "ephemeral"}
+_CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+
+def prompt_cache_style(model: Any) -> PromptCacheStyle | None:
+    """Return how Cognition marks cacheable prompt prefixes for ``model``.
+
+    ``"cache_control"`` is Anthropic's block annotation, used by Claude on the
+    Bedrock InvokeModel API (``ChatBedrock``). ``"cache_point"`` is a Converse
+    API ``cachePoint`` block, used by Claude and Nova on ``ChatBedrockConverse``
+    or ``ChatBedrock(beta_use_converse_api=True)``. ``ChatAnthropic`` is
+    marked by Deep Agents' own ``AnthropicPromptCachingMiddleware``, and other
+    providers cache automatically or not at all, so they return ``None``.
+    """
+    model_class = type(model).__name__
+    if model_class not in ("ChatBedrock", "ChatBedrockConverse"):
+        return None
+
+    model_id = str(getattr(model, "base_model_id", None) or getattr(model, "model_id", "")).lower()
+    provider = getattr(model, "provider", None) or ""
+    if not provider and hasattr(model, "_get_provider"):
+        try:
+            provider = model._get_provider()
+        except ValueError:
+            provider = ""
+    is_claude = provider == "anthropic" or "anthropic." in model_id
+    is_nova = "amazon.nova" in model_id
+
+    if model_class == "ChatBedrockConverse" or getattr(model, "beta_use_converse_api", False):
+        return "cache_point" if is_claude or is_nova else None
+    return "cache_control" if is_claude else None
+
+
+def _mark_system_message(system_message: SystemMessage, style: PromptCacheStyle) -> SystemMessage:
+    """Return ``system_message`` with a cache marker after its last block."""
+    content = system_message.content
+    if not content:
+        return system_message
+    blocks: list[Any] = (
+        [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+    )
+
+    if style == "cache_point":
+        if any(isinstance(b, dict) and "cachePoint" in b for b in blocks):
+            return system_message
+        return SystemMessage(content=[*blocks, _CACHE_POINT])
+
+    last = blocks[-1]
+    if isinstance(last, str):
+        last = {"type": "text", "text": last}
+    if last.get("cache_control"):
+        return system_message
+    return SystemMessage(content=[*blocks[:-1], {**last, "cache_control": _CACHE_CONTROL}])
+
+
+class PromptCacheMiddleware(AgentMiddleware):
+    """Mark the stable prompt prefix for provider prompt caching.
+
+    Deep Agents assembles the system prompt by appending sections as the
+    request passes down the middleware stack: the agent prompt, then the todo,
+    skills, filesystem and subagent sections, which are fixed once the graph
+    is compiled. Memory (``AGENTS.md``) is appended last because the agent
+    may edit it. Sitting at the end of Cognition's middleware, this marks the
+    end of the static sections, so a memory edit does not invalidate the
+    cached prefix, and sets ``cache_control`` on the model call so the
+    provider also caches the conversation up to the newest message. Cache
+    hits are reported back as ``cache_read_tokens`` in the turn's usage.
+    """
+
+    @property
+    def name(self) -> str:
+        return "cognition_prompt_cache"
+
+    async def awrap_model_call(self, request: Any, handler: Any) -> Any:
+        """Add cache markers to requests for models that support them."""
+        style = prompt_cache_style(request.model)
+        if style is None:
+            return await handler(request)
+
+        overrides: dict[str, Any] = {
+            "model_settings": {**request.model_settings, "cache_control": _CACHE_CONTROL}
+        }
+        if request.system_message is not None:
+            overrides["system_message"] = _mark_system_message(request.system_message, style)
+        return await handler(request.override(**overrides))
@@ -5,12 +5,11 @@ from __future__ import annotations
 import importlib
 import inspect
 import os
-from dataclasses import dataclass
-from typing import Any, cast
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
 
 import structlog
-from langchain.chat_models import init_chat_model
-from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
 
 from server.app.agent.definition import AgentDefinition
@@ -18,8 +17,24 @@ from server.app.exceptions import LLMProviderConfigError
 from server.app.settings import Settings
 from server.app.storage.config_store import ConfigStore
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
 logger = structlog.get_logger(__name__)
 
+
+def init_chat_model(model: str, **kwargs: Any) -> Any:
+    """Deferred ``langchain.chat_models.init_chat_model``.
+
+    The provider integration for ``model`` is imported by LangChain on demand;
+    importing ``langchain.chat_models`` itself is deferred to the first model
+    build so server startup does not pay for it.
+    """
+    from langchain.chat_models import init_chat_model as _init_chat_model
+
+    return _init_chat_model(model, **kwargs)
+
+
 _TEST_ONLY_PROVIDERS = {"mock"}
 
 
@@ -34,6 +49,7 @@ class SelectedModelTarget:
     api_key_env: str | None = None
     max_retries: int | None = None
     timeout: int | None = None
+    extra: Mapping[str, Any] = field(default_factory=dict)
 
 
 @dataclass(frozen=True)
@@ -49,6 +65,7 @@ class ResolvedModelConfig:
     max_tokens: int | None = None
     max_retries: int | None = None
     timeout: int | None = None
+    extra: Mapping[str, Any] = field(default_factory=dict)
 
     def build_model(self, resolver: RuntimeResolver) -> BaseChatModel:
         return resolver.build_model(
@@ -62,6 +79,7 @@ class ResolvedModelConfig:
             max_tokens=self.max_tokens,
             max_retries=self.max_retries,
             timeout=self.timeout,
+            extra=self.extra,
         )
 
 
@@ -178,19 +196,33 @@ class RuntimeResolver:
         max_tokens: int | None = None,
         max_retries: int | None = None,
         timeout: int | None = None,
+        extra: Mapping[str, Any] | None = None,
     ) -> BaseChatModel:
         """Build a LangChain BaseChatModel from a resolved provider target."""
         if provider == "mock":
             from server.app.llm.mock import MockLLM
 
-            return cast(BaseChatModel, MockLLM())
+            return cast("BaseChatModel", MockLLM())
+
+        if provider == "scripted_mock":
+            from pydantic import ValidationError
+
+            from server.app.llm.mock import LatencyProfile, ScriptedMockLLM
+
+            try:
+                profile = LatencyProfile.model_validate(dict(extra or {}))
+            except ValidationError as e:
+                raise LLMProviderConfigError(provider=provider, reason=str(e)) from e
+            return ScriptedMockLLM(latency_profile=profile, model_name=model_id)
 
         try:
             if provider == "openai":
                 resolved_key = api_key
                 if not resolved_key and self._settings.openai_api_key:
                     resolved_key = self._settings.openai_api_key.get_secret_value()
-                kwargs: dict[str, Any] = {"model_provider": "openai"}
+                # stream_usage makes OpenAI report usage_metadata on streamed
+                # turns, which feeds per-turn token and cost accounting.
+                kwargs: dict[str, Any] = {"model_provider": "openai", "stream_usage": True}
                 if resolved_key:
                     kwargs["api_key"] = resolved_key
                 if base_url or self._settings.openai_api_base:
@@ -203,7 +235,7 @@ class RuntimeResolver:
                     kwargs["max_retries"] = max_retries
                 if timeout is not None:
                     kwargs["timeout"] = timeout
-                return cast(BaseChatModel, init_chat_model(model_id, **kwargs))
+                return cast("BaseChatModel", init_chat_model(model_id, **kwargs))
 
             elif provider == "anthropic":
                 kwargs = {"model_provider": "anthropic"}
@@ -217,7 +249,7 @@ class RuntimeResolver:
                     kwargs["max_retries"] = max_retries
                 if timeout is not None:
                     kwargs["timeout"] = timeout
-                return cast(BaseChatModel, init_chat_model(model_id, **kwargs))
+                return cast("BaseChatModel", init_chat_model(model_id, **kwargs))
 
             elif provider == "bedrock":
                 return self._build_bedrock_model(
@@ -253,7 +285,7 @@ class RuntimeResolver:
                     compat_kwargs["max_retries"] = max_retries
                 if timeout is not None:
                     compat_kwargs["timeout"] = timeout
-                return cast(BaseChatModel, init_chat_model(model_id, **compat_kwargs))
+                return cast("BaseChatModel", init_chat_model(model_id, **compat_kwargs))
 
             elif provider == "google_genai":
                 kwargs = {"model_provider": "google_genai"}
@@ -267,7 +299,7 @@ class RuntimeResolver:
                     kwargs["max_retries"] = max_retries
                 if timeout is not None:
                     kwargs["timeout"] = timeout
-                return cast(BaseChatModel, init_chat_model(model_id, **kwargs))
+                return cast("BaseChatModel", init_chat_model(model_id, **kwargs))
 
             elif provider == "google_vertexai":
                 kwargs = {"model_provider": "google_vertexai"}
@@ -279,7 +311,7 @@ class RuntimeResolver:
                     kwargs["max_retries"] = max_retries
                 if timeout is not None:
                     kwargs["timeout"] = timeout
-                return cast(BaseChatModel, init_chat_model(model_id, **kwargs))
+                return cast("BaseChatModel", init_chat_model(model_id, **kwargs))
 
             else:
                 raise LLMProviderConfigError(
@@ -386,9 +418,12 @@ class RuntimeResolver:
         if self._store is None:
             return []
         try:
+            servers = await self._store.list_mcp_servers(scope)
+            if not any(s.enabled for s in servers):
+                return []
+
             from server.app.agent.mcp_client import McpServerConfig
 
-            servers = await self._store.list_mcp_servers(scope)
             return [
                 McpServerConfig(
                     name=s.name,
@@ -467,6 +502,7 @@ class RuntimeResolver:
             recursion_limit=recursion_limit,
             max_retries=target.max_retries,
             timeout=target.timeout,
+            extra=target.extra,
             temperature=self._resolve_temperature(session=session, agent_def=agent_def),
             max_tokens=self._resolve_max_tokens(session=session, agent_def=agent_def),
         )
@@ -553,6 +589,7 @@ class RuntimeResolver:
                     api_key_env=chosen.api_key_env,
                     max_retries=chosen.max_retries,
                     timeout=chosen.timeout,
+                    extra=chosen.extra,
                 )
         except RuntimeError:
             logger.warning("ConfigStore not initialized — cannot resolve provider configuration")
@@ -618,6 +655,7 @@ class RuntimeResolver:
             api_key_env=provider_config.api_key_env,
             max_retries=provider_config.max_retries,
             timeout=provider_config.timeout,
+            extra=provider_config.extra,
         )
 
     @staticmethod
@@ -27,7 +27,7 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
-from langchain_core.messages import AIMessageChunk, ToolMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.errors import GraphInterrupt
 from langgraph.types import Command
@@ -36,6 +36,7 @@ from server.app.agent.cognition_agent import CognitionAgentParams, create_cognit
 from server.app.agent.definition import AgentDefinition
 from server.app.settings import Settings, get_settings
 from server.app.storage.factory import create_storage_backend
+from server.app.usage import TokenUsage
 
 # ============================================================================
 # Content normalisation
@@ -151,6 +152,8 @@ class DoneEvent(AgentEvent):
 
     # ISSUE-019: Include message_id so clients can correlate with persisted message
     message_id: str | None = None
+    # Per-turn phase timing summary (see observability.turn_timing)
+    timing: dict[str, Any] | None = None
 
 
 @dataclass
@@ -163,13 +166,24 @@ class ErrorEvent(AgentEvent):
 
 @dataclass
 class UsageEvent(AgentEvent):
-    """Token usage information."""
+    """Token usage information.
+
+    The runtime emits one per model call that reports ``usage_metadata``
+    (``model_calls`` is 1 on the first report for a message). The streaming
+    service folds these into a single priced event per turn. ``input_tokens``
+    includes the cached-prompt tokens; ``estimated`` is set when the provider
+    reported nothing and the counts are approximations.
+    """
 
     input_tokens: int
     output_tokens: int
     estimated_cost: float = 0.0
     provider: str = "unknown"
     model: str = "unknown"
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    model_calls: int = 0
+    estimated: bool = False
 
 
 @dataclass
@@ -288,6 +302,35 @@ def _todo_description(todo: Mapping[str, Any]) -> str:
     return str(content) if content is not None else ""
 
 
+def _usage_from_message(msg: AIMessage, metadata: Any, reported: set[str]) -> UsageEvent | None:
+    """Usage reported on a streamed message, or None if it carries none.
+
+    Providers split a call's usage across chunks (e.g. Anthropic reports input
+    tokens on the first and output tokens on the last), so only the first
+    report for a message ID counts as a model call.
+    """
+    usage = (
+        TokenUsage.from_metadata(msg.usage_metadata, msg.response_metadata.get("model_provider"))
+        if msg.usage_metadata
+        else None
+    )
+    if usage is None or usage.is_empty:
+        return None
+    if msg.id is None or msg.id not in reported:
+        usage.model_calls = 1
+        if msg.id is not None:
+            reported.add(msg.id)
+    model = metadata.get("ls_model_name") if isinstance(metadata, Mapping) else None
+    return UsageEvent(
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_read_tokens=usage.cache_read_tokens,
+        cache_write_tokens=usage.cache_write_tokens,
+        model_calls=usage.model_calls,
+        model=model if isinstance(model, str) and model else "unknown",
+    )
+
+
 def _todo_is_completed(todo: Mapping[str, Any]) -> bool:
     """Return whether a todo is completed."""
     status = todo.get("status")
@@ -538,6 +581,8 @@ class DeepAgentRuntime:
         * Subagent execution is visible via ``chunk["ns"]`` — events that
           arrive with a non-empty namespace came from a subagent and are
           translated to ``DelegationEvent``.
+        * Provider-reported ``usage_metadata`` from every model call, main
+          agent and subagents alike, is yielded as a ``UsageEvent`` per call.
         * Custom status events emitted by tools / middleware via
           ``get_stream_writer()`` arrive as ``custom`` chunks.
 
@@ -547,7 +592,7 @@ class DeepAgentRuntime:
             thread_id: Optional thread ID for state persistence
 
         Yields:
-            AgentEvent: TokenEvent, ToolCallEvent, ToolResultEvent,
+            AgentEvent: TokenEvent, ToolCallEvent, ToolResultEvent, UsageEvent,
                        DelegationEvent, StatusEvent, DoneEvent, or ErrorEvent
         """
         tid = thread_id or self._thread_id or "default"
@@ -587,6 +632,9 @@ class DeepAgentRuntime:
             # per subagent invocation (on first subagent activity), not on every
             # chunk.
             _active_delegations: set[str] = set()
+            # Message IDs whose usage has been reported, so split reports are
+            # counted as one model call.
+            _usage_reported: set[str] = set()
             previous_todos: list[dict[str, Any]] = []
             emitted_initial_plan = False
             interrupt_emitted = False
@@ -617,6 +665,14 @@ class DeepAgentRuntime:
                 if chunk_type == "messages":
                     msg, _metadata = data
 
+                    # ── Usage ────────────────────────────────────────────────
+                    # Every model call, including subagents' (non-empty ns),
+                    # reports usage_metadata on one or more of its chunks.
+                    if isinstance(msg, AIMessage):
+                        usage_event = _usage_from_message(msg, _metadata, _usage_reported)
+                        if usage_event is not None:
+                            yield usage_event
+
                     # ── Token streaming ──────────────────────────────────────
                     # AIMessageChunk with text content → TokenEvent
                     if isinstance(msg, AIMessageChunk) and msg.content:
@@ -13,21 +13,125 @@ provides K8s-native isolation for production deployments on Kubernetes.
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
 from typing import Any, cast
 
 import structlog
 from deepagents.backends import FilesystemBackend, LocalShellBackend
 from deepagents.backends.protocol import (
+    EditResult,
     ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+    GlobResult,
+    GrepResult,
+    LsResult,
     ReadResult,
     SandboxBackendProtocol,
+    WriteResult,
 )
 
+from server.app.agent.sandbox_scheduler import get_sandbox_scheduler
+
 logger = structlog.get_logger(__name__)
 
 
-class CognitionLocalSandboxBackend(LocalShellBackend, SandboxBackendProtocol):
+class ScheduledSandboxBackend(SandboxBackendProtocol):
+    """Sandbox base routing the async methods through the sandbox scheduler.
+
+    Deep Agents' tools call the async methods, whose defaults run the sync
+    methods via ``asyncio.to_thread``. These overrides run them on the
+    :class:`~server.app.agent.sandbox_scheduler.SandboxScheduler` pool
+    instead, keyed by sandbox ID, so parallel tool calls are bounded per
+    session and globally and their queue wait is measured.
+    """
+
+    async def als(self, path: str) -> LsResult:
+        """Async version of ``ls``."""
+        return await get_sandbox_scheduler().run(self.id, "ls", self.ls, path)
+
+    async def aread(self, file_path: str, offset: int = 0, limit: int = 2000) -> ReadResult:
+        """Async version of ``read``."""
+        return await get_sandbox_scheduler().run(
+            self.id,
+            "read",
+            self.read,
+            file_path,
+            offset,
+            limit,
+        )
+
+    async def agrep(
+        self, pattern: str, path: str | None = None, glob: str | None = None
+    ) -> GrepResult:
+        """Async version of ``grep``."""
+        return await get_sandbox_scheduler().run(
+            self.id,
+            "grep",
+            self.grep,
+            pattern,
+            path,
+            glob,
+        )
+
+    async def aglob(self, pattern: str, path: str = "/") -> GlobResult:
+        """Async version of ``glob``."""
+        return await get_sandbox_scheduler().run(self.id, "glob", self.glob, pattern, path)
+
+    async def awrite(self, file_path: str, content: str) -> WriteResult:
+        """Async version of ``write``."""
+        return await get_sandbox_scheduler().run(
+            self.id,
+            "write",
+            self.write,
+            file_path,
+            content,
+        )
+
+    async def aedit(
+        self, file_path: str, old_string: str, new_string: str, replace_all: bool = False
+    ) -> EditResult:
+        """Async version of ``edit``."""
+        return await get_sandbox_scheduler().run(
+            self.id,
+            "edit",
+            self.edit,
+            file_path,
+            old_string,
+            new_string,
+            replace_all,
+        )
+
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,  # noqa: ASYNC109 - forwarded to execute()
+    ) -> ExecuteResponse:
+        """Async version of ``execute``."""
+        if timeout is None:
+            return await get_sandbox_scheduler().run(self.id, "execute", self.execute, command)
+        return await get_sandbox_scheduler().run(
+            self.id,
+            "execute",
+            self.execute,
+            command,
+            timeout=timeout,
+        )
+
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Async version of ``upload_files``."""
+        return await get_sandbox_scheduler().run(self.id, "upload", self.upload_files, files)
+
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Async version of ``download_files``."""
+        return await get_sandbox_scheduler().run(self.id, "download", self.download_files, paths)
+
+
+class CognitionLocalSandboxBackend(
+    ScheduledSandboxBackend, LocalShellBackend, SandboxBackendProtocol
+):
     """Local sandbox backend built on Deep Agents' default LocalShellBackend.
 
     Cognition keeps the protected-path write guard, but local command execution
@@ -113,7 +217,9 @@ class CognitionLocalSandboxBackend(LocalShellBackend, SandboxBackendProtocol):
         return super().write(file_path, content)
 
 
-class CognitionDockerSandboxBackend(FilesystemBackend, SandboxBackendProtocol):
+class CognitionDockerSandboxBackend(
+    ScheduledSandboxBackend, FilesystemBackend, SandboxBackendProtocol
+):
     """Docker sandbox backend with filesystem file ops and containerized execution.
 
     Uses FilesystemBackend for file operations (workspace is volume-mounted,
@@ -216,8 +322,24 @@ class CognitionDockerSandboxBackend(FilesystemBackend, SandboxBackendProtocol):
             truncated=result.truncated,
         )
 
+    def health_check(self) -> bool:
+        """Return False if the session's container has stopped."""
+        if self._docker_backend is None:
+            return True
+        return bool(self._docker_backend.health_check())
 
-class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
+    def terminate(self) -> None:
+        """Remove the session's container, if one was started.
+
+        Safe to call multiple times. A later ``execute()`` starts a new container.
+        """
+        if self._docker_backend is not None:
+            self._docker_backend.terminate()
+            logger.info("Docker sandbox terminated", sandbox_id=self._id)
+            self._docker_backend = None
+
+
+class CognitionKubernetesSandboxBackend(ScheduledSandboxBackend, SandboxBackendProtocol):
     """Kubernetes sandbox backend with Cognition policy enforcement.
 
     Wraps ``langchain_k8s_sandbox.K8sSandbox`` (a ``BaseSandbox`` subclass)
@@ -228,7 +350,8 @@ class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
     - Session-scoped lifecycle tied to Cognition session creation/destruction
 
     The K8sSandbox is lazily initialized on first ``execute()`` — no Sandbox CR
-    is created until code actually needs to run.
+    is created until code actually needs to run, unless ``preclaim()`` is called
+    to provision it ahead of time.
     """
 
     def __init__(
@@ -268,6 +391,9 @@ class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
         self._warm_pool = warm_pool
 
         self._backend: Any | None = None
+        self._backend_lock = threading.Lock()
+        # Metric label for the next claim: "preclaim" or "lazy".
+        self._trigger = "lazy"
 
     @property
     def id(self) -> str:
@@ -283,31 +409,55 @@ class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
         Raises:
             RuntimeError: If langchain-k8s-sandbox is not installed.
         """
-        if self._backend is None:
-            try:
-                from langchain_k8s_sandbox import K8sSandbox
-            except ImportError as e:
-                raise RuntimeError(
-                    "langchain-k8s-sandbox is required for the kubernetes sandbox backend. "
-                    "Install with: pip install cognition[k8s]"
-                ) from e
-
-            self._backend = K8sSandbox(
-                template=self._template,
-                namespace=self._namespace,
-                router_url=self._router_url,
-                labels=self._labels,
-                ttl=self._ttl,
-                warm_pool=self._warm_pool,
-            )
-            logger.info(
-                "K8s sandbox backend initialized",
-                sandbox_id=self._id,
-                template=self._template,
-                namespace=self._namespace,
-            )
+        if self._backend is not None:
+            return self._backend
+        with self._backend_lock:
+            if self._backend is None:
+                try:
+                    from langchain_k8s_sandbox import K8sSandbox
+                except ImportError as e:
+                    raise RuntimeError(
+                        "langchain-k8s-sandbox is required for the kubernetes sandbox backend. "
+                        "Install with: pip install cognition[k8s]"
+                    ) from e
+
+                self._backend = K8sSandbox(
+                    template=self._template,
+                    namespace=self._namespace,
+                    router_url=self._router_url,
+                    labels=self._labels,
+                    ttl=self._ttl,
+                    warm_pool=self._warm_pool,
+                    latency_observer=self._observe_latency,
+                )
+                logger.info(
+                    "K8s sandbox backend initialized",
+                    sandbox_id=self._id,
+                    template=self._template,
+                    namespace=self._namespace,
+                )
         return self._backend
 
+    def _observe_latency(self, phase: str, seconds: float) -> None:
+        from server.app.observability import SANDBOX_CLAIM_LATENCY, SANDBOX_READY_LATENCY
+
+        metric = SANDBOX_CLAIM_LATENCY if phase == "claim" else SANDBOX_READY_LATENCY
+        metric.labels(trigger=self._trigger).observe(seconds)
+
+    def preclaim(self) -> bool:
+        """Provision the sandbox pod now instead of on the first command.
+
+        Blocking; callers run it in a worker thread so provisioning overlaps
+        model resolution and the first LLM call. A command issued meanwhile
+        waits for this claim rather than starting another.
+
+        Returns:
+            True once the sandbox answers commands.
+        """
+        if self._backend is None:
+            self._trigger = "preclaim"
+        return bool(self._get_backend().claim())
+
     def _is_protected_path(self, path: str) -> bool:
         """Check if a path is protected.
 
@@ -461,6 +611,12 @@ class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
         backend = self._get_backend()
         return cast(list[Any], backend.upload_files(files))
 
+    def health_check(self) -> bool:
+        """Return False if the sandbox pod was claimed and no longer responds."""
+        if self._backend is None:
+            return True
+        return bool(self._backend.health_check())
+
     def terminate(self) -> None:
         """Terminate the K8s sandbox and clean up resources.
 
@@ -475,6 +631,7 @@ class CognitionKubernetesSandboxBackend(SandboxBackendProtocol):
                 logger.warning("K8s sandbox terminate failed", error=str(e))
             finally:
                 self._backend = None
+                self._trigger = "lazy"
 
 
 def create_sandbox_backend(
@@ -0,0 +1,132 @@
+"""Per-session registry of sandbox backend handles.
+
+Building a sandbox backend is cheap, but the sandbox behind it is not: a
+Docker backend has to find or start its container and a Kubernetes backend has
+to claim a Sandbox CR through the router. Creating a fresh handle every turn
+throws that connection away.
+
+``SandboxRegistry`` keeps one handle per sandbox id (one per session
+workspace). The first turn creates it; later turns get the same, already
+connected handle, which is also the one captured by any cached agent graph for
+that workspace. Handles are health-checked at most once per
+``health_check_interval`` seconds. An unhealthy handle is terminated in place;
+the backend then provisions a new container or sandbox on its next command, so
+the caller keeps using the same object.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class _Entry:
+    backend: Any
+    checked_at: float
+
+
+class SandboxRegistry:
+    """Reuses sandbox backend handles across turns.
+
+    Args:
+        health_check_interval: Minimum seconds between health checks of a
+            handle. 0 checks on every acquire; a negative value disables checks.
+        clock: Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        health_check_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._interval = health_check_interval
+        self._clock = clock
+        self._entries: dict[str, _Entry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, sandbox_id: str, factory: Callable[[], Any]) -> Any:
+        """Return the handle for ``sandbox_id``, creating it with ``factory`` if needed."""
+        lock = self._locks.setdefault(sandbox_id, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(sandbox_id)
+            if entry is None:
+                backend = factory()
+                self._entries[sandbox_id] = _Entry(backend, self._clock())
+                logger.debug("Sandbox handle created", sandbox_id=sandbox_id)
+                return backend
+
+            if self._interval >= 0 and self._clock() - entry.checked_at >= self._interval:
+                if not await asyncio.to_thread(_is_healthy, entry.backend):
+                    logger.warning("Sandbox unhealthy, re-provisioning", sandbox_id=sandbox_id)
+                    await asyncio.to_thread(_reset, entry.backend)
+                entry.checked_at = self._clock()
+            return entry.backend
+
+    def get(self, sandbox_id: str) -> Any | None:
+        """Return the registered handle for ``sandbox_id``, if any."""
+        entry = self._entries.get(sandbox_id)
+        return entry.backend if entry is not None else None
+
+    def discard(self, backend: Any) -> bool:
+        """Forget ``backend`` without terminating it. Returns True if it was registered."""
+        for sandbox_id, entry in list(self._entries.items()):
+            if entry.backend is backend:
+                del self._entries[sandbox_id]
+                self._locks.pop(sandbox_id, None)
+                return True
+        return False
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._locks.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _is_healthy(backend: Any) -> bool:
+    check = getattr(backend, "health_check", None)
+    if check is None:
+        return True
+    try:
+        return bool(check())
+    except Exception as e:
+        logger.warning("Sandbox health check failed", error=str(e))
+        return False
+
+
+def _reset(backend: Any) -> None:
+    terminate = getattr(backend, "terminate", None)
+    if terminate is None:
+        return
+    try:
+        terminate()
+    except Exception as e:
+        logger.warning("Sandbox reset failed", error=str(e))
+
+
+_default_registry: SandboxRegistry | None = None
+
+
+def get_sandbox_registry() -> SandboxRegistry:
+    """Return the process-wide sandbox registry, creating it on first use."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SandboxRegistry()
+    return _default_registry
+
+
+def set_sandbox_registry(registry: SandboxRegistry | None) -> None:
+    global _default_registry
+    _default_registry = registry
+
+
+__all__ = ["SandboxRegistry", "get_sandbox_registry", "set_sandbox_registry"]
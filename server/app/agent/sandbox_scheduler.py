@@ -0,0 +1,177 @@
+"""Concurrency-limited scheduler for sandbox backend operations.
+
+When the model emits several tool calls in one step, the graph runs them
+concurrently and each awaits an async backend method (``aread``, ``agrep``,
+``aexecute``...). The sandbox backends implement those methods
+synchronously, and Deep Agents' default async wrappers hand each call to
+``asyncio.to_thread``. That shares the loop's default executor with every
+other ``to_thread`` user in the process, and puts no bound on how many calls
+one session can have in flight.
+
+``SandboxScheduler`` runs backend calls on its own thread pool behind two
+limits: per-session (one lane per sandbox) and global. A call waits for a
+slot in its session's lane first and then for a global slot, so one busy
+session cannot hold global slots while it queues. The time spent waiting is
+exported as ``cognition_sandbox_queue_wait_seconds``. Each call is awaited
+by the tool call that issued it, so the graph receives results in the order
+the model issued the calls. A call's slots are released when its worker
+thread finishes, not when its caller stops waiting: a cancelled tool call
+whose operation is already running keeps its slots until the operation ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from server.app.observability import SANDBOX_OPS_IN_FLIGHT, SANDBOX_QUEUE_WAIT
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Lane:
+    """Per-session slots and the number of calls holding or awaiting one."""
+
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+class SandboxScheduler:
+    """Run blocking sandbox operations concurrently within limits.
+
+    Args:
+        max_concurrent: Operations running at once across all sessions; also
+            the size of the thread pool.
+        max_per_session: Operations running at once for one session.
+    """
+
+    def __init__(self, max_concurrent: int = 32, max_per_session: int = 4) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_session = max(1, min(max_per_session, self.max_concurrent))
+        self._executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._lanes: dict[str, _Lane] = {}
+
+    def _bind(self) -> None:
+        # Semaphores belong to one event loop; start afresh on a new one.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_concurrent)
+            self._lanes = {}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent, thread_name_prefix="cognition-sandbox"
+            )
+
+    def in_flight(self, session_key: str) -> int:
+        """Operations of ``session_key`` running or waiting for a slot."""
+        lane = self._lanes.get(session_key)
+        return lane.users if lane is not None else 0
+
+    async def run(
+        self,
+        session_key: str,
+        operation: str,
+        func: Callable[..., T],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool once slots are free.
+
+        Args:
+            session_key: Lane the call counts against, normally the sandbox ID.
+            operation: Operation name for metrics (``read``, ``execute``...).
+            func: Blocking callable to run.
+            *args: Positional arguments for ``func``.
+            **kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            What ``func`` returns.
+        """
+        self._bind()
+        loop = asyncio.get_running_loop()
+        global_slots = self._global
+        lane = self._lanes.get(session_key)
+        if lane is None:
+            lane = self._lanes[session_key] = _Lane(asyncio.Semaphore(self.max_per_session))
+        lane.users += 1
+        queued_at = time.perf_counter()
+        try:
+            await lane.semaphore.acquire()
+            try:
+                await global_slots.acquire()
+            except BaseException:
+                lane.semaphore.release()
+                raise
+        except BaseException:
+            self._leave(session_key, lane)
+            raise
+
+        SANDBOX_QUEUE_WAIT.labels(operation=operation).observe(time.perf_counter() - queued_at)
+        SANDBOX_OPS_IN_FLIGHT.inc()
+
+        def release() -> None:
+            SANDBOX_OPS_IN_FLIGHT.dec()
+            global_slots.release()
+            lane.semaphore.release()
+            self._leave(session_key, lane)
+
+        def on_done(_: concurrent.futures.Future[T]) -> None:
+            # Runs on the worker thread, or inline if the call never started.
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(release)
+
+        assert self._executor is not None
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            release()
+            raise
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def _leave(self, session_key: str, lane: _Lane) -> None:
+        lane.users -= 1
+        if lane.users == 0 and self._lanes.get(session_key) is lane:
+            del self._lanes[session_key]
+
+    def shutdown(self) -> None:
+        """Stop the thread pool; running operations finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_default_scheduler: SandboxScheduler | None = None
+
+
+def get_sandbox_scheduler() -> SandboxScheduler:
+    """Return the process-wide sandbox scheduler, creating it on first use."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = SandboxScheduler()
+    return _default_scheduler
+
+
+def set_sandbox_scheduler(scheduler: SandboxScheduler | None) -> None:
+    """Replace the process-wide scheduler, shutting down the previous one."""
+    global _default_scheduler
+    if _default_scheduler is not None and _default_scheduler is not scheduler:
+        _default_scheduler.shutdown()
+    _default_scheduler = scheduler
+
+
+__all__ = ["SandboxScheduler", "get_sandbox_scheduler", "set_sandbox_scheduler"]
@@ -0,0 +1,220 @@
+"""Versioned index of Deep Agents subagent specs.
+
+Every turn, the primary agent needs the ``SubAgent`` spec of every other agent
+definition visible to it. Building those specs (``AgentDefinition.to_subagent``)
+resolves tool paths and imports tool modules, so doing it per message scales
+with the size of the agent catalogue.
+
+``SubagentSpecIndex`` builds each agent's spec once, keeps it until that agent's
+definition changes, and composes per ``(scope, primary agent)`` spec sets that
+are shared across sessions. Composed sets are kept in a bounded LRU, since
+every distinct scope adds one. Each set carries a content hash that
+``RuntimeContext`` uses as part of the compiled-graph cache key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from server.app.agent.definition import AgentDefinition
+from server.app.storage.config_models import ConfigChangeEvent
+
+logger = structlog.get_logger(__name__)
+
+_EMPTY_SPEC_HASH = hashlib.sha256(b"").hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    # Resolved tools and middleware instances are identified by name/type.
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        return name
+    return type(value).__qualname__
+
+
+def hash_subagent_spec(spec: Any) -> str:
+    """Return a stable content hash for a single subagent spec."""
+    if isinstance(spec, dict):
+        payload = json.dumps(spec, sort_keys=True, default=_json_default)
+    else:
+        payload = f"{type(spec).__qualname__}:{getattr(spec, 'name', '')}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def hash_subagent_specs(specs: Sequence[Any] | None) -> str:
+    """Return a stable content hash for an ordered list of subagent specs."""
+    if not specs:
+        return _EMPTY_SPEC_HASH
+    return _combine_digests(hash_subagent_spec(spec) for spec in specs)
+
+
+def _combine_digests(digests: Any) -> str:
+    h = hashlib.sha256()
+    for digest in digests:
+        h.update(digest.encode())
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class SubagentSpecSet:
+    """Subagent specs for one primary agent, with their content hash."""
+
+    specs: tuple[dict[str, Any], ...]
+    spec_hash: str
+    version: int
+
+
+@dataclass
+class _SpecEntry:
+    definition: AgentDefinition
+    spec: dict[str, Any]
+    digest: str
+
+
+@dataclass
+class _SetEntry:
+    members: tuple[_SpecEntry, ...]
+    spec_set: SubagentSpecSet
+
+
+class SubagentSpecIndex:
+    """Shared cache of subagent specs keyed by agent, scope and primary agent.
+
+    Entries are validated against the definitions returned by the config store
+    by identity — the store replaces an ``AgentDefinition`` object whenever the
+    agent changes — so a stale spec is never served even without change
+    notifications. ``on_agent_change`` drops entries eagerly when wired to the
+    store's agent change events.
+
+    Args:
+        max_sets: Composed spec sets kept, least recently used evicted first.
+    """
+
+    def __init__(self, max_sets: int = 256) -> None:
+        self.max_sets = max(1, max_sets)
+        self._specs: dict[tuple[str, str], _SpecEntry] = {}
+        self._sets: OrderedDict[tuple[tuple[tuple[str, str], ...], str, str], _SetEntry] = (
+            OrderedDict()
+        )
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped whenever any spec set is rebuilt."""
+        return self._version
+
+    async def get_spec_set(
+        self,
+        config_store: Any,
+        primary_name: str,
+        base_path: str,
+        scope: dict[str, str] | None = None,
+    ) -> SubagentSpecSet:
+        """Return the subagent specs available to ``primary_name``.
+
+        Args:
+            config_store: Store providing ``list_agent_definitions``.
+            primary_name: Name of the primary agent (excluded from the set).
+            base_path: Workspace root used to resolve relative tool paths.
+            scope: Request scope; spec sets are cached per scope.
+        """
+        definitions = await config_store.list_agent_definitions(include_hidden=True, scope=scope)
+        members = tuple(
+            self._spec_entry(definition, base_path)
+            for definition in definitions
+            if definition.name != primary_name
+        )
+
+        key = (tuple(sorted((scope or {}).items())), primary_name, base_path)
+        cached = self._sets.get(key)
+        if cached is not None and len(cached.members) == len(members):
+            if all(a is b for a, b in zip(cached.members, members, strict=True)):
+                self._sets.move_to_end(key)
+                return cached.spec_set
+
+        self._version += 1
+        spec_set = SubagentSpecSet(
+            specs=tuple(entry.spec for entry in members),
+            spec_hash=(
+                _combine_digests(entry.digest for entry in members) if members else _EMPTY_SPEC_HASH
+            ),
+            version=self._version,
+        )
+        self._sets[key] = _SetEntry(members=members, spec_set=spec_set)
+        self._sets.move_to_end(key)
+        while len(self._sets) > self.max_sets:
+            self._sets.popitem(last=False)
+        logger.debug(
+            "Subagent spec set rebuilt",
+            primary=primary_name,
+            subagents=len(members),
+            spec_hash=spec_set.spec_hash[:12],
+            version=self._version,
+        )
+        return spec_set
+
+    def _spec_entry(self, definition: AgentDefinition, base_path: str) -> _SpecEntry:
+        key = (base_path, definition.name)
+        entry = self._specs.get(key)
+        if entry is not None and entry.definition is definition:
+            return entry
+        spec = definition.to_subagent(base_path=base_path)
+        entry = _SpecEntry(definition=definition, spec=spec, digest=hash_subagent_spec(spec))
+        self._specs[key] = entry
+        return entry
+
+    def invalidate_agent(self, name: str) -> None:
+        """Drop the cached spec for ``name`` and every composed set.
+
+        Adding, removing or editing any agent can change every set, and sets
+        are cheap to recompose from the per-agent specs that remain.
+        """
+        for spec_key in [k for k in self._specs if k[1] == name]:
+            del self._specs[spec_key]
+        self._sets.clear()
+
+    async def on_agent_change(self, event: ConfigChangeEvent) -> None:
+        """Config-store agent change handler."""
+        if event.entity_type == "agent":
+            self.invalidate_agent(event.name)
+
+    def clear(self) -> None:
+        """Drop every cached spec, e.g. after tool files change on disk."""
+        self._specs.clear()
+        self._sets.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"specs": len(self._specs), "sets": len(self._sets), "version": self._version}
+
+
+_default_index: SubagentSpecIndex | None = None
+
+
+def get_subagent_spec_index() -> SubagentSpecIndex:
+    """Return the process-wide subagent spec index, creating it on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = SubagentSpecIndex()
+    return _default_index
+
+
+def set_subagent_spec_index(index: SubagentSpecIndex | None) -> None:
+    global _default_index
+    _default_index = index
+
+
+__all__ = [
+    "SubagentSpecIndex",
+    "SubagentSpecSet",
+    "get_subagent_spec_index",
+    "hash_subagent_spec",
+    "hash_subagent_specs",
+    "set_subagent_spec_index",
+]
@@ -369,4 +369,5 @@ class InspectPackageTool(BaseTool):
             return f"Error inspecting package: {str(e)}"
 
     async def _arun(self, package_name: str) -> str:
-        return self._run_sync(package_name)
+        # Importing an arbitrary package can take seconds; keep it off the loop.
+        return await asyncio.to_thread(self._run_sync, package_name)
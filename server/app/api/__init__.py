@@ -3,6 +3,17 @@
 REST API routes and utilities.
 """
 
-from server.app.api.routes import messages, sessions
+from __future__ import annotations
 
 __all__ = ["sessions", "messages"]
+
+
+def __getattr__(name: str) -> object:
+    # The routes pull in the whole server (agent runtime, storage); importing
+    # them lazily lets the client SDK share ``server.app.api.models`` cheaply.
+    if name in __all__:
+        from server.app.api import routes
+
+        return getattr(routes, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
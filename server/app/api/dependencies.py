@@ -25,6 +25,7 @@ from server.app.api.scoping import SessionScope, create_scope_dependency
 from server.app.rate_limiter import RateLimiter, get_rate_limiter
 from server.app.settings import Settings, get_settings
 from server.app.storage.config_store import ConfigStore
+from server.app.usage import UsageLedger, get_usage_ledger
 
 if TYPE_CHECKING:
     from server.app.llm.deep_agent_service import SessionAgentManager
@@ -118,6 +119,10 @@ def get_rate_limiter_dep() -> RateLimiter:
     return get_rate_limiter()
 
 
+def get_usage_ledger_dep() -> UsageLedger:
+    return get_usage_ledger()
+
+
 def get_scope_dep(
     request: Request,
     settings: Settings = Depends(get_settings_dep),  # noqa: B008
@@ -140,6 +145,7 @@ __all__ = [
     "get_session_agent_manager_dep",
     "get_settings_dep",
     "get_storage_backend_dep",
+    "get_usage_ledger_dep",
     "set_config_store",
     "set_model_catalog_dep",
     "set_runtime_resolver",
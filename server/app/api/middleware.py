@@ -1,101 +1,163 @@
-"""FastAPI middleware for observability."""
+"""ASGI middleware for observability and security headers.
+
+Both middlewares are plain ASGI callables rather than ``BaseHTTPMiddleware``
+subclasses: they only observe or amend the messages passing through, so they
+add no extra task or queue per request and leave streaming responses
+untouched.
+"""
 
 from __future__ import annotations
 
 import time
-from collections.abc import Callable
-from typing import cast
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from server.app.observability import REQUEST_COUNT, REQUEST_DURATION, get_logger
+from server.app.observability import (
+    REQUEST_COUNT,
+    REQUEST_DURATION,
+    SSE_BYTES_SENT,
+    SSE_STREAM_DURATION,
+    get_logger,
+)
+from server.app.observability.loop_monitor import bind_loop_context
 
 logger = get_logger(__name__)
 
+# Label for requests that matched no route, so scans of random paths cannot
+# create new time series.
+UNMATCHED_ROUTE = "<unmatched>"
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
-    """Middleware for HTTP request observability.
 
-    Tracks:
-    - Request count (total, by status code, by endpoint)
-    - Request duration
-    - Error rates
+def route_template(scope: Scope) -> str:
+    """Return the path template of the route that handled ``scope``.
+
+    FastAPI records the matched route in the scope during routing, so after
+    the app has run this is e.g. ``/sessions/{session_id}/messages`` rather
+    than the concrete path.
     """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return template if isinstance(template, str) else UNMATCHED_ROUTE
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with observability tracking."""
-        start_time = time.time()
 
-        # Extract endpoint info
-        method = request.method
-        endpoint = request.url.path
+class ObservabilityMiddleware:
+    """Middleware for HTTP request observability.
 
-        try:
-            response = cast(Response, await call_next(request))
-            status_code = response.status_code
-
-            # Record metrics
-            duration = time.time() - start_time
-            REQUEST_DURATION.labels(
-                method=method,
-                endpoint=endpoint,
-            ).observe(duration)
-
-            REQUEST_COUNT.labels(
-                method=method,
-                endpoint=endpoint,
-                status=str(status_code),
-            ).inc()
-
-            # Log request
-            logger.info(
-                "HTTP request",
-                method=method,
-                endpoint=endpoint,
-                status_code=status_code,
-                duration_ms=round(duration * 1000, 2),
-            )
+    Tracks:
+    - Request count (by method, route template and status code)
+    - Request duration: until the response completes, or for SSE responses
+      until the response headers are sent
+    - For SSE responses, the full stream duration and bytes sent
+    """
 
-            return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        bind_loop_context(method=scope["method"], path=scope["path"])
+        start = time.perf_counter()
+        status_code = 500
+        headers_sent_at: float | None = None
+        is_stream = False
+        bytes_sent = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, headers_sent_at, is_stream, bytes_sent
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers_sent_at = time.perf_counter()
+                # Routing has run by now; streamed bodies are attributed to the route.
+                bind_loop_context(
+                    route=route_template(scope),
+                    session_id=scope.get("path_params", {}).get("session_id"),
+                )
+                content_type = MutableHeaders(scope=message).get("content-type", "")
+                is_stream = content_type.startswith("text/event-stream")
+            elif message["type"] == "http.response.body":
+                bytes_sent += len(message.get("body", b""))
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Record error metrics
-            duration = time.time() - start_time
-            REQUEST_DURATION.labels(
-                method=method,
-                endpoint=endpoint,
-            ).observe(duration)
-
-            REQUEST_COUNT.labels(
-                method=method,
-                endpoint=endpoint,
-                status="500",
-            ).inc()
-
-            # Log error
+            # A stream that fails after its headers went out keeps its status.
+            if headers_sent_at is None:
+                status_code = 500
+            self._record(scope, status_code, start, headers_sent_at, is_stream, bytes_sent)
             logger.exception(
                 "HTTP request failed",
-                method=method,
-                endpoint=endpoint,
+                method=scope["method"],
+                endpoint=route_template(scope),
+                path=scope["path"],
                 error=str(e),
-                duration_ms=round(duration * 1000, 2),
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
             )
-
             raise
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+        self._record(scope, status_code, start, headers_sent_at, is_stream, bytes_sent)
+
+    @staticmethod
+    def _record(
+        scope: Scope,
+        status_code: int,
+        start: float,
+        headers_sent_at: float | None,
+        is_stream: bool,
+        bytes_sent: int,
+    ) -> None:
+        end = time.perf_counter()
+        method = scope["method"]
+        endpoint = route_template(scope)
+        duration = end - start
+        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=str(status_code)).inc()
+
+        if is_stream and headers_sent_at is not None:
+            REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(
+                headers_sent_at - start
+            )
+            SSE_STREAM_DURATION.labels(endpoint=endpoint).observe(duration)
+            SSE_BYTES_SENT.labels(endpoint=endpoint).observe(bytes_sent)
+        else:
+            REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
+
+        logger.info(
+            "HTTP request",
+            method=method,
+            endpoint=endpoint,
+            path=scope["path"],
+            status_code=status_code,
+            duration_ms=round(duration * 1000, 2),
+            **({"bytes_sent": bytes_sent} if is_stream else {}),
+        )
+
+
+class SecurityHeadersMiddleware:
     """Middleware to add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add security headers."""
-        response = cast(Response, await call_next(request))
-
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        return response
+    HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
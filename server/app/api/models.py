@@ -6,14 +6,18 @@ These wrap the core domain models from server.app.models.
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Literal
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, Literal
 
 from pydantic import AnyHttpUrl, BaseModel, Field
 
 from server.app.models import Session as CoreSession
 from server.app.models import SessionConfig
 
+if TYPE_CHECKING:
+    from server.app.observability.profiling import ProfileInfo
+    from server.app.usage import UsageRollup
+
 # ============================================================================
 # Session Models
 # ============================================================================
@@ -152,6 +156,121 @@ class MessageList(BaseModel):
     has_more: bool = Field(False, description="Whether more messages exist")
 
 
+# ============================================================================
+# Usage Models
+# ============================================================================
+
+
+class UsageTotals(BaseModel):
+    """Token and cost totals. ``input_tokens`` includes cached-prompt tokens."""
+
+    input_tokens: int = Field(0, description="Prompt tokens, including cached tokens")
+    output_tokens: int = Field(0, description="Completion tokens")
+    cache_read_tokens: int = Field(0, description="Prompt tokens served from the cache")
+    cache_write_tokens: int = Field(0, description="Prompt tokens written to the cache")
+    model_calls: int = Field(0, description="Model calls, including subagent calls")
+    turns: int = Field(0, description="Agent turns")
+    estimated_cost: float = Field(0.0, description="Cost in USD at model catalog rates")
+
+
+class ModelUsage(UsageTotals):
+    """Usage rollup for one provider/model."""
+
+    provider: str = Field(..., description="Provider type")
+    model: str = Field(..., description="Model ID")
+    updated_at: datetime = Field(..., description="Time of the last recorded turn")
+
+    @classmethod
+    def from_rollup(cls, rollup: UsageRollup) -> ModelUsage:
+        """Create from a usage ledger rollup."""
+        usage = rollup.usage
+        return cls(
+            provider=rollup.provider,
+            model=rollup.model,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_read_tokens=usage.cache_read_tokens,
+            cache_write_tokens=usage.cache_write_tokens,
+            model_calls=usage.model_calls,
+            turns=rollup.turns,
+            estimated_cost=rollup.cost,
+            updated_at=datetime.fromtimestamp(rollup.updated_at, UTC),
+        )
+
+
+class UsageResponse(UsageTotals):
+    """Usage rollup for a session or scope, with a per-model breakdown."""
+
+    session_id: str | None = Field(None, description="Session the usage belongs to")
+    scope: dict[str, str] | None = Field(None, description="Scope the usage belongs to")
+    models: list[ModelUsage] = Field(default_factory=list)
+
+    @classmethod
+    def from_rollups(
+        cls,
+        rollups: list[UsageRollup],
+        session_id: str | None = None,
+        scope: dict[str, str] | None = None,
+    ) -> UsageResponse:
+        """Create from usage ledger rollups, summing them into the totals."""
+        models = [ModelUsage.from_rollup(r) for r in rollups]
+        return cls(
+            session_id=session_id,
+            scope=scope,
+            models=models,
+            input_tokens=sum(m.input_tokens for m in models),
+            output_tokens=sum(m.output_tokens for m in models),
+            cache_read_tokens=sum(m.cache_read_tokens for m in models),
+            cache_write_tokens=sum(m.cache_write_tokens for m in models),
+            model_calls=sum(m.model_calls for m in models),
+            turns=sum(m.turns for m in models),
+            estimated_cost=round(sum(m.estimated_cost for m in models), 6),
+        )
+
+
+# ============================================================================
+# Profile Models
+# ============================================================================
+
+
+class ProfileResponse(BaseModel):
+    """Metadata of a stored turn profile."""
+
+    id: str = Field(..., description="Profile ID")
+    session_id: str = Field(..., description="Session of the profiled turn")
+    agent_name: str | None = Field(None, description="Agent that ran the turn")
+    provider: str | None = Field(None, description="Provider that served the turn")
+    model: str | None = Field(None, description="Model that served the turn")
+    status: str | None = Field(None, description="How the turn ended")
+    trigger: str = Field(..., description="'request' (asked for) or 'sampled'")
+    created_at: datetime = Field(..., description="When the turn started")
+    duration_ms: float = Field(..., description="Profiled wall time in milliseconds")
+    samples: int = Field(..., description="Number of stack samples")
+
+    @classmethod
+    def from_info(cls, info: ProfileInfo) -> ProfileResponse:
+        """Create from stored profile metadata."""
+        return cls(
+            id=info.id,
+            session_id=info.session_id,
+            agent_name=info.agent_name,
+            provider=info.provider,
+            model=info.model,
+            status=info.status,
+            trigger=info.trigger,
+            created_at=datetime.fromtimestamp(info.created_at, UTC),
+            duration_ms=info.duration_ms,
+            samples=info.samples,
+        )
+
+
+class ProfileList(BaseModel):
+    """List of stored turn profiles, newest first."""
+
+    profiles: list[ProfileResponse] = Field(default_factory=list)
+    total: int = Field(0, description="Number of profiles returned")
+
+
 # ============================================================================
 # SSE Event Models
 # ============================================================================
@@ -227,7 +346,11 @@ class UsageEvent(BaseModel):
 
     event: Literal["usage"] = "usage"
     data: dict = Field(
-        ..., description="Usage with 'input_tokens', 'output_tokens', 'estimated_cost'"
+        ...,
+        description=(
+            "Usage with 'input_tokens', 'output_tokens', 'cache_read_tokens', "
+            "'cache_write_tokens', 'model_calls', 'estimated_cost', 'estimated'"
+        ),
     )
 
 
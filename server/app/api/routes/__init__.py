@@ -1,5 +1,25 @@
 """API routes package."""
 
-from server.app.api.routes import agents, config, messages, models, sessions, skills, tools
+from server.app.api.routes import (
+    agents,
+    config,
+    messages,
+    models,
+    profiles,
+    sessions,
+    skills,
+    tools,
+    usage,
+)
 
-__all__ = ["agents", "config", "messages", "models", "sessions", "skills", "tools"]
+__all__ = [
+    "agents",
+    "config",
+    "messages",
+    "models",
+    "profiles",
+    "sessions",
+    "skills",
+    "tools",
+    "usage",
+]
@@ -15,8 +15,10 @@ Persistence contract:
 
 from __future__ import annotations
 
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
@@ -39,7 +41,12 @@ from server.app.api.models import (
     ToolCallResponse,
 )
 from server.app.api.scoping import SessionScope
-from server.app.api.sse import EventBuilder, SSEStream, get_last_event_id
+from server.app.api.sse import (
+    EventBuilder,
+    SSEStream,
+    get_last_event_id,
+    open_session_event_log,
+)
 from server.app.llm.deep_agent_service import (
     DelegationEvent,
     DoneEvent,
@@ -49,12 +56,24 @@ from server.app.llm.deep_agent_service import (
     SessionAgentManager,
     StatusEvent,
     StepCompleteEvent,
+    StreamEvent,
     TokenEvent,
     ToolCallEvent,
     ToolResultEvent,
     UsageEvent,
 )
 from server.app.models import SessionStatus
+from server.app.observability.profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    ProfileInfo,
+    ProfileStore,
+    SamplingProfiler,
+    get_profile_store,
+    new_profile_id,
+    profile_trigger,
+)
+from server.app.observability.turn_timing import TurnTiming
 from server.app.rate_limiter import RateLimiter
 from server.app.settings import Settings
 from server.app.storage.backend import StorageBackend
@@ -63,6 +82,131 @@ router = APIRouter(prefix="/sessions/{session_id}/messages", tags=["messages"])
 logger = structlog.get_logger(__name__)
 
 
+async def render_agent_events(
+    events: AsyncIterator[StreamEvent],
+    session_id: str,
+    store: StorageBackend,
+) -> AsyncGenerator[dict, None]:
+    """Render agent stream events as SSE dictionaries.
+
+    Shared by ``send_message`` and session resume. Keeps the session status in
+    sync (waiting for approval on interrupt, active on completion, error on
+    failure) and emits a final ``done`` event whose ``assistant_data`` holds
+    the reply for persistence.
+    """
+    # Accumulate assistant message data for persistence
+    accumulated_content = []
+    tool_calls = []
+    _current_tool_call = None
+    token_count: int | None = None
+    model_used: str | None = None
+    metadata: dict[str, Any] = {}
+
+    async for event in events:
+        if isinstance(event, TokenEvent):
+            accumulated_content.append(event.content)
+            yield EventBuilder.token(event.content)
+
+        elif isinstance(event, ToolCallEvent):
+            tool_call = {
+                "name": event.name,
+                "args": event.args,
+                "id": event.tool_call_id,
+            }
+            tool_calls.append(tool_call)
+            _current_tool_call = event.tool_call_id
+            yield EventBuilder.tool_call(
+                name=event.name,
+                args=event.args,
+                tool_call_id=event.tool_call_id,
+            )
+
+        elif isinstance(event, ToolResultEvent):
+            yield EventBuilder.tool_result(
+                tool_call_id=event.tool_call_id,
+                output=event.output,
+                exit_code=event.exit_code,
+            )
+
+        elif isinstance(event, PlanningEvent):
+            yield EventBuilder.planning(event.todos)
+
+        elif isinstance(event, StepCompleteEvent):
+            yield EventBuilder.step_complete(
+                step_number=event.step_number,
+                total_steps=event.total_steps,
+                description=event.description,
+            )
+
+        elif isinstance(event, InterruptEvent):
+            await store.update_session(
+                session_id=session_id,
+                status=SessionStatus.WAITING_FOR_APPROVAL.value,
+            )
+            yield EventBuilder.interrupt(
+                tool_call_id=event.tool_call_id,
+                tool_name=event.tool_name,
+                args=event.args,
+                session_id=session_id,
+                action_requests=event.action_requests,
+            )
+
+        elif isinstance(event, DelegationEvent):
+            # ISSUE-010: Emit delegation event for UI visibility
+            yield EventBuilder.delegation(
+                from_agent=event.from_agent,
+                to_agent=event.to_agent,
+                task=event.task,
+            )
+
+        elif isinstance(event, StatusEvent):
+            yield EventBuilder.status(event.status)
+
+        elif isinstance(event, UsageEvent):
+            token_count = event.output_tokens
+            model_used = event.model
+            metadata["input_tokens"] = event.input_tokens
+            metadata["output_tokens"] = event.output_tokens
+            metadata["cache_read_tokens"] = event.cache_read_tokens
+            metadata["cache_write_tokens"] = event.cache_write_tokens
+            metadata["model_calls"] = event.model_calls
+            metadata["estimated_cost"] = event.estimated_cost
+            metadata["provider"] = event.provider
+            if event.estimated:
+                metadata["usage_estimated"] = True
+            yield EventBuilder.usage(
+                input_tokens=event.input_tokens,
+                output_tokens=event.output_tokens,
+                estimated_cost=event.estimated_cost,
+                provider=event.provider,
+                model=event.model,
+                cache_read_tokens=event.cache_read_tokens,
+                cache_write_tokens=event.cache_write_tokens,
+                model_calls=event.model_calls,
+                estimated=event.estimated,
+            )
+
+        elif isinstance(event, DoneEvent):
+            await store.update_session(session_id=session_id, status=SessionStatus.ACTIVE.value)
+            # ISSUE-019: Generate message_id upfront and include in done event
+            # This allows clients to correlate with persisted message without extra API call
+            message_id = event.message_id or str(uuid.uuid4())
+            assistant_data = {
+                "content": "".join(accumulated_content),
+                "tool_calls": tool_calls if tool_calls else None,
+                "token_count": token_count,
+                "model_used": model_used,
+                "metadata": metadata if metadata else None,
+            }
+            yield EventBuilder.done(
+                assistant_data=assistant_data, message_id=message_id, timing=event.timing
+            )
+
+        elif isinstance(event, ErrorEvent):
+            await store.update_session(session_id=session_id, status=SessionStatus.ERROR.value)
+            yield EventBuilder.error(event.message, code=event.code)
+
+
 async def agent_event_stream(
     session_id: str,
     thread_id: str,
@@ -72,6 +216,7 @@ async def agent_event_stream(
     agent_manager: SessionAgentManager,
     store: StorageBackend,
     scope: dict[str, str] | None = None,
+    timing: TurnTiming | None = None,
 ) -> AsyncGenerator[dict, None]:
     """Generate agent events as SSE using DeepAgents.
 
@@ -92,6 +237,8 @@ async def agent_event_stream(
             Propagated to the agent runtime so that scope-aware
             backends (e.g. ConfigRegistrySkillsBackend) can filter
             skills, providers, and other config by tenant.
+        timing: Turn timing started by the route, continued by the agent
+            service and summarised on the ``done`` event.
 
     Yields:
         SSE events as dictionaries. The final 'done' event contains
@@ -99,10 +246,7 @@ async def agent_event_stream(
     """
     try:
         # Get or create agent service for this session
-        service = agent_manager.get_service(session_id)
-
-        if not service:
-            service = agent_manager.register_session(session_id, workspace_path)
+        service = agent_manager.get_or_register(session_id, workspace_path)
 
         session = await store.get_session(session_id)
 
@@ -115,121 +259,98 @@ async def agent_event_stream(
         if session and session.config.system_prompt:
             system_prompt = session.config.system_prompt
 
-        # Accumulate assistant message data for persistence
-        accumulated_content = []
-        tool_calls = []
-        _current_tool_call = None
-        token_count: int | float = 0
-        model_used: str | None = None
-        metadata: dict[str, Any] = {}
-
-        # Stream response using DeepAgents with multi-step support
-        # Pass agent_manager to enable abort functionality
-        async for event in service.stream_response(
+        async for sse_event in render_agent_events(
+            service.stream_response(
+                session_id=session_id,
+                thread_id=thread_id,
+                project_path=workspace_path,
+                content=content,
+                system_prompt=system_prompt,
+                manager=agent_manager,
+                scope=scope,
+                timing=timing,
+            ),
             session_id=session_id,
-            thread_id=thread_id,
-            project_path=workspace_path,
-            content=content,
-            system_prompt=system_prompt,
-            manager=agent_manager,
-            scope=scope,
+            store=store,
         ):
-            if isinstance(event, TokenEvent):
-                accumulated_content.append(event.content)
-                token_count += len(event.content.split())
-                yield EventBuilder.token(event.content)
-
-            elif isinstance(event, ToolCallEvent):
-                tool_call = {
-                    "name": event.name,
-                    "args": event.args,
-                    "id": event.tool_call_id,
-                }
-                tool_calls.append(tool_call)
-                _current_tool_call = event.tool_call_id
-                yield EventBuilder.tool_call(
-                    name=event.name,
-                    args=event.args,
-                    tool_call_id=event.tool_call_id,
-                )
+            yield sse_event
 
-            elif isinstance(event, ToolResultEvent):
-                yield EventBuilder.tool_result(
-                    tool_call_id=event.tool_call_id,
-                    output=event.output,
-                    exit_code=event.exit_code,
-                )
+    except Exception as e:
+        logger.error("Agent streaming error", error=str(e), session_id=session_id, exc_info=True)
+        yield EventBuilder.error(str(e), code="AGENT_ERROR")
 
-            elif isinstance(event, PlanningEvent):
-                yield EventBuilder.planning(event.todos)
 
-            elif isinstance(event, StepCompleteEvent):
-                yield EventBuilder.step_complete(
-                    step_number=event.step_number,
-                    total_steps=event.total_steps,
-                    description=event.description,
-                )
-
-            elif isinstance(event, InterruptEvent):
-                await store.update_session(
-                    session_id=session_id,
-                    status=SessionStatus.WAITING_FOR_APPROVAL.value,
-                )
-                yield EventBuilder.interrupt(
-                    tool_call_id=event.tool_call_id,
-                    tool_name=event.tool_name,
-                    args=event.args,
-                    session_id=session_id,
-                    action_requests=event.action_requests,
-                )
+@dataclass
+class TurnOutcome:
+    """What a completed agent turn produced, filled in by ``persist_assistant_reply``."""
 
-            elif isinstance(event, DelegationEvent):
-                # ISSUE-010: Emit delegation event for UI visibility
-                yield EventBuilder.delegation(
-                    from_agent=event.from_agent,
-                    to_agent=event.to_agent,
-                    task=event.task,
-                )
+    assistant_data: dict[str, Any] | None = None
+    message_id: str | None = None
+    status: str = "error"
+    error: dict[str, Any] | None = None
 
-            elif isinstance(event, StatusEvent):
-                yield EventBuilder.status(event.status)
-
-            elif isinstance(event, UsageEvent):
-                token_count = event.output_tokens
-                model_used = event.model
-                metadata["input_tokens"] = event.input_tokens
-                metadata["output_tokens"] = event.output_tokens
-                metadata["estimated_cost"] = event.estimated_cost
-                metadata["provider"] = event.provider
-                yield EventBuilder.usage(
-                    input_tokens=event.input_tokens,
-                    output_tokens=event.output_tokens,
-                    estimated_cost=event.estimated_cost,
-                    provider=event.provider,
-                    model=event.model,
-                )
 
-            elif isinstance(event, DoneEvent):
-                await store.update_session(session_id=session_id, status=SessionStatus.ACTIVE.value)
-                # ISSUE-019: Generate message_id upfront and include in done event
-                # This allows clients to correlate with persisted message without extra API call
-                message_id = event.message_id or str(uuid.uuid4())
-                assistant_data = {
-                    "content": "".join(accumulated_content),
-                    "tool_calls": tool_calls if tool_calls else None,
-                    "token_count": token_count,
-                    "model_used": model_used,
-                    "metadata": metadata if metadata else None,
-                }
-                yield EventBuilder.done(assistant_data=assistant_data, message_id=message_id)
-
-            elif isinstance(event, ErrorEvent):
-                await store.update_session(session_id=session_id, status=SessionStatus.ERROR.value)
-                yield EventBuilder.error(event.message, code=event.code)
+async def persist_assistant_reply(
+    event_stream: AsyncGenerator[dict[str, Any], None],
+    session_id: str,
+    store: StorageBackend,
+    outcome: TurnOutcome,
+    parent_id: str | None = None,
+    timing: TurnTiming | None = None,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Relay SSE events, then persist the assistant reply from the ``done`` event.
 
-    except Exception as e:
-        logger.error("Agent streaming error", error=str(e), session_id=session_id, exc_info=True)
-        yield EventBuilder.error(str(e), code="AGENT_ERROR")
+    The write is recorded as the ``persistence`` phase of ``timing``.
+    """
+    async for event in event_stream:
+        # Capture assistant data and message_id from done event
+        if event.get("event") == "done":
+            if event.get("data", {}).get("assistant_data"):
+                outcome.assistant_data = event["data"]["assistant_data"]
+            # ISSUE-019: Capture message_id from done event
+            outcome.message_id = event.get("data", {}).get("message_id")
+            outcome.status = "done"
+        elif event.get("event") == "error":
+            outcome.error = event.get("data")
+        yield event
+
+    # Persist assistant message after stream completes
+    assistant_data = outcome.assistant_data
+    if assistant_data:
+        start = time.perf_counter()
+        try:
+            from server.app.models import ToolCall
+
+            # Convert tool_calls dicts to ToolCall objects
+            tc_objects = None
+            if assistant_data.get("tool_calls"):
+                tc_objects = [
+                    ToolCall(name=tc["name"], args=tc.get("args", {}), id=tc["id"])
+                    for tc in assistant_data["tool_calls"]
+                ]
+
+            persist_message_id = outcome.message_id or str(uuid.uuid4())
+            await store.create_message(
+                message_id=persist_message_id,
+                session_id=session_id,
+                role="assistant",
+                content=assistant_data.get("content"),
+                parent_id=parent_id,
+                tool_calls=tc_objects,
+                token_count=assistant_data.get("token_count"),
+                model_used=assistant_data.get("model_used"),
+                metadata=assistant_data.get("metadata"),
+            )
+
+            messages_for_session, _ = await store.get_messages_by_session(
+                session_id, limit=-1, offset=0
+            )
+            await store.update_message_count(session_id, len(messages_for_session))
+        except Exception as e:
+            logger.error("Failed to persist assistant message", error=str(e), session_id=session_id)
+        finally:
+            if timing is not None:
+                timing.record_phase("persistence", time.perf_counter() - start)
 
 
 async def _post_completion_callback(
@@ -257,6 +378,31 @@ async def _post_completion_callback(
         )
 
 
+async def profile_turn(
+    event_stream: AsyncGenerator[dict[str, Any], None],
+    profile: ProfileInfo,
+    store: ProfileStore,
+    timing: TurnTiming,
+    interval: float,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Relay SSE events while the turn runs under the sampling profiler.
+
+    The profile is tagged with the turn's provider, model and outcome and
+    stored once the stream ends.
+    """
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start()
+    try:
+        async for event in event_stream:
+            yield event
+    finally:
+        profiler.stop()
+        profile.provider = timing.provider
+        profile.model = timing.model
+        profile.status = timing.status or "aborted"
+        await store.asave(profile, profiler)
+
+
 @router.post(
     "",
     status_code=status.HTTP_200_OK,
@@ -287,8 +433,15 @@ async def send_message(
     - `step_complete`: A step in the plan has been completed
     - `usage`: Token usage and cost information
     - `error`: Error occurred
-    - `done`: Stream complete
+    - `done`: Stream complete, with a per-turn timing summary
+
+    When profiling is enabled, the `X-Cognition-Profile` header runs the turn
+    under the sampling profiler. The response's
+    `X-Cognition-Profile-Id` header then names the profile served by
+    `GET /profiles/{profile_id}`.
     """
+    timing = TurnTiming(session_id=session_id)
+
     # Check rate limit
     # Use scope-based key if scoping is enabled, otherwise use IP
     if settings.scoping_enabled and not scope.is_empty():
@@ -299,7 +452,12 @@ async def send_message(
 
     await rate_limiter.check_rate_limit(rate_limit_key)
 
-    session = await store.get_session(session_id)
+    # Per-scope (tenant) quotas, shared across sessions and replicas
+    quota_scope = scope.get_all() if settings.scoping_enabled and not scope.is_empty() else {}
+    await rate_limiter.check_scope_quota(quota_scope)
+
+    with timing.phase("session_load"):
+        session = await store.get_session(session_id)
 
     if session is None:
         raise HTTPException(
@@ -324,16 +482,19 @@ async def send_message(
         # Store thread_id on session for persistence
         session.thread_id = thread_id
 
-    user_message = await store.create_message(
-        message_id=str(uuid.uuid4()),
-        session_id=session_id,
-        role="user",
-        content=request.content,
-        parent_id=request.parent_id,
-    )
+    with timing.phase("persistence"):
+        user_message = await store.create_message(
+            message_id=str(uuid.uuid4()),
+            session_id=session_id,
+            role="user",
+            content=request.content,
+            parent_id=request.parent_id,
+        )
 
-    messages_for_session, _ = await store.get_messages_by_session(session_id, limit=-1, offset=0)
-    await store.update_message_count(session_id, len(messages_for_session))
+        messages_for_session, _ = await store.get_messages_by_session(
+            session_id, limit=-1, offset=0
+        )
+        await store.update_message_count(session_id, len(messages_for_session))
 
     event_stream = agent_event_stream(
         session_id,
@@ -344,60 +505,30 @@ async def send_message(
         agent_manager,
         store=store,
         scope=scope.get_all() if not scope.is_empty() else None,
+        timing=timing,
     )
 
     # Wrap the event stream to persist assistant message on completion
     async def wrapped_event_stream() -> AsyncGenerator[dict[str, Any], None]:
-        assistant_data = None
-        message_id = None
-        completion_status = "error"
-        callback_error: dict[str, Any] | None = None
-        async for event in event_stream:
-            # Capture assistant data and message_id from done event
-            if event.get("event") == "done":
-                if event.get("data", {}).get("assistant_data"):
-                    assistant_data = event["data"]["assistant_data"]
-                # ISSUE-019: Capture message_id from done event
-                message_id = event.get("data", {}).get("message_id")
-                completion_status = "done"
-            elif event.get("event") == "error":
-                callback_error = event.get("data")
+        outcome = TurnOutcome()
+        async for event in persist_assistant_reply(
+            event_stream, session_id, store, outcome, parent_id=user_message.id, timing=timing
+        ):
             yield event
+        assistant_data = outcome.assistant_data
+        message_id = outcome.message_id
+        completion_status = outcome.status
+        callback_error = outcome.error
 
-        # Persist assistant message after stream completes
-        if assistant_data:
+        if assistant_data and quota_scope:
+            usage = assistant_data.get("metadata") or {}
             try:
-                from server.app.models import ToolCall
-
-                # Convert tool_calls dicts to ToolCall objects
-                tc_objects = None
-                if assistant_data.get("tool_calls"):
-                    tc_objects = [
-                        ToolCall(name=tc["name"], args=tc.get("args", {}), id=tc["id"])
-                        for tc in assistant_data["tool_calls"]
-                    ]
-
-                persist_message_id = message_id or str(uuid.uuid4())
-                await store.create_message(
-                    message_id=persist_message_id,
-                    session_id=session_id,
-                    role="assistant",
-                    content=assistant_data.get("content"),
-                    parent_id=user_message.id,
-                    tool_calls=tc_objects,
-                    token_count=assistant_data.get("token_count"),
-                    model_used=assistant_data.get("model_used"),
-                    metadata=assistant_data.get("metadata"),
+                await rate_limiter.record_token_usage(
+                    quota_scope,
+                    int(usage.get("input_tokens", 0)) + int(usage.get("output_tokens", 0)),
                 )
-
-                messages_for_session, _ = await store.get_messages_by_session(
-                    session_id, limit=-1, offset=0
-                )
-                await store.update_message_count(session_id, len(messages_for_session))
             except Exception as e:
-                logger.error(
-                    "Failed to persist assistant message", error=str(e), session_id=session_id
-                )
+                logger.warning("Failed to record scope token usage", error=str(e))
 
         if request.callback_url:
             callback_payload = {
@@ -422,12 +553,42 @@ async def send_message(
                 callback_payload["error"] = callback_error
             await _post_completion_callback(str(request.callback_url), callback_payload, session_id)
 
+    events: AsyncGenerator[dict[str, Any], None] = wrapped_event_stream()
+    profile_store = get_profile_store()
+    profile_id: str | None = None
+    trigger = profile_trigger(
+        settings,
+        http_request.headers.get(PROFILE_HEADER),
+    )
+    if trigger and profile_store is not None:
+        profile_id = new_profile_id()
+        profile = ProfileInfo(
+            id=profile_id,
+            session_id=session_id,
+            agent_name=session.agent_name,
+            trigger=trigger,
+            scopes=dict(session.scopes),
+        )
+        events = profile_turn(
+            events, profile, profile_store, timing, settings.profiling_interval_seconds
+        )
+
     # Check for Last-Event-ID header for stream resumption
     last_event_id = get_last_event_id(http_request)
 
-    # Create SSE stream with settings-based configuration
+    # Create SSE stream with settings-based configuration. The turn is
+    # produced into the session's event log so it outlives this connection
+    # and can be reattached to via GET /sessions/{session_id}/events.
     sse_stream = SSEStream.from_settings(settings)
-    return sse_stream.create_response(wrapped_event_stream(), http_request, last_event_id)
+    response = sse_stream.create_response(
+        events,
+        http_request,
+        last_event_id,
+        event_log=open_session_event_log(session_id),
+    )
+    if profile_id:
+        response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
 
 
 @router.get(
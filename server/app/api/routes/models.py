@@ -119,16 +119,9 @@ async def list_models(
 
     catalog_models = []
     for provider_type in sorted(configured_provider_types):
-        catalog_models.extend(await catalog.get_models_for_cognition_provider(provider_type))
-
-    if q or tool_call is not None:
-        query = q.lower() if q else None
-        catalog_models = [
-            m
-            for m in catalog_models
-            if (query is None or query in m.id.lower() or query in m.name.lower())
-            and (tool_call is None or m.tool_call == tool_call)
-        ]
+        catalog_models.extend(
+            await catalog.search(query=q, provider_type=provider_type, tool_call=tool_call)
+        )
 
     models = [_catalog_model_to_info(m) for m in catalog_models]
     return ModelList(models=models)
@@ -363,6 +356,7 @@ async def test_provider(
             base_url=provider_config.base_url,
             region=provider_config.region,
             role_arn=provider_config.role_arn,
+            extra=provider_config.extra,
         )
     except LLMProviderConfigError as e:
         return ProviderTestResponse(
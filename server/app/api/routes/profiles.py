@@ -0,0 +1,96 @@
+"""Turn profile API routes.
+
+Profiles are recorded when profiling is enabled and a turn is sent with the
+``X-Cognition-Profile`` header, or is sampled (see
+``server/app/observability/profiling.py``). These routes require the same
+header carrying the profiling token, and are refused while no token is
+configured.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from server.app.api.dependencies import get_scope_dep, get_settings_dep
+from server.app.api.models import ErrorResponse, ProfileList, ProfileResponse
+from server.app.api.scoping import SessionScope
+from server.app.observability.profiling import (
+    PROFILE_HEADER,
+    ProfileStore,
+    get_profile_store,
+    profile_access_allowed,
+)
+from server.app.settings import Settings
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+
+
+def get_authorized_profile_store(
+    request: Request,
+    settings: Settings = Depends(get_settings_dep),  # noqa: B008
+) -> ProfileStore:
+    """Return the profile store, checking that profiling is on and allowed."""
+    store = get_profile_store()
+    if store is None or not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if not profile_access_allowed(settings, request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Missing or invalid {PROFILE_HEADER} header",
+        )
+    return store
+
+
+@router.get("", response_model=ProfileList)
+async def list_profiles(
+    session_id: str | None = None,
+    store: ProfileStore = Depends(get_authorized_profile_store),  # noqa: B008
+    scope: SessionScope = Depends(get_scope_dep),  # noqa: B008
+) -> ProfileList:
+    """List stored turn profiles, newest first.
+
+    Only profiles of sessions in the caller's scope are returned, optionally
+    filtered to one session.
+    """
+    profiles = [
+        ProfileResponse.from_info(info)
+        for info in store.list_profiles()
+        if (session_id is None or info.session_id == session_id)
+        and (scope.is_empty() or scope.matches(info.scopes))
+    ]
+    return ProfileList(profiles=profiles, total=len(profiles))
+
+
+@router.get(
+    "/{profile_id}",
+    responses={
+        200: {"description": "Speedscope profile document", "content": {"application/json": {}}},
+        404: {"model": ErrorResponse, "description": "Profile not found"},
+    },
+)
+async def get_profile(
+    profile_id: str,
+    store: ProfileStore = Depends(get_authorized_profile_store),  # noqa: B008
+    scope: SessionScope = Depends(get_scope_dep),  # noqa: B008
+) -> FileResponse:
+    """Download a profile in the speedscope format.
+
+    Open the file at https://www.speedscope.app to view it as a flamegraph.
+    """
+    info = store.get(profile_id)
+    path = store.profile_path(profile_id)
+    if (
+        info is None
+        or path is None
+        or not path.is_file()
+        or (not scope.is_empty() and not scope.matches(info.scopes))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Profile not found: {profile_id}"
+        )
+    return FileResponse(
+        path,
+        media_type="application/json",
+        filename=f"cognition-{info.session_id}-{profile_id}.speedscope.json",
+    )
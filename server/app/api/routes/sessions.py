@@ -28,6 +28,7 @@ from server.app.api.dependencies import (
     get_session_agent_manager_dep,
     get_settings_dep,
     get_storage_backend_dep,
+    get_usage_ledger_dep,
 )
 from server.app.api.models import (
     ErrorResponse,
@@ -36,24 +37,28 @@ from server.app.api.models import (
     SessionResponse,
     SessionResumeRequest,
     SessionUpdate,
+    UsageResponse,
 )
-from server.app.api.scoping import SessionScope
-from server.app.api.sse import EventBuilder, SSEStream, get_last_event_id
-from server.app.llm.deep_agent_service import (
-    DeepAgentStreamingService,
-    DoneEvent,
-    SessionAgentManager,
-    TokenEvent,
-    UsageEvent,
+from server.app.api.routes.messages import (
+    TurnOutcome,
+    persist_assistant_reply,
+    render_agent_events,
 )
-from server.app.llm.deep_agent_service import (
-    ErrorEvent as ResumeErrorEvent,
+from server.app.api.scoping import SessionScope
+from server.app.api.sse import (
+    EventBuilder,
+    SSEStream,
+    get_last_event_id,
+    get_session_event_log,
+    open_session_event_log,
 )
+from server.app.llm.deep_agent_service import SessionAgentManager
 from server.app.models import SessionConfig, SessionStatus
 from server.app.session_manager import build_session_workspace_path, ensure_session_workspace_path
 from server.app.settings import Settings
 from server.app.storage.backend import StorageBackend
 from server.app.storage.config_store import ConfigStore
+from server.app.usage import UsageLedger
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -66,6 +71,7 @@ SessionProvider = Literal[
     "openai_compatible",
     "google_genai",
     "google_vertexai",
+    "scripted_mock",
 ]
 
 
@@ -198,6 +204,9 @@ async def create_session(
 
     # Register session with Agent manager
     agent_manager.register_session(session_id, workspace_path)
+    agent_manager.preclaim_sandbox(
+        session_id, workspace_path, scope.get_all() if not scope.is_empty() else None
+    )
 
     return SessionResponse.from_core(session)
 
@@ -262,6 +271,29 @@ async def get_session(
     return SessionResponse.from_core(session)
 
 
+@router.get(
+    "/{session_id}/usage",
+    response_model=UsageResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Session not found"},
+    },
+)
+async def get_session_usage(
+    session_id: str,
+    scope: SessionScope = Depends(get_scope_dep),  # noqa: B008
+    store: StorageBackend = Depends(get_storage_backend_dep),  # noqa: B008
+    ledger: UsageLedger = Depends(get_usage_ledger_dep),  # noqa: B008
+) -> UsageResponse:
+    """Get token usage and cost for a session.
+
+    Served from the usage ledger's per-session rollup, broken down by model.
+    Includes turns that paused for approval or were aborted.
+    """
+    await _get_scoped_session(session_id, store, scope)
+    rollups = await ledger.rollups("session", session_id)
+    return UsageResponse.from_rollups(rollups, session_id=session_id)
+
+
 @router.patch(
     "/{session_id}",
     response_model=SessionResponse,
@@ -377,8 +409,16 @@ async def resume_session(
     settings: Settings = Depends(get_settings_dep),
     scope: SessionScope = Depends(get_scope_dep),
     store: StorageBackend = Depends(get_storage_backend_dep),  # noqa: B008
+    agent_manager: SessionAgentManager = Depends(get_session_agent_manager_dep),  # noqa: B008
 ) -> dict[str, str | bool] | StreamingResponse:
-    """Resume an interrupted Deep Agents session using native Command(resume=...)."""
+    """Resume an interrupted Deep Agents session using native Command(resume=...).
+
+    Runs through the session's shared agent service and the same event
+    pipeline as ``send_message``: the resumed reply is streamed, persisted and
+    can itself pause on a further interrupt. The pipeline records the
+    session's final status, so a non-streaming resume is never marked active
+    before the resumed turn has succeeded.
+    """
     session = await _get_scoped_session(session_id, store, scope)
 
     if session.status != SessionStatus.WAITING_FOR_APPROVAL.value:
@@ -387,70 +427,81 @@ async def resume_session(
             detail=f"Session {session_id} is not waiting for approval",
         )
 
-    service = DeepAgentStreamingService(settings)
-
-    accept_header = http_request.headers.get("accept", "")
-    wants_stream = "text/event-stream" in accept_header.lower()
-
-    if not wants_stream:
-        async for event in service.resume_response(
+    service = agent_manager.get_or_register(session_id, session.workspace_path)
+    agent_events = render_agent_events(
+        service.resume_response(
             session_id=session_id,
             thread_id=session.thread_id,
-            project_path=str(settings.workspace_path),
+            project_path=session.workspace_path,
             decision=request.decision,
             tool_name=request.tool_name,
             args=request.args,
-            scope=session.scopes,
-        ):
-            if isinstance(event, ResumeErrorEvent):
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=event.message,
-                )
-        await store.update_session(session_id=session_id, status=SessionStatus.ACTIVE.value)
-        return {"success": True, "message": "Session resumed"}
+            scope=scope.get_all() if not scope.is_empty() else None,
+            manager=agent_manager,
+        ),
+        session_id=session_id,
+        store=store,
+    )
+    outcome = TurnOutcome()
+    event_stream = persist_assistant_reply(agent_events, session_id, store, outcome)
 
-    sse = SSEStream.from_settings(settings)
-    last_event_id = get_last_event_id(http_request)
+    accept_header = http_request.headers.get("accept", "")
+    if "text/event-stream" not in accept_header.lower():
+        async for _ in event_stream:
+            pass
+        if outcome.error is not None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=outcome.error.get("message", "Resume failed"),
+            )
+        return {"success": True, "message": "Session resumed"}
 
-    async def event_generator() -> AsyncGenerator[dict[str, object], None]:
+    async def event_generator() -> AsyncGenerator[dict[str, Any], None]:
         await store.update_session(session_id=session_id, status=SessionStatus.ACTIVE.value)
         yield EventBuilder.status("resuming")
+        async for event in event_stream:
+            yield event
 
-        async for event in service.resume_response(
-            session_id=session_id,
-            thread_id=session.thread_id,
-            project_path=str(settings.workspace_path),
-            decision=request.decision,
-            tool_name=request.tool_name,
-            args=request.args,
-            scope=session.scopes,
-        ):
-            if isinstance(event, TokenEvent):
-                yield EventBuilder.token(event.content)
-            elif isinstance(event, UsageEvent):
-                yield EventBuilder.usage(
-                    input_tokens=event.input_tokens,
-                    output_tokens=event.output_tokens,
-                    estimated_cost=event.estimated_cost,
-                    provider=event.provider,
-                    model=event.model,
-                )
-            elif isinstance(event, DoneEvent):
-                yield EventBuilder.done(
-                    message_id="resume",
-                    assistant_data={"content": "resumed", "tool_calls": None, "token_count": 0},
-                )
-            elif isinstance(event, ResumeErrorEvent):
-                yield EventBuilder.error(event.message, code=event.code)
-                return
-
-    return StreamingResponse(
-        sse.event_generator(event_generator(), request=http_request, last_event_id=last_event_id),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+    sse = SSEStream.from_settings(settings)
+    return sse.create_response(
+        event_generator(),
+        http_request,
+        get_last_event_id(http_request),
+        event_log=open_session_event_log(session_id),
+    )
+
+
+@router.get(
+    "/{session_id}/events",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={
+        404: {"model": ErrorResponse, "description": "Session or event stream not found"},
+    },
+)
+async def stream_session_events(
+    session_id: str,
+    http_request: Request,
+    settings: Settings = Depends(get_settings_dep),
+    scope: SessionScope = Depends(get_scope_dep),
+    store: StorageBackend = Depends(get_storage_backend_dep),  # noqa: B008
+) -> StreamingResponse:
+    """Reattach to the session's current or most recent turn stream.
+
+    Replays the retained events after the ``Last-Event-ID`` header (all of
+    them without it), then follows the turn live until it finishes. Finished
+    turns stay attachable for a short grace period.
+    """
+    await _get_scoped_session(session_id, store, scope)
+
+    event_log = get_session_event_log(session_id)
+    if event_log is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No event stream for session: {session_id}",
+        )
+
+    sse = SSEStream.from_settings(settings)
+    return sse.create_response(
+        None, http_request, get_last_event_id(http_request), event_log=event_log
     )
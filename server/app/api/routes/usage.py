@@ -0,0 +1,32 @@
+"""Usage API routes.
+
+Token usage and cost rollups from the usage ledger. Per-session usage is
+served by ``GET /sessions/{session_id}/usage``.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from server.app.api.dependencies import get_scope_dep, get_usage_ledger_dep
+from server.app.api.models import UsageResponse
+from server.app.api.scoping import SessionScope
+from server.app.rate_limiter import scope_key
+from server.app.usage import UsageLedger
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+
+@router.get("", response_model=UsageResponse)
+async def get_scope_usage(
+    scope: SessionScope = Depends(get_scope_dep),  # noqa: B008
+    ledger: UsageLedger = Depends(get_usage_ledger_dep),  # noqa: B008
+) -> UsageResponse:
+    """Get token usage and cost for the caller's scope.
+
+    Totals cover every session in the scope, broken down by model. Without
+    scope headers this returns the usage of unscoped sessions.
+    """
+    scopes = scope.get_all()
+    rollups = await ledger.rollups("scope", scope_key(scopes))
+    return UsageResponse.from_rollups(rollups, scope=scopes)
@@ -8,6 +8,7 @@ Features:
 - Keepalive heartbeat events
 - Last-Event-ID header support for stream resumption
 - Event buffering for replay
+- Per-session event logs that let clients reattach to a running turn
 """
 
 from __future__ import annotations
@@ -17,7 +18,7 @@ import json
 import time
 import uuid
 from collections import deque
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Coroutine
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -120,6 +121,124 @@ class EventBuffer:
             self._buffer.clear()
 
 
+class SessionEventLog:
+    """Events of one session turn, retained so clients can reattach to it.
+
+    The turn is produced into the log by a background task, so it runs to
+    completion even if the client that started it disconnects. Any number of
+    readers can :meth:`follow` the log from a ``Last-Event-ID``: retained
+    events after that ID are replayed, then new ones are delivered as they
+    are appended until the turn closes the log.
+    """
+
+    def __init__(self, max_size: int = 5000):
+        """Initialize an empty, open log.
+
+        Args:
+            max_size: Maximum number of events retained for replay
+        """
+        self._events: deque[BufferedEvent] = deque(maxlen=max_size)
+        self._appended = 0
+        self._wakeup = asyncio.Event()
+        self._producer: asyncio.Task[None] | None = None
+        self.closed_at: float | None = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the turn has finished producing events."""
+        return self.closed_at is not None
+
+    def append(self, event_id: str, event_type: str, data: dict[str, Any]) -> None:
+        """Append an event and wake any followers."""
+        self._events.append(BufferedEvent(event_id, event_type, data, time.time()))
+        self._appended += 1
+        self._notify()
+
+    def close(self) -> None:
+        """Mark the turn as finished; followers drain and stop."""
+        self.closed_at = time.monotonic()
+        self._notify()
+
+    def start(self, producer: Coroutine[Any, Any, None]) -> None:
+        """Run ``producer`` in the background, detached from any one request."""
+        self._producer = asyncio.create_task(producer)
+
+    def _notify(self) -> None:
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    def _first_seq(self) -> int:
+        return self._appended - len(self._events)
+
+    def _seq_after(self, last_event_id: str | None) -> int:
+        if last_event_id:
+            for offset, event in enumerate(self._events):
+                if event.event_id == last_event_id:
+                    return self._first_seq() + offset + 1
+        # Unknown or evicted ID: replay everything retained, like EventBuffer.
+        return self._first_seq()
+
+    async def follow(
+        self, last_event_id: str | None, idle_timeout: float
+    ) -> AsyncGenerator[BufferedEvent | None, None]:
+        """Yield events after ``last_event_id`` until the log is closed.
+
+        Args:
+            last_event_id: Event ID to resume after; None replays from the start
+            idle_timeout: Seconds without events after which None is yielded,
+                so callers can send a keepalive
+
+        Yields:
+            Buffered events in order, or None after an idle period
+        """
+        next_seq = self._seq_after(last_event_id)
+        while True:
+            while next_seq < self._appended:
+                first = self._first_seq()
+                next_seq = max(next_seq, first)
+                yield self._events[next_seq - first]
+                next_seq += 1
+            if self.closed:
+                return
+            wakeup = self._wakeup
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=idle_timeout)
+            except TimeoutError:
+                yield None
+
+
+# Finished turns stay attachable this long, so a client that dropped just
+# before the end can still collect the final events.
+_EVENT_LOG_RETENTION_SECONDS = 60.0
+
+_session_event_logs: dict[str, SessionEventLog] = {}
+
+
+def _expire_session_event_logs() -> None:
+    cutoff = time.monotonic() - _EVENT_LOG_RETENTION_SECONDS
+    expired = [
+        session_id
+        for session_id, log in _session_event_logs.items()
+        if log.closed_at is not None and log.closed_at < cutoff
+    ]
+    for session_id in expired:
+        del _session_event_logs[session_id]
+
+
+def open_session_event_log(session_id: str) -> SessionEventLog:
+    """Start a new event log for a session's turn, replacing the previous one."""
+    _expire_session_event_logs()
+    log = SessionEventLog()
+    _session_event_logs[session_id] = log
+    return log
+
+
+def get_session_event_log(session_id: str) -> SessionEventLog | None:
+    """Return the session's running or recently finished turn log, if any."""
+    _expire_session_event_logs()
+    return _session_event_logs.get(session_id)
+
+
 class SSEStream:
     """Helper class for streaming SSE events with reconnection support.
 
@@ -238,11 +357,54 @@ class SSEStream:
                 event_id=event.event_id,
             )
 
+    async def _produce(
+        self, event_stream: AsyncGenerator[dict, None], log: SessionEventLog
+    ) -> None:
+        """Drain ``event_stream`` into ``log``, assigning event IDs."""
+        try:
+            async for event in event_stream:
+                event_id = await self._generate_event_id()
+                log.append(event_id, event.get("event", "message"), event.get("data", {}))
+        except Exception as e:
+            error_event_id = await self._generate_event_id()
+            log.append(error_event_id, "error", {"message": str(e), "code": "STREAM_ERROR"})
+        finally:
+            log.close()
+
+    async def _log_event_generator(
+        self,
+        event_stream: AsyncGenerator[dict, None] | None,
+        request: Request,
+        last_event_id: str | None,
+        event_log: SessionEventLog,
+    ) -> AsyncGenerator[str, None]:
+        """Serve ``event_log`` to one client, starting its producer if given."""
+        yield f"retry: {self.retry_ms}\n\n"
+
+        if event_stream is not None:
+            event_log.start(self._produce(event_stream, event_log))
+
+        if last_event_id:
+            # No ID, so the client keeps resuming from the last logged event.
+            yield self.format_event(
+                event_type="reconnected",
+                data={"last_event_id": last_event_id, "resumed": True},
+            )
+
+        async for event in event_log.follow(last_event_id, self.heartbeat_interval):
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield self.format_keepalive()
+            else:
+                yield self.format_event(event.event_type, event.data, event.event_id)
+
     async def event_generator(
         self,
-        event_stream: AsyncGenerator[dict, None],
+        event_stream: AsyncGenerator[dict, None] | None,
         request: Request,
         last_event_id: str | None = None,
+        event_log: SessionEventLog | None = None,
     ) -> AsyncGenerator[str, None]:
         """Generate SSE formatted events from an async generator.
 
@@ -253,14 +415,28 @@ class SSEStream:
         - Client disconnection detection
         - Event buffering for replay on reconnection
 
+        With an ``event_log``, ``event_stream`` is drained into the log by a
+        background task and the client follows the log instead, so the turn
+        survives a disconnect and can be reattached to with Last-Event-ID.
+        ``event_stream`` may then be None to only follow an existing log.
+
         Args:
             event_stream: Async generator yielding event dictionaries
             request: FastAPI request object for disconnection detection
             last_event_id: Optional ID to resume from (from Last-Event-ID header)
+            event_log: Optional session log to produce into and follow
 
         Yields:
             Formatted SSE event strings
         """
+        if event_log is not None:
+            async for event_str in self._log_event_generator(
+                event_stream, request, last_event_id, event_log
+            ):
+                yield event_str
+            return
+        assert event_stream is not None
+
         # Send retry directive first
         yield f"retry: {self.retry_ms}\n\n"
 
@@ -333,10 +509,11 @@ class SSEStream:
 
     def create_response(
         self,
-        event_stream: AsyncGenerator[dict, None],
+        event_stream: AsyncGenerator[dict, None] | None,
         request: Request,
         last_event_id: str | None = None,
         status_code: int = 200,
+        event_log: SessionEventLog | None = None,
     ) -> StreamingResponse:
         """Create a StreamingResponse for SSE with reconnection support.
 
@@ -345,12 +522,13 @@ class SSEStream:
             request: FastAPI request object
             last_event_id: Optional ID for resumption (from Last-Event-ID header)
             status_code: HTTP status code
+            event_log: Optional session log; see :meth:`event_generator`
 
         Returns:
             FastAPI StreamingResponse configured for SSE
         """
         return StreamingResponse(
-            self.event_generator(event_stream, request, last_event_id),
+            self.event_generator(event_stream, request, last_event_id, event_log),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -416,18 +594,25 @@ class EventBuilder:
         }
 
     @staticmethod
-    def done(assistant_data: dict[str, Any] | None = None, message_id: str | None = None) -> dict:
+    def done(
+        assistant_data: dict[str, Any] | None = None,
+        message_id: str | None = None,
+        timing: dict[str, Any] | None = None,
+    ) -> dict:
         """Create a done event.
 
         Args:
             assistant_data: Optional assistant message data for persistence
             message_id: Optional ID of the persisted assistant message (ISSUE-019)
+            timing: Optional per-turn phase timing summary, in milliseconds
         """
         data: dict[str, Any] = {}
         if assistant_data:
             data["assistant_data"] = assistant_data
         if message_id:
             data["message_id"] = message_id
+        if timing:
+            data["timing"] = timing
         return {"event": "done", "data": data}
 
     @staticmethod
@@ -437,14 +622,27 @@ class EventBuilder:
         estimated_cost: float,
         provider: str | None = None,
         model: str | None = None,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        model_calls: int = 0,
+        estimated: bool = False,
     ) -> dict:
-        """Create a usage event."""
+        """Create a usage event.
+
+        ``input_tokens`` includes the cached-prompt tokens broken out in
+        ``cache_read_tokens`` and ``cache_write_tokens``. ``estimated`` marks
+        counts approximated because the provider reported no usage.
+        """
         return {
             "event": "usage",
             "data": {
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
+                "cache_read_tokens": cache_read_tokens,
+                "cache_write_tokens": cache_write_tokens,
+                "model_calls": model_calls,
                 "estimated_cost": estimated_cost,
+                "estimated": estimated,
                 "provider": provider,
                 "model": model,
             },
@@ -28,6 +28,7 @@ _PROVIDER_TYPE_TO_DEFAULT_API_KEY_ENV: dict[str, str | None] = {
     "google_vertexai": None,  # uses ADC, no key
     "bedrock": None,  # uses IAM, no key
     "mock": None,
+    "scripted_mock": None,
 }
 
 
@@ -86,6 +87,7 @@ async def seed_providers_from_config(
     base_url = llm.get("base_url")
     region = llm.get("region")
     role_arn = llm.get("role_arn")
+    extra = llm.get("extra")
 
     definition: dict[str, Any] = {
         "id": "default",
@@ -106,6 +108,8 @@ async def seed_providers_from_config(
         definition["region"] = region
     if role_arn:
         definition["role_arn"] = role_arn
+    if isinstance(extra, dict):
+        definition["extra"] = extra
 
     try:
         inserted = await config_store.seed_if_absent(
@@ -4,6 +4,7 @@ Commands:
 - serve: Start the API server
 - init: Initialize configuration
 - config: Show configuration
+- profile-startup: Report import cost and time-to-ready
 - db: Database migration commands
 """
 
@@ -215,6 +216,63 @@ def health(
         console.print(f"Error: {e}")
 
 
+@app.command("profile-startup")
+def profile_startup(
+    top: int = typer.Option(25, "--top", "-n", help="Number of modules to show"),
+    module: str = typer.Option("server.app.main", "--module", "-m", help="Module to import"),
+    ready: bool = typer.Option(False, "--ready", help="Also measure time until /ready"),
+    runs: int = typer.Option(3, "--runs", help="Server launches for --ready"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port for --ready launches"),
+) -> None:
+    """Profile server startup.
+
+    Imports the server in a fresh interpreter under ``-X importtime`` and shows
+    the most expensive modules. With ``--ready``, launches the server ``runs``
+    times and reports the time until ``GET /ready`` succeeds.
+    """
+    from server.app.startup_profile import measure_time_to_ready, profile_imports
+
+    try:
+        timings = profile_imports(module)
+    except RuntimeError as e:
+        console.print(f"[bold red]✗ {e}[/bold red]")
+        raise typer.Exit(1) from None
+
+    total = next((t.cumulative_us for t in timings if t.module == module), 0)
+    console.print(f"[bold]Import {module}:[/bold] {total / 1000:.0f} ms")
+
+    table = Table(title=f"Top {top} modules by cumulative import time")
+    table.add_column("Module", style="cyan")
+    table.add_column("Cumulative (ms)", justify="right")
+    table.add_column("Self (ms)", justify="right")
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        table.add_row(
+            f"{'  ' * timing.depth}{timing.module}",
+            f"{timing.cumulative_us / 1000:.1f}",
+            f"{timing.self_us / 1000:.1f}",
+        )
+    console.print(table)
+
+    if not ready:
+        return
+
+    samples: list[float] = []
+    for run in range(runs):
+        try:
+            seconds = measure_time_to_ready(port=port)
+        except (RuntimeError, TimeoutError) as e:
+            console.print(f"[bold red]✗ Run {run + 1}: {e}[/bold red]")
+            raise typer.Exit(1) from None
+        samples.append(seconds)
+        console.print(f"Run {run + 1}: ready in {seconds * 1000:.0f} ms")
+    samples.sort()
+    console.print(
+        f"[bold]Time to /ready:[/bold] min {samples[0] * 1000:.0f} ms, "
+        f"median {samples[len(samples) // 2] * 1000:.0f} ms, "
+        f"max {samples[-1] * 1000:.0f} ms"
+    )
+
+
 @db_app.command("upgrade")
 def db_upgrade(
     revision: str = typer.Option(
@@ -183,9 +183,12 @@ class ValidationError(CognitionError):
 class RateLimitError(CognitionError):
     """Rate limit exceeded."""
 
-    def __init__(self, resource: str, limit: int, window: int):
+    def __init__(self, resource: str, limit: int, window: int, retry_after: float | None = None):
+        details: dict[str, Any] = {"resource": resource, "limit": limit, "window_seconds": window}
+        if retry_after is not None:
+            details["retry_after_seconds"] = round(retry_after, 3)
         super().__init__(
             message=f"Rate limit exceeded for {resource}",
             code=ErrorCode.RATE_LIMITED,
-            details={"resource": resource, "limit": limit, "window_seconds": window},
+            details=details,
         )
@@ -192,3 +192,27 @@ class DockerExecutionBackend:
                         }
                     )
         return files
+
+    def health_check(self) -> bool:
+        """Return False if the container was started and is no longer running."""
+        if self._container is None:
+            return True
+        try:
+            self._container.reload()
+        except Exception:
+            return False
+        return bool(self._container.status == "running")
+
+    def terminate(self) -> None:
+        """Stop and remove the container. Safe to call multiple times."""
+        if self._container is None:
+            return
+        import structlog
+
+        logger = structlog.get_logger(__name__)
+        try:
+            self._container.remove(force=True)
+        except Exception as e:
+            logger.warning("Docker container removal failed", error=str(e))
+        finally:
+            self._container = None
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -99,7 +99,7 @@ class WorkspaceFileHandler(FileSystemEventHandler):
         Args:
             watcher: Parent workspace watcher
             path: Path being watched
-            watch_type: Type of watch ('tools', 'middleware', 'config')
+            watch_type: Type of watch ('tools', 'middleware', 'agents', 'config')
         """
         self.watcher = watcher
         self.path = Path(path).resolve()
@@ -195,6 +195,7 @@ class WorkspaceWatcher:
         self._tools_changed_callbacks: list[Callable[[], None]] = []
         self._middleware_changed_callbacks: list[Callable[[], None]] = []
         self._config_changed_callbacks: list[Callable[[], None]] = []
+        self._agents_changed_callbacks: list[Callable[[], Awaitable[Any] | None]] = []
 
         logger.debug("WorkspaceWatcher initialized", enabled=self.config.enabled)
 
@@ -254,6 +255,35 @@ class WorkspaceWatcher:
 
         return self
 
+    def watch_agents(self, agents_dir: str) -> WorkspaceWatcher:
+        """Watch the agents directory for changes.
+
+        When agent definition files change, notifies agent callbacks so the
+        config store can incrementally reload them.
+
+        Args:
+            agents_dir: Path to .cognition/agents/ directory
+
+        Returns:
+            Self for method chaining
+        """
+        if not self.config.enabled:
+            return self
+
+        path = Path(agents_dir).resolve()
+        if not path.exists():
+            logger.warning("Agents directory does not exist, skipping watch", path=str(path))
+            return self
+
+        handler = WorkspaceFileHandler(self, str(path), "agents")
+        self._handlers[str(path)] = handler
+
+        if self._observer:
+            self._observer.schedule(handler, str(path), recursive=False)
+            logger.info("Watching agents directory", path=str(path))
+
+        return self
+
     def watch_config(self, config_path: str) -> WorkspaceWatcher:
         """Watch the config file for changes.
 
@@ -306,6 +336,18 @@ class WorkspaceWatcher:
         self._middleware_changed_callbacks.append(callback)
         return self
 
+    def on_agents_changed(self, callback: Callable[[], Awaitable[Any] | None]) -> WorkspaceWatcher:
+        """Register a callback for when agent definition files change.
+
+        Args:
+            callback: Function (sync or async) to call when agents change
+
+        Returns:
+            Self for method chaining
+        """
+        self._agents_changed_callbacks.append(callback)
+        return self
+
     def on_config_changed(self, callback: Callable[[], None]) -> WorkspaceWatcher:
         """Register a callback for when config changes.
 
@@ -371,7 +413,7 @@ class WorkspaceWatcher:
 
         Args:
             event: The change event
-            watch_type: Type of watch ('tools', 'middleware', 'config')
+            watch_type: Type of watch ('tools', 'middleware', 'agents', 'config')
         """
         # Cancel existing timer for this watch type
         key = f"{watch_type}:{event.src_path}"
@@ -410,7 +452,7 @@ class WorkspaceWatcher:
 
         Args:
             event: The change event
-            watch_type: Type of watch ('tools', 'middleware', 'config')
+            watch_type: Type of watch ('tools', 'middleware', 'agents', 'config')
         """
         # Remove timer reference
         key = f"{watch_type}:{event.src_path}"
@@ -444,6 +486,16 @@ class WorkspaceWatcher:
                     except Exception as e:
                         logger.error("Middleware changed callback failed", error=str(e))
 
+            elif watch_type == "agents":
+                for agents_callback in self._agents_changed_callbacks:
+                    try:
+                        if asyncio.iscoroutinefunction(agents_callback):
+                            await agents_callback()
+                        else:
+                            agents_callback()
+                    except Exception as e:
+                        logger.error("Agents changed callback failed", error=str(e))
+
             elif watch_type == "config":
                 # Trigger config reload
                 logger.info("Config changed, reload triggered")
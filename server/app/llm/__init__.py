@@ -1,15 +1,6 @@
 """LLM integration module."""
 
-from server.app.llm.deep_agent_service import (
-    DeepAgentStreamingService,
-    SessionAgentManager,
-    get_session_agent_manager,
-)
-from server.app.llm.model_catalog import (
-    ModelCatalog,
-    get_model_catalog,
-    reset_model_catalog,
-)
+from __future__ import annotations
 
 __all__ = [
     "DeepAgentStreamingService",
@@ -19,3 +10,20 @@ __all__ = [
     "get_session_agent_manager",
     "reset_model_catalog",
 ]
+
+
+def __getattr__(name: str) -> object:
+    # deep_agent_service pulls in the agent runtime (langgraph, deepagents);
+    # importing it lazily keeps lightweight users such as the model catalog
+    # from paying for it at startup.
+    if name in {"DeepAgentStreamingService", "SessionAgentManager", "get_session_agent_manager"}:
+        from server.app.llm import deep_agent_service
+
+        return getattr(deep_agent_service, name)
+
+    if name in {"ModelCatalog", "get_model_catalog", "reset_model_catalog"}:
+        from server.app.llm import model_catalog
+
+        return getattr(model_catalog, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,15 +12,25 @@ and builds a LangChain BaseChatModel. No custom fallback chains.
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
 from dataclasses import dataclass, field
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any
 
 import structlog
-from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage
 
-from server.app.agent.cognition_agent import CognitionAgentParams, create_cognition_agent
+from server.app.agent.cognition_agent import (
+    CognitionAgentParams,
+    CognitionAgentResult,
+    create_cognition_agent,
+    invalidate_agent_cache_for_sandbox,
+    invalidate_agent_cache_for_workspace,
+    start_sandbox_preclaim,
+)
+from server.app.agent.graph_warmup import get_graph_warmup_manifest
 from server.app.agent.resolver import RuntimeResolver
 from server.app.agent.runtime import (
     DeepAgentRuntime,
@@ -40,10 +50,34 @@ from server.app.agent.runtime import (
 from server.app.agent.runtime import (
     _resolve_middleware as _resolve_single_middleware,
 )
+from server.app.agent.sandbox_registry import get_sandbox_registry
+from server.app.agent.subagent_index import get_subagent_spec_index
 from server.app.exceptions import LLMProviderConfigError
+from server.app.llm.model_catalog import get_model_catalog
+from server.app.observability import AGENT_SESSION_EVICTIONS, AGENT_SESSIONS
+from server.app.observability.loop_monitor import bind_loop_context
+from server.app.observability.turn_timing import (
+    TurnTiming,
+    reset_turn_timing,
+    set_turn_timing,
+    turn_phase,
+)
+from server.app.rate_limiter import scope_key
 from server.app.settings import Settings
 from server.app.storage.config_store import ConfigStore
 from server.app.storage.factory import create_storage_backend
+from server.app.usage import (
+    TokenUsage,
+    UsageRecord,
+    estimate_tokens,
+    get_usage_ledger,
+    price_usage,
+)
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+    from server.app.storage.backend import StorageBackend
 
 logger = structlog.get_logger(__name__)
 
@@ -84,22 +118,51 @@ class ResolvedAgentConfig:
     response_format: str | None = None
     tool_token_limit_before_evict: int | None = None
     subagents: list[Any] = field(default_factory=list)
+    subagent_spec_hash: str | None = None
     agent_def: Any = None
 
 
+@dataclass
+class PreparedAgent:
+    """A built agent graph plus the per-turn inputs needed to run it."""
+
+    agent: CognitionAgentResult
+    checkpointer: Any
+    invocation_context: Any
+    provider: str
+    model_id: str
+    recursion_limit: int
+
+
 @dataclass
 class StreamAccumulator:
-    """Tracks token counts and accumulated content during streaming."""
+    """Tracks provider-reported usage and accumulated content during streaming.
+
+    ``usage`` is keyed by the model that reported it, so subagents running a
+    different model are priced at their own rates. ``prompt`` is only used to
+    estimate input tokens when the provider reports no usage at all.
+    """
 
-    input_tokens: int = 0
-    output_tokens: int = 0
+    prompt: str = ""
     accumulated_content: str = ""
+    usage: dict[str, TokenUsage] = field(default_factory=dict)
     _current_tool_call: str | None = field(default=None, repr=False)
 
     def record_token(self, content: str) -> None:
-        self.output_tokens += len(content.split())
         self.accumulated_content += content
 
+    def record_usage(self, event: UsageEvent, default_model: str) -> None:
+        model = default_model if event.model == "unknown" else event.model
+        self.usage.setdefault(model, TokenUsage()).add(
+            TokenUsage(
+                input_tokens=event.input_tokens,
+                output_tokens=event.output_tokens,
+                cache_read_tokens=event.cache_read_tokens,
+                cache_write_tokens=event.cache_write_tokens,
+                model_calls=event.model_calls,
+            )
+        )
+
     def set_tool_call(self, tool_call_id: str | None) -> None:
         self._current_tool_call = tool_call_id
 
@@ -123,12 +186,29 @@ class DeepAgentStreamingService:
         settings: Settings,
         runtime_resolver: RuntimeResolver | None = None,
         config_store: ConfigStore | None = None,
+        storage_backend: StorageBackend | None = None,
     ) -> None:
         self.settings = settings
-        self.storage_backend = create_storage_backend(settings)
+        self._storage_backend = storage_backend
         self._runtime_resolver = runtime_resolver
         self._config_store = config_store
 
+    @property
+    def storage_backend(self) -> Any:
+        """Storage backend shared with the app; a private one is created only if none was given.
+
+        A private backend opens its own checkpointer and store pools, so
+        request paths should always go through ``SessionAgentManager``, which
+        injects the lifespan-initialized backend.
+        """
+        if self._storage_backend is None:
+            self._storage_backend = create_storage_backend(self.settings)
+        return self._storage_backend
+
+    @storage_backend.setter
+    def storage_backend(self, backend: Any) -> None:
+        self._storage_backend = backend
+
     def _get_runtime_resolver(self) -> RuntimeResolver:
         if self._runtime_resolver is None:
             try:
@@ -156,6 +236,7 @@ class DeepAgentStreamingService:
         session: Any,
         project_path: str,
         system_prompt: str | None = None,
+        scope: dict[str, str] | None = None,
     ) -> tuple[ResolvedAgentConfig, list[Any]]:
         """Resolve agent definition fields and custom tools from ConfigStore.
 
@@ -192,13 +273,12 @@ class DeepAgentStreamingService:
         if "/skills/api/" not in resolved.skills:
             resolved.skills.append("/skills/api/")
 
-        all_defs = await cs.list_agent_definitions(include_hidden=True)
         workspace_base = str(self.settings.workspace_path)
-        resolved.subagents = [
-            s.to_subagent(base_path=workspace_base)
-            for s in all_defs
-            if s.name != agent_def.name
-        ]
+        spec_set = await get_subagent_spec_index().get_spec_set(
+            cs, primary_name=agent_def.name, base_path=workspace_base, scope=scope
+        )
+        resolved.subagents = list(spec_set.specs)
+        resolved.subagent_spec_hash = spec_set.spec_hash
 
         if agent_def.memory:
             resolved.memory = list(agent_def.memory)
@@ -216,152 +296,187 @@ class DeepAgentStreamingService:
             resolved.middleware = _resolve_middleware(agent_def.middleware)
 
         if agent_def.tools:
-            agent_def_tools = agent_def._resolve_tools(base_path=workspace_base)
+            # Tool files are imported and executed; keep that off the event loop.
+            agent_def_tools = await asyncio.to_thread(
+                agent_def._resolve_tools, base_path=workspace_base
+            )
             if agent_def_tools:
                 custom_tools = list(custom_tools) + agent_def_tools
 
         return resolved, custom_tools
 
-    async def stream_response(
+    async def prepare_agent(
         self,
+        session: Any,
         session_id: str,
-        thread_id: str,
         project_path: str,
-        content: str,
         system_prompt: str | None = None,
-        manager: SessionAgentManager | None = None,
         scope: dict[str, str] | None = None,
-    ) -> AsyncGenerator[StreamEvent, None]:
-        """Stream LLM response using DeepAgents with multi-step support."""
-        runtime: DeepAgentRuntime | None = None
-        try:
-            # Get session for config / agent_name resolution
-            session = await self.storage_backend.get_session(session_id)
+        record_fingerprint: bool = True,
+    ) -> PreparedAgent:
+        """Resolve config, model and tools, and build (or fetch) the agent graph.
 
+        Shared by streaming, resume and startup graph warmup. Records the
+        graph fingerprint in the warmup manifest when one is configured,
+        unless ``record_fingerprint`` is False (warmup itself is not a use).
+
+        Raises:
+            LLMProviderConfigError: If the provider is misconfigured.
+        """
+        with turn_phase("agent_config"):
             agent_cfg, custom_tools = await self._resolve_agent_config(
                 session=session,
                 project_path=project_path,
                 system_prompt=system_prompt,
+                scope=scope,
             )
 
+        with turn_phase("model_build"):
             model, provider, model_id, recursion_limit = await self._resolve_model(
                 session=session, scope=scope, agent_def=agent_cfg.agent_def
             )
 
-            # Get checkpointer from storage backend
-            checkpointer = await self.storage_backend.get_checkpointer()
+        # Get checkpointer from storage backend
+        checkpointer = await self.storage_backend.get_checkpointer()
 
-            # Load tools registered via POST /tools from ConfigStore.
+        # Load tools registered via POST /tools from ConfigStore.
+        with turn_phase("tool_build"):
             config_store_tools = await self._get_runtime_resolver().build_tools(
                 scope=scope, extra_tools=custom_tools if custom_tools else None
             )
-            if config_store_tools:
-                custom_tools = config_store_tools
+        if config_store_tools:
+            custom_tools = config_store_tools
 
-            store = await self.storage_backend.get_store()
+        store = await self.storage_backend.get_store()
 
-            from server.app.agent.cognition_agent import CognitionContext
+        from server.app.agent.cognition_agent import CognitionContext
 
-            invocation_context = CognitionContext.from_scope(
-                session.scopes if session and hasattr(session, "scopes") else scope
-            )
+        invocation_context = CognitionContext.from_scope(
+            session.scopes if session and hasattr(session, "scopes") else scope
+        )
 
+        with turn_phase("tool_build"):
             mcp_configs = await self._resolve_mcp_configs(scope=scope)
 
-            agent_params = CognitionAgentParams(
+        agent_params = CognitionAgentParams(
+            project_path=project_path,
+            model=model,
+            store=store,
+            checkpointer=checkpointer,
+            settings=self.settings,
+            tools=custom_tools if custom_tools else None,
+            system_prompt=agent_cfg.system_prompt,
+            skills=agent_cfg.skills if agent_cfg.skills else None,
+            subagents=agent_cfg.subagents,
+            subagent_spec_hash=agent_cfg.subagent_spec_hash,
+            memory=agent_cfg.memory,
+            interrupt_on=agent_cfg.interrupt_on,
+            response_format=(session.config.response_format if session and session.config else None)
+            or agent_cfg.response_format,
+            tool_token_limit_before_evict=agent_cfg.tool_token_limit_before_evict,
+            middleware=agent_cfg.middleware,
+            mcp_configs=mcp_configs or None,
+            scope=scope,
+            config_store=self._get_config_store(),
+        )
+        agent = await create_cognition_agent(agent_params)
+
+        manifest = get_graph_warmup_manifest()
+        fingerprint = getattr(agent, "fingerprint", None)
+        if record_fingerprint and manifest is not None and isinstance(fingerprint, str):
+            manifest.record(
+                fingerprint,
+                session_id=session_id,
                 project_path=project_path,
-                model=model,
-                store=store,
-                checkpointer=checkpointer,
-                settings=self.settings,
-                tools=custom_tools if custom_tools else None,
-                system_prompt=agent_cfg.system_prompt,
-                skills=agent_cfg.skills if agent_cfg.skills else None,
-                subagents=agent_cfg.subagents,
-                memory=agent_cfg.memory,
-                interrupt_on=agent_cfg.interrupt_on,
-                response_format=(
-                    session.config.response_format if session and session.config else None
-                )
-                or agent_cfg.response_format,
-                tool_token_limit_before_evict=agent_cfg.tool_token_limit_before_evict,
-                middleware=agent_cfg.middleware,
-                mcp_configs=mcp_configs or None,
                 scope=scope,
-                config_store=self._get_config_store(),
             )
-            agent = await create_cognition_agent(agent_params)
 
-            if manager and agent.sandbox_backend is not None:
-                manager.register_sandbox_backend(session_id, agent.sandbox_backend)
+        return PreparedAgent(
+            agent=agent,
+            checkpointer=checkpointer,
+            invocation_context=invocation_context,
+            provider=provider,
+            model_id=model_id,
+            recursion_limit=recursion_limit,
+        )
 
-            runtime = DeepAgentRuntime(
-                agent=agent.agent,
-                checkpointer=checkpointer,
-                thread_id=thread_id,
-                recursion_limit=recursion_limit,
-                context=invocation_context,
-            )
+    async def warm_graph(
+        self,
+        session_id: str,
+        project_path: str,
+        scope: dict[str, str] | None = None,
+    ) -> CognitionAgentResult | None:
+        """Compile the agent graph for a session ahead of its first message.
+
+        Returns:
+            The built agent, including the sandbox handle it acquired, or None
+            if the session no longer exists.
+        """
+        session = await self.storage_backend.get_session(session_id)
+        if session is None:
+            return None
+        prepared = await self.prepare_agent(
+            session=session,
+            session_id=session_id,
+            project_path=project_path,
+            scope=scope,
+            record_fingerprint=False,
+        )
+        return prepared.agent
+
+    async def stream_response(
+        self,
+        session_id: str,
+        thread_id: str,
+        project_path: str,
+        content: str,
+        system_prompt: str | None = None,
+        manager: SessionAgentManager | None = None,
+        scope: dict[str, str] | None = None,
+        timing: TurnTiming | None = None,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream LLM response using DeepAgents with multi-step support.
+
+        ``timing`` continues a turn timing started by the caller (e.g. the
+        route, to include request handling); a new one is started otherwise.
+        """
+        timing = timing or TurnTiming(session_id=session_id)
+        timing_token = set_turn_timing(timing)
+        bind_loop_context(session_id=session_id)
+        try:
+            # Provision the sandbox while config, model and graph are resolved;
+            # the agent built below picks up the same handle.
             if manager:
-                manager.register_runtime(session_id, runtime)
+                manager.preclaim_sandbox(session_id, project_path, scope)
+
+            # Get session for config / agent_name resolution
+            with timing.phase("session_load"):
+                session = await self.storage_backend.get_session(session_id)
 
+            prepared = await self.prepare_agent(
+                session=session,
+                session_id=session_id,
+                project_path=project_path,
+                system_prompt=system_prompt,
+                scope=scope,
+            )
             # Build message input (system prompt already embedded in agent graph)
             messages = self._build_messages(content, None)
 
-            acc = StreamAccumulator(input_tokens=len(content.split()))
-
-            try:
-                async for event in runtime.astream_events(
-                    {"messages": messages},
-                    thread_id=thread_id,
-                ):
-                    if isinstance(event, TokenEvent):
-                        acc.record_token(event.content)
-                        yield event
-
-                    elif isinstance(event, ToolCallEvent):
-                        acc.set_tool_call(event.tool_call_id)
-                        yield event
-
-                    elif isinstance(event, ToolResultEvent):
-                        acc.set_tool_call(None)
-                        yield event
-
-                    elif isinstance(event, PlanningEvent) or isinstance(
-                        event, (DelegationEvent, StatusEvent, StepCompleteEvent, InterruptEvent)
-                    ):
-                        yield event
-                        if isinstance(event, InterruptEvent):
-                            return
-
-                    elif isinstance(event, ErrorEvent):
-                        yield event
-                        if event.code == "ABORTED":
-                            return
-
-                    # DoneEvent from the runtime is absorbed here; we emit our own below.
-
-            except Exception as exc:
-                logger.error(
-                    "LangGraph execution failed during stream_response",
-                    error=str(exc),
-                    session_id=session_id,
-                    exc_info=True,
-                )
-                yield ErrorEvent(message=f"Agent execution failed: {exc}", code="STREAMING_ERROR")
-
-            finally:
-                if manager:
-                    manager.unregister_runtime(session_id)
-
-            yield UsageEvent(
-                input_tokens=acc.input_tokens,
-                output_tokens=acc.output_tokens,
-                estimated_cost=self._estimate_cost(acc.input_tokens, acc.output_tokens, provider),
-                provider=provider,
-                model=model_id,
-            )
-            yield DoneEvent()
+            async for event in self._run_turn(
+                prepared,
+                session_id=session_id,
+                project_path=project_path,
+                thread_id=thread_id,
+                manager=manager,
+                acc=StreamAccumulator(prompt=content),
+                timing=timing,
+                scope=scope,
+                start=lambda runtime: runtime.astream_events(
+                    {"messages": messages}, thread_id=thread_id
+                ),
+            ):
+                yield event
 
         except LLMProviderConfigError as e:
             logger.error(
@@ -373,6 +488,10 @@ class DeepAgentStreamingService:
         except Exception as e:
             logger.error("DeepAgents streaming error", error=str(e), session_id=session_id)
             yield ErrorEvent(message=str(e), code="STREAMING_ERROR")
+        finally:
+            # No-op when the turn ran to completion in _run_turn.
+            timing.finish("error")
+            reset_turn_timing(timing_token)
 
     async def resume_response(
         self,
@@ -383,120 +502,168 @@ class DeepAgentStreamingService:
         tool_name: str,
         args: dict[str, Any] | None = None,
         scope: dict[str, str] | None = None,
+        manager: SessionAgentManager | None = None,
     ) -> AsyncGenerator[StreamEvent, None]:
-        """Resume an interrupted Deep Agents run from persisted checkpoint state."""
+        """Resume an interrupted Deep Agents run from persisted checkpoint state.
+
+        Uses the same prepared graph and event pipeline as ``stream_response``,
+        so the resumed run can be aborted and may pause again on a further
+        interrupt.
+        """
+        timing = TurnTiming(session_id=session_id)
+        timing_token = set_turn_timing(timing)
+        bind_loop_context(session_id=session_id)
         try:
-            session = await self.storage_backend.get_session(session_id)
+            with timing.phase("session_load"):
+                session = await self.storage_backend.get_session(session_id)
             if session is None:
                 yield ErrorEvent(message=f"Session not found: {session_id}", code="NOT_FOUND")
                 return
 
-            agent_cfg, custom_tools = await self._resolve_agent_config(
+            prepared = await self.prepare_agent(
                 session=session,
+                session_id=session_id,
                 project_path=project_path,
+                scope=scope,
             )
 
-            model, provider, model_id, recursion_limit = await self._resolve_model(
-                session=session, scope=scope, agent_def=agent_cfg.agent_def
-            )
-            checkpointer = await self.storage_backend.get_checkpointer()
-            config_store_tools = await self._get_runtime_resolver().build_tools(
-                scope=scope, extra_tools=custom_tools if custom_tools else None
+            async for event in self._run_turn(
+                prepared,
+                session_id=session_id,
+                project_path=project_path,
+                thread_id=thread_id,
+                manager=manager,
+                acc=StreamAccumulator(),
+                timing=timing,
+                scope=scope,
+                start=lambda runtime: runtime.astream_resume_events(
+                    decision=decision,
+                    tool_name=tool_name,
+                    args=args,
+                    thread_id=thread_id,
+                ),
+            ):
+                yield event
+
+        except LLMProviderConfigError as e:
+            logger.error(
+                "Provider configuration error on resume", error=str(e), session_id=session_id
             )
-            if config_store_tools:
-                custom_tools = config_store_tools
-            store = await self.storage_backend.get_store()
+            yield ErrorEvent(message=str(e), code="PROVIDER_CONFIG_ERROR")
+        except Exception as e:
+            logger.error("DeepAgents resume error", error=str(e), session_id=session_id)
+            yield ErrorEvent(message=str(e), code="RESUME_ERROR")
+        finally:
+            timing.finish("error")
+            reset_turn_timing(timing_token)
 
-            from server.app.agent.cognition_agent import CognitionContext
+    async def _run_turn(
+        self,
+        prepared: PreparedAgent,
+        session_id: str,
+        project_path: str,
+        thread_id: str,
+        manager: SessionAgentManager | None,
+        acc: StreamAccumulator,
+        start: Callable[[DeepAgentRuntime], AsyncIterator[Any]],
+        scope: dict[str, str] | None = None,
+        timing: TurnTiming | None = None,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Run one agent turn and relay its events.
+
+        Registers the runtime (for abort) and sandbox backend with ``manager``,
+        registering the session again if it was evicted while the agent was
+        being prepared, then yields runtime events followed by a single priced ``UsageEvent``
+        and ``DoneEvent``. Stops early, without usage/done, when the run pauses
+        on an interrupt or is aborted. The turn's usage is written to the usage
+        ledger in every case, since those tokens were spent either way.
+        ``timing`` is finished here, and its summary rides on ``DoneEvent``.
+        """
+        timing = timing or TurnTiming(session_id=session_id)
+        timing.provider, timing.model = prepared.provider, prepared.model_id
+        agent = prepared.agent
+        if manager:
+            # Eviction only looks at live sessions; without this the backend
+            # and runtime below would be tracked for a session nothing sweeps.
+            manager.get_or_register(session_id, project_path)
+            if agent.sandbox_backend is not None:
+                manager.register_sandbox_backend(session_id, agent.sandbox_backend)
 
-            invocation_context = CognitionContext.from_scope(
-                session.scopes if hasattr(session, "scopes") else scope
-            )
-            mcp_configs = await self._resolve_mcp_configs(scope=scope)
+        runtime = DeepAgentRuntime(
+            agent=agent.agent,
+            checkpointer=prepared.checkpointer,
+            thread_id=thread_id,
+            recursion_limit=prepared.recursion_limit,
+            context=prepared.invocation_context,
+        )
+        if manager:
+            manager.register_runtime(session_id, runtime)
 
-            agent_params = CognitionAgentParams(
-                project_path=project_path,
-                model=model,
-                store=store,
-                checkpointer=checkpointer,
-                settings=self.settings,
-                tools=custom_tools if custom_tools else None,
-                system_prompt=agent_cfg.system_prompt,
-                skills=agent_cfg.skills if agent_cfg.skills else None,
-                subagents=agent_cfg.subagents,
-                memory=agent_cfg.memory,
-                interrupt_on=agent_cfg.interrupt_on,
-                response_format=(session.config.response_format if session.config else None)
-                or agent_cfg.response_format,
-                tool_token_limit_before_evict=agent_cfg.tool_token_limit_before_evict,
-                middleware=agent_cfg.middleware,
-                mcp_configs=mcp_configs or None,
-                scope=scope,
-                config_store=self._get_config_store(),
-            )
-            agent = await create_cognition_agent(agent_params)
-
-            resume_decision: dict[str, Any] = {"type": decision}
-            if decision == "edit":
-                resume_decision["edited_action"] = {
-                    "name": tool_name,
-                    "args": args or {},
-                }
-
-            runtime = DeepAgentRuntime(
-                agent=agent.agent,
-                checkpointer=checkpointer,
-                thread_id=thread_id,
-                recursion_limit=recursion_limit,
-                context=invocation_context,
-            )
+        stopped = False
+        status = "done"
+        try:
+            async for event in start(runtime):
+                if isinstance(event, UsageEvent):
+                    acc.record_usage(event, prepared.model_id)
 
-            acc = StreamAccumulator(input_tokens=0)
-            async for event in runtime.astream_resume_events(
-                decision=decision,
-                tool_name=tool_name,
-                args=args,
-                thread_id=thread_id,
-            ):
-                if isinstance(event, TokenEvent):
+                elif isinstance(event, TokenEvent):
+                    timing.mark_token()
                     acc.record_token(event.content)
-                if isinstance(event, InterruptEvent):
-                    continue
-                if isinstance(event, DoneEvent):
-                    continue
-                if isinstance(
+                    yield event
+
+                elif isinstance(event, ToolCallEvent):
+                    acc.set_tool_call(event.tool_call_id)
+                    yield event
+
+                elif isinstance(event, ToolResultEvent):
+                    acc.set_tool_call(None)
+                    yield event
+
+                elif isinstance(
                     event,
                     (
-                        TokenEvent,
-                        ToolCallEvent,
-                        ToolResultEvent,
-                        StatusEvent,
-                        ErrorEvent,
-                        UsageEvent,
                         PlanningEvent,
-                        StepCompleteEvent,
                         DelegationEvent,
+                        StatusEvent,
+                        StepCompleteEvent,
+                        InterruptEvent,
                     ),
                 ):
-                    yield cast(StreamEvent, event)
-
-            yield UsageEvent(
-                input_tokens=0,
-                output_tokens=acc.output_tokens,
-                estimated_cost=self._estimate_cost(0, acc.output_tokens, provider),
-                provider=provider,
-                model=model_id,
-            )
-            yield DoneEvent()
+                    yield event
+                    if isinstance(event, InterruptEvent):
+                        stopped, status = True, "interrupted"
+                        break
 
-        except LLMProviderConfigError as e:
+                elif isinstance(event, ErrorEvent):
+                    status = "error"
+                    yield event
+                    if event.code == "ABORTED":
+                        stopped, status = True, "aborted"
+                        break
+
+                # DoneEvent from the runtime is absorbed here; we emit our own below.
+
+        except Exception as exc:
             logger.error(
-                "Provider configuration error on resume", error=str(e), session_id=session_id
+                "LangGraph execution failed during agent turn",
+                error=str(exc),
+                session_id=session_id,
+                exc_info=True,
             )
-            yield ErrorEvent(message=str(e), code="PROVIDER_CONFIG_ERROR")
-        except Exception as e:
-            logger.error("DeepAgents resume error", error=str(e), session_id=session_id)
-            yield ErrorEvent(message=str(e), code="RESUME_ERROR")
+            status = "error"
+            yield ErrorEvent(message=f"Agent execution failed: {exc}", code="STREAMING_ERROR")
+
+        finally:
+            if manager:
+                manager.unregister_runtime(session_id)
+
+        usage_event = self._price_usage(prepared, acc)
+        await self._record_usage(session_id, scope, usage_event)
+        summary = timing.finish(status)
+        if stopped:
+            return
+        yield usage_event
+        yield DoneEvent(timing=summary)
 
     async def rebuild_message_projection(
         self,
@@ -561,25 +728,80 @@ class DeepAgentStreamingService:
         messages.append(HumanMessage(content=user_content))
         return messages
 
-    def _estimate_cost(
-        self,
-        input_tokens: int,
-        output_tokens: int,
-        provider: str,
-    ) -> float:
-        """Estimate cost based on provider pricing (rough approximation)."""
-        pricing: dict[str, dict[str, float]] = {
-            "openai": {"input": 0.0025, "output": 0.01},
-            "anthropic": {"input": 0.003, "output": 0.015},
-            "bedrock": {"input": 0.003, "output": 0.015},
-            "openai_compatible": {"input": 0.001, "output": 0.002},
-            "google_genai": {"input": 0.0005, "output": 0.0015},
-            "google_vertexai": {"input": 0.0005, "output": 0.0015},
-        }
-        rates = pricing.get(provider, pricing["openai"])
-        input_cost = (input_tokens / 1000) * rates["input"]
-        output_cost = (output_tokens / 1000) * rates["output"]
-        return round(input_cost + output_cost, 6)
+    def _price_usage(self, prepared: PreparedAgent, acc: StreamAccumulator) -> UsageEvent:
+        """Total the turn's usage and price it from the cached model catalog.
+
+        Falls back to a character-based estimate, flagged ``estimated``, when
+        the provider reported no usage (e.g. the mock provider).
+        """
+        totals = TokenUsage()
+        cost = 0.0
+        catalog = get_model_catalog()
+        for model_id, usage in acc.usage.items():
+            totals.add(usage)
+            cost += price_usage(usage, catalog.lookup(prepared.provider, model_id))
+
+        estimated = totals.is_empty
+        if estimated:
+            totals = TokenUsage(
+                input_tokens=estimate_tokens(acc.prompt),
+                output_tokens=estimate_tokens(acc.accumulated_content),
+            )
+            cost = price_usage(totals, catalog.lookup(prepared.provider, prepared.model_id))
+
+        return UsageEvent(
+            input_tokens=totals.input_tokens,
+            output_tokens=totals.output_tokens,
+            estimated_cost=round(cost, 6),
+            provider=prepared.provider,
+            model=prepared.model_id,
+            cache_read_tokens=totals.cache_read_tokens,
+            cache_write_tokens=totals.cache_write_tokens,
+            model_calls=totals.model_calls,
+            estimated=estimated,
+        )
+
+    async def _record_usage(
+        self, session_id: str, scope: dict[str, str] | None, event: UsageEvent
+    ) -> None:
+        """Append the turn to the usage ledger. Failures are logged, not raised."""
+        if event.input_tokens + event.output_tokens == 0:
+            return
+        try:
+            await get_usage_ledger().record(
+                UsageRecord(
+                    session_id=session_id,
+                    scope=scope_key(scope or {}),
+                    provider=event.provider,
+                    model=event.model,
+                    usage=TokenUsage(
+                        input_tokens=event.input_tokens,
+                        output_tokens=event.output_tokens,
+                        cache_read_tokens=event.cache_read_tokens,
+                        cache_write_tokens=event.cache_write_tokens,
+                        model_calls=event.model_calls,
+                    ),
+                    cost=event.estimated_cost,
+                    estimated=event.estimated,
+                )
+            )
+        except Exception as e:
+            logger.warning("Failed to record turn usage", error=str(e), session_id=session_id)
+
+
+@dataclass(frozen=True)
+class SessionAgentStats:
+    """Point-in-time counts for ``SessionAgentManager``.
+
+    ``live`` sessions hold a cached service; ``active`` ones are mid-turn and
+    the rest are ``idle``. ``evicted`` is cumulative since startup.
+    """
+
+    live: int
+    active: int
+    idle: int
+    sandboxes: int
+    evicted: int
 
 
 class SessionAgentManager:
@@ -587,6 +809,12 @@ class SessionAgentManager:
 
     Creates and caches agent services for each session.
     Tracks active streaming operations for abort functionality.
+
+    The cache is bounded: sessions idle for longer than
+    ``agent_session_idle_ttl_seconds`` are evicted by ``sweep()``, and
+    registering beyond ``agent_session_max_live`` evicts the least recently
+    used idle sessions. Sessions with a turn in flight are never evicted.
+    Evicting a session terminates its sandbox backend off the event loop.
     """
 
     def __init__(
@@ -595,6 +823,7 @@ class SessionAgentManager:
         storage_backend: Any | None = None,
         runtime_resolver: RuntimeResolver | None = None,
         config_store: ConfigStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         """Initialize the session manager.
 
@@ -603,15 +832,36 @@ class SessionAgentManager:
             storage_backend: Initialized storage backend shared with the app lifespan.
             runtime_resolver: Shared runtime resolver instance.
             config_store: Shared config store instance.
+            clock: Monotonic time source used for idle tracking.
         """
         self.settings = settings
         self._storage_backend = storage_backend
         self._runtime_resolver = runtime_resolver
         self._config_store = config_store
-        self._services: dict[str, DeepAgentStreamingService] = {}
+        self._clock = clock
+        self._idle_ttl = settings.agent_session_idle_ttl_seconds
+        self._max_live = settings.agent_session_max_live
+        # Ordered least to most recently used.
+        self._services: OrderedDict[str, DeepAgentStreamingService] = OrderedDict()
+        self._last_used: dict[str, float] = {}
         self._project_paths: dict[str, str] = {}
         self._active_runtimes: dict[str, Any] = {}
         self._sandbox_backends: dict[str, Any] = {}
+        self._terminations: set[asyncio.Task[None]] = set()
+        self._evicted = 0
+
+    def _touch(self, session_id: str) -> None:
+        if session_id in self._services:
+            self._services.move_to_end(session_id)
+            self._last_used[session_id] = self._clock()
+
+    def _new_service(self) -> DeepAgentStreamingService:
+        return DeepAgentStreamingService(
+            settings=self.settings,
+            runtime_resolver=self._runtime_resolver,
+            config_store=self._config_store,
+            storage_backend=self._storage_backend,
+        )
 
     def register_session(
         self,
@@ -627,25 +877,79 @@ class SessionAgentManager:
         Returns:
             Configured DeepAgentStreamingService for the session.
         """
-        service = DeepAgentStreamingService(
-            settings=self.settings,
-            runtime_resolver=self._runtime_resolver,
-            config_store=self._config_store,
-        )
-        if self._storage_backend is not None:
-            service.storage_backend = self._storage_backend
+        service = self._new_service()
         self._services[session_id] = service
         self._project_paths[session_id] = project_path
+        self._touch(session_id)
         logger.info(
             "Session registered with DeepAgents",
             session_id=session_id,
             project_path=project_path,
         )
+        self._enforce_max_live(keep=session_id)
         return service
 
     def get_service(self, session_id: str) -> DeepAgentStreamingService | None:
         """Get the agent service for a session."""
-        return self._services.get(session_id)
+        service = self._services.get(session_id)
+        if service is not None:
+            self._touch(session_id)
+        return service
+
+    def get_or_register(self, session_id: str, project_path: str) -> DeepAgentStreamingService:
+        """Return the session's service, registering the session if needed."""
+        return self.get_service(session_id) or self.register_session(session_id, project_path)
+
+    async def warm_graph(
+        self,
+        session_id: str,
+        project_path: str,
+        scope: dict[str, str] | None = None,
+    ) -> str | None:
+        """Precompile the agent graph for a session (used by startup warmup).
+
+        The session is not registered: warmup runs for sessions recorded by
+        earlier processes, most of which may never return. The graph stays in
+        the agent cache with the (not yet provisioned) sandbox handle it was
+        built on, and the session picks both up from the registry on its next
+        turn, which registers it as usual.
+        """
+        service = self._services.get(session_id) or self._new_service()
+        agent = await service.warm_graph(session_id, project_path, scope)
+        return agent.fingerprint if agent is not None else None
+
+    def preclaim_sandbox(
+        self,
+        session_id: str,
+        project_path: str,
+        scope: dict[str, str] | None = None,
+    ) -> asyncio.Task[Any] | None:
+        """Start claiming the session's sandbox ahead of its first message.
+
+        The claimed backend is registered with the session so it is terminated
+        if the session is deleted or evicted before it is ever used.
+        """
+        task = start_sandbox_preclaim(project_path, self.settings, scope)
+        if task is None:
+            return None
+
+        def _register(done: asyncio.Task[Any]) -> None:
+            if done.cancelled() or done.result() is None:
+                return
+            backend = done.result()
+            if session_id in self._services:
+                self.register_sandbox_backend(session_id, backend)
+                return
+            # The session went away while the claim was in flight. Nothing
+            # else owns the handle unless another live session shares it.
+            if any(b is backend for b in self._sandbox_backends.values()):
+                return
+            get_sandbox_registry().discard(backend)
+            if hasattr(backend, "terminate"):
+                self._schedule_termination(session_id, backend)
+
+        task.add_done_callback(_register)
+        return task
 
     def get_project_path(self, session_id: str) -> str | None:
         """Get the project path for a session."""
@@ -658,11 +962,14 @@ class SessionAgentManager:
     def register_runtime(self, session_id: str, runtime: Any) -> None:
         """Register an active runtime for abort tracking."""
         self._active_runtimes[session_id] = runtime
+        self._touch(session_id)
         logger.debug("Runtime registered for abort tracking", session_id=session_id)
 
     def unregister_runtime(self, session_id: str) -> None:
         """Unregister a runtime when streaming completes."""
         self._active_runtimes.pop(session_id, None)
+        # Idle time counts from the end of the turn, not its start.
+        self._touch(session_id)
         logger.debug("Runtime unregistered", session_id=session_id)
 
     async def abort_session(self, session_id: str, thread_id: str | None = None) -> bool:
@@ -683,32 +990,155 @@ class SessionAgentManager:
         """Register a sandbox backend for lifecycle tracking.
 
         The backend's ``terminate()`` method will be called when the session
-        is unregistered, cleaning up any K8s Sandbox CRs or Docker containers.
+        is unregistered or evicted, cleaning up any K8s Sandbox CRs or Docker
+        containers.
 
         Args:
             session_id: Unique session identifier.
             backend: The sandbox backend instance (must have a ``terminate()`` method).
         """
+        previous = self._sandbox_backends.get(session_id)
         self._sandbox_backends[session_id] = backend
         logger.debug("Sandbox backend registered", session_id=session_id)
+        # A session only gets a new handle after its old one was discarded
+        # from the registry; nothing else terminates the old one.
+        if (
+            previous is not None
+            and previous is not backend
+            and not any(b is previous for b in self._sandbox_backends.values())
+        ):
+            invalidate_agent_cache_for_sandbox(previous)
+            if hasattr(previous, "terminate"):
+                self._schedule_termination(session_id, previous)
 
     def unregister_session(self, session_id: str) -> None:
-        """Unregister a session and clean up resources."""
+        """Unregister a session and clean up resources.
+
+        The sandbox backend is terminated in a worker thread when called from
+        the event loop, so a slow Docker or Kubernetes API call does not block
+        other requests.
+        """
         self._services.pop(session_id, None)
-        self._project_paths.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+        project_path = self._project_paths.pop(session_id, None)
         self._active_runtimes.pop(session_id, None)
+        if project_path is not None and project_path not in self._project_paths.values():
+            invalidate_agent_cache_for_workspace(project_path)
 
         backend = self._sandbox_backends.pop(session_id, None)
-        if backend is not None and hasattr(backend, "terminate"):
+        if backend is not None:
+            get_sandbox_registry().discard(backend)
+            invalidate_agent_cache_for_sandbox(backend)
+            if hasattr(backend, "terminate"):
+                self._schedule_termination(session_id, backend)
+
+        logger.info("Session unregistered", session_id=session_id)
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        self.unregister_session(session_id)
+        self._evicted += 1
+        AGENT_SESSION_EVICTIONS.labels(reason=reason).inc()
+        logger.info("Session evicted", session_id=session_id, reason=reason)
+
+    def _enforce_max_live(self, keep: str) -> None:
+        if self._max_live <= 0:
+            return
+        overflow = len(self._services) - self._max_live
+        if overflow <= 0:
+            return
+        # Least recently used first; sessions mid-turn are skipped.
+        victims = [
+            sid for sid in self._services if sid != keep and sid not in self._active_runtimes
+        ][:overflow]
+        for session_id in victims:
+            self._evict(session_id, "max_live")
+        self._report()
+
+    def sweep(self) -> int:
+        """Evict sessions idle for longer than the configured TTL.
+
+        Returns:
+            Number of sessions evicted.
+        """
+        if self._idle_ttl <= 0:
+            self._report()
+            return 0
+        cutoff = self._clock() - self._idle_ttl
+        expired = [
+            sid
+            for sid in self._services
+            if sid not in self._active_runtimes and self._last_used.get(sid, 0.0) <= cutoff
+        ]
+        for session_id in expired:
+            self._evict(session_id, "idle_ttl")
+        self._report()
+        return len(expired)
+
+    async def run_sweeper(self, interval_seconds: float) -> None:
+        """Call ``sweep()`` every ``interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
             try:
-                backend.terminate()
-                logger.info("Sandbox backend terminated", session_id=session_id)
+                evicted = self.sweep()
+                if evicted:
+                    stats = self.stats()
+                    logger.info(
+                        "Idle agent sessions evicted",
+                        evicted=evicted,
+                        live=stats.live,
+                        idle=stats.idle,
+                    )
             except Exception as e:
-                logger.warning(
-                    "Sandbox backend terminate failed", session_id=session_id, error=str(e)
-                )
+                logger.warning("Agent session sweep failed", error=str(e))
+
+    def stats(self) -> SessionAgentStats:
+        """Return live, active, idle and evicted session counts."""
+        live = len(self._services)
+        active = sum(1 for sid in self._active_runtimes if sid in self._services)
+        return SessionAgentStats(
+            live=live,
+            active=active,
+            idle=live - active,
+            sandboxes=len(self._sandbox_backends),
+            evicted=self._evicted,
+        )
 
-        logger.info("Session unregistered", session_id=session_id)
+    def _report(self) -> None:
+        stats = self.stats()
+        AGENT_SESSIONS.labels(state="active").set(stats.active)
+        AGENT_SESSIONS.labels(state="idle").set(stats.idle)
+
+    def _schedule_termination(self, session_id: str, backend: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _terminate_sandbox(session_id, backend)
+            return
+        task = loop.create_task(asyncio.to_thread(_terminate_sandbox, session_id, backend))
+        self._terminations.add(task)
+        task.add_done_callback(self._terminations.discard)
+
+    async def aclose(self) -> None:
+        """Unregister every session and wait for sandbox termination to finish."""
+        for session_id in list(self._services):
+            self.unregister_session(session_id)
+        for session_id, backend in list(self._sandbox_backends.items()):
+            self._sandbox_backends.pop(session_id, None)
+            get_sandbox_registry().discard(backend)
+            invalidate_agent_cache_for_sandbox(backend)
+            if hasattr(backend, "terminate"):
+                self._schedule_termination(session_id, backend)
+        if self._terminations:
+            await asyncio.gather(*self._terminations, return_exceptions=True)
+        self._report()
+
+
+def _terminate_sandbox(session_id: str, backend: Any) -> None:
+    try:
+        backend.terminate()
+        logger.info("Sandbox backend terminated", session_id=session_id)
+    except Exception as e:
+        logger.warning("Sandbox backend terminate failed", session_id=session_id, error=str(e))
 
 
 # Global manager instance
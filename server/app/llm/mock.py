@@ -1,10 +1,21 @@
-"""Mock LLM for testing."""
+"""Mock LLMs.
+
+``MockLLM`` is the fixture model used by tests. ``ScriptedMockLLM`` backs
+the ``scripted_mock`` provider: a configurable offline model for load tests.
+"""
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, Sequence
-from typing import Any
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from typing import Any, Literal
 
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import (
     AIMessage,
@@ -12,7 +23,15 @@ from langchain_core.messages import (
     BaseMessage,
     HumanMessage,
     SystemMessage,
+    ToolCallChunk,
+    message_chunk_to_message,
 )
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from server.app.exceptions import LLMRateLimitError, LLMUnavailableError
 
 
 class MockLLM(BaseChatModel):
@@ -225,3 +244,317 @@ class MockLLM(BaseChatModel):
 
         # Yield final empty chunk to signal completion
         yield AIMessageChunk(content="")
+
+
+# ---------------------------------------------------------------------------
+# Scripted mock provider (provider type "scripted_mock")
+# ---------------------------------------------------------------------------
+
+_FILLER_WORDS = [
+    "the",
+    "agent",
+    "reads",
+    "the",
+    "workspace",
+    "and",
+    "checks",
+    "each",
+    "result",
+    "before",
+    "it",
+    "reports",
+    "what",
+    "changed",
+    "in",
+    "the",
+    "code",
+    "along",
+    "with",
+    "tests",
+    "logs",
+    "and",
+    "next",
+    "steps",
+    "for",
+    "review",
+]
+
+
+class Distribution(BaseModel):
+    """A random variable used for latencies and lengths.
+
+    A bare number is shorthand for a constant. Samples are clamped to
+    ``[min, max]`` when given, and never go below zero.
+
+    Attributes:
+        distribution: Shape of the distribution.
+        mean: Mean (or the value, for ``constant``). For ``lognormal`` this
+            is the mean of the samples themselves, not of their logarithm.
+        stddev: Standard deviation for ``normal`` and ``lognormal``.
+        min: Lower bound; also the lower end of ``uniform``.
+        max: Upper bound; also the upper end of ``uniform``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    distribution: Literal["constant", "uniform", "normal", "lognormal", "exponential"] = "constant"
+    mean: float = Field(default=0.0, ge=0)
+    stddev: float = Field(default=0.0, ge=0)
+    min: float | None = Field(default=None, ge=0)
+    max: float | None = Field(default=None, ge=0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_number(cls, value: Any) -> Any:
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            return {"mean": value}
+        return value
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> Distribution:
+        if self.distribution == "uniform" and (self.min is None or self.max is None):
+            raise ValueError("uniform distributions require min and max")
+        if self.min is not None and self.max is not None and self.min > self.max:
+            raise ValueError("min must not exceed max")
+        return self
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        match self.distribution:
+            case "constant":
+                value = self.mean
+            case "uniform":
+                value = rng.uniform(self.min or 0.0, self.max or 0.0)
+            case "normal":
+                value = rng.gauss(self.mean, self.stddev)
+            case "lognormal":
+                if self.mean <= 0:
+                    value = 0.0
+                else:
+                    sigma2 = math.log1p((self.stddev / self.mean) ** 2)
+                    value = rng.lognormvariate(math.log(self.mean) - sigma2 / 2, sigma2**0.5)
+            case "exponential":
+                value = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        if self.min is not None:
+            value = max(value, self.min)
+        if self.max is not None:
+            value = min(value, self.max)
+        return max(value, 0.0)
+
+
+class ScriptedToolCall(BaseModel):
+    """A tool call the scripted model emits verbatim."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(..., min_length=1)
+    args: dict[str, Any] = Field(default_factory=dict)
+
+
+class ScriptStep(BaseModel):
+    """What the scripted model does on one model call of a turn.
+
+    Attributes:
+        text: Reply text to stream. Generated filler of ``response_tokens``
+            length is streamed when omitted.
+        tool_calls: Tool calls emitted after the text, all in the same
+            message, so several calls run in parallel. Delegate to a
+            subagent with the ``task`` tool.
+        response_tokens: Length override for generated text.
+        stall_ms: Pause before the first token, on top of time-to-first-token.
+        error: Fail this call with this message instead of answering.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    text: str | None = None
+    tool_calls: list[ScriptedToolCall] = Field(default_factory=list)
+    response_tokens: Distribution | None = None
+    stall_ms: float = Field(default=0.0, ge=0)
+    error: str | None = None
+
+
+class LatencyProfile(BaseModel):
+    """Streaming shape of the scripted mock provider.
+
+    Read from ``ProviderConfig.extra``. Every model call picks its step by
+    position in the current turn: the first call after the user's message
+    runs ``script[0]``, the call after its tool results runs ``script[1]``
+    and so on; once the script is exhausted the model gives a plain text
+    answer. When the script delegates with the ``task`` tool, subagents
+    (whose calls have no ``task`` tool bound) follow ``subagent_script``
+    instead. Each call draws from its own random stream, so concurrent
+    sessions sending the same messages do not stream in lockstep. With
+    ``deterministic`` set, draws are seeded from ``seed`` and the
+    conversation only, so a replayed conversation streams identically.
+
+    Attributes:
+        seed: Seed for every random draw.
+        deterministic: Replay the same draws for the same conversation.
+        ttft_ms: Time to first token.
+        inter_token_ms: Delay between streamed chunks.
+        response_tokens: Length of generated replies, in tokens.
+        chunk_tokens: Tokens per streamed chunk.
+        script: Steps of the main agent's turn.
+        subagent_script: Steps of a subagent's run.
+        error_rate: Probability that a call fails with ``error_kind``.
+        error_kind: Error raised for injected failures.
+        error_after_tokens: Tokens streamed before an injected failure.
+        stall_rate: Probability that a call stalls mid-stream.
+        stall_ms: Length of an injected stall.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    seed: int = 0
+    deterministic: bool = False
+    ttft_ms: Distribution = Field(default_factory=Distribution)
+    inter_token_ms: Distribution = Field(default_factory=Distribution)
+    response_tokens: Distribution = Field(default_factory=lambda: Distribution(mean=50))
+    chunk_tokens: int = Field(default=1, ge=1)
+    script: list[ScriptStep] = Field(default_factory=list)
+    subagent_script: list[ScriptStep] = Field(default_factory=list)
+    error_rate: float = Field(default=0.0, ge=0, le=1)
+    error_kind: Literal["unavailable", "rate_limit"] = "unavailable"
+    error_after_tokens: int = Field(default=0, ge=0)
+    stall_rate: float = Field(default=0.0, ge=0, le=1)
+    stall_ms: Distribution = Field(default_factory=lambda: Distribution(mean=5000))
+
+
+# Per-call entropy for non-deterministic profiles called without a run manager.
+_call_ids = itertools.count()
+
+
+class ScriptedMockLLM(BaseChatModel):
+    """Offline chat model that streams according to a :class:`LatencyProfile`.
+
+    Unlike :class:`MockLLM` it is a regular provider (``scripted_mock``)
+    selectable through ``ProviderConfig``, so load tests can reproduce
+    production streaming shapes and measure server overhead without a real
+    provider's latency. It reports ``usage_metadata`` (about four characters
+    per input token) so usage accounting runs as it would in production.
+    """
+
+    latency_profile: LatencyProfile = Field(default_factory=LatencyProfile)
+    model_name: str = "scripted-mock"
+    bound_tools: tuple[str, ...] = ()
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted_mock"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Any:
+        """Record the bound tool names; scripted calls are emitted regardless."""
+        names = tuple(convert_to_openai_tool(tool)["function"]["name"] for tool in tools)
+        return self.model_copy(update={"bound_tools": names})
+
+    def _generate(self, *args: Any, **kwargs: Any) -> ChatResult:
+        raise NotImplementedError("ScriptedMockLLM is async-only")
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        chunks = [c async for c in self._astream(messages, stop, run_manager, **kwargs)]
+        message = chunks[0].message
+        for chunk in chunks[1:]:
+            message += chunk.message
+        ai_message = message_chunk_to_message(message)
+        return ChatResult(generations=[ChatGeneration(message=ai_message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        profile = self.latency_profile
+        rng_seed = f"{profile.seed}:{len(messages)}:{messages[-1].text if messages else ''}"
+        if not profile.deterministic:
+            call_id = run_manager.run_id if run_manager else next(_call_ids)
+            rng_seed = f"{rng_seed}:{call_id}"
+        rng = random.Random(rng_seed)
+        step = self._select_step(messages)
+
+        delay_ms = profile.ttft_ms.sample(rng) + step.stall_ms
+        await asyncio.sleep(delay_ms / 1000)
+        if step.error is not None:
+            raise LLMUnavailableError(provider="scripted_mock", reason=step.error)
+
+        if step.text is not None:
+            tokens = re.findall(r"\S+\s*", step.text)
+        elif step.tool_calls:
+            tokens = []
+        else:
+            length = int((step.response_tokens or profile.response_tokens).sample(rng))
+            words = [rng.choice(_FILLER_WORDS) for _ in range(length)]
+            tokens = [w + " " for w in words[:-1]] + words[-1:]
+
+        fail_at = len(tokens) + 1
+        if rng.random() < profile.error_rate:
+            fail_at = min(profile.error_after_tokens, len(tokens))
+        stall_at = rng.randrange(len(tokens) + 1) if rng.random() < profile.stall_rate else -1
+
+        for start in range(0, max(len(tokens), 1), profile.chunk_tokens):
+            if start >= fail_at:
+                self._raise_injected_error()
+            if stall_at >= 0 and start <= stall_at < start + profile.chunk_tokens:
+                await asyncio.sleep(profile.stall_ms.sample(rng) / 1000)
+            if start:
+                await asyncio.sleep(profile.inter_token_ms.sample(rng) / 1000)
+            text = "".join(tokens[start : start + profile.chunk_tokens])
+            if not text:
+                continue
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+        if fail_at <= len(tokens):
+            self._raise_injected_error()
+
+        tool_call_chunks: list[ToolCallChunk] = [
+            tool_call_chunk(
+                name=call.name,
+                args=json.dumps(call.args),
+                id=f"call_{profile.seed}_{len(messages)}_{index}",
+                index=index,
+            )
+            for index, call in enumerate(step.tool_calls)
+        ]
+        input_tokens = sum(len(m.text) for m in messages) // 4
+        output_tokens = len(tokens) + sum(len(c["args"] or "") // 4 for c in tool_call_chunks)
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                tool_call_chunks=tool_call_chunks,
+                usage_metadata={
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                },
+                response_metadata={"model_name": self.model_name},
+            )
+        )
+
+    def _select_step(self, messages: list[BaseMessage]) -> ScriptStep:
+        script = self.latency_profile.script
+        delegates = any(call.name == "task" for step in script for call in step.tool_calls)
+        if delegates and "task" not in self.bound_tools:
+            # Subagents are built without the task tool.
+            script = self.latency_profile.subagent_script
+        index = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, AIMessage):
+                index += 1
+        return script[index] if index < len(script) else ScriptStep()
+
+    def _raise_injected_error(self) -> None:
+        if self.latency_profile.error_kind == "rate_limit":
+            raise LLMRateLimitError(provider="scripted_mock")
+        raise LLMUnavailableError(provider="scripted_mock", reason="Injected failure")
@@ -5,16 +5,21 @@ providing model metadata (context windows, tool call support, pricing,
 modalities) for enrichment of API responses and validation warnings.
 
 The catalog is **enrichment only** — it never blocks model execution.
-If the catalog is unreachable, endpoints degrade gracefully (return
-empty lists or skip enrichment).
+If the catalog is unreachable, endpoints degrade gracefully (serve the
+last on-disk snapshot, return empty lists or skip enrichment).
 
 Architecture: Layer 5 (LLM Provider) — read-only data service.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 import httpx
@@ -37,6 +42,7 @@ PROVIDER_TYPE_TO_CATALOG_SLUGS: dict[str, list[str]] = {
     # catalog provider to map to, so we return an empty list.
     "openai_compatible": [],
     "mock": [],
+    "scripted_mock": [],
 }
 
 
@@ -62,7 +68,8 @@ class CatalogModel:
     """A model entry from the models.dev catalog.
 
     All fields come directly from the catalog JSON. Costs are per-million
-    tokens. Context/output limits are in tokens.
+    tokens; cache costs are None when the catalog doesn't list them.
+    Context/output limits are in tokens.
     """
 
     id: str
@@ -78,35 +85,210 @@ class CatalogModel:
     modalities: dict[str, list[str]] = field(default_factory=dict)
     structured_output: bool | None = None
     status: str | None = None
+    cache_read_cost: float | None = None
+    cache_write_cost: float | None = None
 
 
 # ---------------------------------------------------------------------------
-# ModelCatalog — in-memory cache with TTL
+# CatalogIndex — immutable parsed catalog with a search index
 # ---------------------------------------------------------------------------
 
+# Length of the character n-grams indexed for substring search.
+_NGRAM = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """A parsed catalog plus the lookup structures used to filter it.
+
+    Built once per fetch and swapped in as a whole, so readers never see a
+    half-updated catalog. Models are numbered in catalog order; each
+    provider's models occupy a contiguous ordinal range, and the search
+    index maps every trigram of a model's lowercased ID and name to the
+    ordinals containing it.
+    """
+
+    models: list[CatalogModel] = field(default_factory=list)
+    by_provider: dict[str, list[CatalogModel]] = field(default_factory=dict)
+    by_key: dict[str, CatalogModel] = field(default_factory=dict)
+    provider_names: dict[str, str] = field(default_factory=dict)
+    provider_ranges: dict[str, range] = field(default_factory=dict)
+    search_text: list[str] = field(default_factory=list)
+    trigrams: dict[str, frozenset[int]] = field(default_factory=dict)
+    flags: dict[tuple[str, bool], frozenset[int]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, raw: dict[str, Any]) -> CatalogIndex:
+        """Parse the models.dev JSON structure and index it."""
+        models: list[CatalogModel] = []
+        by_provider: dict[str, list[CatalogModel]] = {}
+        by_key: dict[str, CatalogModel] = {}
+        provider_names: dict[str, str] = {}
+        provider_ranges: dict[str, range] = {}
+
+        for provider_slug, provider_data in raw.items():
+            if not isinstance(provider_data, dict):
+                continue
+            models_dict = provider_data.get("models", {})
+            if not isinstance(models_dict, dict):
+                continue
+
+            provider_names[provider_slug] = provider_data.get("name", provider_slug)
+            provider_models: list[CatalogModel] = []
+
+            for model_id, model_data in models_dict.items():
+                if not isinstance(model_data, dict):
+                    continue
+
+                catalog_model = _parse_model_entry(
+                    model_id=model_id,
+                    data=model_data,
+                    provider_slug=provider_slug,
+                )
+                if catalog_model is not None:
+                    provider_models.append(catalog_model)
+                    by_key[f"{provider_slug}:{model_id}"] = catalog_model
+
+            if provider_models:
+                by_provider[provider_slug] = provider_models
+                provider_ranges[provider_slug] = range(
+                    len(models), len(models) + len(provider_models)
+                )
+                models.extend(provider_models)
+
+        # The newline keeps a query from matching across the ID/name boundary.
+        search_text = [f"{m.id.lower()}\n{m.name.lower()}" for m in models]
+        postings: dict[str, set[int]] = {}
+        for ordinal, text in enumerate(search_text):
+            for gram in _ngrams(text):
+                postings.setdefault(gram, set()).add(ordinal)
+
+        flags: dict[tuple[str, bool], frozenset[int]] = {}
+        for flag in ("tool_call", "reasoning"):
+            having = frozenset(i for i, m in enumerate(models) if getattr(m, flag))
+            flags[(flag, True)] = having
+            flags[(flag, False)] = frozenset(range(len(models))) - having
+
+        return cls(
+            models=models,
+            by_provider=by_provider,
+            by_key=by_key,
+            provider_names=provider_names,
+            provider_ranges=provider_ranges,
+            search_text=search_text,
+            trigrams={gram: frozenset(ids) for gram, ids in postings.items()},
+            flags=flags,
+        )
+
+    def select(
+        self,
+        *,
+        query: str | None = None,
+        provider_slugs: list[str] | None = None,
+        tool_call: bool | None = None,
+        reasoning: bool | None = None,
+    ) -> list[CatalogModel]:
+        """Return the models matching every given filter, in catalog order.
+
+        ``query`` is a case-insensitive substring of the model ID or name.
+        Queries of three or more characters are narrowed through the trigram
+        index before the substring check; shorter ones are checked directly.
+        """
+        sets: list[frozenset[int]] = []
+        if tool_call is not None:
+            sets.append(self.flags[("tool_call", tool_call)])
+        if reasoning is not None:
+            sets.append(self.flags[("reasoning", reasoning)])
+
+        q = query.lower() if query else ""
+        if len(q) >= _NGRAM:
+            for gram in _ngrams(q):
+                posting = self.trigrams.get(gram)
+                if posting is None:
+                    return []
+                sets.append(posting)
+        sets.sort(key=len)
+
+        ordinals: Iterable[int]
+        if provider_slugs is not None:
+            ordinals = (
+                i
+                for slug in provider_slugs
+                for i in self.provider_ranges.get(slug, ())
+                if all(i in s for s in sets)
+            )
+        elif sets:
+            ordinals = sorted(sets[0].intersection(*sets[1:]))
+        else:
+            ordinals = range(len(self.models))
+
+        return [self.models[i] for i in ordinals if not q or q in self.search_text[i]]
+
+
+# ---------------------------------------------------------------------------
+# ModelCatalog — indexed cache with stale-while-revalidate refresh
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_VERSION = 1
+# Longest wait before retrying a failed fetch (capped by the TTL).
+_FAILURE_RETRY_SECONDS = 60.0
+
 
 class ModelCatalog:
-    """In-memory cache of the models.dev catalog.
+    """Cached, indexed copy of the models.dev catalog.
 
-    Fetches the full catalog JSON on first access, then serves from
-    cache until the TTL expires. If a refresh fails, stale data is
+    The catalog is fetched on first access and served from memory after
+    that. Once the TTL expires, readers keep getting the cached catalog
+    while a single background refresh revalidates it with a conditional
+    request (``If-None-Match`` / ``If-Modified-Since``); concurrent callers
+    share that one in-flight fetch. If a refresh fails, stale data is
     served with a warning. If no data has ever been fetched, methods
-    return empty results.
+    return empty results. After a failure, ``ensure_loaded`` waits
+    ``min(ttl, 60s)`` before fetching again, so an unreachable catalog is
+    not re-requested on every call.
+
+    With a ``snapshot_path``, every successful fetch is written to disk and
+    the snapshot is loaded before the first network fetch, so restarts and
+    air-gapped pods have a catalog without reaching models.dev.
 
     Usage:
         catalog = ModelCatalog(url="https://models.dev/api.json", ttl_seconds=3600)
         models = await catalog.get_models_for_provider("openai")
     """
 
-    def __init__(self, catalog_url: str, ttl_seconds: int = 3600) -> None:
+    def __init__(
+        self,
+        catalog_url: str,
+        ttl_seconds: int = 3600,
+        snapshot_path: str | Path | None = None,
+    ) -> None:
         self._catalog_url = catalog_url
         self._ttl_seconds = ttl_seconds
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
 
         # Cache state
-        self._cache: dict[str, list[CatalogModel]] = {}  # provider_slug → models
-        self._all_models: dict[str, CatalogModel] = {}  # (provider_slug, model_id) key → model
+        self._index = CatalogIndex()
         self._last_refresh: float = 0.0
-        self._provider_names: dict[str, str] = {}  # provider_slug → display name
+        self._failed_at: float = 0.0
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._snapshot_task: asyncio.Task[None] | None = None
+
+    @property
+    def _cache(self) -> dict[str, list[CatalogModel]]:
+        """provider_slug → models."""
+        return self._index.by_provider
+
+    @property
+    def _all_models(self) -> dict[str, CatalogModel]:
+        """``provider_slug:model_id`` → model."""
+        return self._index.by_key
 
     @property
     def is_stale(self) -> bool:
@@ -120,33 +302,81 @@ class ModelCatalog:
         """Whether the cache has never been populated."""
         return self._last_refresh == 0.0
 
+    @property
+    def _backing_off(self) -> bool:
+        """Whether the last fetch failed too recently to try again."""
+        if self._failed_at == 0.0:
+            return False
+        retry_after = min(self._ttl_seconds, _FAILURE_RETRY_SECONDS)
+        return (time.monotonic() - self._failed_at) < retry_after
+
     async def ensure_loaded(self) -> None:
-        """Ensure the catalog is loaded, refreshing if stale or empty."""
-        if self.is_stale or self.is_empty:
+        """Ensure the catalog is loaded.
+
+        A cold catalog loads the on-disk snapshot, then waits for a fetch
+        only if there is still nothing to serve. A stale catalog schedules
+        a background refresh and returns immediately.
+        """
+        if self.is_empty and self._snapshot_path is not None:
+            if self._snapshot_task is None:
+                self._snapshot_task = asyncio.create_task(self._load_snapshot())
+            await asyncio.shield(self._snapshot_task)
+        if self._backing_off:
+            return
+        if self.is_empty:
             await self.refresh()
+        elif self.is_stale:
+            self._start_refresh()
 
     async def refresh(self) -> None:
         """Fetch the catalog from the configured URL and replace the cache.
 
-        On failure, logs a warning and keeps stale data if available.
+        Joins the in-flight refresh if there is one. On failure, logs a
+        warning and keeps stale data if available.
         """
+        await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task[None]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def _fetch(self) -> None:
+        headers: dict[str, str] = {}
+        if not self.is_empty:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(self._catalog_url)
-                resp.raise_for_status()
-                raw = resp.json()
+                resp = await client.get(self._catalog_url, headers=headers)
+
+            if resp.status_code == httpx.codes.NOT_MODIFIED and not self.is_empty:
+                self._last_refresh = time.monotonic()
+                self._failed_at = 0.0
+                logger.debug("Model catalog not modified", url=self._catalog_url)
+                return
 
-            self._parse_catalog(raw)
+            resp.raise_for_status()
+            raw = await asyncio.to_thread(resp.json)
+            index = await asyncio.to_thread(CatalogIndex.build, raw)
+
+            self._index = index
             self._last_refresh = time.monotonic()
-            total_models = sum(len(models) for models in self._cache.values())
+            self._failed_at = 0.0
+            self._etag = resp.headers.get("etag")
+            self._last_modified = resp.headers.get("last-modified")
             logger.info(
                 "Model catalog refreshed",
                 url=self._catalog_url,
-                providers=len(self._cache),
-                models=total_models,
+                providers=len(index.by_provider),
+                models=len(index.models),
             )
 
         except Exception as exc:
+            self._failed_at = time.monotonic()
             if self.is_empty:
                 logger.warning(
                     "Model catalog fetch failed — no cached data available",
@@ -160,42 +390,61 @@ class ModelCatalog:
                     error=str(exc),
                     stale_age_seconds=int(time.monotonic() - self._last_refresh),
                 )
+            return
 
-    def _parse_catalog(self, raw: dict[str, Any]) -> None:
-        """Parse the models.dev JSON structure into CatalogModel instances."""
-        cache: dict[str, list[CatalogModel]] = {}
-        all_models: dict[str, CatalogModel] = {}
-        provider_names: dict[str, str] = {}
-
-        for provider_slug, provider_data in raw.items():
-            if not isinstance(provider_data, dict):
-                continue
-            models_dict = provider_data.get("models", {})
-            if not isinstance(models_dict, dict):
-                continue
+        if self._snapshot_path is not None:
+            await self._save_snapshot(raw)
 
-            provider_names[provider_slug] = provider_data.get("name", provider_slug)
-            provider_models: list[CatalogModel] = []
-
-            for model_id, model_data in models_dict.items():
-                if not isinstance(model_data, dict):
-                    continue
-
-                catalog_model = _parse_model_entry(
-                    model_id=model_id,
-                    data=model_data,
-                    provider_slug=provider_slug,
-                )
-                if catalog_model is not None:
-                    provider_models.append(catalog_model)
-                    all_models[f"{provider_slug}:{model_id}"] = catalog_model
+    async def _load_snapshot(self) -> None:
+        """Populate the cache from the on-disk snapshot, if there is one."""
+        assert self._snapshot_path is not None
+        path = self._snapshot_path
+        try:
+            snapshot = await asyncio.to_thread(_read_snapshot, path)
+            if snapshot is None or not self.is_empty:
+                return
+            index = await asyncio.to_thread(CatalogIndex.build, snapshot["catalog"])
+        except Exception as exc:
+            logger.warning(
+                "Ignoring unreadable model catalog snapshot", path=str(path), error=str(exc)
+            )
+            return
+
+        age = max(0.0, time.time() - float(snapshot.get("fetched_at", 0.0)))
+        self._index = index
+        self._last_refresh = time.monotonic() - age
+        if snapshot.get("url") == self._catalog_url:
+            self._etag = snapshot.get("etag")
+            self._last_modified = snapshot.get("last_modified")
+        logger.info(
+            "Model catalog loaded from snapshot",
+            path=str(path),
+            models=len(index.models),
+            age_seconds=int(age),
+        )
 
-            if provider_models:
-                cache[provider_slug] = provider_models
+    async def _save_snapshot(self, raw: dict[str, Any]) -> None:
+        assert self._snapshot_path is not None
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "url": self._catalog_url,
+            "fetched_at": time.time(),
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "catalog": raw,
+        }
+        try:
+            await asyncio.to_thread(_write_snapshot, self._snapshot_path, snapshot)
+        except Exception as exc:
+            logger.warning(
+                "Failed to write model catalog snapshot",
+                path=str(self._snapshot_path),
+                error=str(exc),
+            )
 
-        self._cache = cache
-        self._all_models = all_models
-        self._provider_names = provider_names
+    def _parse_catalog(self, raw: dict[str, Any]) -> None:
+        """Parse the models.dev JSON structure and replace the cache with it."""
+        self._index = CatalogIndex.build(raw)
 
     async def get_models_for_provider(self, provider_slug: str) -> list[CatalogModel]:
         """Return all models for a models.dev provider slug.
@@ -259,11 +508,25 @@ class ModelCatalog:
                 return entry
         return None
 
+    def lookup(self, provider_type: str, model_id: str) -> CatalogModel | None:
+        """Cache-only variant of :meth:`find_model` that never fetches.
+
+        Used on hot paths such as per-turn cost accounting, where waiting on
+        models.dev is not acceptable. Returns None until the catalog has been
+        loaded.
+        """
+        for slug in catalog_slugs_for_provider(provider_type):
+            entry = self._all_models.get(f"{slug}:{model_id}")
+            if entry is not None:
+                return entry
+        return None
+
     async def search(
         self,
         *,
         query: str | None = None,
         provider_slug: str | None = None,
+        provider_type: str | None = None,
         tool_call: bool | None = None,
         reasoning: bool | None = None,
     ) -> list[CatalogModel]:
@@ -272,6 +535,8 @@ class ModelCatalog:
         Args:
             query: Case-insensitive substring match on model ID or name.
             provider_slug: Filter to a specific models.dev provider.
+            provider_type: Filter to the models.dev providers mapped to a
+                Cognition provider type.
             tool_call: Filter to models with/without tool call support.
             reasoning: Filter to models with/without reasoning support.
 
@@ -280,29 +545,23 @@ class ModelCatalog:
         """
         await self.ensure_loaded()
 
-        candidates: list[CatalogModel]
+        provider_slugs: list[str] | None = None
         if provider_slug:
-            candidates = list(self._cache.get(provider_slug, []))
-        else:
-            candidates = list(self._all_models.values())
-
-        results: list[CatalogModel] = []
-        for model in candidates:
-            if query:
-                q = query.lower()
-                if q not in model.id.lower() and q not in model.name.lower():
-                    continue
-            if tool_call is not None and model.tool_call != tool_call:
-                continue
-            if reasoning is not None and model.reasoning != reasoning:
-                continue
-            results.append(model)
-
-        return results
+            provider_slugs = [provider_slug]
+        if provider_type is not None:
+            mapped = catalog_slugs_for_provider(provider_type)
+            provider_slugs = [s for s in provider_slugs or mapped if s in mapped]
+
+        return self._index.select(
+            query=query,
+            provider_slugs=provider_slugs,
+            tool_call=tool_call,
+            reasoning=reasoning,
+        )
 
     def get_provider_name(self, provider_slug: str) -> str:
         """Return the display name for a provider slug, or the slug itself."""
-        return self._provider_names.get(provider_slug, provider_slug)
+        return self._index.provider_names.get(provider_slug, provider_slug)
 
 
 # ---------------------------------------------------------------------------
@@ -310,6 +569,10 @@ class ModelCatalog:
 # ---------------------------------------------------------------------------
 
 
+def _optional_float(value: Any) -> float | None:
+    return None if value is None else float(value)
+
+
 def _parse_model_entry(
     model_id: str,
     data: dict[str, Any],
@@ -337,6 +600,8 @@ def _parse_model_entry(
             modalities=data.get("modalities", {}),
             structured_output=data.get("structured_output"),
             status=data.get("status"),
+            cache_read_cost=_optional_float(cost.get("cache_read")),
+            cache_write_cost=_optional_float(cost.get("cache_write")),
         )
     except (TypeError, ValueError, AttributeError) as exc:
         logger.debug(
@@ -348,6 +613,27 @@ def _parse_model_entry(
         return None
 
 
+def _read_snapshot(path: Path) -> dict[str, Any] | None:
+    """Read a catalog snapshot, or None if it is missing or from another format."""
+    try:
+        with path.open("rb") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != _SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    """Atomically replace the snapshot so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
 # ---------------------------------------------------------------------------
 # Global singleton
 # ---------------------------------------------------------------------------
@@ -365,9 +651,15 @@ def get_model_catalog() -> ModelCatalog:
         from server.app.settings import get_settings
 
         settings = get_settings()
+        snapshot_path: Path | None = None
+        if settings.model_catalog_snapshot_path:
+            snapshot_path = Path(settings.model_catalog_snapshot_path)
+            if not snapshot_path.is_absolute():
+                snapshot_path = settings.workspace_path / snapshot_path
         _catalog = ModelCatalog(
             catalog_url=settings.model_catalog_url,
             ttl_seconds=settings.model_catalog_ttl_seconds,
+            snapshot_path=snapshot_path,
         )
     return _catalog
 
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import math
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
 
 import structlog
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from server.app.agent.graph_warmup import (
+    GraphWarmupManifest,
+    run_periodic_flush,
+    set_graph_warmup_manifest,
+    warm_compiled_graphs,
+)
 from server.app.agent.resolver import RuntimeResolver
+from server.app.agent.sandbox_registry import SandboxRegistry, set_sandbox_registry
+from server.app.agent.sandbox_scheduler import SandboxScheduler, set_sandbox_scheduler
+from server.app.agent.subagent_index import get_subagent_spec_index
 from server.app.api.dependencies import (
     get_storage_backend_dep,
     set_config_store,
@@ -22,19 +35,40 @@ from server.app.api.dependencies import (
 )
 from server.app.api.middleware import ObservabilityMiddleware, SecurityHeadersMiddleware
 from server.app.api.models import HealthStatus, ReadyStatus
-from server.app.api.routes import agents, config, messages, models, sessions, skills, tools
+from server.app.api.routes import (
+    agents,
+    config,
+    messages,
+    models,
+    profiles,
+    sessions,
+    skills,
+    tools,
+    usage,
+)
 from server.app.exceptions import RateLimitError
-from server.app.file_watcher import WorkspaceWatcher
-from server.app.observability import setup_metrics, setup_tracing
+from server.app.observability import setup_logging, setup_metrics, setup_tracing
+from server.app.observability.log_pipeline import set_log_sink
+from server.app.observability.loop_monitor import EventLoopMonitor
 from server.app.observability.mlflow_config import setup_mlflow_tracing
+from server.app.observability.profiling import ProfileStore, set_profile_store
 from server.app.rate_limiter import RateLimitConfig, get_rate_limiter
 from server.app.session_manager import initialize_session_manager
 from server.app.settings import get_settings
-from server.app.storage import create_storage_backend
+from server.app.startup_profile import preload_deferred_modules
+from server.app.storage import (
+    create_rate_limiter_backend,
+    create_storage_backend,
+    create_usage_ledger,
+)
 from server.app.storage.backend import StorageBackend
 from server.app.storage.config_store import DefaultConfigStore, set_default_config_store
+from server.app.usage import set_usage_ledger
 from server.version import VERSION
 
+if TYPE_CHECKING:
+    from server.app.file_watcher import WorkspaceWatcher
+
 logger = structlog.get_logger(__name__)
 
 # Global file watcher instance
@@ -46,8 +80,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan context manager."""
     global file_watcher
 
-    logger.info("Starting Cognition server")
+    startup_started = time.perf_counter()
     settings = get_settings()
+    setup_logging(
+        settings.log_level,
+        json_format=settings.log_json,
+        async_sink=settings.log_async,
+        queue_size=settings.log_queue_size,
+        sample_rates=settings.log_sample_rates,
+    )
+    logger.info("Starting Cognition server")
 
     # Initialize storage backend
     storage_backend = create_storage_backend(settings)
@@ -82,6 +124,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Seed store-backed agent definitions after ConfigStore is available.
     await config_store.seed_agent_definitions()
 
+    # Sandbox handles are reused across a session's turns.
+    set_sandbox_registry(
+        SandboxRegistry(health_check_interval=settings.sandbox_health_check_interval_seconds)
+    )
+    # Parallel tool calls share a bounded sandbox pool, limited per session.
+    set_sandbox_scheduler(
+        SandboxScheduler(
+            max_concurrent=settings.sandbox_max_concurrent_ops,
+            max_per_session=settings.sandbox_max_concurrent_ops_per_session,
+        )
+    )
+
+    # Shared subagent spec index; rebuilt per agent as definitions change.
+    subagent_index = get_subagent_spec_index()
+    config_store.subscribe_agent_changes(subagent_index.on_agent_change)
+
     # Initialize RuntimeResolver (agent runtime bridge)
     runtime_resolver = RuntimeResolver(config_store=config_store, settings=settings)
     set_runtime_resolver(runtime_resolver)
@@ -109,16 +167,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     set_session_agent_manager_dep(session_agent_manager)
     logger.info("SessionAgentManager initialized")
 
-    # Initialize ModelCatalog for DI
-    from server.app.llm.model_catalog import ModelCatalog
+    # Initialize ModelCatalog for DI. The same instance prices agent turns,
+    # so the API and usage accounting share one cache.
+    from server.app.llm.model_catalog import get_model_catalog
 
-    model_catalog = ModelCatalog(
-        catalog_url=settings.model_catalog_url,
-        ttl_seconds=settings.model_catalog_ttl_seconds,
-    )
+    model_catalog = get_model_catalog()
     set_model_catalog_dep(model_catalog)
     logger.info("ModelCatalog initialized")
 
+    # Usage ledger for per-session and per-scope token/cost rollups
+    usage_ledger = create_usage_ledger(settings)
+    set_usage_ledger(usage_ledger)
+
+    # Opt-in turn profiles, stored in the workspace and served by /profiles
+    if settings.profiling_enabled:
+        if settings.profiling_token is None:
+            logger.warning(
+                "Profiling enabled without COGNITION_PROFILING_TOKEN; "
+                "profile requests and /profiles are refused"
+            )
+        set_profile_store(
+            ProfileStore(
+                settings.workspace_path / ".cognition" / "profiles",
+                max_profiles=settings.profiling_max_profiles,
+            )
+        )
+
     # Validate K8s sandbox prerequisites if backend is kubernetes
     if settings.sandbox_backend == "kubernetes":
         from server.app.agent.sandbox_backend import validate_k8s_sandbox_config
@@ -134,20 +208,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Set up file watcher for hot-reload
     try:
+        from server.app.file_watcher import WorkspaceWatcher
+
         file_watcher = WorkspaceWatcher()
 
-        # Watch tools and middleware directories
+        # Watch tools, middleware and agent definition directories
         tools_path = settings.workspace_path / ".cognition" / "tools"
         middleware_path = settings.workspace_path / ".cognition" / "middleware"
+        agents_path = settings.workspace_path / ".cognition" / "agents"
 
         # Create directories if they don't exist
         tools_path.mkdir(parents=True, exist_ok=True)
         middleware_path.mkdir(parents=True, exist_ok=True)
+        agents_path.mkdir(parents=True, exist_ok=True)
 
         file_watcher.watch_tools(str(tools_path))
         file_watcher.watch_middleware(str(middleware_path))
+        file_watcher.watch_agents(str(agents_path))
+        file_watcher.on_tools_changed(subagent_index.clear)
+        # Agent files are re-parsed only when their stat signature changes.
+        file_watcher.on_agents_changed(config_store.areload_file_agents)
         file_watcher.start()
-        logger.info("File watcher started", tools=str(tools_path), middleware=str(middleware_path))
+        logger.info(
+            "File watcher started",
+            tools=str(tools_path),
+            middleware=str(middleware_path),
+            agents=str(agents_path),
+        )
     except Exception as e:
         logger.warning("Failed to start file watcher", error=str(e))
 
@@ -165,14 +252,62 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         RateLimitConfig(
             requests_per_minute=settings.rate_limit_per_minute,
             burst_size=settings.rate_limit_burst,
-        )
+            scope_requests_per_minute=settings.rate_limit_scope_per_minute,
+            scope_burst_size=settings.rate_limit_scope_burst,
+            scope_tokens_per_minute=settings.rate_limit_scope_tokens_per_minute,
+        ),
+        backend=create_rate_limiter_backend(settings),
     )
     await rate_limiter.start()
+
+    # Precompile recently hot agent graphs in the background so cold replicas
+    # don't pay graph compilation on each tenant's first request.
+    warmup_manifest: GraphWarmupManifest | None = None
+    warmup_tasks: list[asyncio.Task[Any]] = []
+    if settings.graph_warmup_enabled:
+        warmup_manifest = GraphWarmupManifest(
+            settings.workspace_path / ".cognition" / "graph_warmup.json",
+            max_entries=settings.graph_warmup_max_entries,
+        )
+        await asyncio.to_thread(warmup_manifest.load)
+        set_graph_warmup_manifest(warmup_manifest)
+        warmup_tasks = [
+            asyncio.create_task(warm_compiled_graphs(warmup_manifest, session_agent_manager)),
+            asyncio.create_task(
+                run_periodic_flush(warmup_manifest, settings.graph_warmup_flush_interval_seconds)
+            ),
+        ]
+        logger.info("Graph warmup scheduled", entries=len(warmup_manifest))
+
+    # The agent runtime is imported lazily; load it off the event loop now so
+    # the first request doesn't pay for it.
+    background_tasks: list[asyncio.Task[Any]] = []
+    # Turn pricing only reads the cached catalog; load it now.
+    background_tasks.append(asyncio.create_task(model_catalog.ensure_loaded()))
+    if settings.preload_agent_runtime:
+        background_tasks.append(asyncio.create_task(preload_deferred_modules()))
+    background_tasks.append(
+        asyncio.create_task(
+            session_agent_manager.run_sweeper(settings.agent_session_sweep_interval_seconds)
+        )
+    )
+    if settings.loop_monitor_enabled:
+        loop_monitor = EventLoopMonitor(
+            settings.loop_monitor_interval_seconds,
+            debug=settings.loop_monitor_debug,
+            slow_callback_seconds=settings.loop_monitor_slow_callback_seconds,
+        )
+        background_tasks.append(asyncio.create_task(loop_monitor.run()))
+
     logger.info(
         "Server configuration",
         otel_enabled=settings.otel_enabled,
         persistence_backend=settings.persistence_backend,
     )
+    logger.info(
+        "Server ready",
+        startup_ms=round((time.perf_counter() - startup_started) * 1000, 1),
+    )
     yield
     logger.info("Shutting down Cognition server")
 
@@ -183,6 +318,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     await rate_limiter.stop()
 
+    for task in [*warmup_tasks, *background_tasks]:
+        task.cancel()
+    if warmup_manifest is not None:
+        try:
+            await warmup_manifest.asave()
+        except Exception as e:
+            logger.warning("Failed to persist graph warmup manifest", error=str(e))
+        set_graph_warmup_manifest(None)
+
+    # Terminate the sandboxes of every session still cached in this process
+    await session_agent_manager.aclose()
+    set_sandbox_scheduler(None)
+
+    await usage_ledger.close()
+    set_usage_ledger(None)
+    set_profile_store(None)
+
     # Stop ConfigChangeDispatcher
     await dispatcher.stop()
     logger.info("ConfigChangeDispatcher stopped")
@@ -191,6 +343,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if storage_backend:
         await storage_backend.close()
     logger.info("Server shutdown complete")
+    # Write out logs still queued for the writer thread
+    set_log_sink(None)
 
 
 app = FastAPI(
@@ -220,6 +374,8 @@ app.include_router(agents.router)
 app.include_router(skills.router)
 app.include_router(models.router)
 app.include_router(tools.router)
+app.include_router(usage.router)
+app.include_router(profiles.router)
 
 
 @app.get("/health", response_model=HealthStatus, tags=["health"])
@@ -252,9 +408,11 @@ async def rate_limit_exception_handler(request: Request, exc: RateLimitError) ->
         error=str(exc),
         path=request.url.path,
     )
+    retry_after = exc.details.get("retry_after_seconds")
     return JSONResponse(
         status_code=429,
         content={"detail": f"Rate limit exceeded: {exc.message}"},
+        headers={"Retry-After": str(math.ceil(retry_after))} if retry_after else None,
     )
 
 
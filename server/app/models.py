@@ -105,6 +105,7 @@ class SessionConfig(BaseModel):
             "openai_compatible",
             "google_genai",
             "google_vertexai",
+            "scripted_mock",
         ]
         | None
     ) = None
@@ -6,7 +6,9 @@ Provides structured logging, OpenTelemetry tracing, and metrics collection.
 from __future__ import annotations
 
 import functools
+import importlib
 import inspect
+import logging
 import time
 from collections.abc import Callable
 from contextlib import contextmanager
@@ -16,51 +18,35 @@ import structlog
 
 # Optional imports with fallbacks
 try:
-    from prometheus_client import Counter, Histogram, start_http_server
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
     Counter = None  # type: ignore[assignment,misc]
+    Gauge = None  # type: ignore[assignment,misc]
     Histogram = None  # type: ignore[assignment,misc]
     start_http_server = None  # type: ignore[assignment]
 
+# Only the lightweight OpenTelemetry API is imported eagerly. The SDK, OTLP
+# exporters (gRPC in particular) and instrumentations are imported by
+# setup_tracing() when tracing is actually enabled.
 try:
     from opentelemetry import trace
-    from opentelemetry.sdk.resources import Resource
-    from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
-    # Try different OTLP exporters
-    try:
-        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-    except ImportError:
-        try:
-            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-        except ImportError:
-            OTLPSpanExporter = None  # type: ignore[assignment,misc]
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:
+    OPENTELEMETRY_AVAILABLE = False
+    trace = None  # type: ignore[assignment]
 
-    # Instrumentation imports
-    try:
-        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-    except ImportError:
-        FastAPIInstrumentor = None  # type: ignore[assignment,misc]
 
+def _optional_import(module: str, attr: str) -> Any | None:
+    """Return ``module.attr`` or None if the module is not installed."""
     try:
-        from opentelemetry.instrumentation.langchain import LangchainInstrumentor
+        return getattr(importlib.import_module(module), attr)
     except ImportError:
-        LangchainInstrumentor = None  # type: ignore[assignment,misc]
+        return None
 
-    OPENTELEMETRY_AVAILABLE = True
-except ImportError:
-    OPENTELEMETRY_AVAILABLE = False
-    trace = None  # type: ignore[assignment]
-    OTLPSpanExporter = None  # type: ignore[assignment,misc]
-    Resource = None  # type: ignore[assignment,misc]
-    TracerProvider = None  # type: ignore[assignment,misc]
-    BatchSpanProcessor = None  # type: ignore[assignment,misc]
-    FastAPIInstrumentor = None  # type: ignore[assignment,misc]
-    LangchainInstrumentor = None  # type: ignore[assignment,misc]
 
 # Type variable for generic function decorator
 F = TypeVar("F", bound=Callable[..., Any])
@@ -75,6 +61,20 @@ if PROMETHEUS_AVAILABLE:
         "cognition_request_duration_seconds", "Request duration in seconds", ["method", "endpoint"]
     )
 
+    SSE_STREAM_DURATION = Histogram(
+        "cognition_sse_stream_duration_seconds",
+        "Duration of SSE responses, from request to end of stream",
+        ["endpoint"],
+        buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+    )
+
+    SSE_BYTES_SENT = Histogram(
+        "cognition_sse_bytes_sent",
+        "Bytes sent per SSE response",
+        ["endpoint"],
+        buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7),
+    )
+
     LLM_CALL_DURATION = Histogram(
         "cognition_llm_call_duration_seconds", "LLM API call duration", ["provider", "model"]
     )
@@ -88,6 +88,99 @@ if PROMETHEUS_AVAILABLE:
         "Session lifecycle events",
         ["event_type"],  # created, resumed, closed, expired
     )
+
+    AGENT_SESSIONS = Gauge(
+        "cognition_agent_sessions",
+        "Sessions with a cached agent service",
+        ["state"],  # active, idle
+    )
+
+    AGENT_SESSION_EVICTIONS = Counter(
+        "cognition_agent_session_evictions_total",
+        "Agent sessions evicted from the in-process cache",
+        ["reason"],  # idle_ttl, max_live
+    )
+
+    _SANDBOX_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+    SANDBOX_CLAIM_LATENCY = Histogram(
+        "cognition_sandbox_claim_seconds",
+        "Time to create and configure a sandbox",
+        ["trigger"],  # preclaim, lazy
+        buckets=_SANDBOX_LATENCY_BUCKETS,
+    )
+
+    SANDBOX_READY_LATENCY = Histogram(
+        "cognition_sandbox_ready_seconds",
+        "Time from starting a sandbox claim until it first runs a command",
+        ["trigger"],  # preclaim, lazy
+        buckets=_SANDBOX_LATENCY_BUCKETS,
+    )
+
+    _PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    TURN_DURATION = Histogram(
+        "cognition_turn_duration_seconds",
+        "Agent turn duration, from receiving the message to the end of the stream",
+        ["status"],  # done, interrupted, aborted, error
+        buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+    )
+
+    TURN_PHASE_DURATION = Histogram(
+        "cognition_turn_phase_seconds",
+        "Time an agent turn spent in each phase",
+        ["phase"],  # session_load, agent_config, model_build, tool_build, ...
+        buckets=_PHASE_BUCKETS,
+    )
+
+    TIME_TO_FIRST_TOKEN = Histogram(
+        "cognition_time_to_first_token_seconds",
+        "Time from receiving a message to streaming the first token",
+        ["provider", "model"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+    )
+
+    INTER_TOKEN_GAP = Histogram(
+        "cognition_inter_token_gap_seconds",
+        "Time between consecutive streamed tokens",
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    )
+
+    TOOL_CALL_DURATION = Histogram(
+        "cognition_tool_call_duration_seconds",
+        "Tool execution duration",
+        ["tool_name"],
+        buckets=_PHASE_BUCKETS,
+    )
+
+    EVENT_LOOP_LAG = Histogram(
+        "cognition_event_loop_lag_seconds",
+        "How late the event loop ran a timer scheduled by the loop monitor",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+
+    LOG_EVENTS_DROPPED = Counter(
+        "cognition_log_events_dropped_total",
+        "Log events dropped before being written",
+        ["reason"],  # sampled, queue_full
+    )
+
+    EVENT_LOOP_STALLS = Counter(
+        "cognition_event_loop_stalls_total",
+        "Callbacks caught blocking the event loop past the slow-callback threshold",
+    )
+
+    SANDBOX_QUEUE_WAIT = Histogram(
+        "cognition_sandbox_queue_wait_seconds",
+        "Time sandbox operations waited for a session or global concurrency slot",
+        ["operation"],  # read, write, edit, ls, grep, glob, execute, upload, download
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+
+    SANDBOX_OPS_IN_FLIGHT = Gauge(
+        "cognition_sandbox_ops_in_flight",
+        "Sandbox operations currently running on the sandbox thread pool",
+    )
 else:
     # Dummy metrics that do nothing
     class DummyMetric:
@@ -101,11 +194,33 @@ else:
         def observe(self, *args: Any, **kwargs: Any) -> None:
             """No-op."""
 
+        def set(self, *args: Any, **kwargs: Any) -> None:
+            """No-op."""
+
+        def dec(self, *args: Any, **kwargs: Any) -> None:
+            """No-op."""
+
     REQUEST_COUNT = DummyMetric()  # type: ignore[assignment]
     REQUEST_DURATION = DummyMetric()  # type: ignore[assignment]
+    SSE_STREAM_DURATION = DummyMetric()  # type: ignore[assignment]
+    SSE_BYTES_SENT = DummyMetric()  # type: ignore[assignment]
     LLM_CALL_DURATION = DummyMetric()  # type: ignore[assignment]
     TOOL_CALL_COUNT = DummyMetric()  # type: ignore[assignment]
     SESSION_COUNT = DummyMetric()  # type: ignore[assignment]
+    AGENT_SESSIONS = DummyMetric()  # type: ignore[assignment]
+    AGENT_SESSION_EVICTIONS = DummyMetric()  # type: ignore[assignment]
+    SANDBOX_CLAIM_LATENCY = DummyMetric()  # type: ignore[assignment]
+    SANDBOX_READY_LATENCY = DummyMetric()  # type: ignore[assignment]
+    TURN_DURATION = DummyMetric()  # type: ignore[assignment]
+    TURN_PHASE_DURATION = DummyMetric()  # type: ignore[assignment]
+    TIME_TO_FIRST_TOKEN = DummyMetric()  # type: ignore[assignment]
+    INTER_TOKEN_GAP = DummyMetric()  # type: ignore[assignment]
+    TOOL_CALL_DURATION = DummyMetric()  # type: ignore[assignment]
+    EVENT_LOOP_LAG = DummyMetric()  # type: ignore[assignment]
+    EVENT_LOOP_STALLS = DummyMetric()  # type: ignore[assignment]
+    LOG_EVENTS_DROPPED = DummyMetric()  # type: ignore[assignment]
+    SANDBOX_QUEUE_WAIT = DummyMetric()  # type: ignore[assignment]
+    SANDBOX_OPS_IN_FLIGHT = DummyMetric()  # type: ignore[assignment]
 
 
 def setup_tracing(
@@ -128,10 +243,25 @@ def setup_tracing(
         logger.debug("OpenTelemetry tracing disabled by settings")
         return
 
+    Resource = _optional_import("opentelemetry.sdk.resources", "Resource")
+    TracerProvider = _optional_import("opentelemetry.sdk.trace", "TracerProvider")
     if not OPENTELEMETRY_AVAILABLE or Resource is None or TracerProvider is None:
         logger.debug("OpenTelemetry not available, skipping tracing setup")
         return
 
+    BatchSpanProcessor = _optional_import("opentelemetry.sdk.trace.export", "BatchSpanProcessor")
+    OTLPSpanExporter = _optional_import(
+        "opentelemetry.exporter.otlp.proto.grpc.trace_exporter", "OTLPSpanExporter"
+    ) or _optional_import(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter", "OTLPSpanExporter"
+    )
+    FastAPIInstrumentor = _optional_import(
+        "opentelemetry.instrumentation.fastapi", "FastAPIInstrumentor"
+    )
+    LangchainInstrumentor = _optional_import(
+        "opentelemetry.instrumentation.langchain", "LangchainInstrumentor"
+    )
+
     resource = Resource.create({"service.name": service_name})
     provider = TracerProvider(resource=resource)
 
@@ -175,28 +305,83 @@ def setup_tracing(
             LangchainInstrumentor().instrument()
 
 
-def setup_logging(log_level: str = "info", json_format: bool = False) -> None:
+def setup_logging(
+    log_level: str = "info",
+    json_format: bool = False,
+    *,
+    async_sink: bool = False,
+    queue_size: int = 10_000,
+    sample_rates: dict[str, float] | None = None,
+) -> None:
     """Configure structured logging.
 
     Args:
         log_level: Logging level (debug, info, warning, error)
         json_format: Whether to output JSON formatted logs
+        async_sink: Render and write logs on a background thread through a
+            bounded queue instead of in the calling thread (see
+            ``server/app/observability/log_pipeline.py``)
+        queue_size: Events the async sink buffers before dropping new ones
+        sample_rates: Fraction of events to keep per event name, e.g.
+            ``{"HTTP request": 0.01}``; warnings and errors are always kept
     """
+    from server.app.observability.log_pipeline import (
+        LogSampler,
+        QueueLoggerFactory,
+        QueueLogSink,
+        enqueue,
+        set_log_sink,
+    )
+
+    renderer = (
+        structlog.processors.JSONRenderer() if json_format else structlog.dev.ConsoleRenderer()
+    )
+    sampling = [LogSampler(sample_rates)] if sample_rates else []
+
+    if not async_sink:
+        set_log_sink(None)
+        # Events pass through stdlib logging, which drops everything below
+        # WARNING until the root logger is given a level and a handler.
+        logging.basicConfig(level=log_level.upper(), format="%(message)s")
+        logging.getLogger().setLevel(log_level.upper())
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                *sampling,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                renderer,
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
+        return
+
+    # Only cheap processors run in the caller; exceptions are formatted here
+    # because the writer thread cannot see the caller's exception state.
+    sink = QueueLogSink(renderer, max_size=queue_size)
+    sink.start()
+    set_log_sink(sink)
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
+            *sampling,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if json_format else structlog.dev.ConsoleRenderer(),
+            enqueue,
         ],
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        logger_factory=QueueLoggerFactory(sink),
+        wrapper_class=structlog.make_filtering_bound_logger(log_level.upper()),
         cache_logger_on_first_use=True,
     )
 
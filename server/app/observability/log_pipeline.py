@@ -0,0 +1,210 @@
+"""Non-blocking, sampled structlog pipeline.
+
+By default structlog renders each event and writes it to stdout in the
+calling thread, which for the server means on the event loop: every
+``HTTP request`` and tool-call log pays for JSON or console rendering and a
+blocking write while other sessions wait.
+
+``setup_logging(async_sink=True)`` keeps only the cheap processors (level
+filter, sampling, timestamps, exception formatting) in the calling thread.
+The event dict is then handed to a bounded ``QueueLogSink`` and a background
+writer thread renders and writes it in batches. When the queue is full,
+events are dropped rather than blocking the caller, and counted.
+
+``LogSampler`` keeps a configured fraction of high-volume events by name,
+e.g. ``{"HTTP request": 0.01}``. Warnings and errors are always kept, and
+kept sampled events carry their ``sample_rate`` so counts can be scaled
+back up.
+"""
+
+from __future__ import annotations
+
+import queue
+import random
+import sys
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any, TextIO
+
+import structlog
+
+from server.app.observability import LOG_EVENTS_DROPPED
+
+Renderer = Callable[[Any, str, Any], str | bytes]
+
+# Levels that are never sampled out.
+_ALWAYS_KEEP = frozenset({"warn", "warning", "error", "err", "exception", "critical", "fatal"})
+# Events rendered and written per stream write.
+_BATCH_SIZE = 256
+_STOP = object()
+
+
+class LogSampler:
+    """structlog processor keeping a fraction of events by event name.
+
+    Args:
+        rates: Fraction of events to keep (0.0-1.0), keyed by event name.
+            Events not listed are always kept.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self.rates = {event: max(0.0, min(1.0, rate)) for event, rate in rates.items()}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Any) -> Any:
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1.0 or method_name in _ALWAYS_KEEP:
+            return event_dict
+        if rate > 0.0 and random.random() < rate:
+            event_dict["sample_rate"] = rate
+            return event_dict
+        LOG_EVENTS_DROPPED.labels(reason="sampled").inc()
+        raise structlog.DropEvent
+
+
+class QueueLogSink:
+    """Bounded queue of event dicts rendered and written by a writer thread.
+
+    Args:
+        renderer: structlog renderer turning an event dict into a line.
+        stream: Stream to write to; defaults to the current ``sys.stdout``.
+        max_size: Events buffered before new ones are dropped.
+    """
+
+    def __init__(
+        self, renderer: Renderer, stream: TextIO | None = None, max_size: int = 10_000
+    ) -> None:
+        self.renderer = renderer
+        self.stream = stream
+        self.dropped = 0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_size)
+        self._reported_dropped = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="cognition-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def put(self, event_dict: Any) -> None:
+        """Queue an event without blocking; drop it if the queue is full.
+
+        Before :meth:`start` and after :meth:`close` events are written
+        synchronously, so nothing logged during shutdown is lost.
+        """
+        if self._thread is None:
+            self._write([event_dict])
+            return
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            self.dropped += 1
+            LOG_EVENTS_DROPPED.labels(reason="queue_full").inc()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write out queued events and stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            self._write([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _render(self, event_dict: Any) -> str:
+        try:
+            line = self.renderer(None, event_dict.get("level", "info"), event_dict)
+        except Exception as e:
+            line = f"{event_dict!r} (log rendering failed: {e})"
+        return line.decode() if isinstance(line, bytes) else line
+
+    def _write(self, batch: list[Any]) -> None:
+        lines = [self._render(event_dict) for event_dict in batch]
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            lines.append(
+                f"log queue full: dropped {dropped - self._reported_dropped} events "
+                f"({dropped} since start)"
+            )
+            self._reported_dropped = dropped
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError):  # Closed or broken stream
+            pass
+
+
+class QueueLogger:
+    """structlog logger that hands event dicts to a :class:`QueueLogSink`."""
+
+    def __init__(self, sink: QueueLogSink, name: str | None = None) -> None:
+        self._sink = sink
+        self.name = name
+
+    def msg(self, event_dict: Any) -> None:
+        self._sink.put(event_dict)
+
+    log = debug = info = warn = warning = error = err = exception = critical = fatal = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory creating :class:`QueueLogger` instances."""
+
+    def __init__(self, sink: QueueLogSink) -> None:
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.sink, name=args[0] if args else None)
+
+
+def enqueue(
+    logger: Any, method_name: str, event_dict: Any
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """Final processor: pass the event dict itself on to :class:`QueueLogger`."""
+    return (event_dict,), {}
+
+
+_sink: QueueLogSink | None = None
+
+
+def get_log_sink() -> QueueLogSink | None:
+    """Return the active queue sink, if logging runs through one."""
+    return _sink
+
+
+def set_log_sink(sink: QueueLogSink | None) -> None:
+    """Replace the active queue sink, closing the previous one."""
+    global _sink
+    if _sink is not None and _sink is not sink:
+        _sink.close()
+    _sink = sink
+
+
+__all__ = [
+    "LogSampler",
+    "QueueLogSink",
+    "QueueLogger",
+    "QueueLoggerFactory",
+    "enqueue",
+    "get_log_sink",
+    "set_log_sink",
+]
@@ -0,0 +1,212 @@
+"""Event-loop health monitoring.
+
+Everything the server does (every request, SSE stream and agent turn)
+shares one asyncio event loop, so any synchronous work on it (a blocking
+import, a YAML parse, a synchronous client call) stalls every other session
+for as long as it runs.
+
+``EventLoopMonitor`` samples loop lag: it sleeps for a fixed interval and
+measures how late it wakes up. The overshoot is the time the loop spent
+running other callbacks instead of scheduling it, and is exported as the
+``cognition_event_loop_lag_seconds`` histogram.
+
+In debug mode a watchdog thread also watches the sampler's heartbeat. When
+the loop fails to wake the sampler for longer than the slow-callback
+threshold, the watchdog captures the loop thread's current stack, the
+task being run and the request context bound to that task (route, path and
+session), and logs them as an ``Event loop blocked`` warning. Debug mode
+installs a task factory so that tasks spawned by a request (e.g. the agent
+turn producer) inherit its context; it is meant for diagnosis rather than
+permanent production use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from collections.abc import Coroutine
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from server.app.observability import EVENT_LOOP_LAG, EVENT_LOOP_STALLS, get_logger
+
+logger = get_logger(__name__)
+
+# Request context of the running code. The dict is shared by reference, so
+# child tasks see labels (e.g. the session) bound after they were spawned.
+_loop_context: ContextVar[dict[str, Any] | None] = ContextVar(
+    "cognition_loop_context", default=None
+)
+# Context per task, readable from the watchdog thread, which cannot see the
+# loop thread's context variables.
+_task_context: weakref.WeakKeyDictionary[asyncio.Task[Any], dict[str, Any]] = (
+    weakref.WeakKeyDictionary()
+)
+_attribution_enabled = False
+
+# Innermost frames kept per captured stack.
+_STACK_LIMIT = 30
+
+
+def bind_loop_context(**labels: Any) -> None:
+    """Attribute the current task and the tasks it spawns to ``labels``.
+
+    Labels such as ``route``, ``path`` or ``session_id`` are attached to
+    slow-callback reports. A no-op unless a monitor runs in debug mode.
+    """
+    if not _attribution_enabled:
+        return
+    context = _loop_context.get()
+    if context is None:
+        context = {}
+        _loop_context.set(context)
+    context.update({key: value for key, value in labels.items() if value is not None})
+    task = asyncio.current_task()
+    if task is not None:
+        _task_context[task] = context
+
+
+@dataclass
+class LoopStall:
+    """A callback that blocked the event loop past the slow-callback threshold.
+
+    Attributes:
+        blocked_seconds: How long the loop had been blocked when captured.
+        task: Name and coroutine of the task being run, if any.
+        context: Request context bound to that task (route, path, session).
+        stack: Formatted stack of the loop thread, innermost frame last.
+    """
+
+    blocked_seconds: float
+    task: str | None
+    context: dict[str, Any] = field(default_factory=dict)
+    stack: list[str] = field(default_factory=list)
+
+
+class EventLoopMonitor:
+    """Sample event-loop lag and, in debug mode, capture blocking callbacks.
+
+    Args:
+        interval: Seconds between lag samples.
+        debug: Run the watchdog thread that captures blocking callbacks.
+        slow_callback_seconds: Block duration after which the watchdog
+            captures the loop's stack.
+        max_stalls: Number of recent captures kept in :attr:`stalls`.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        *,
+        debug: bool = False,
+        slow_callback_seconds: float = 0.1,
+        max_stalls: int = 20,
+    ) -> None:
+        self.interval = interval
+        self.debug = debug
+        self.slow_callback_seconds = slow_callback_seconds
+        self.stalls: deque[LoopStall] = deque(maxlen=max_stalls)
+        self.max_lag = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.perf_counter()
+        self._reported_beat: float | None = None
+        self._stop = threading.Event()
+
+    async def run(self) -> None:
+        """Sample lag until cancelled."""
+        global _attribution_enabled
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        watchdog: threading.Thread | None = None
+        previous_factory = self._loop.get_task_factory()
+        if self.debug:
+            _attribution_enabled = True
+            self._loop.set_task_factory(self._task_factory(previous_factory))
+            self._stop.clear()
+            watchdog = threading.Thread(
+                target=self._watch, name="cognition-loop-watchdog", daemon=True
+            )
+            watchdog.start()
+        try:
+            while True:
+                self._heartbeat = time.perf_counter()
+                expected = self._heartbeat + self.interval
+                await asyncio.sleep(self.interval)
+                self.record_lag(max(0.0, time.perf_counter() - expected))
+        finally:
+            if watchdog is not None:
+                self._stop.set()
+                watchdog.join(timeout=1.0)
+                self._loop.set_task_factory(previous_factory)
+                _attribution_enabled = False
+
+    def record_lag(self, lag: float) -> None:
+        """Export one lag sample."""
+        EVENT_LOOP_LAG.observe(lag)
+        self.max_lag = max(self.max_lag, lag)
+
+    @staticmethod
+    def _task_factory(previous: Any) -> Any:
+        """Wrap ``previous`` so new tasks inherit their creator's loop context."""
+
+        def factory(
+            loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, Any], **kwargs: Any
+        ) -> asyncio.Task[Any]:
+            task: asyncio.Task[Any]
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            creator = kwargs.get("context")
+            context = creator.get(_loop_context) if creator is not None else _loop_context.get()
+            if context is not None:
+                _task_context[task] = context
+            return task
+
+        return factory
+
+    def _watch(self) -> None:
+        poll = min(self.slow_callback_seconds, self.interval) / 2
+        while not self._stop.wait(poll):
+            beat = self._heartbeat
+            blocked = time.perf_counter() - (beat + self.interval)
+            if blocked >= self.slow_callback_seconds and self._reported_beat != beat:
+                self._reported_beat = beat
+                self.capture(blocked)
+
+    def capture(self, blocked_seconds: float) -> LoopStall:
+        """Capture what the loop thread is running right now and report it."""
+        stall = LoopStall(blocked_seconds=blocked_seconds, task=None)
+        frame = sys._current_frames().get(self._loop_thread_id or threading.get_ident())
+        if frame is not None:
+            stall.stack = [
+                line.rstrip() for line in traceback.format_stack(frame, limit=_STACK_LIMIT)
+            ]
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        if task is not None:
+            stall.task = f"{task.get_name()} ({getattr(task.get_coro(), '__qualname__', '?')})"
+            try:
+                stall.context = dict(_task_context.get(task) or {})
+            except Exception:  # Mutated concurrently by the loop thread
+                stall.context = {}
+        self.stalls.append(stall)
+        EVENT_LOOP_STALLS.inc()
+        logger.warning(
+            "Event loop blocked",
+            blocked_ms=round(blocked_seconds * 1000, 1),
+            task=stall.task,
+            **stall.context,
+            stack="\n".join(stall.stack),
+        )
+        return stall
+
+
+__all__ = ["EventLoopMonitor", "LoopStall", "bind_loop_context"]
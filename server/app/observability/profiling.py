@@ -0,0 +1,311 @@
+"""Opt-in sampling profiler for agent turns.
+
+Slow turns are hard to reproduce outside production because they depend on
+the real agent definitions, tools, MCP servers and scopes. With profiling
+enabled (``COGNITION_PROFILING_ENABLED``), a turn runs under a sampling
+profiler when the request asks for it with the ``X-Cognition-Profile``
+header, or when it is picked by ``COGNITION_PROFILING_SAMPLE_RATE``. The
+header must carry ``COGNITION_PROFILING_TOKEN``; without a token, profiles
+can neither be requested nor read, and only sampled turns are profiled. The
+token is only accepted in a header, never in the URL, so it does not end up
+in access logs.
+
+``SamplingProfiler`` is a pure-Python sampler: a background thread reads the
+event-loop thread's stack every few milliseconds with
+``sys._current_frames()``, so the profiled turn runs unmodified and the cost
+is one stack walk per sample. The loop is shared, so concurrent turns appear
+in the same profile; each sample is rooted in a frame naming the asyncio
+task that was running, which separates them. Work that a turn hands to
+worker threads (``asyncio.to_thread``) shows as the loop waiting.
+
+Profiles are written to ``.cognition/profiles/`` in the speedscope format
+(open them at https://www.speedscope.app), next to a small metadata file
+tagging them with the session, agent, provider and model, and are served by
+``GET /profiles``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from server.app.settings import Settings
+
+logger = structlog.get_logger(__name__)
+
+PROFILE_HEADER = "X-Cognition-Profile"
+PROFILE_ID_HEADER = "X-Cognition-Profile-Id"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def new_profile_id() -> str:
+    """Return a new profile ID."""
+    return uuid.uuid4().hex
+
+
+def profile_access_allowed(settings: Settings, value: str | None) -> bool:
+    """Whether ``value`` (a header or query value) grants profiling access.
+
+    Access always requires the configured token; without one it is refused.
+    """
+    if not settings.profiling_enabled or value is None or settings.profiling_token is None:
+        return False
+    return hmac.compare_digest(value.encode(), settings.profiling_token.get_secret_value().encode())
+
+
+def profile_trigger(settings: Settings, requested: str | None) -> str | None:
+    """Decide whether to profile a turn.
+
+    Args:
+        settings: Server settings.
+        requested: Value of the profile header, if sent.
+
+    Returns:
+        ``"request"`` or ``"sampled"`` when the turn should be profiled,
+        otherwise None.
+    """
+    if not settings.profiling_enabled:
+        return None
+    if profile_access_allowed(settings, requested):
+        return "request"
+    if settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+        return "sampled"
+    return None
+
+
+class SamplingProfiler:
+    """Sample one thread's Python stack from a background thread.
+
+    Args:
+        thread_id: Thread to sample; defaults to the thread calling
+            :meth:`start`, normally the event-loop thread.
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = 0.005) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames: list[dict[str, Any]] = []
+        self.samples: list[list[int]] = []
+        self.weights: list[float] = []
+        self._frame_index: dict[tuple[str, str, int], int] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="cognition-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> float:
+        """Stop sampling and return the profiled duration in seconds."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self._started
+        return self.duration
+
+    def _run(self) -> None:
+        last = self._started
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def _frame(self, name: str, file: str, line: int) -> int:
+        key = (name, file, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": name, "file": file, "line": line})
+        return index
+
+    def _sample(self, weight: float) -> None:
+        frame = sys._current_frames().get(self.thread_id or 0)
+        if frame is None:
+            return
+        stack: list[int] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(self._frame(code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.append(self._frame(self._task_label(), "", 0))
+        stack.reverse()
+        self.samples.append(stack)
+        self.weights.append(weight)
+
+    def _task_label(self) -> str:
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        if task is None:
+            return "[event loop]"
+        return f"[task {getattr(task.get_coro(), '__qualname__', task.get_name())}]"
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        """Return the samples as a speedscope document."""
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "cognition",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(sum(self.weights), 6),
+                    "samples": self.samples,
+                    "weights": [round(w, 6) for w in self.weights],
+                }
+            ],
+        }
+
+
+@dataclass
+class ProfileInfo:
+    """Metadata of one stored profile."""
+
+    id: str
+    session_id: str
+    agent_name: str | None = None
+    provider: str | None = None
+    model: str | None = None
+    status: str | None = None
+    trigger: str = "request"
+    scopes: dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    samples: int = 0
+
+
+class ProfileStore:
+    """Profiles stored as files in a directory, newest ``max_profiles`` kept.
+
+    Each profile is ``<id>.speedscope.json`` plus ``<id>.json`` metadata, so
+    listing reads only the small metadata files.
+    """
+
+    def __init__(self, directory: Path, max_profiles: int = 50) -> None:
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def profile_path(self, profile_id: str) -> Path | None:
+        """Path of the speedscope file for ``profile_id``, if the ID is valid."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return self.directory / f"{profile_id}.speedscope.json"
+
+    def _write(self, path: Path, payload: dict[str, Any]) -> None:
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp_path, path)
+
+    def save(self, info: ProfileInfo, document: dict[str, Any]) -> None:
+        """Write a profile and its metadata, then drop the oldest profiles."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self.directory / f"{info.id}.speedscope.json", document)
+        self._write(self.directory / f"{info.id}.json", asdict(info))
+        for stale in self.list_profiles()[self.max_profiles :]:
+            for suffix in (".json", ".speedscope.json"):
+                (self.directory / f"{stale.id}{suffix}").unlink(missing_ok=True)
+
+    def get(self, profile_id: str) -> ProfileInfo | None:
+        """Return the metadata of ``profile_id``, or None if it is not stored."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return self._read(self.directory / f"{profile_id}.json")
+
+    def _read(self, path: Path) -> ProfileInfo | None:
+        try:
+            return ProfileInfo(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def list_profiles(self) -> list[ProfileInfo]:
+        """Return stored profiles, newest first."""
+        if not self.directory.is_dir():
+            return []
+        profiles = [
+            info
+            for path in self.directory.glob("*.json")
+            if not path.name.endswith(".speedscope.json") and (info := self._read(path)) is not None
+        ]
+        return sorted(profiles, key=lambda info: info.created_at, reverse=True)
+
+    async def asave(self, info: ProfileInfo, profiler: SamplingProfiler) -> None:
+        """Render and save a finished profile from a worker thread."""
+        info.duration_ms = round(profiler.duration * 1000, 1)
+        info.samples = len(profiler.samples)
+        name = f"{info.agent_name or 'agent'} turn in session {info.session_id}"
+
+        def _save() -> None:
+            self.save(info, profiler.speedscope(name))
+
+        try:
+            await asyncio.to_thread(_save)
+        except OSError as e:
+            logger.warning("Failed to store profile", profile_id=info.id, error=str(e))
+            return
+        logger.info(
+            "Turn profile stored",
+            profile_id=info.id,
+            session_id=info.session_id,
+            duration_ms=info.duration_ms,
+            samples=info.samples,
+        )
+
+
+_profile_store: ProfileStore | None = None
+
+
+def get_profile_store() -> ProfileStore | None:
+    """Return the process-wide profile store, or None if profiling is disabled."""
+    return _profile_store
+
+
+def set_profile_store(store: ProfileStore | None) -> None:
+    """Set (or clear) the process-wide profile store."""
+    global _profile_store
+    _profile_store = store
+
+
+__all__ = [
+    "PROFILE_HEADER",
+    "PROFILE_ID_HEADER",
+    "ProfileInfo",
+    "ProfileStore",
+    "SamplingProfiler",
+    "get_profile_store",
+    "new_profile_id",
+    "profile_access_allowed",
+    "profile_trigger",
+    "set_profile_store",
+]
@@ -0,0 +1,257 @@
+"""Per-turn phase timing for agent turns.
+
+A ``TurnTiming`` follows one message from the moment the route receives it
+to the end of its event stream. Each phase the turn passes through (session
+load, agent config resolution, model and tool build, sandbox acquire, graph
+compile or cache lookup, persistence) is timed, together with time to first
+token, inter-token gaps and per-tool execution time.
+
+When the turn finishes, the phases are exported as Prometheus histograms and
+as attributes of a ``cognition.turn`` OpenTelemetry span, and a compact
+summary is attached to the turn's ``done`` event.
+
+The active turn is held in a context variable, so code deep in the call
+stack (graph construction, tool middleware) records into it with
+``turn_phase`` / ``current_turn_timing`` without the timing object being
+threaded through every signature. Outside a turn those calls are no-ops.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from server.app.observability import (
+    INTER_TOKEN_GAP,
+    TIME_TO_FIRST_TOKEN,
+    TOOL_CALL_DURATION,
+    TURN_DURATION,
+    TURN_PHASE_DURATION,
+    get_tracer,
+)
+
+_current_turn: ContextVar[TurnTiming | None] = ContextVar("cognition_turn_timing", default=None)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+@dataclass
+class _Stat:
+    """Count, total and maximum of a repeated duration."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> dict[str, Any]:
+        return {"count": self.count, "total_ms": _ms(self.total), "max_ms": _ms(self.max)}
+
+
+@dataclass
+class TurnTiming:
+    """Phase timings of one agent turn.
+
+    Attributes:
+        session_id: Session the turn belongs to.
+        provider: Provider serving the turn, once the model is resolved.
+        model: Model serving the turn, once the model is resolved.
+        graph_cache_hit: Whether the compiled agent graph came from the cache.
+        phases: Seconds spent per phase; a phase entered twice accumulates.
+        tools: Execution time per tool name.
+        time_to_first_token: Seconds from turn start to the first token.
+        status: How the turn ended, once finished.
+    """
+
+    session_id: str | None = None
+    provider: str = "unknown"
+    model: str = "unknown"
+    graph_cache_hit: bool | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    tools: dict[str, _Stat] = field(default_factory=dict)
+    time_to_first_token: float | None = None
+    status: str | None = None
+    _started_at: float = field(default_factory=time.time, repr=False)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _last_token: float | None = field(default=None, repr=False)
+    _token_gaps: _Stat = field(default_factory=_Stat, repr=False)
+    _duration: float | None = field(default=None, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to phase ``name``.
+
+        Phases recorded after :meth:`finish` (e.g. persisting the reply once
+        the stream has ended) go straight to the phase histogram.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self._duration is not None:
+            TURN_PHASE_DURATION.labels(phase=name).observe(seconds)
+
+    def record_tool(self, name: str, seconds: float) -> None:
+        """Record one execution of tool ``name``."""
+        self.tools.setdefault(name, _Stat()).add(seconds)
+
+    def mark_token(self) -> None:
+        """Record a streamed token.
+
+        The first token sets time to first token; later ones record the gap
+        since the previous token.
+        """
+        now = time.perf_counter()
+        if self._last_token is None:
+            self.time_to_first_token = now - self._start
+        else:
+            gap = now - self._last_token
+            self._token_gaps.add(gap)
+            INTER_TOKEN_GAP.observe(gap)
+        self._last_token = now
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the turn started, or its duration once finished."""
+        if self._duration is not None:
+            return self._duration
+        return time.perf_counter() - self._start
+
+    def summary(self) -> dict[str, Any]:
+        """Compact timing breakdown in milliseconds, as sent on ``done``."""
+        summary: dict[str, Any] = {
+            "total_ms": _ms(self.elapsed),
+            "ttft_ms": _ms(self.time_to_first_token)
+            if self.time_to_first_token is not None
+            else None,
+            "phases": {name: _ms(seconds) for name, seconds in self.phases.items()},
+        }
+        if self.graph_cache_hit is not None:
+            summary["graph_cache_hit"] = self.graph_cache_hit
+        if self._token_gaps.count:
+            summary["inter_token_ms"] = {
+                "mean": _ms(self._token_gaps.total / self._token_gaps.count),
+                "max": _ms(self._token_gaps.max),
+            }
+        if self.tools:
+            summary["tools"] = {name: stat.summary() for name, stat in self.tools.items()}
+        return summary
+
+    def finish(self, status: str) -> dict[str, Any]:
+        """End the turn, export its metrics and span, and return the summary.
+
+        Idempotent: only the first call exports.
+        """
+        if self._duration is None:
+            self._duration = time.perf_counter() - self._start
+            self.status = status
+            self._export(self._duration)
+        return self.summary()
+
+    def _export(self, duration: float) -> None:
+        TURN_DURATION.labels(status=self.status).observe(duration)
+        for name, seconds in self.phases.items():
+            TURN_PHASE_DURATION.labels(phase=name).observe(seconds)
+        if self.time_to_first_token is not None:
+            TIME_TO_FIRST_TOKEN.labels(provider=self.provider, model=self.model).observe(
+                self.time_to_first_token
+            )
+
+        tracer = get_tracer(__name__)
+        if tracer is not None:
+            span = tracer.start_span(
+                "cognition.turn",
+                start_time=int(self._started_at * 1e9),
+                attributes=self.span_attributes(),
+            )
+            span.end()
+
+    def span_attributes(self) -> dict[str, Any]:
+        """Flat OpenTelemetry attributes for the turn."""
+        attributes: dict[str, Any] = {
+            "cognition.turn.status": self.status or "running",
+            "cognition.turn.total_ms": _ms(self.elapsed),
+            "cognition.turn.provider": self.provider,
+            "cognition.turn.model": self.model,
+        }
+        if self.session_id:
+            attributes["cognition.session_id"] = self.session_id
+        if self.time_to_first_token is not None:
+            attributes["cognition.turn.ttft_ms"] = _ms(self.time_to_first_token)
+        if self.graph_cache_hit is not None:
+            attributes["cognition.turn.graph_cache_hit"] = self.graph_cache_hit
+        for name, seconds in self.phases.items():
+            attributes[f"cognition.turn.phase.{name}_ms"] = _ms(seconds)
+        if self._token_gaps.count:
+            attributes["cognition.turn.inter_token_max_ms"] = _ms(self._token_gaps.max)
+        if self.tools:
+            attributes["cognition.turn.tool_calls"] = sum(s.count for s in self.tools.values())
+            attributes["cognition.turn.tool_ms"] = _ms(sum(s.total for s in self.tools.values()))
+        return attributes
+
+
+def current_turn_timing() -> TurnTiming | None:
+    """Return the timing of the turn running in this context, if any."""
+    return _current_turn.get()
+
+
+def set_turn_timing(timing: TurnTiming | None) -> Token[TurnTiming | None]:
+    """Make ``timing`` the current turn for this context and its child tasks."""
+    return _current_turn.set(timing)
+
+
+def reset_turn_timing(token: Token[TurnTiming | None]) -> None:
+    """Undo :func:`set_turn_timing`.
+
+    A streaming generator may be closed from a different context than the
+    one it started in; the current turn is then left for that context to
+    discard.
+    """
+    try:
+        _current_turn.reset(token)
+    except ValueError:
+        pass
+
+
+@contextmanager
+def turn_phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as phase ``name`` of the current turn, if any."""
+    timing = _current_turn.get()
+    if timing is None:
+        yield
+        return
+    with timing.phase(name):
+        yield
+
+
+def record_tool_duration(name: str, seconds: float) -> None:
+    """Export one tool execution and add it to the current turn, if any."""
+    TOOL_CALL_DURATION.labels(tool_name=name).observe(seconds)
+    timing = _current_turn.get()
+    if timing is not None:
+        timing.record_tool(name, seconds)
+
+
+__all__ = [
+    "TurnTiming",
+    "current_turn_timing",
+    "record_tool_duration",
+    "reset_turn_timing",
+    "set_turn_timing",
+    "turn_phase",
+]
@@ -1,14 +1,27 @@
 """Rate limiting implementation for Cognition.
 
-Supports token bucket and sliding window algorithms.
+Limits are enforced with the generic cell rate algorithm (GCRA): each key
+stores a single float, its *theoretical arrival time* (TAT). A request of
+``cost`` units is admitted when, after advancing the TAT by ``cost`` emission
+intervals, it lies no more than ``burst`` intervals in the future. This is
+equivalent to a token bucket with fractional refill, but needs no refill
+bookkeeping and no lock: the read-modify-write happens without an ``await``.
+
+Storage of TATs is pluggable through :class:`RateLimiterBackend`:
+
+- :class:`InMemoryRateLimiterBackend` — per-process, the default.
+- ``SqliteRateLimiterBackend`` / ``PostgresRateLimiterBackend``
+  (``server.app.storage.rate_limit_store``) — shared across replicas.
+- :class:`LeasingRateLimiterBackend` — wraps a shared backend and claims
+  small batches of capacity, so most checks are served locally.
 """
 
 from __future__ import annotations
 
 import asyncio
 import time
-from collections import defaultdict
 from dataclasses import dataclass
+from typing import Protocol, runtime_checkable
 
 import structlog
 
@@ -24,12 +37,195 @@ class RateLimitConfig:
     requests_per_minute: int = 60
     burst_size: int = 10  # Allow short bursts
     window_seconds: int = 60
+    # Per-scope (tenant) quotas shared by all sessions in the scope; 0 disables.
+    scope_requests_per_minute: int = 0
+    scope_burst_size: int = 0
+    scope_tokens_per_minute: int = 0
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A GCRA limit: ``limit`` units per ``period_seconds``, bursting to ``burst``."""
+
+    limit: float
+    period_seconds: float = 60.0
+    burst: float = 1.0
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds of capacity consumed by one unit."""
+        return self.period_seconds / self.limit
+
+    @property
+    def tolerance(self) -> float:
+        """How far the TAT may run ahead of now, in seconds."""
+        return self.burst * self.emission_interval
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    remaining: float
+    retry_after: float = 0.0
+
+
+def gcra(
+    tat: float | None,
+    now: float,
+    rule: RateLimitRule,
+    cost: float = 1.0,
+    force: bool = False,
+) -> tuple[float | None, RateLimitDecision]:
+    """Apply one GCRA step.
+
+    Args:
+        tat: Stored theoretical arrival time, or None for an unseen key.
+        now: Current time on the same clock as ``tat``.
+        rule: Limit to enforce.
+        cost: Units requested. ``0`` checks that the key is not in debt.
+        force: Record the cost even if it exceeds the limit. Used for usage
+            that has already happened (e.g. LLM tokens), so later checks are
+            denied until the debt is repaid.
+
+    Returns:
+        The new TAT (unchanged when denied) and the decision.
+    """
+    interval = rule.emission_interval
+    base = now if tat is None else max(tat, now)
+    new_tat = base + cost * interval
+    allow_at = new_tat - rule.tolerance
+    if allow_at <= now or force:
+        remaining = max(0.0, (rule.tolerance - (new_tat - now)) / interval)
+        return new_tat, RateLimitDecision(allowed=True, remaining=remaining)
+    remaining = max(0.0, (rule.tolerance - (base - now)) / interval)
+    return tat, RateLimitDecision(allowed=False, remaining=remaining, retry_after=allow_at - now)
+
+
+@runtime_checkable
+class RateLimiterBackend(Protocol):
+    """Storage for per-key GCRA state."""
+
+    async def acquire(
+        self, key: str, rule: RateLimitRule, cost: float = 1.0, force: bool = False
+    ) -> RateLimitDecision:
+        """Atomically apply :func:`gcra` to ``key``."""
+        ...
+
+    async def prune(self) -> int:
+        """Drop keys whose capacity has fully recovered. Returns the count."""
+        ...
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+        ...
+
+
+class InMemoryRateLimiterBackend:
+    """Per-process GCRA state in a dict.
+
+    ``acquire`` never awaits between reading and writing a key, so it is atomic
+    with respect to other coroutines on the event loop without a lock.
+    """
+
+    def __init__(self) -> None:
+        self._tats: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    async def acquire(
+        self, key: str, rule: RateLimitRule, cost: float = 1.0, force: bool = False
+    ) -> RateLimitDecision:
+        new_tat, decision = gcra(self._tats.get(key), time.monotonic(), rule, cost, force)
+        if new_tat is not None:
+            self._tats[key] = new_tat
+        return decision
+
+    async def prune(self) -> int:
+        # A TAT in the past means a full bucket, which is the same as no entry.
+        now = time.monotonic()
+        stale = [key for key, tat in self._tats.items() if tat <= now]
+        for key in stale:
+            del self._tats[key]
+        return len(stale)
+
+    async def close(self) -> None:
+        self._tats.clear()
+
+
+@dataclass
+class _Lease:
+    units: float
+    expires_at: float
+
+
+class LeasingRateLimiterBackend:
+    """Serve checks from locally leased capacity of a shared backend.
+
+    On a local miss, up to ``lease_size`` units are claimed from ``inner`` in a
+    single call, and subsequent checks for that key are admitted locally until
+    the lease is spent or ``lease_ttl_seconds`` pass. Unspent units of an
+    expired lease are forfeited, so the deployment never admits more than the
+    configured limit; the cost is slight under-admission when a replica's
+    traffic for a key stops mid-lease.
+    """
+
+    def __init__(
+        self,
+        inner: RateLimiterBackend,
+        lease_size: int = 5,
+        lease_ttl_seconds: float = 2.0,
+    ) -> None:
+        self.inner = inner
+        self.lease_size = lease_size
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self._leases: dict[str, _Lease] = {}
+
+    async def acquire(
+        self, key: str, rule: RateLimitRule, cost: float = 1.0, force: bool = False
+    ) -> RateLimitDecision:
+        if force or cost == 0:
+            # Debt recording and debt checks must see the shared state.
+            return await self.inner.acquire(key, rule, cost, force)
+
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease.expires_at > now and lease.units >= cost:
+            lease.units -= cost
+            return RateLimitDecision(allowed=True, remaining=lease.units)
+
+        # Never lease more than the burst, or a single replica could hold
+        # capacity another replica is entitled to use right now.
+        claim = max(cost, min(float(self.lease_size), rule.burst))
+        decision = await self.inner.acquire(key, rule, claim)
+        if not decision.allowed and claim > cost:
+            claim = cost
+            decision = await self.inner.acquire(key, rule, claim)
+        if not decision.allowed:
+            return decision
+
+        self._leases[key] = _Lease(units=claim - cost, expires_at=now + self.lease_ttl_seconds)
+        return RateLimitDecision(allowed=True, remaining=claim - cost)
+
+    async def prune(self) -> int:
+        now = time.monotonic()
+        for key in [k for k, lease in self._leases.items() if lease.expires_at <= now]:
+            del self._leases[key]
+        return await self.inner.prune()
+
+    async def close(self) -> None:
+        self._leases.clear()
+        await self.inner.close()
 
 
 class TokenBucket:
     """Token bucket rate limiter.
 
-    Allows bursts up to burst_size, then enforces steady rate.
+    Allows bursts up to burst_size, then enforces steady rate. Tokens accrue
+    fractionally; the bucket is only touched from the event loop thread, so no
+    lock is needed.
     """
 
     def __init__(self, rate: float, capacity: int):
@@ -41,9 +237,13 @@ class TokenBucket:
         """
         self.rate = rate
         self.capacity = capacity
-        self.tokens = capacity
-        self.last_update = time.time()
-        self._lock = asyncio.Lock()
+        self.tokens: float = capacity
+        self.last_update = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.rate)
+        self.last_update = now
 
     async def acquire(self) -> bool:
         """Try to acquire a token.
@@ -51,42 +251,70 @@ class TokenBucket:
         Returns:
             True if token acquired, False otherwise
         """
-        async with self._lock:
-            now = time.time()
-            elapsed = now - self.last_update
-
-            # Add tokens based on elapsed time
-            self.tokens = int(min(self.capacity, self.tokens + elapsed * self.rate))
-            self.last_update = now
-
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return True
-            return False
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
 
     async def wait_time(self) -> float:
         """Calculate time until next token available."""
-        async with self._lock:
-            if self.tokens >= 1:
-                return 0.0
-            return (1 - self.tokens) / self.rate
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def scope_key(scope: dict[str, str]) -> str:
+    """Stable rate limit key for a scope, independent of header order."""
+    return "scope:" + "&".join(f"{k}={v}" for k, v in sorted(scope.items()))
 
 
 class RateLimiter:
-    """Rate limiter for WebSocket connections and API endpoints."""
+    """Rate limiter for API endpoints.
 
-    def __init__(self, config: RateLimitConfig | None = None):
+    ``check_rate_limit`` enforces the per-key request limit from
+    :class:`RateLimitConfig`. ``check_scope_quota`` and ``record_token_usage``
+    enforce optional per-scope quotas shared by every session in a scope.
+    """
+
+    def __init__(
+        self,
+        config: RateLimitConfig | None = None,
+        backend: RateLimiterBackend | None = None,
+    ):
         """Initialize rate limiter.
 
         Args:
             config: Rate limiting configuration
+            backend: Where limiter state is kept; in-process by default.
         """
         self.config = config or RateLimitConfig()
-        self.buckets: dict[str, TokenBucket] = defaultdict(
-            lambda: TokenBucket(
-                rate=self.config.requests_per_minute / 60,
-                capacity=self.config.burst_size,
+        self.backend: RateLimiterBackend = backend or InMemoryRateLimiterBackend()
+        self.rule = RateLimitRule(
+            limit=self.config.requests_per_minute,
+            period_seconds=60.0,
+            burst=self.config.burst_size,
+        )
+        self.scope_request_rule = (
+            RateLimitRule(
+                limit=self.config.scope_requests_per_minute,
+                period_seconds=60.0,
+                burst=self.config.scope_burst_size or self.config.scope_requests_per_minute,
+            )
+            if self.config.scope_requests_per_minute > 0
+            else None
+        )
+        # A minute's worth of tokens may be spent at once; beyond that the
+        # scope is in debt until it recovers.
+        self.scope_token_rule = (
+            RateLimitRule(
+                limit=self.config.scope_tokens_per_minute,
+                period_seconds=60.0,
+                burst=self.config.scope_tokens_per_minute,
             )
+            if self.config.scope_tokens_per_minute > 0
+            else None
         )
         self._cleanup_task: asyncio.Task | None = None
 
@@ -95,60 +323,108 @@ class RateLimiter:
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
 
     async def stop(self) -> None:
-        """Stop background cleanup task."""
+        """Stop background cleanup task and release the backend."""
         if self._cleanup_task:
             self._cleanup_task.cancel()
             try:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
+        await self.backend.close()
 
-    async def check_rate_limit(self, key: str) -> None:
+    async def check_rate_limit(self, key: str, cost: float = 1.0) -> None:
         """Check if request is within rate limit.
 
         Args:
             key: Rate limit key (e.g., client_id, session_id, IP)
+            cost: Units consumed by this request.
 
         Raises:
             RateLimitError: If rate limit exceeded
         """
-        bucket = self.buckets[key]
-
-        if not await bucket.acquire():
-            _wait_time = await bucket.wait_time()
+        decision = await self.backend.acquire(key, self.rule, cost)
+        if not decision.allowed:
             raise RateLimitError(
                 resource=key,
                 limit=self.config.requests_per_minute,
                 window=self.config.window_seconds,
+                retry_after=decision.retry_after,
             )
 
+    async def check_scope_quota(self, scope: dict[str, str]) -> None:
+        """Enforce the per-scope request quota and token budget.
+
+        Raises:
+            RateLimitError: If the scope is over its request quota or has
+                spent more than its token budget.
+        """
+        if not scope:
+            return
+        key = scope_key(scope)
+        if self.scope_token_rule is not None:
+            decision = await self.backend.acquire(f"{key}:tokens", self.scope_token_rule, 0)
+            if not decision.allowed:
+                raise RateLimitError(
+                    resource=f"{key}:tokens",
+                    limit=self.config.scope_tokens_per_minute,
+                    window=60,
+                    retry_after=decision.retry_after,
+                )
+        if self.scope_request_rule is not None:
+            decision = await self.backend.acquire(f"{key}:requests", self.scope_request_rule)
+            if not decision.allowed:
+                raise RateLimitError(
+                    resource=f"{key}:requests",
+                    limit=self.config.scope_requests_per_minute,
+                    window=60,
+                    retry_after=decision.retry_after,
+                )
+
+    async def record_token_usage(self, scope: dict[str, str], tokens: int) -> None:
+        """Charge ``tokens`` against the scope's token budget."""
+        if not scope or self.scope_token_rule is None or tokens <= 0:
+            return
+        await self.backend.acquire(
+            f"{scope_key(scope)}:tokens", self.scope_token_rule, tokens, force=True
+        )
+
     async def _cleanup_loop(self) -> None:
-        """Periodically clean up unused buckets."""
+        """Periodically drop state for keys that have fully recovered."""
         while True:
             try:
                 await asyncio.sleep(300)  # Clean up every 5 minutes
-
-                # Remove buckets that haven't been used in 10 minutes
-                cutoff = time.time() - 600
-                keys_to_remove = [
-                    key for key, bucket in self.buckets.items() if bucket.last_update < cutoff
-                ]
-                for key in keys_to_remove:
-                    del self.buckets[key]
-
+                await self.backend.prune()
             except asyncio.CancelledError:
                 break
             except Exception:
-                logger.exception("Rate limiter bucket cleanup failed")
+                logger.exception("Rate limiter cleanup failed")
 
 
 # Global rate limiter instance
 _rate_limiter: RateLimiter | None = None
 
 
-def get_rate_limiter(config: RateLimitConfig | None = None) -> RateLimiter:
+def get_rate_limiter(
+    config: RateLimitConfig | None = None,
+    backend: RateLimiterBackend | None = None,
+) -> RateLimiter:
     """Get or create global rate limiter instance."""
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RateLimiter(config)
+        _rate_limiter = RateLimiter(config, backend)
     return _rate_limiter
+
+
+__all__ = [
+    "InMemoryRateLimiterBackend",
+    "LeasingRateLimiterBackend",
+    "RateLimitConfig",
+    "RateLimitDecision",
+    "RateLimitRule",
+    "RateLimiter",
+    "RateLimiterBackend",
+    "TokenBucket",
+    "gcra",
+    "get_rate_limiter",
+    "scope_key",
+]
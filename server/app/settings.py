@@ -32,6 +32,32 @@ class Settings(BaseSettings):
     host: str = Field(default="127.0.0.1", alias="COGNITION_HOST")
     port: int = Field(default=8000, alias="COGNITION_PORT")
     log_level: str = Field(default="info", alias="COGNITION_LOG_LEVEL")
+    log_json: bool = Field(
+        default=False,
+        alias="COGNITION_LOG_JSON",
+        description="Render logs as JSON lines instead of console output.",
+    )
+    log_async: bool = Field(
+        default=True,
+        alias="COGNITION_LOG_ASYNC",
+        description=(
+            "Render and write logs on a background thread through a bounded queue "
+            "instead of on the event loop."
+        ),
+    )
+    log_queue_size: int = Field(
+        default=10_000,
+        alias="COGNITION_LOG_QUEUE_SIZE",
+        description="Log events buffered by the async sink before new ones are dropped.",
+    )
+    log_sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        alias="COGNITION_LOG_SAMPLE_RATES",
+        description=(
+            'Fraction of log events kept per event name, as JSON, e.g. {"HTTP request": '
+            "0.01}. Warnings and errors are always kept."
+        ),
+    )
 
     # Workspace settings
     workspace_root: Path = Field(
@@ -81,6 +107,42 @@ class Settings(BaseSettings):
     # Rate limiting settings
     rate_limit_per_minute: int = Field(default=60, alias="COGNITION_RATE_LIMIT_PER_MINUTE")
     rate_limit_burst: int = Field(default=10, alias="COGNITION_RATE_LIMIT_BURST")
+    rate_limit_backend: Literal["memory", "shared"] = Field(
+        default="memory",
+        alias="COGNITION_RATE_LIMIT_BACKEND",
+        description=(
+            "Where rate limiter state is kept: 'memory' (per process) or 'shared' "
+            "(the persistence database, so limits hold across replicas)."
+        ),
+    )
+    rate_limit_lease_size: int = Field(
+        default=5,
+        alias="COGNITION_RATE_LIMIT_LEASE_SIZE",
+        description=(
+            "Units a replica claims from the shared backend per database round trip. "
+            "1 disables leasing."
+        ),
+    )
+    rate_limit_lease_ttl_seconds: float = Field(
+        default=2.0,
+        alias="COGNITION_RATE_LIMIT_LEASE_TTL_SECONDS",
+        description="How long leased units stay usable before they are forfeited.",
+    )
+    rate_limit_scope_per_minute: int = Field(
+        default=0,
+        alias="COGNITION_RATE_LIMIT_SCOPE_PER_MINUTE",
+        description="Message requests per minute per scope (tenant). 0 disables.",
+    )
+    rate_limit_scope_burst: int = Field(
+        default=0,
+        alias="COGNITION_RATE_LIMIT_SCOPE_BURST",
+        description="Burst for the per-scope request quota. 0 uses the per-minute value.",
+    )
+    rate_limit_scope_tokens_per_minute: int = Field(
+        default=0,
+        alias="COGNITION_RATE_LIMIT_SCOPE_TOKENS_PER_MINUTE",
+        description="LLM tokens (input + output) per minute per scope. 0 disables.",
+    )
 
     # Observability settings
     otel_enabled: bool = Field(default=False, alias="COGNITION_OTEL_ENABLED")
@@ -155,6 +217,34 @@ class Settings(BaseSettings):
         alias="COGNITION_DOCKER_CPU_LIMIT",
     )
 
+    sandbox_health_check_interval_seconds: float = Field(
+        default=30.0,
+        alias="COGNITION_SANDBOX_HEALTH_CHECK_INTERVAL_SECONDS",
+        description=(
+            "Minimum time between health checks of a session's reused sandbox. A dead "
+            "container or sandbox pod is re-provisioned on the next command. "
+            "Negative disables checks."
+        ),
+    )
+    sandbox_max_concurrent_ops: int = Field(
+        default=32,
+        ge=1,
+        alias="COGNITION_SANDBOX_MAX_CONCURRENT_OPS",
+        description=(
+            "Sandbox file and command operations running at once across all sessions; "
+            "also the size of the sandbox thread pool."
+        ),
+    )
+    sandbox_max_concurrent_ops_per_session: int = Field(
+        default=4,
+        ge=1,
+        alias="COGNITION_SANDBOX_MAX_CONCURRENT_OPS_PER_SESSION",
+        description=(
+            "Sandbox operations one session runs at once when the model issues "
+            "parallel tool calls; further calls queue."
+        ),
+    )
+
     # Kubernetes sandbox settings (only used when sandbox_backend="kubernetes")
     k8s_sandbox_template: str = Field(
         default="cognition-sandbox",
@@ -181,6 +271,24 @@ class Settings(BaseSettings):
         alias="COGNITION_K8S_SANDBOX_WARM_POOL",
         description="Optional SandboxWarmPool CR name for pre-warmed sandbox allocation.",
     )
+    k8s_sandbox_preclaim: bool = Field(
+        default=False,
+        alias="COGNITION_K8S_SANDBOX_PRECLAIM",
+        description=(
+            "Start claiming a session's K8s sandbox when the session is created and when "
+            "a message arrives, in parallel with model resolution, instead of on the "
+            "first tool call."
+        ),
+    )
+
+    prompt_cache_enabled: bool = Field(
+        default=True,
+        alias="COGNITION_PROMPT_CACHE_ENABLED",
+        description=(
+            "Mark the static system prompt and the conversation for provider prompt "
+            "caching on Bedrock models that support it (Claude, Nova)."
+        ),
+    )
 
     blocked_tools: list[str] = Field(
         default=[],
@@ -216,6 +324,124 @@ class Settings(BaseSettings):
         alias="COGNITION_MODEL_CATALOG_TTL_SECONDS",
         description="How long (in seconds) to cache the model catalog in memory.",
     )
+    model_catalog_snapshot_path: str = Field(
+        default=".cognition/model-catalog.json",
+        alias="COGNITION_MODEL_CATALOG_SNAPSHOT_PATH",
+        description=(
+            "On-disk snapshot of the last fetched catalog, relative to the workspace "
+            "unless absolute. Loaded at startup so the catalog is available without "
+            "network access. Empty disables the snapshot."
+        ),
+    )
+
+    # Compiled-graph warmup settings
+    graph_warmup_enabled: bool = Field(
+        default=True,
+        alias="COGNITION_GRAPH_WARMUP_ENABLED",
+        description="Record hot agent-graph fingerprints and precompile them at startup.",
+    )
+    graph_warmup_max_entries: int = Field(
+        default=50,
+        alias="COGNITION_GRAPH_WARMUP_MAX_ENTRIES",
+        description="Maximum number of fingerprints kept in the warmup manifest.",
+    )
+    graph_warmup_flush_interval_seconds: float = Field(
+        default=60.0,
+        alias="COGNITION_GRAPH_WARMUP_FLUSH_INTERVAL_SECONDS",
+        description="How often the warmup manifest is written to disk.",
+    )
+    preload_agent_runtime: bool = Field(
+        default=True,
+        alias="COGNITION_PRELOAD_AGENT_RUNTIME",
+        description=(
+            "Import the agent runtime (Deep Agents, LangChain chat models) in the "
+            "background after startup instead of on the first request."
+        ),
+    )
+
+    # Agent session cache settings
+    agent_session_idle_ttl_seconds: float = Field(
+        default=1800.0,
+        alias="COGNITION_AGENT_SESSION_IDLE_TTL_SECONDS",
+        description=(
+            "Evict a session's cached agent service and terminate its sandbox after "
+            "this long without a turn. 0 disables idle eviction."
+        ),
+    )
+    agent_session_max_live: int = Field(
+        default=1000,
+        alias="COGNITION_AGENT_SESSION_MAX_LIVE",
+        description=(
+            "Maximum sessions with a cached agent service per process; the least "
+            "recently used idle sessions are evicted beyond this. 0 disables the cap."
+        ),
+    )
+    agent_session_sweep_interval_seconds: float = Field(
+        default=60.0,
+        alias="COGNITION_AGENT_SESSION_SWEEP_INTERVAL_SECONDS",
+        description="How often idle agent sessions are checked for eviction.",
+    )
+
+    # Event-loop monitor settings
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        alias="COGNITION_LOOP_MONITOR_ENABLED",
+        description="Sample event-loop lag and export it as a histogram.",
+    )
+    loop_monitor_interval_seconds: float = Field(
+        default=0.5,
+        alias="COGNITION_LOOP_MONITOR_INTERVAL_SECONDS",
+        description="How often event-loop lag is sampled.",
+    )
+    loop_monitor_debug: bool = Field(
+        default=False,
+        alias="COGNITION_LOOP_MONITOR_DEBUG",
+        description=(
+            "Capture the stack, route and session of callbacks that block the event "
+            "loop past the slow-callback threshold."
+        ),
+    )
+    loop_monitor_slow_callback_seconds: float = Field(
+        default=0.1,
+        alias="COGNITION_LOOP_MONITOR_SLOW_CALLBACK_SECONDS",
+        description="Block duration after which debug mode captures the loop's stack.",
+    )
+
+    # Turn profiling settings
+    profiling_enabled: bool = Field(
+        default=False,
+        alias="COGNITION_PROFILING_ENABLED",
+        description=(
+            "Allow agent turns to run under the sampling profiler, on request or "
+            "sampled, with profiles stored under .cognition/profiles/."
+        ),
+    )
+    profiling_token: SecretStr | None = Field(
+        default=None,
+        alias="COGNITION_PROFILING_TOKEN",
+        description=(
+            "Token the X-Cognition-Profile header must carry "
+            "to profile a turn or read profiles. While unset, requests are refused "
+            "and only sampled turns are profiled."
+        ),
+    )
+    profiling_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        alias="COGNITION_PROFILING_SAMPLE_RATE",
+        description="Fraction of turns profiled without being requested.",
+    )
+    profiling_interval_seconds: float = Field(
+        default=0.005,
+        alias="COGNITION_PROFILING_INTERVAL_SECONDS",
+        description="Time between profiler stack samples.",
+    )
+    profiling_max_profiles: int = Field(
+        default=50,
+        alias="COGNITION_PROFILING_MAX_PROFILES",
+        description="Number of most recent profiles kept on disk.",
+    )
 
     # SSE (Server-Sent Events) settings
     sse_heartbeat_interval_seconds: float = Field(
@@ -0,0 +1,174 @@
+"""Startup profiling for the Cognition server.
+
+Two measurements matter for how quickly a new replica can take traffic:
+
+- **Import time** — what ``import server.app.main`` costs, broken down by
+  module. Collected from ``python -X importtime`` in a fresh interpreter so the
+  numbers are not skewed by modules the caller already imported.
+- **Time to ready** — wall-clock time from launching the server process until
+  ``GET /ready`` returns 200.
+
+Heavy subsystems (Deep Agents, the LangChain provider registry, MCP, the
+OpenTelemetry SDK, watchdog) are imported on first use rather than at startup.
+``preload_deferred_modules`` imports the agent runtime in a worker thread after
+the server is up, so the first request does not pay for it either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Modules needed to serve the first agent turn but not to start the server.
+DEFERRED_MODULES: tuple[str, ...] = (
+    "deepagents",
+    "langchain.chat_models",
+    "server.app.agent.middleware",
+)
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Import cost of a single module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse ``python -X importtime`` output into per-module timings."""
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            timings.append(
+                ImportTiming(
+                    module=name.strip(),
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=(len(name) - len(name.lstrip()) - 1) // 2,
+                )
+            )
+        except ValueError:
+            # Header line ("self [us] | cumulative | imported package").
+            continue
+    return timings
+
+
+def profile_imports(module: str = "server.app.main") -> list[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and return per-module timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_time_to_ready(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    timeout: float = 60.0,
+    extra_env: dict[str, str] | None = None,
+) -> float:
+    """Start the server in a subprocess and return seconds until ``/ready`` is 200.
+
+    The server runs from a temporary directory, so the state it creates on
+    startup (``.cognition/``, workspaces) does not land in the caller's tree.
+
+    Raises:
+        TimeoutError: If the server is not ready within ``timeout`` seconds.
+        RuntimeError: If the server process exits before becoming ready.
+    """
+    import httpx
+
+    project_root = str(Path(__file__).resolve().parents[2])
+    pythonpath = os.pathsep.join(p for p in (project_root, os.environ.get("PYTHONPATH")) if p)
+    env = {**os.environ, "PYTHONPATH": pythonpath, **(extra_env or {})}
+    cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "server.app.main:app",
+        "--host",
+        host,
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+    ]
+    url = f"http://{host}:{port}/ready"
+    workdir = tempfile.TemporaryDirectory(prefix="cognition-startup-")
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=workdir.name, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if proc.poll() is not None:
+                    stderr = proc.stderr.read().decode(errors="replace") if proc.stderr else ""
+                    raise RuntimeError(f"Server exited with code {proc.returncode}:\n{stderr}")
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.05)
+        raise TimeoutError(f"Server not ready after {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        workdir.cleanup()
+
+
+def _import_modules(modules: Sequence[str]) -> dict[str, float]:
+    durations: dict[str, float] = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.debug("Deferred module unavailable", module=name, error=str(e))
+            continue
+        durations[name] = round((time.perf_counter() - started) * 1000, 1)
+    return durations
+
+
+async def preload_deferred_modules(modules: Sequence[str] = DEFERRED_MODULES) -> None:
+    """Import ``modules`` in a worker thread so the first agent turn is warm."""
+    durations = await asyncio.to_thread(_import_modules, modules)
+    logger.info("Deferred modules preloaded", duration_ms=durations)
+
+
+__all__ = [
+    "DEFERRED_MODULES",
+    "ImportTiming",
+    "measure_time_to_ready",
+    "parse_importtime",
+    "preload_deferred_modules",
+    "profile_imports",
+]
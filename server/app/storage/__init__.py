@@ -16,7 +16,9 @@ from server.app.storage.backend import (
 from server.app.storage.factory import (
     create_config_dispatcher,
     create_config_registry,
+    create_rate_limiter_backend,
     create_storage_backend,
+    create_usage_ledger,
 )
 
 __all__ = [
@@ -26,5 +28,7 @@ __all__ = [
     "StorageBackend",
     "create_config_dispatcher",
     "create_config_registry",
+    "create_rate_limiter_backend",
     "create_storage_backend",
+    "create_usage_ledger",
 ]
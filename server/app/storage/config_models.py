@@ -29,6 +29,7 @@ PROVIDER_TYPES = {
     "openai_compatible",
     "google_genai",
     "google_vertexai",
+    "scripted_mock",
 }
 
 # ---------------------------------------------------------------------------
@@ -43,7 +44,8 @@ class ProviderConfig(BaseModel):
 
     Attributes:
         id: Unique provider identifier (e.g. "openai-gpt4o", "bedrock-claude").
-        provider: Provider type key ("openai", "bedrock", "openai_compatible", "mock").
+        provider: Provider type key ("openai", "bedrock", "openai_compatible",
+            "scripted_mock", "mock").
         model: Model ID for this entry (e.g. "gpt-4o").
         display_name: Human-readable label for UIs.
         enabled: Whether the provider is active.
@@ -54,6 +56,7 @@ class ProviderConfig(BaseModel):
         region: AWS region for Bedrock providers.
         role_arn: IAM role ARN for cross-account Bedrock access.
         extra: Provider-specific options that don't have first-class fields.
+            For ``scripted_mock`` this is the ``LatencyProfile``.
         scope: Scope this entry applies to. Empty dict = global default.
         source: "file" for bootstrap rows, "api" for API-written rows.
     """
@@ -116,6 +119,11 @@ class ProviderConfig(BaseModel):
         if self.role_arn is not None and self.provider != "bedrock":
             raise ValueError("role_arn is only valid for bedrock providers")
 
+        if self.provider == "scripted_mock":
+            from server.app.llm.mock import LatencyProfile
+
+            LatencyProfile.model_validate(self.extra)
+
         return self
 
 
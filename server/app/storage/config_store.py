@@ -19,7 +19,10 @@ dependency-injected interface.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Protocol, cast, runtime_checkable
@@ -38,6 +41,7 @@ from server.app.storage.config_models import (
     GlobalAgentDefaults,
     GlobalProviderDefaults,
     McpServerRegistration,
+    OperationType,
     ProviderConfig,
     SkillDefinition,
     ToolRegistration,
@@ -45,6 +49,15 @@ from server.app.storage.config_models import (
 
 logger = logging.getLogger(__name__)
 
+AgentChangeListener = Callable[[ConfigChangeEvent], Awaitable[None]]
+
+# File suffixes recognised under .cognition/agents, in load precedence order.
+# When two files declare the same agent name, the later suffix wins.
+_AGENT_FILE_SUFFIXES: tuple[str, ...] = (".yaml", ".yml", ".md")
+
+# (st_mtime_ns, st_size, st_ino) — cheap change detection without reading files.
+FileSignature = tuple[int, int, int]
+
 _default_store: DefaultConfigStore | None = None
 
 
@@ -212,6 +225,73 @@ class ConfigStore(Protocol):
     async def mark_changes_processed(self, change_ids: list[int]) -> None: ...
 
 
+def _scan_agent_files(agents_dir: Path) -> dict[Path, FileSignature]:
+    """Return the stat signature of every agent definition file in ``agents_dir``."""
+    signatures: dict[Path, FileSignature] = {}
+    try:
+        entries = os.scandir(agents_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return signatures
+
+    with entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1] not in _AGENT_FILE_SUFFIXES:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            signatures[Path(entry.path)] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return signatures
+
+
+def _parse_agent_file(path: Path) -> AgentDefinition | None:
+    """Parse one agent definition file, logging and returning None on failure."""
+    try:
+        if path.suffix == ".md":
+            definition = load_agent_definition_from_markdown(path)
+        else:
+            definition = load_agent_definition(path)
+    except Exception as exc:
+        kind = "Markdown" if path.suffix == ".md" else "YAML"
+        logger.warning("Failed to load agent from %s %s: %s", kind, path, exc)
+        return None
+    definition.native = False
+    return definition
+
+
+def _scan_and_parse_agent_files(
+    agents_dir: Path,
+    known: dict[Path, FileSignature],
+) -> tuple[dict[Path, FileSignature], dict[Path, AgentDefinition | None]]:
+    """Stat the agents directory and parse only new or changed files.
+
+    Blocking (filesystem + YAML); callers on the event loop should run it in a
+    worker thread.
+
+    Returns:
+        ``(signatures, parsed)`` — the current signature of every file, and the
+        freshly parsed definition (or None on parse failure) for each file whose
+        signature differs from ``known``.
+    """
+    signatures = _scan_agent_files(agents_dir)
+    parsed = {
+        path: _parse_agent_file(path)
+        for path, signature in signatures.items()
+        if known.get(path) != signature
+    }
+    return signatures, parsed
+
+
+def _agent_file_precedence(path: Path) -> tuple[int, str]:
+    try:
+        return _AGENT_FILE_SUFFIXES.index(path.suffix), path.name
+    except ValueError:
+        return len(_AGENT_FILE_SUFFIXES), path.name
+
+
 class DefaultConfigStore:
     """Default ConfigStore implementation.
 
@@ -227,6 +307,12 @@ class DefaultConfigStore:
         self._config_registry = config_registry
         self._workspace_path = Path(workspace_path) if workspace_path else Path.cwd()
         self._agent_definitions: dict[str, AgentDefinition] = {}
+        self._builtin_agents: dict[str, AgentDefinition] = {}
+        # Per-file cache of parsed agent definitions, keyed by absolute path.
+        self._file_signatures: dict[Path, FileSignature] = {}
+        self._file_agents: dict[Path, AgentDefinition | None] = {}
+        self._agent_listeners: list[AgentChangeListener] = []
+        self._reload_lock = asyncio.Lock()
         self._init_builtin_agents()
         self.reload_file_agents()
 
@@ -298,37 +384,136 @@ Attempt the exact protected tool call immediately so that human-in-the-loop appr
             config=AgentConfig(),
         )
         self._agent_definitions["hitl_test"] = hitl_test_agent
+        self._builtin_agents = dict(self._agent_definitions)
+
+    # ------------------------------------------------------------------
+    # Agent change notifications
+    # ------------------------------------------------------------------
 
-    def reload_file_agents(self) -> None:
-        self._agent_definitions = {
-            name: agent for name, agent in self._agent_definitions.items() if agent.native
-        }
-        agents_dir = self._workspace_path / ".cognition" / "agents"
-        if not agents_dir.exists():
+    def subscribe_agent_changes(self, handler: AgentChangeListener) -> None:
+        """Register a coroutine function notified once per changed agent.
+
+        Events carry ``entity_type="agent"`` and the agent name, so downstream
+        caches can invalidate just the affected agents.
+        """
+        if handler not in self._agent_listeners:
+            self._agent_listeners.append(handler)
+
+    def unsubscribe_agent_changes(self, handler: AgentChangeListener) -> None:
+        """Remove a previously registered agent change handler."""
+        try:
+            self._agent_listeners.remove(handler)
+        except ValueError:
+            pass
+
+    async def _emit_agent_changes(self, changes: dict[str, OperationType]) -> None:
+        for name, operation in changes.items():
+            event = ConfigChangeEvent(entity_type="agent", name=name, scope={}, operation=operation)
+            for handler in list(self._agent_listeners):
+                try:
+                    await handler(event)
+                except Exception:
+                    logger.exception(
+                        "Agent change listener raised",
+                        extra={"handler": getattr(handler, "__name__", repr(handler))},
+                    )
+
+    def _emit_agent_changes_soon(self, changes: dict[str, OperationType]) -> None:
+        """Fire-and-forget variant for sync callers; no-op without a running loop."""
+        if not changes or not self._agent_listeners:
             return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self._emit_agent_changes(changes))
 
-        for yaml_path in agents_dir.glob("*.yaml"):
-            try:
-                definition = load_agent_definition(yaml_path)
-                definition.native = False
-                self._agent_definitions[definition.name] = definition
-            except Exception as exc:
-                logger.warning("Failed to load agent from YAML %s: %s", yaml_path, exc)
+    # ------------------------------------------------------------------
+    # File-backed agents (.cognition/agents)
+    # ------------------------------------------------------------------
 
-        for yml_path in agents_dir.glob("*.yml"):
-            try:
-                definition = load_agent_definition(yml_path)
-                definition.native = False
-                self._agent_definitions[definition.name] = definition
-            except Exception as exc:
-                logger.warning("Failed to load agent from YAML %s: %s", yml_path, exc)
+    @property
+    def agents_dir(self) -> Path:
+        return self._workspace_path / ".cognition" / "agents"
 
-        for md_path in agents_dir.glob("*.md"):
-            try:
-                definition = load_agent_definition_from_markdown(md_path)
-                self._agent_definitions[definition.name] = definition
-            except Exception as exc:
-                logger.warning("Failed to load agent from Markdown %s: %s", md_path, exc)
+    def reload_file_agents(self) -> dict[str, OperationType]:
+        """Incrementally reload ``.cognition/agents`` on the calling thread.
+
+        Only files whose stat signature changed since the previous reload are
+        re-parsed. Prefer :meth:`areload_file_agents` from async code.
+
+        Returns:
+            Mapping of changed agent name to ``"upsert"`` or ``"delete"``.
+        """
+        signatures, parsed = _scan_and_parse_agent_files(
+            self.agents_dir, dict(self._file_signatures)
+        )
+        changes = self._apply_file_agents(signatures, parsed)
+        self._emit_agent_changes_soon(changes)
+        return changes
+
+    async def areload_file_agents(self) -> dict[str, OperationType]:
+        """Incrementally reload ``.cognition/agents`` without blocking the loop.
+
+        Directory scanning and YAML parsing run in a worker thread; the
+        in-memory cache is updated on the event loop and one change event is
+        emitted per affected agent.
+
+        Returns:
+            Mapping of changed agent name to ``"upsert"`` or ``"delete"``.
+        """
+        async with self._reload_lock:
+            signatures, parsed = await asyncio.to_thread(
+                _scan_and_parse_agent_files, self.agents_dir, dict(self._file_signatures)
+            )
+            changes = self._apply_file_agents(signatures, parsed)
+        if changes:
+            logger.info("File agents reloaded: %s", changes)
+            await self._emit_agent_changes(changes)
+        return changes
+
+    def _apply_file_agents(
+        self,
+        signatures: dict[Path, FileSignature],
+        parsed: dict[Path, AgentDefinition | None],
+    ) -> dict[str, OperationType]:
+        """Merge a scan result into the cache and return per-agent changes."""
+        affected: set[str] = set()
+
+        for path in set(self._file_agents) - set(signatures):
+            previous = self._file_agents.pop(path, None)
+            self._file_signatures.pop(path, None)
+            if previous is not None:
+                affected.add(previous.name)
+
+        for path, definition in parsed.items():
+            previous = self._file_agents.get(path)
+            if previous is not None:
+                affected.add(previous.name)
+            if definition is not None:
+                affected.add(definition.name)
+            self._file_agents[path] = definition
+            self._file_signatures[path] = signatures[path]
+
+        changes: dict[str, OperationType] = {}
+        for name in sorted(affected):
+            candidates = [
+                definition
+                for path, definition in sorted(
+                    self._file_agents.items(), key=lambda item: _agent_file_precedence(item[0])
+                )
+                if definition is not None and definition.name == name
+            ]
+            if candidates:
+                self._agent_definitions[name] = candidates[-1]
+                changes[name] = "upsert"
+            elif name in self._builtin_agents:
+                self._agent_definitions[name] = self._builtin_agents[name]
+                changes[name] = "upsert"
+            elif name in self._agent_definitions:
+                del self._agent_definitions[name]
+                changes[name] = "delete"
+        return changes
 
     async def seed_agent_definitions(self, scope: dict[str, str] | None = None) -> None:
         rows = await self._config_registry.list_agents(scope)
@@ -349,6 +534,7 @@ Attempt the exact protected tool call immediately so that human-in-the-loop appr
             existing = self._agent_definitions.get(event.name)
             if existing and not existing.native:
                 del self._agent_definitions[event.name]
+                await self._emit_agent_changes({event.name: "delete"})
             return
 
         data = await self._config_registry.get_agent_raw(event.name, event.scope)
@@ -360,6 +546,7 @@ Attempt the exact protected tool call immediately so that human-in-the-loop appr
         if existing and existing.native:
             return
         self._agent_definitions[event.name] = definition
+        await self._emit_agent_changes({event.name: "upsert"})
 
     # ------------------------------------------------------------------
     # Provider CRUD
@@ -450,6 +637,8 @@ Attempt the exact protected tool call immediately so that human-in-the-loop appr
             self._agent_definitions[name] = agent_def
         except Exception as e:
             logger.warning(f"Failed to update in-memory agent definition after upsert: {e}")
+            return
+        await self._emit_agent_changes({name: "upsert"})
 
     async def get_agent_raw(
         self, name: str, scope: dict[str, str] | None = None
@@ -462,6 +651,7 @@ Attempt the exact protected tool call immediately so that human-in-the-loop appr
             existing = self._agent_definitions.get(name)
             if existing and not existing.native:
                 del self._agent_definitions[name]
+                await self._emit_agent_changes({name: "delete"})
         return result
 
     # ------------------------------------------------------------------
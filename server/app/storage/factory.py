@@ -13,10 +13,12 @@ from typing import TYPE_CHECKING
 from server.app.exceptions import CognitionError, ErrorCode
 
 if TYPE_CHECKING:
+    from server.app.rate_limiter import RateLimiterBackend
     from server.app.settings import Settings
     from server.app.storage.backend import StorageBackend
     from server.app.storage.config_dispatcher import ConfigChangeDispatcher
     from server.app.storage.config_registry import ConfigRegistry
+    from server.app.usage import UsageLedger
 
 
 class StorageBackendError(CognitionError):
@@ -100,12 +102,7 @@ def create_config_registry(settings: Settings) -> ConfigRegistry:
     if backend_type == "sqlite":
         from server.app.storage.config_registry import SqliteConfigRegistry
 
-        # Resolve DB path the same way SqliteStorageBackend does
-        normalized_uri = uri.removeprefix("sqlite:///")
-        db_path = Path(normalized_uri)
-        if not db_path.is_absolute():
-            db_path = Path(workspace_path) / normalized_uri
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        db_path = _sqlite_db_path(uri, workspace_path)
         registry = SqliteConfigRegistry(db_path=str(db_path))
         return registry
 
@@ -129,6 +126,108 @@ def create_config_registry(settings: Settings) -> ConfigRegistry:
         )
 
 
+def _sqlite_db_path(uri: str, workspace_path: str) -> Path:
+    # Resolve DB path the same way SqliteStorageBackend does
+    normalized_uri = uri.removeprefix("sqlite:///")
+    db_path = Path(normalized_uri)
+    if not db_path.is_absolute():
+        db_path = Path(workspace_path) / normalized_uri
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return db_path
+
+
+def create_rate_limiter_backend(settings: Settings) -> RateLimiterBackend:
+    """Create the rate limiter backend selected by ``rate_limit_backend``.
+
+    ``memory`` keeps state per process. ``shared`` stores it in the
+    persistence database so limits hold across replicas, wrapped in a leasing
+    layer when ``rate_limit_lease_size`` > 1. A shared limiter on the memory
+    persistence backend falls back to in-process state.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Configured RateLimiterBackend instance.
+    """
+    from server.app.rate_limiter import InMemoryRateLimiterBackend, LeasingRateLimiterBackend
+
+    mode = getattr(settings, "rate_limit_backend", "memory")
+    backend_type = getattr(settings, "persistence_backend", "sqlite")
+    uri = getattr(settings, "persistence_uri", ".cognition/state.db")
+
+    if mode != "shared" or backend_type == "memory":
+        return InMemoryRateLimiterBackend()
+
+    shared: RateLimiterBackend
+    if backend_type == "sqlite":
+        from server.app.storage.rate_limit_store import SqliteRateLimiterBackend
+
+        db_path = _sqlite_db_path(uri, str(settings.workspace_path))
+        shared = SqliteRateLimiterBackend(db_path=str(db_path))
+    elif backend_type == "postgres":
+        from server.app.storage.rate_limit_store import PostgresRateLimiterBackend
+
+        shared = PostgresRateLimiterBackend(
+            dsn=uri.replace("postgresql+asyncpg://", "postgresql://", 1)
+        )
+    else:
+        raise StorageBackendError(
+            f"Unknown storage backend type: '{backend_type}'. "
+            f"Supported types: sqlite, postgres, memory",
+            backend_type=backend_type,
+        )
+
+    if settings.rate_limit_lease_size > 1:
+        return LeasingRateLimiterBackend(
+            shared,
+            lease_size=settings.rate_limit_lease_size,
+            lease_ttl_seconds=settings.rate_limit_lease_ttl_seconds,
+        )
+    return shared
+
+
+def create_usage_ledger(settings: Settings) -> UsageLedger:
+    """Create the usage ledger on the persistence backend.
+
+    The memory persistence backend gets a per-process in-memory ledger.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Configured UsageLedger instance.
+
+    Raises:
+        StorageBackendError: If backend type is unknown.
+    """
+    backend_type = getattr(settings, "persistence_backend", "sqlite")
+    uri = getattr(settings, "persistence_uri", ".cognition/state.db")
+
+    if backend_type == "sqlite":
+        from server.app.storage.usage_store import SqliteUsageLedger
+
+        db_path = _sqlite_db_path(uri, str(settings.workspace_path))
+        return SqliteUsageLedger(db_path=str(db_path))
+
+    elif backend_type == "postgres":
+        from server.app.storage.usage_store import PostgresUsageLedger
+
+        return PostgresUsageLedger(dsn=uri.replace("postgresql+asyncpg://", "postgresql://", 1))
+
+    elif backend_type == "memory":
+        from server.app.usage import InMemoryUsageLedger
+
+        return InMemoryUsageLedger()
+
+    else:
+        raise StorageBackendError(
+            f"Unknown storage backend type: '{backend_type}'. "
+            f"Supported types: sqlite, postgres, memory",
+            backend_type=backend_type,
+        )
+
+
 def create_config_dispatcher(settings: Settings) -> ConfigChangeDispatcher:
     """Create the ConfigChangeDispatcher matching the persistence backend.
 
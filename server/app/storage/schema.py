@@ -20,9 +20,11 @@ from typing import Any
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     Index,
     Integer,
     MetaData,
@@ -197,6 +199,58 @@ config_changes_table = Table(
 Index("idx_config_changes_changed_at", config_changes_table.c.changed_at)
 Index("idx_config_changes_unprocessed", config_changes_table.c.processed)
 
+# rate_limits — GCRA state shared by all replicas when
+# COGNITION_RATE_LIMIT_BACKEND=shared. ``tat`` is the key's theoretical
+# arrival time in epoch seconds; rows whose tat is in the past can be deleted.
+rate_limits_table = Table(
+    "rate_limits",
+    metadata,
+    Column("key", Text, primary_key=True),
+    Column("tat", Float, nullable=False),
+)
+
+# usage_events — append-only ledger, one row per priced agent turn. ``scope``
+# is the rate limiter's scope key ("scope:" for unscoped turns).
+usage_events_table = Table(
+    "usage_events",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("session_id", String(36), nullable=False),
+    Column("scope", Text, nullable=False),
+    Column("provider", String(50), nullable=False),
+    Column("model", Text, nullable=False),
+    Column("input_tokens", BigInteger, nullable=False),
+    Column("output_tokens", BigInteger, nullable=False),
+    Column("cache_read_tokens", BigInteger, nullable=False),
+    Column("cache_write_tokens", BigInteger, nullable=False),
+    Column("model_calls", Integer, nullable=False),
+    Column("cost", Float, nullable=False),
+    Column("estimated", Boolean, nullable=False),
+    Column("created_at", Float, nullable=False),
+)
+
+Index("idx_usage_events_session", usage_events_table.c.session_id)
+
+# usage_rollups — running totals per session ("session") and per scope key
+# ("scope"), split by provider/model; updated in the same transaction as the
+# usage_events insert.
+usage_rollups_table = Table(
+    "usage_rollups",
+    metadata,
+    Column("kind", String(10), primary_key=True),
+    Column("subject", Text, primary_key=True),
+    Column("provider", String(50), primary_key=True),
+    Column("model", Text, primary_key=True),
+    Column("input_tokens", BigInteger, nullable=False),
+    Column("output_tokens", BigInteger, nullable=False),
+    Column("cache_read_tokens", BigInteger, nullable=False),
+    Column("cache_write_tokens", BigInteger, nullable=False),
+    Column("model_calls", BigInteger, nullable=False),
+    Column("cost", Float, nullable=False),
+    Column("turns", BigInteger, nullable=False),
+    Column("updated_at", Float, nullable=False),
+)
+
 
 async def create_all_tables(engine: AsyncEngine) -> None:
     """Create all defined tables in the database.
@@ -257,6 +311,9 @@ __all__ = [
     "messages_table",
     "config_entities_table",
     "config_changes_table",
+    "rate_limits_table",
+    "usage_events_table",
+    "usage_rollups_table",
     "create_all_tables",
     "drop_all_tables",
     "get_table_names",
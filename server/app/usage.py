@@ -0,0 +1,225 @@
+"""Token usage accounting for Cognition.
+
+Agent turns report the ``usage_metadata`` returned by the provider for every
+model call — subagent calls and cached-prompt tokens included — and the
+streaming service prices the turn against ModelCatalog entries. Each priced
+turn is appended to a :class:`UsageLedger`, which also maintains per-session
+and per-scope rollups so usage queries never scan the message table.
+
+Ledgers are pluggable:
+
+- :class:`InMemoryUsageLedger` — per-process, the default.
+- ``SqliteUsageLedger`` / ``PostgresUsageLedger``
+  (``server.app.storage.usage_store``) — on the persistence database.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Literal, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from server.app.llm.model_catalog import CatalogModel
+
+RollupKind = Literal["session", "scope"]
+
+# ``model_provider`` of chat models whose ``input_tokens`` leave out the
+# cached-prompt tokens (ChatBedrock on the InvokeModel API reports Bedrock's
+# uncached count as is).
+_CACHE_EXCLUDED_PROVIDERS = frozenset({"bedrock"})
+
+
+@dataclass
+class TokenUsage:
+    """Token counts for one or more model calls.
+
+    ``input_tokens`` follows LangChain's ``usage_metadata`` convention and
+    includes the cached-prompt tokens broken out in ``cache_read_tokens`` and
+    ``cache_write_tokens``.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    model_calls: int = 0
+
+    @classmethod
+    def from_metadata(
+        cls, usage_metadata: Mapping[str, Any], model_provider: str | None = None
+    ) -> TokenUsage:
+        """Build from a LangChain ``UsageMetadata`` dict.
+
+        Args:
+            usage_metadata: The message's ``usage_metadata``.
+            model_provider: The message's ``response_metadata["model_provider"]``,
+                used to add cached-prompt tokens back into ``input_tokens`` for
+                chat models that report them separately.
+        """
+        details = usage_metadata.get("input_token_details") or {}
+        usage = cls(
+            input_tokens=int(usage_metadata.get("input_tokens") or 0),
+            output_tokens=int(usage_metadata.get("output_tokens") or 0),
+            cache_read_tokens=int(details.get("cache_read") or 0),
+            cache_write_tokens=int(details.get("cache_creation") or 0),
+        )
+        if model_provider in _CACHE_EXCLUDED_PROVIDERS:
+            usage.input_tokens += usage.cache_read_tokens + usage.cache_write_tokens
+        return usage
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def is_empty(self) -> bool:
+        return self.model_calls == 0 and self.total_tokens == 0
+
+    def add(self, other: TokenUsage) -> None:
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.model_calls += other.model_calls
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for providers that report no usage (~4 chars/token)."""
+    return (len(text) + 3) // 4
+
+
+def price_usage(usage: TokenUsage, model: CatalogModel | None) -> float:
+    """Cost in USD of ``usage`` at the catalog's per-million-token rates.
+
+    Cached-prompt tokens are charged at the model's cache read/write rates
+    when the catalog lists them, otherwise at the input rate. Returns 0.0
+    for models missing from the catalog.
+    """
+    if model is None:
+        return 0.0
+    cache_read_rate = model.input_cost if model.cache_read_cost is None else model.cache_read_cost
+    cache_write_rate = (
+        model.input_cost if model.cache_write_cost is None else model.cache_write_cost
+    )
+    uncached = max(0, usage.input_tokens - usage.cache_read_tokens - usage.cache_write_tokens)
+    cost = (
+        uncached * model.input_cost
+        + usage.cache_read_tokens * cache_read_rate
+        + usage.cache_write_tokens * cache_write_rate
+        + usage.output_tokens * model.output_cost
+    )
+    return round(cost / 1_000_000, 6)
+
+
+@dataclass(frozen=True)
+class UsageRecord:
+    """One priced agent turn, as appended to the ledger.
+
+    ``scope`` is the :func:`server.app.rate_limiter.scope_key` of the turn's
+    scope (``"scope:"`` for unscoped turns). ``estimated`` is set when the
+    provider reported no usage and the counts are approximations.
+    """
+
+    session_id: str
+    scope: str
+    provider: str
+    model: str
+    usage: TokenUsage
+    cost: float
+    estimated: bool = False
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class UsageRollup:
+    """Running totals for one session or scope and model."""
+
+    provider: str
+    model: str
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    cost: float = 0.0
+    turns: int = 0
+    updated_at: float = 0.0
+
+
+@runtime_checkable
+class UsageLedger(Protocol):
+    """Append-only usage ledger with per-session and per-scope rollups."""
+
+    async def record(self, record: UsageRecord) -> None:
+        """Append ``record`` and fold it into its session and scope rollups."""
+        ...
+
+    async def rollups(self, kind: RollupKind, subject: str) -> list[UsageRollup]:
+        """Rollups for a session ID or scope key, one per provider/model."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class InMemoryUsageLedger:
+    """Per-process usage ledger. Records are lost on restart.
+
+    Args:
+        max_records: Records kept for inspection; rollups are unbounded.
+    """
+
+    def __init__(self, max_records: int = 10_000) -> None:
+        self.records: list[UsageRecord] = []
+        self._max_records = max_records
+        self._rollups: dict[tuple[str, str, str, str], UsageRollup] = {}
+
+    async def record(self, record: UsageRecord) -> None:
+        self.records.append(record)
+        del self.records[: -self._max_records]
+        for kind, subject in (("session", record.session_id), ("scope", record.scope)):
+            key = (kind, subject, record.provider, record.model)
+            rollup = self._rollups.setdefault(key, UsageRollup(record.provider, record.model))
+            rollup.usage.add(record.usage)
+            rollup.cost = round(rollup.cost + record.cost, 6)
+            rollup.turns += 1
+            rollup.updated_at = record.created_at
+
+    async def rollups(self, kind: RollupKind, subject: str) -> list[UsageRollup]:
+        return [
+            replace(rollup, usage=replace(rollup.usage))
+            for (k, s, _, _), rollup in self._rollups.items()
+            if k == kind and s == subject
+        ]
+
+    async def close(self) -> None:
+        return None
+
+
+# Global usage ledger, replaced at startup by the persistence-backed one
+_usage_ledger: UsageLedger | None = None
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Get the global usage ledger, creating an in-memory one if unset."""
+    global _usage_ledger
+    if _usage_ledger is None:
+        _usage_ledger = InMemoryUsageLedger()
+    return _usage_ledger
+
+
+def set_usage_ledger(ledger: UsageLedger | None) -> None:
+    """Install the global usage ledger (``None`` resets to in-memory)."""
+    global _usage_ledger
+    _usage_ledger = ledger
+
+
+__all__ = [
+    "InMemoryUsageLedger",
+    "RollupKind",
+    "TokenUsage",
+    "UsageLedger",
+    "UsageRecord",
+    "UsageRollup",
+    "estimate_tokens",
+    "get_usage_ledger",
+    "price_usage",
+    "set_usage_ledger",
+]
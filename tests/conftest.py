@@ -12,6 +12,7 @@ from server.app.storage.sqlite import SqliteStorageBackend
 @pytest.fixture(autouse=True)
 async def setup_storage_backend():
     """Automatically set up storage backend and DI providers for all tests."""
+    from server.app.agent.subagent_index import set_subagent_spec_index
     from server.app.api.dependencies import (
         set_config_store,
         set_session_agent_manager_dep,
@@ -35,6 +36,7 @@ async def setup_storage_backend():
 
         config_reg = MemoryConfigRegistry()
         set_config_store(DefaultConfigStore(config_reg))
+        set_subagent_spec_index(None)
 
         yield storage
 
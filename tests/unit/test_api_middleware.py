@@ -0,0 +1,91 @@
+"""Unit tests for the observability and security-header ASGI middleware."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from server.app.api.middleware import (
+    UNMATCHED_ROUTE,
+    ObservabilityMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: str) -> dict[str, str]:
+        if thing_id == "missing":
+            raise HTTPException(status_code=404, detail="not found")
+        return {"id": thing_id}
+
+    @app.get("/things/{thing_id}/events")
+    async def thing_events(thing_id: str) -> StreamingResponse:
+        async def events() -> AsyncIterator[bytes]:
+            for i in range(3):
+                yield f"event: token\ndata: {i}\n\n".encode()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(ObservabilityMiddleware)
+    return TestClient(app)
+
+
+class TestObservabilityMiddleware:
+    def test_requests_are_labelled_by_route_template(self, client: TestClient) -> None:
+        labels = {"method": "GET", "endpoint": "/things/{thing_id}", "status": "200"}
+        before = _sample("cognition_requests_total", labels)
+
+        for thing_id in ("a", "b", "c"):
+            assert client.get(f"/things/{thing_id}").status_code == 200
+        client.get("/things/missing")
+
+        assert _sample("cognition_requests_total", labels) == before + 3
+        assert _sample("cognition_requests_total", {**labels, "status": "404"}) >= 1
+        assert _sample("cognition_requests_total", {**labels, "endpoint": "/things/a"}) == 0
+
+    def test_unmatched_paths_share_one_label(self, client: TestClient) -> None:
+        labels = {"method": "GET", "endpoint": UNMATCHED_ROUTE, "status": "404"}
+        before = _sample("cognition_requests_total", labels)
+
+        client.get("/wp-admin/x1")
+        client.get("/wp-admin/x2")
+
+        assert _sample("cognition_requests_total", labels) == before + 2
+
+    def test_sse_stream_duration_and_bytes(self, client: TestClient) -> None:
+        labels = {"endpoint": "/things/{thing_id}/events"}
+        count_before = _sample("cognition_sse_stream_duration_seconds_count", labels)
+        bytes_before = _sample("cognition_sse_bytes_sent_sum", labels)
+
+        response = client.get("/things/abc/events")
+
+        assert response.status_code == 200
+        assert _sample("cognition_sse_stream_duration_seconds_count", labels) == count_before + 1
+        assert _sample("cognition_sse_bytes_sent_sum", labels) == bytes_before + len(
+            response.content
+        )
+
+
+class TestSecurityHeadersMiddleware:
+    @pytest.mark.parametrize("path", ["/things/a", "/things/a/events", "/nowhere"])
+    def test_headers_on_every_response(self, client: TestClient, path: str) -> None:
+        response = client.get(path)
+
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["referrer-policy"] == "strict-origin-when-cross-origin"
@@ -0,0 +1,60 @@
+"""Unit tests for the load benchmark's statistics and regression checks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks.load import TurnSample, check_provider, compare, percentiles, server_env
+
+
+def _run(**metrics: Any) -> dict[str, Any]:
+    return {"backends": {"sqlite": metrics, "postgres": {"skipped": "no database"}}}
+
+
+class TestPercentiles:
+    def test_nearest_rank(self) -> None:
+        assert percentiles(list(range(1, 101))) == {"p50": 50, "p95": 95, "p99": 99}
+        assert percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+class TestServerIsolation:
+    def test_env_points_home_at_the_workspace(self, tmp_path: Path) -> None:
+        env = server_env("sqlite", tmp_path, None)
+
+        assert env["HOME"] == str(tmp_path)
+        assert env["COGNITION_PERSISTENCE_URI"].startswith(str(tmp_path))
+
+    def test_check_provider_rejects_other_providers(self) -> None:
+        def sample(provider: str | None, ok: bool = True) -> TurnSample:
+            return TurnSample(1.0, 2.0, 3, 4, ok, provider)
+
+        check_provider([sample("scripted_mock"), sample(None, ok=False)])
+        with pytest.raises(RuntimeError, match="anthropic"):
+            check_provider([sample("scripted_mock"), sample("anthropic")])
+
+
+class TestCompare:
+    def test_flags_regressions_beyond_threshold_and_floor(self) -> None:
+        baseline = _run(turn_ms={"p50": 100.0, "p95": 200.0}, tokens_per_s=1000.0)
+        current = _run(turn_ms={"p50": 105.0, "p95": 260.0}, tokens_per_s=800.0)
+
+        regressions = compare(baseline, current)
+
+        assert {(r.backend, r.metric) for r in regressions} == {
+            ("sqlite", "turn_ms.p95"),
+            ("sqlite", "tokens_per_s"),
+        }
+
+    def test_noise_floor_and_custom_thresholds(self) -> None:
+        baseline = _run(ttft_ms={"p50": 5.0})
+        current = _run(ttft_ms={"p50": 6.5})
+
+        assert compare(baseline, current) == []
+        assert compare(_run(ttft_ms={"p50": 50.0}), _run(ttft_ms={"p50": 60.0}), {}) != []
+        assert (
+            compare(_run(ttft_ms={"p50": 50.0}), _run(ttft_ms={"p50": 60.0}), {"ttft_ms.p50": 0.5})
+            == []
+        )
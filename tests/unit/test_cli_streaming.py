@@ -0,0 +1,88 @@
+"""Unit tests for the CLI's SSE parsing and incremental reply rendering."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from rich.markdown import Markdown
+
+from client.cli.render import MarkdownStream
+from client.sdk import SSEParser, StreamEvent
+
+
+class TestSSEParser:
+    def test_events_split_across_arbitrary_chunks(self) -> None:
+        payload = (
+            b"retry: 3000\n\n"
+            b'id: 1-a\nevent: token\ndata: {"content": "Hel"}\n\n'
+            b":heartbeat\n\n"
+            b'id: 2-b\r\nevent: token\r\ndata: {"content": "lo"}\r\n\r\n'
+        )
+        parser = SSEParser()
+
+        events = []
+        for i in range(0, len(payload), 7):
+            events.extend(parser.feed(payload[i : i + 7]))
+
+        assert [(e.event, e.data, e.id) for e in events] == [
+            ("token", {"content": "Hel"}, "1-a"),
+            ("token", {"content": "lo"}, "2-b"),
+        ]
+        assert parser.last_event_id == "2-b"
+        assert parser.retry_ms == 3000
+
+    def test_multiline_data_and_reset(self) -> None:
+        parser = SSEParser()
+
+        assert parser.feed(b'event: done\ndata: {"a":\ndata: 1}\n\n') == [
+            StreamEvent("done", {"a": 1})
+        ]
+
+        parser.feed(b'id: 9-z\nevent: token\ndata: {"content"')
+        parser.reset()
+        assert parser.feed(b"\n\n") == []
+        assert parser.last_event_id == "9-z"
+
+
+class TestMarkdownStream:
+    def _stream(self) -> tuple[MarkdownStream, MagicMock, list[float]]:
+        live = MagicMock()
+        now = [0.0]
+        return MarkdownStream(live, fps=10, clock=lambda: now[0]), live, now
+
+    @staticmethod
+    def _printed(live: MagicMock) -> list[str]:
+        return [c.args[0].markup for c in live.console.print.call_args_list]
+
+    def test_finished_blocks_are_printed_once(self) -> None:
+        stream, live, _ = self._stream()
+
+        stream.append("# Title\n\nFirst para")
+        stream.append("graph.\n\nSecond")
+
+        assert self._printed(live) == ["# Title\n", "First paragraph.\n"]
+        stream.flush()
+        assert self._printed(live)[-1] == "Second"
+
+    def test_blank_lines_inside_code_fences_do_not_split(self) -> None:
+        stream, live, _ = self._stream()
+
+        stream.append("```python\nx = 1\n\ny = 2\n")
+        assert self._printed(live) == []
+
+        stream.append("```\n\n")
+        assert self._printed(live) == ["```python\nx = 1\n\ny = 2\n```\n"]
+
+    def test_tail_redraws_are_throttled(self) -> None:
+        stream, live, now = self._stream()
+
+        for token in ("a", "b", "c"):
+            stream.append(token)
+        assert live.update.call_count == 1
+
+        now[0] = 0.2
+        stream.append("d")
+        assert live.update.call_count == 2
+        tail = live.update.call_args.args[0]
+        assert isinstance(tail, Markdown)
+        assert tail.markup == "abcd"
@@ -0,0 +1,137 @@
+"""Unit tests for the async client SDK."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from client.sdk import CognitionAPIError, CognitionClient
+
+
+class _DroppingStream(httpx.AsyncByteStream):
+    """Body that delivers some bytes, then fails like a dropped connection."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._body
+        raise httpx.ReadError("connection reset")
+
+
+def _session(session_id: str, title: str | None = None) -> dict:
+    return {
+        "id": session_id,
+        "title": title,
+        "thread_id": session_id,
+        "status": "active",
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+    }
+
+
+def _client(handler, **kwargs) -> CognitionClient:  # type: ignore[no-untyped-def]
+    return CognitionClient(
+        "http://test", transport=httpx.MockTransport(handler), backoff=0, **kwargs
+    )
+
+
+class TestCognitionClient:
+    async def test_scope_headers_and_api_errors(self) -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(404, json={"detail": "Session not found: s1"})
+
+        async with _client(handler, scope={"user": "alice"}) as client:
+            with pytest.raises(CognitionAPIError) as exc_info:
+                await client.get_session("s1")
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "Session not found: s1"
+        assert seen[0].headers["x-cognition-scope-user"] == "alice"
+
+    async def test_create_sessions_bounds_concurrency_and_keeps_order(self) -> None:
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(201, json=_session("id", json.loads(request.content)["title"]))
+
+        titles = [f"eval-{i}" for i in range(12)]
+        async with _client(handler) as client:
+            sessions = await client.create_sessions(titles, concurrency=3)
+
+        assert [s.title for s in sessions] == titles
+        assert peak == 3
+
+    async def test_dropped_stream_resumes_from_last_event_id(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.method == "POST":
+                return httpx.Response(
+                    200,
+                    stream=_DroppingStream(
+                        b'retry: 1\n\nid: 1-a\nevent: token\ndata: {"content": "Hel"}\n\n'
+                    ),
+                )
+            return httpx.Response(
+                200,
+                content=(
+                    b'event: reconnected\ndata: {"last_event_id": "1-a", "resumed": true}\n\n'
+                    b'id: 2-b\nevent: token\ndata: {"content": "lo"}\n\n'
+                    b'id: 3-c\nevent: done\ndata: {"message_id": "m1"}\n\n'
+                ),
+            )
+
+        async with _client(handler) as client:
+            result = await client.chat("s1", "hi")
+
+        assert result.ok
+        assert (result.content, result.message_id, result.reconnects) == ("Hello", "m1", 1)
+        assert [(r.method, r.url.path) for r in requests] == [
+            ("POST", "/sessions/s1/messages"),
+            ("GET", "/sessions/s1/events"),
+        ]
+        assert requests[1].headers["last-event-id"] == "1-a"
+
+    async def test_clean_close_after_error_ends_stream(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(
+                200, content=b'id: 1-a\nevent: error\ndata: {"message": "boom"}\n\n'
+            )
+
+        async with _client(handler) as client:
+            result = await client.chat("s1", "hi")
+
+        assert calls == 1
+        assert not result.ok
+        assert result.error == {"message": "boom"}
+
+    async def test_failure_before_turn_starts_is_not_resumed(self) -> None:
+        paths: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            raise httpx.ConnectError("refused")
+
+        async with _client(handler) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.chat("s1", "hi")
+
+        assert paths == ["/sessions/s1/messages"]
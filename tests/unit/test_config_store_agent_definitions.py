@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from server.app.storage import config_store as config_store_module
+from server.app.storage.config_models import ConfigChangeEvent
 from server.app.storage.config_registry import MemoryConfigRegistry
 from server.app.storage.config_store import DefaultConfigStore
 
@@ -67,6 +71,121 @@ class TestFileAgents:
         assert agent.system_prompt == "New!"
 
 
+class TestIncrementalFileReload:
+    @pytest.fixture
+    def agents_dir(self, tmp_path: Path) -> Path:
+        path = tmp_path / ".cognition" / "agents"
+        path.mkdir(parents=True)
+        (path / "alpha.yaml").write_text("name: alpha\nsystem_prompt: Alpha\n")
+        (path / "beta.md").write_text("---\ndescription: Beta\n---\nBeta prompt\n")
+        return path
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_not_reparsed(self, tmp_path: Path, agents_dir: Path):
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+
+        with patch.object(
+            config_store_module, "_parse_agent_file", wraps=config_store_module._parse_agent_file
+        ) as parse:
+            changes = await store.areload_file_agents()
+
+        assert changes == {}
+        assert parse.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_modified_file_is_reparsed(self, tmp_path: Path, agents_dir: Path):
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+        alpha = agents_dir / "alpha.yaml"
+        alpha.write_text("name: alpha\nsystem_prompt: Alpha v2\n")
+        st = alpha.stat()
+        os.utime(alpha, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        with patch.object(
+            config_store_module, "_parse_agent_file", wraps=config_store_module._parse_agent_file
+        ) as parse:
+            changes = await store.areload_file_agents()
+
+        assert changes == {"alpha": "upsert"}
+        assert [call.args[0].name for call in parse.call_args_list] == ["alpha.yaml"]
+        agent = await store.get_agent_definition("alpha")
+        assert agent is not None
+        assert agent.system_prompt == "Alpha v2"
+
+    @pytest.mark.asyncio
+    async def test_deleted_file_removes_agent(self, tmp_path: Path, agents_dir: Path):
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+        (agents_dir / "beta.md").unlink()
+
+        changes = await store.areload_file_agents()
+
+        assert changes == {"beta": "delete"}
+        assert await store.get_agent_definition("beta") is None
+        assert await store.get_agent_definition("alpha") is not None
+
+    @pytest.mark.asyncio
+    async def test_deleting_override_restores_builtin(self, tmp_path: Path, agents_dir: Path):
+        override = agents_dir / "default.yaml"
+        override.write_text("name: default\nsystem_prompt: Overridden\n")
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+        agent = await store.get_agent_definition("default")
+        assert agent is not None and agent.system_prompt == "Overridden"
+
+        override.unlink()
+        changes = await store.areload_file_agents()
+
+        assert changes == {"default": "upsert"}
+        agent = await store.get_agent_definition("default")
+        assert agent is not None
+        assert agent.native is True
+
+    @pytest.mark.asyncio
+    async def test_reload_emits_per_agent_events(self, tmp_path: Path, agents_dir: Path):
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+        events: list[ConfigChangeEvent] = []
+
+        async def listener(event: ConfigChangeEvent) -> None:
+            events.append(event)
+
+        store.subscribe_agent_changes(listener)
+        (agents_dir / "gamma.yml").write_text("name: gamma\nsystem_prompt: Gamma\n")
+        (agents_dir / "alpha.yaml").unlink()
+
+        await store.areload_file_agents()
+
+        assert sorted((e.name, e.operation) for e in events) == [
+            ("alpha", "delete"),
+            ("gamma", "upsert"),
+        ]
+        assert all(e.entity_type == "agent" for e in events)
+
+    @pytest.mark.asyncio
+    async def test_reload_keeps_db_seeded_agents(self, tmp_path: Path, agents_dir: Path):
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+        await store.upsert_agent(
+            "db-agent", {}, {"name": "db-agent", "system_prompt": "hello"}, "api"
+        )
+        (agents_dir / "gamma.yml").write_text("name: gamma\nsystem_prompt: Gamma\n")
+
+        await store.areload_file_agents()
+
+        assert await store.get_agent_definition("db-agent") is not None
+        assert await store.get_agent_definition("gamma") is not None
+
+    @pytest.mark.asyncio
+    async def test_invalid_file_is_not_retried_until_changed(
+        self, tmp_path: Path, agents_dir: Path
+    ):
+        (agents_dir / "broken.yaml").write_text("name: [unterminated\n")
+        store = DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+
+        with patch.object(
+            config_store_module, "_parse_agent_file", wraps=config_store_module._parse_agent_file
+        ) as parse:
+            await store.areload_file_agents()
+
+        assert parse.call_count == 0
+
+
 class TestDbAgents:
     @pytest.mark.asyncio
     async def test_upsert_agent_updates_cache(self, store: DefaultConfigStore):
@@ -0,0 +1,247 @@
+"""Unit tests for content-hash graph fingerprints and the warmup manifest."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.tools import tool
+
+from server.app.agent.cognition_agent import (
+    RuntimeContext,
+    _model_cache_key,
+    cache_agent,
+    clear_agent_cache,
+    get_cached_agent,
+    invalidate_agent_cache_for_sandbox,
+)
+from server.app.agent.graph_warmup import GraphWarmupManifest, warm_compiled_graphs
+from server.app.llm.deep_agent_service import DeepAgentStreamingService
+from server.app.settings import Settings
+
+
+def _ctx(tmp_path: Path, **overrides: Any) -> RuntimeContext:
+    params: dict[str, Any] = {
+        "project_path": tmp_path,
+        "model": "m",
+        "store": None,
+        "system_prompt": "prompt",
+        "memory": None,
+        "skills": None,
+        "subagents": None,
+        "interrupt_on": None,
+        "response_format": None,
+        "tool_token_limit_before_evict": None,
+        "middleware": None,
+        "tools": None,
+        "settings": Settings(),
+        "scope": None,
+    }
+    params.update(overrides)
+    return RuntimeContext.from_params(**params)
+
+
+class TestRuntimeContextFingerprint:
+    def test_fingerprint_is_stable(self, tmp_path: Path):
+        assert _ctx(tmp_path).fingerprint == _ctx(tmp_path).fingerprint
+
+    def test_fingerprint_ignores_workspace(self, tmp_path: Path):
+        first = _ctx(tmp_path / "a")
+        second = _ctx(tmp_path / "b")
+
+        assert first != second
+        assert first.fingerprint == second.fingerprint
+
+    def test_model_key_includes_build_params(self):
+        from langchain_anthropic import ChatAnthropic
+
+        def build(**kwargs: Any) -> ChatAnthropic:
+            params: dict[str, Any] = {"model": "claude-sonnet-4-6", "api_key": "k"}
+            params.update(kwargs)
+            return ChatAnthropic(**params)
+
+        key = _model_cache_key(build(temperature=0.1))
+        assert key.startswith("ChatAnthropic:claude-sonnet-4-6:")
+        assert key == _model_cache_key(build(temperature=0.1))
+        assert key != _model_cache_key(build(temperature=0.7))
+        assert key != _model_cache_key(build(temperature=0.1, max_tokens=100))
+        assert key != _model_cache_key(build(temperature=0.1, base_url="http://proxy"))
+        assert key != _model_cache_key(build(model="claude-haiku-4-5", temperature=0.1))
+
+    def test_set_constants_hash_stably_across_processes(self):
+        script = (
+            "from server.app.agent.cognition_agent import _callable_digest\n"
+            "def f(x):\n"
+            "    return x in {'alpha', 'beta', 'gamma', 'delta', 'epsilon'}\n"
+            "print(_callable_digest(f))\n"
+        )
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parents[2],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+
+        assert len(digests) == 1
+
+    def test_system_prompt_is_hashed(self, tmp_path: Path):
+        ctx = _ctx(tmp_path, system_prompt="a very long prompt " * 100)
+        assert len(ctx.system_prompt_hash) == 64
+        assert ctx != _ctx(tmp_path, system_prompt="other")
+
+    def test_tool_code_edit_changes_key(self, tmp_path: Path):
+        @tool
+        def lookup(query: str) -> str:
+            """Look something up."""
+            return query
+
+        first = _ctx(tmp_path, tools=[lookup])
+
+        @tool  # type: ignore[no-redef]
+        def lookup(query: str) -> str:
+            """Look something up."""
+            return query.upper()
+
+        second = _ctx(tmp_path, tools=[lookup])
+        assert first.tools_hash != second.tools_hash
+        assert first.fingerprint != second.fingerprint
+
+    def test_tool_order_does_not_change_key(self, tmp_path: Path):
+        @tool
+        def alpha(x: str) -> str:
+            """Alpha."""
+            return x
+
+        @tool
+        def beta(x: str) -> str:
+            """Beta."""
+            return x
+
+        assert _ctx(tmp_path, tools=[alpha, beta]) == _ctx(tmp_path, tools=[beta, alpha])
+
+    def test_middleware_config_changes_key(self, tmp_path: Path):
+        class Limit:
+            def __init__(self, n: int) -> None:
+                self.n = n
+
+        assert _ctx(tmp_path, middleware=[Limit(1)]) != _ctx(tmp_path, middleware=[Limit(2)])
+        assert _ctx(tmp_path, middleware=[Limit(1)]) == _ctx(tmp_path, middleware=[Limit(1)])
+
+
+class TestAgentCacheSandboxBinding:
+    def test_graph_is_reused_only_with_its_sandbox(self, tmp_path: Path):
+        ctx = _ctx(tmp_path)
+        old_sandbox, new_sandbox = object(), object()
+        try:
+            cache_agent(ctx, "graph", old_sandbox)
+            assert get_cached_agent(ctx, old_sandbox) == "graph"
+
+            assert get_cached_agent(ctx, new_sandbox) is None
+            assert get_cached_agent(ctx, old_sandbox) is None
+        finally:
+            clear_agent_cache()
+
+    def test_invalidate_for_sandbox(self, tmp_path: Path):
+        sandbox, other = object(), object()
+        try:
+            cache_agent(_ctx(tmp_path, system_prompt="a"), "a", sandbox)
+            cache_agent(_ctx(tmp_path, system_prompt="b"), "b", sandbox)
+            cache_agent(_ctx(tmp_path, system_prompt="c"), "c", other)
+
+            assert invalidate_agent_cache_for_sandbox(sandbox) == 2
+            assert get_cached_agent(_ctx(tmp_path, system_prompt="c"), other) == "c"
+        finally:
+            clear_agent_cache()
+
+
+class TestGraphWarmupManifest:
+    def test_save_and_load_round_trip(self, tmp_path: Path):
+        path = tmp_path / "manifest.json"
+        manifest = GraphWarmupManifest(path)
+        manifest.record("fp-1", session_id="s1", project_path="/p", scope={"user": "u"})
+        manifest.save()
+
+        loaded = GraphWarmupManifest(path)
+        loaded.load()
+        [entry] = loaded.hot_entries()
+        assert entry.fingerprint == "fp-1"
+        assert entry.session_id == "s1"
+        assert entry.scope == {"user": "u"}
+
+    def test_save_merges_entries_from_other_replicas(self, tmp_path: Path):
+        path = tmp_path / "manifest.json"
+        replica_a = GraphWarmupManifest(path)
+        replica_b = GraphWarmupManifest(path)
+        replica_a.record("fp-a", session_id="sa", project_path="/a")
+        replica_a.save()
+        replica_b.record("fp-b", session_id="sb", project_path="/b")
+        replica_b.save()
+
+        data = json.loads(path.read_text())
+        assert {e["fingerprint"] for e in data["entries"]} == {"fp-a", "fp-b"}
+
+    def test_trims_to_most_recent(self, tmp_path: Path):
+        manifest = GraphWarmupManifest(tmp_path / "manifest.json", max_entries=2)
+        for i in range(4):
+            manifest.record(f"fp-{i}", session_id=f"s{i}", project_path="/p")
+            manifest.hot_entries()[0].last_used = float(i)
+        manifest.save()
+
+        assert [e.fingerprint for e in manifest.hot_entries()] == ["fp-3", "fp-2"]
+
+    def test_corrupt_file_is_ignored(self, tmp_path: Path):
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+        manifest = GraphWarmupManifest(path)
+        manifest.load()
+        assert len(manifest) == 0
+
+
+class TestWarmCompiledGraphs:
+    @pytest.mark.asyncio
+    async def test_warms_hot_entries_and_skips_failures(self, tmp_path: Path):
+        manifest = GraphWarmupManifest(tmp_path / "manifest.json")
+        manifest.record("fp-ok", session_id="ok", project_path="/p")
+        manifest.record("fp-bad", session_id="bad", project_path="/p")
+        manifest.record("fp-gone", session_id="gone", project_path="/p")
+
+        class Warmer:
+            def __init__(self) -> None:
+                self.calls: list[str] = []
+
+            async def warm_graph(
+                self, session_id: str, project_path: str, scope: dict[str, str] | None = None
+            ) -> str | None:
+                self.calls.append(session_id)
+                if session_id == "bad":
+                    raise RuntimeError("boom")
+                if session_id == "gone":
+                    return None
+                return "fp-ok"
+
+        warmer = Warmer()
+        warmed = await warm_compiled_graphs(manifest, warmer)
+
+        assert warmed == 1
+        assert sorted(warmer.calls) == ["bad", "gone", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_warming_a_graph_does_not_count_as_a_use(self):
+        service = DeepAgentStreamingService(MagicMock(), storage_backend=MagicMock())
+        service.storage_backend.get_session = AsyncMock(return_value=MagicMock())
+
+        with patch.object(service, "prepare_agent", new_callable=AsyncMock) as prepare:
+            await service.warm_graph("s", "/p")
+
+        assert prepare.await_args.kwargs["record_fingerprint"] is False
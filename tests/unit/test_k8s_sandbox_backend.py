@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from server.app.agent.cognition_agent import acquire_sandbox, start_sandbox_preclaim
 from server.app.agent.sandbox_backend import (
     CognitionKubernetesSandboxBackend,
     create_sandbox_backend,
 )
+from server.app.agent.sandbox_registry import SandboxRegistry, set_sandbox_registry
+from server.app.llm.deep_agent_service import SessionAgentManager
+from server.app.settings import Settings
 
 
 class TestCognitionKubernetesSandboxBackendInit:
@@ -139,6 +144,7 @@ class TestCognitionKubernetesSandboxBackendLazyInit:
                 labels={"k": "v"},
                 ttl=600,
                 warm_pool=None,
+                latency_observer=backend._observe_latency,
             )
 
     def test_get_backend_cached(self, tmp_path):
@@ -153,6 +159,103 @@ class TestCognitionKubernetesSandboxBackendLazyInit:
             assert mock_k8s_class.call_count == 1
 
 
+class TestCognitionKubernetesSandboxBackendPreclaim:
+    def test_preclaim_claims_and_labels_latency(self, tmp_path):
+        backend = CognitionKubernetesSandboxBackend(root_dir=tmp_path)
+        inner = MagicMock()
+
+        def claim() -> bool:
+            backend._observe_latency("claim", 1.5)
+            return True
+
+        inner.claim.side_effect = claim
+        mock_module = MagicMock(K8sSandbox=MagicMock(return_value=inner))
+
+        with (
+            patch.dict("sys.modules", {"langchain_k8s_sandbox": mock_module}),
+            patch("server.app.observability.SANDBOX_CLAIM_LATENCY") as claim_metric,
+        ):
+            assert backend.preclaim() is True
+
+        inner.claim.assert_called_once()
+        claim_metric.labels.assert_called_once_with(trigger="preclaim")
+        claim_metric.labels.return_value.observe.assert_called_once_with(1.5)
+
+    def test_lazy_claim_is_labelled_lazy(self, tmp_path):
+        backend = CognitionKubernetesSandboxBackend(root_dir=tmp_path)
+
+        with patch("server.app.observability.SANDBOX_READY_LATENCY") as ready_metric:
+            backend._observe_latency("ready", 3.0)
+
+        ready_metric.labels.assert_called_once_with(trigger="lazy")
+
+
+@pytest.fixture
+def registry():
+    registry = SandboxRegistry()
+    set_sandbox_registry(registry)
+    yield registry
+    set_sandbox_registry(None)
+
+
+def _k8s_settings(**overrides) -> Settings:
+    return Settings(
+        COGNITION_SANDBOX_BACKEND="kubernetes", COGNITION_K8S_SANDBOX_PRECLAIM=True, **overrides
+    )
+
+
+class TestStartSandboxPreclaim:
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, tmp_path, registry):
+        settings = Settings(COGNITION_SANDBOX_BACKEND="kubernetes")
+        assert start_sandbox_preclaim(tmp_path, settings) is None
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_only_applies_to_kubernetes(self, tmp_path, registry):
+        settings = Settings(COGNITION_SANDBOX_BACKEND="local", COGNITION_K8S_SANDBOX_PRECLAIM=True)
+        assert start_sandbox_preclaim(tmp_path, settings) is None
+
+    @pytest.mark.asyncio
+    async def test_claims_in_worker_thread_and_shares_handle(self, tmp_path, registry):
+        sandbox = MagicMock()
+        threads: list[threading.Thread] = []
+        sandbox.preclaim.side_effect = lambda: threads.append(threading.current_thread())
+
+        with patch("server.app.agent.cognition_agent._create_sandbox", return_value=sandbox):
+            task = start_sandbox_preclaim(tmp_path, _k8s_settings(), {"user": "alice"})
+            assert task is not None
+            assert await task is sandbox
+            assert await acquire_sandbox(tmp_path, _k8s_settings(), {"user": "alice"}) is sandbox
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_failed_claim_resolves_to_none(self, tmp_path, registry):
+        sandbox = MagicMock()
+        sandbox.preclaim.side_effect = RuntimeError("router down")
+
+        with patch("server.app.agent.cognition_agent._create_sandbox", return_value=sandbox):
+            task = start_sandbox_preclaim(tmp_path, _k8s_settings())
+            assert task is not None
+            assert await task is None
+
+    @pytest.mark.asyncio
+    async def test_manager_registers_claimed_sandbox_for_cleanup(self, tmp_path, registry):
+        sandbox = MagicMock()
+        manager = SessionAgentManager(_k8s_settings(), storage_backend=MagicMock())
+        manager.register_session("s1", str(tmp_path))
+
+        with patch("server.app.agent.cognition_agent._create_sandbox", return_value=sandbox):
+            task = manager.preclaim_sandbox("s1", str(tmp_path))
+            assert task is not None
+            await task
+
+        assert manager.stats().sandboxes == 1
+        await manager.aclose()
+        sandbox.terminate.assert_called_once()
+
+
 class TestCreateSandboxBackendFactory:
     def test_kubernetes_branch(self, tmp_path):
         backend = create_sandbox_backend(
@@ -0,0 +1,115 @@
+"""Unit tests for the queue-backed, sampled log pipeline."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from server.app.observability import setup_logging
+from server.app.observability.log_pipeline import (
+    LogSampler,
+    QueueLogSink,
+    get_log_sink,
+    set_log_sink,
+)
+
+
+class TestLogSampler:
+    def test_drops_sampled_events_but_keeps_warnings(self) -> None:
+        sampler = LogSampler({"HTTP request": 0.0})
+
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "HTTP request"})
+        assert sampler(None, "warning", {"event": "HTTP request"}) == {"event": "HTTP request"}
+        assert sampler(None, "info", {"event": "Tool call"}) == {"event": "Tool call"}
+
+    def test_kept_events_carry_their_rate(self) -> None:
+        sampler = LogSampler({"HTTP request": 0.01})
+
+        with patch("server.app.observability.log_pipeline.random.random", return_value=0.005):
+            kept = sampler(None, "info", {"event": "HTTP request"})
+        with (
+            patch("server.app.observability.log_pipeline.random.random", return_value=0.5),
+            pytest.raises(structlog.DropEvent),
+        ):
+            sampler(None, "info", {"event": "HTTP request"})
+
+        assert kept["sample_rate"] == 0.01
+
+
+class TestQueueLogSink:
+    def test_writer_renders_queued_events(self) -> None:
+        stream = io.StringIO()
+        sink = QueueLogSink(structlog.processors.JSONRenderer(), stream=stream)
+        sink.start()
+        for i in range(3):
+            sink.put({"event": "tick", "i": i})
+        sink.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["i"] for line in lines] == [0, 1, 2]
+
+    def test_full_queue_drops_and_reports(self) -> None:
+        stream = io.StringIO()
+        sink = QueueLogSink(structlog.processors.JSONRenderer(), stream=stream, max_size=2)
+        # Hold the writer back so the queue fills up.
+        sink._thread = object()  # type: ignore[assignment]
+        for i in range(5):
+            sink.put({"event": "tick", "i": i})
+        sink._thread = None
+        sink.start()
+        sink.close()
+
+        assert sink.dropped == 3
+        assert "dropped 3 events" in stream.getvalue()
+
+
+@pytest.fixture
+def restore_logging() -> Iterator[None]:
+    yield
+    set_log_sink(None)
+    structlog.reset_defaults()
+
+
+def test_setup_logging_sync_emits_info_through_stdlib(
+    restore_logging: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    root_level = logging.getLogger().level
+    try:
+        setup_logging("info", json_format=True)
+        logger = structlog.get_logger("server.app.test")
+        logger.info("Session created", session_id="s1")
+        logger.debug("Not at this level")
+    finally:
+        logging.getLogger().setLevel(root_level)
+
+    events = [json.loads(r.getMessage()) for r in caplog.records]
+    assert [(e["event"], e["level"]) for e in events] == [("Session created", "info")]
+
+
+def test_setup_logging_async_sink_samples_and_renders(restore_logging: None) -> None:
+    setup_logging("info", json_format=True, async_sink=True, sample_rates={"HTTP request": 0.0})
+    sink = get_log_sink()
+    assert sink is not None
+    stream = sink.stream = io.StringIO()
+
+    logger = structlog.get_logger("server.app.test")
+    logger.info("HTTP request", path="/health")
+    logger.debug("Not at this level")
+    logger.warning("HTTP request", path="/slow")
+    logger.info("Session created", session_id="s1")
+    set_log_sink(None)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(e["event"], e["level"]) for e in events] == [
+        ("HTTP request", "warning"),
+        ("Session created", "info"),
+    ]
+    assert events[1]["logger"] == "server.app.test"
+    assert "timestamp" in events[1]
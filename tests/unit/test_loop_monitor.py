@@ -0,0 +1,72 @@
+"""Unit tests for the event-loop lag monitor and blocking-call detector."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import pytest
+
+from server.app.observability import loop_monitor
+from server.app.observability.loop_monitor import EventLoopMonitor, bind_loop_context
+
+
+async def _run_monitor(
+    monitor: EventLoopMonitor, body: Callable[[], Coroutine[Any, Any, None]]
+) -> None:
+    runner = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    try:
+        # Spawned once the monitor (and in debug mode its task factory) runs.
+        await asyncio.create_task(body())
+        await asyncio.sleep(0.05)
+    finally:
+        runner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await runner
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def test_lag_reflects_blocking_work() -> None:
+    monitor = EventLoopMonitor(interval=0.01)
+
+    async def blocker() -> None:
+        _block_loop(0.15)
+
+    await _run_monitor(monitor, blocker)
+
+    assert monitor.max_lag >= 0.1
+    assert not monitor.stalls
+
+
+async def test_debug_mode_captures_stack_and_request_context() -> None:
+    monitor = EventLoopMonitor(interval=0.02, debug=True, slow_callback_seconds=0.05)
+
+    async def handler() -> None:
+        bind_loop_context(route="/sessions/{session_id}/messages", session_id="s1")
+
+        async def producer() -> None:
+            _block_loop(0.3)
+
+        await asyncio.create_task(producer(), name="turn-producer")
+
+    await _run_monitor(monitor, handler)
+
+    assert len(monitor.stalls) == 1
+    stall = monitor.stalls[0]
+    assert stall.blocked_seconds >= 0.05
+    assert stall.task is not None and stall.task.startswith("turn-producer")
+    assert stall.context == {"route": "/sessions/{session_id}/messages", "session_id": "s1"}
+    assert "_block_loop" in "\n".join(stall.stack)
+    assert loop_monitor._attribution_enabled is False
+
+
+async def test_bind_is_noop_without_debug_monitor() -> None:
+    bind_loop_context(session_id="s1")
+
+    assert loop_monitor._loop_context.get() is None
@@ -1,15 +1,22 @@
 """Unit tests for server.app.llm.model_catalog.
 
 Tests the ModelCatalog service: caching, provider mapping, model lookup,
-search, and graceful degradation when the catalog is unreachable.
+search, conditional refresh, the on-disk snapshot, and graceful degradation
+when the catalog is unreachable.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from server.app.llm.model_catalog import (
@@ -116,9 +123,28 @@ SAMPLE_CATALOG_JSON: dict[str, Any] = {
 }
 
 
+CATALOG_URL = "https://test.example.com/api.json"
+
+
 def _make_catalog(ttl: int = 3600) -> ModelCatalog:
     """Create a catalog with a test URL."""
-    return ModelCatalog(catalog_url="https://test.example.com/api.json", ttl_seconds=ttl)
+    return ModelCatalog(catalog_url=CATALOG_URL, ttl_seconds=ttl)
+
+
+def _response(status_code: int, **kwargs: Any) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", CATALOG_URL), **kwargs)
+
+
+@contextmanager
+def _patched_client(get: Any) -> Iterator[AsyncMock]:
+    """Patch httpx.AsyncClient so every client's ``get`` is ``get``."""
+    with patch("server.app.llm.model_catalog.httpx.AsyncClient") as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.get = get if isinstance(get, AsyncMock) else AsyncMock(side_effect=get)
+        mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+        mock_instance.__aexit__ = AsyncMock(return_value=None)
+        mock_client.return_value = mock_instance
+        yield mock_instance
 
 
 # ---------------------------------------------------------------------------
@@ -146,6 +172,8 @@ class TestParseModelEntry:
         assert result.output_cost == 10
         assert result.structured_output is True
         assert result.modalities == {"input": ["text", "image"], "output": ["text"]}
+        assert result.cache_read_cost == 1.25
+        assert result.cache_write_cost is None
 
     def test_parses_minimal_entry(self) -> None:
         data = {
@@ -202,6 +230,7 @@ class TestCatalogSlugsForProvider:
             "google_genai",
             "google_vertexai",
             "openai_compatible",
+            "scripted_mock",
             "mock",
         }
         assert set(PROVIDER_TYPE_TO_CATALOG_SLUGS.keys()) == expected
@@ -334,6 +363,16 @@ class TestModelCatalog:
         entry = await catalog.find_model("openai_compatible", "gpt-4o")
         assert entry is None
 
+    def test_lookup_reads_cache_only(self) -> None:
+        catalog = _make_catalog()
+        assert catalog.lookup("openai", "gpt-4o") is None
+
+        catalog._parse_catalog(SAMPLE_CATALOG_JSON)
+        entry = catalog.lookup("bedrock", "anthropic.claude-3-sonnet-20240229-v1:0")
+        assert entry is not None
+        assert entry.provider_slug == "amazon-bedrock"
+        assert catalog.lookup("openai_compatible", "gpt-4o") is None
+
 
 # ---------------------------------------------------------------------------
 # Search tests
@@ -398,6 +437,27 @@ class TestModelCatalogSearch:
         ids = {m.id for m in results}
         assert "claude-sonnet-4-6" in ids
 
+    @pytest.mark.asyncio
+    async def test_search_matches_substrings_across_tokens(self) -> None:
+        catalog = _make_catalog()
+        catalog._parse_catalog(SAMPLE_CATALOG_JSON)
+        catalog._last_refresh = time.monotonic()
+
+        assert [m.id for m in await catalog.search(query="PT-4")] == ["gpt-4o"]
+        assert [m.id for m in await catalog.search(query="o1")] == ["o1-mini"]
+        assert [m.id for m in await catalog.search(query="sonnet 4.6")] == ["claude-sonnet-4-6"]
+
+    @pytest.mark.asyncio
+    async def test_search_by_cognition_provider_type(self) -> None:
+        catalog = _make_catalog()
+        catalog._parse_catalog(SAMPLE_CATALOG_JSON)
+        catalog._last_refresh = time.monotonic()
+
+        results = await catalog.search(provider_type="bedrock", query="claude")
+        assert [m.provider_slug for m in results] == ["amazon-bedrock"]
+        assert await catalog.search(provider_type="openai_compatible") == []
+        assert await catalog.search(provider_type="openai", provider_slug="anthropic") == []
+
     @pytest.mark.asyncio
     async def test_search_no_results(self) -> None:
         catalog = _make_catalog()
@@ -475,7 +535,42 @@ class TestModelCatalogRefresh:
         assert catalog._cache == {}
 
     @pytest.mark.asyncio
-    async def test_ensure_loaded_triggers_refresh_when_stale(self) -> None:
+    async def test_failed_fetch_backs_off_before_retrying(self) -> None:
+        catalog = _make_catalog(ttl=3600)
+        get = AsyncMock(side_effect=httpx.ConnectError("unreachable"))
+
+        with _patched_client(get):
+            await catalog.ensure_loaded()
+            await catalog.ensure_loaded()
+            assert get.await_count == 1
+
+            catalog._failed_at = time.monotonic() - 61
+            await catalog.ensure_loaded()
+
+        assert get.await_count == 2
+        assert catalog.is_empty is True
+
+    @pytest.mark.asyncio
+    async def test_failed_revalidation_backs_off_for_at_most_the_ttl(self) -> None:
+        catalog = _make_catalog(ttl=5)
+        catalog._parse_catalog(SAMPLE_CATALOG_JSON)
+        catalog._last_refresh = time.monotonic() - 10
+        get = AsyncMock(side_effect=httpx.ConnectError("unreachable"))
+
+        with _patched_client(get):
+            await catalog.refresh()
+            await catalog.ensure_loaded()
+            assert catalog._refresh_task is not None and catalog._refresh_task.done()
+
+            catalog._failed_at = time.monotonic() - 6
+            await catalog.ensure_loaded()
+            await catalog._refresh_task
+
+        assert get.await_count == 2
+        assert len(catalog._cache["openai"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_ensure_loaded_revalidates_stale_cache_in_background(self) -> None:
         catalog = _make_catalog(ttl=1)
         catalog._parse_catalog(SAMPLE_CATALOG_JSON)
         catalog._last_refresh = time.monotonic() - 2  # Expired
@@ -492,8 +587,56 @@ class TestModelCatalogRefresh:
             mock_client.return_value = mock_instance
 
             await catalog.ensure_loaded()
+            # Stale data is served without waiting on the fetch.
+            assert catalog.is_stale is True
+            assert catalog._refresh_task is not None
+            await catalog._refresh_task
 
         mock_instance.get.assert_called_once()
+        assert catalog.is_stale is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_fetch(self) -> None:
+        catalog = _make_catalog()
+        release = asyncio.Event()
+
+        async def slow_get(url: str, headers: dict[str, str]) -> httpx.Response:
+            await release.wait()
+            return _response(200, json=SAMPLE_CATALOG_JSON)
+
+        with _patched_client(slow_get) as mock_instance:
+            waiters = [asyncio.create_task(catalog.ensure_loaded()) for _ in range(5)]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*waiters)
+
+        assert mock_instance.get.await_count == 1
+        assert catalog.is_empty is False
+
+    @pytest.mark.asyncio
+    async def test_refresh_sends_validators_and_keeps_cache_on_304(self) -> None:
+        catalog = _make_catalog()
+        responses = [
+            _response(
+                200,
+                json=SAMPLE_CATALOG_JSON,
+                headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"},
+            ),
+            _response(304),
+        ]
+
+        with _patched_client(AsyncMock(side_effect=responses)) as mock_instance:
+            await catalog.refresh()
+            catalog._last_refresh = time.monotonic() - 7200
+            await catalog.refresh()
+
+        assert mock_instance.get.await_args_list[0].kwargs["headers"] == {}
+        assert mock_instance.get.await_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 01 Jan 2026 00:00:00 GMT",
+        }
+        assert catalog.is_stale is False
+        assert len(catalog._cache["openai"]) == 2
 
     @pytest.mark.asyncio
     async def test_ensure_loaded_skips_refresh_when_fresh(self) -> None:
@@ -521,6 +664,69 @@ class TestModelCatalogRefresh:
         assert catalog.is_stale is True
 
 
+# ---------------------------------------------------------------------------
+# Snapshot tests
+# ---------------------------------------------------------------------------
+
+
+class TestModelCatalogSnapshot:
+    """Tests for the on-disk catalog snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_writes_snapshot_that_loads_without_network(self, tmp_path) -> None:
+        snapshot_path = tmp_path / "catalog" / "snapshot.json"
+        online = ModelCatalog(catalog_url=CATALOG_URL, snapshot_path=snapshot_path)
+        with _patched_client(AsyncMock(return_value=_response(200, json=SAMPLE_CATALOG_JSON))):
+            await online.refresh()
+        assert snapshot_path.exists()
+
+        offline = ModelCatalog(catalog_url=CATALOG_URL, snapshot_path=snapshot_path)
+        with _patched_client(AsyncMock(side_effect=httpx.ConnectError("offline"))) as client:
+            models = await offline.get_models_for_provider("anthropic")
+
+        assert [m.id for m in models] == ["claude-sonnet-4-6"]
+        assert offline.is_stale is False
+        client.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_is_served_while_revalidating(self, tmp_path) -> None:
+        snapshot_path = tmp_path / "snapshot.json"
+        snapshot_path.write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "url": CATALOG_URL,
+                    "fetched_at": time.time() - 7200,
+                    "etag": '"v1"',
+                    "last_modified": None,
+                    "catalog": SAMPLE_CATALOG_JSON,
+                }
+            )
+        )
+        catalog = ModelCatalog(catalog_url=CATALOG_URL, snapshot_path=snapshot_path)
+
+        with _patched_client(AsyncMock(return_value=_response(304))) as client:
+            entry = await catalog.get_model("openai", "gpt-4o")
+            assert entry is not None
+            assert catalog._refresh_task is not None
+            await catalog._refresh_task
+
+        assert client.get.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert catalog.is_stale is False
+
+    @pytest.mark.asyncio
+    async def test_corrupt_snapshot_is_ignored(self, tmp_path) -> None:
+        snapshot_path = tmp_path / "snapshot.json"
+        snapshot_path.write_text("{not json")
+        catalog = ModelCatalog(catalog_url=CATALOG_URL, snapshot_path=snapshot_path)
+
+        with _patched_client(AsyncMock(return_value=_response(200, json=SAMPLE_CATALOG_JSON))):
+            await catalog.ensure_loaded()
+
+        assert catalog.is_empty is False
+        assert json.loads(snapshot_path.read_text())["catalog"] == SAMPLE_CATALOG_JSON
+
+
 # ---------------------------------------------------------------------------
 # Singleton tests
 # ---------------------------------------------------------------------------
@@ -541,6 +747,8 @@ class TestModelCatalogSingleton:
         settings = MagicMock()
         settings.model_catalog_url = "https://test.example.com/api.json"
         settings.model_catalog_ttl_seconds = 1800
+        settings.model_catalog_snapshot_path = ".cognition/model-catalog.json"
+        settings.workspace_path = Path("/srv/workspace")
 
         with patch("server.app.settings.get_settings", return_value=settings):
             from server.app.llm.model_catalog import get_model_catalog
@@ -548,6 +756,7 @@ class TestModelCatalogSingleton:
             catalog = get_model_catalog()
             assert catalog._catalog_url == "https://test.example.com/api.json"
             assert catalog._ttl_seconds == 1800
+            assert catalog._snapshot_path == Path("/srv/workspace/.cognition/model-catalog.json")
 
         reset_model_catalog()
 
@@ -0,0 +1,160 @@
+"""Unit tests for opt-in turn profiling."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncGenerator, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server.app.api.routes import profiles
+from server.app.api.routes.messages import profile_turn
+from server.app.observability.profiling import (
+    PROFILE_HEADER,
+    ProfileInfo,
+    ProfileStore,
+    SamplingProfiler,
+    new_profile_id,
+    profile_trigger,
+    set_profile_store,
+)
+from server.app.observability.turn_timing import TurnTiming
+from server.app.settings import Settings
+
+
+def _settings(**overrides: Any) -> Settings:
+    return Settings(COGNITION_PROFILING_ENABLED=True, **overrides)
+
+
+def _busy_turn_step(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfileTrigger:
+    def test_disabled_never_profiles(self) -> None:
+        settings = Settings(COGNITION_PROFILING_ENABLED=False, COGNITION_PROFILING_SAMPLE_RATE=1.0)
+        assert profile_trigger(settings, "1") is None
+
+    def test_requested_with_and_without_token(self) -> None:
+        assert profile_trigger(_settings(), "1") is None
+        assert profile_trigger(_settings(), "") is None
+
+        with_token = _settings(COGNITION_PROFILING_TOKEN="s3cret")
+        assert profile_trigger(with_token, "1") is None
+        assert profile_trigger(with_token, "s3cret") == "request"
+
+    def test_sampled(self) -> None:
+        assert profile_trigger(_settings(COGNITION_PROFILING_SAMPLE_RATE=1.0), None) == "sampled"
+        assert profile_trigger(_settings(COGNITION_PROFILING_SAMPLE_RATE=0.0), None) is None
+
+
+class TestSamplingProfiler:
+    async def test_samples_the_loop_thread_as_speedscope(self) -> None:
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        _busy_turn_step(0.1)
+        duration = profiler.stop()
+
+        document = profiler.speedscope("turn")
+        frames = document["shared"]["frames"]
+        profile = document["profiles"][0]
+
+        assert duration >= 0.1
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"]) > 10
+        names = {frames[i]["name"] for stack in profile["samples"] for i in stack}
+        assert "_busy_turn_step" in names
+        assert all(frames[stack[0]]["name"].startswith("[task ") for stack in profile["samples"])
+
+
+class TestProfileStore:
+    def test_save_list_get_and_prune(self, tmp_path: Path) -> None:
+        store = ProfileStore(tmp_path, max_profiles=2)
+        ids = []
+        for i in range(3):
+            info = ProfileInfo(id=new_profile_id(), session_id=f"s{i}", created_at=1000.0 + i)
+            store.save(info, {"profiles": []})
+            ids.append(info.id)
+
+        assert [info.session_id for info in store.list_profiles()] == ["s2", "s1"]
+        assert store.get(ids[0]) is None
+        assert not (tmp_path / f"{ids[0]}.speedscope.json").exists()
+        assert store.get(ids[2]) is not None
+        assert store.profile_path("../../etc/passwd") is None
+
+    async def test_profile_turn_tags_and_stores_profile(self, tmp_path: Path) -> None:
+        store = ProfileStore(tmp_path)
+        timing = TurnTiming(session_id="s1", provider="bedrock", model="claude")
+        info = ProfileInfo(id=new_profile_id(), session_id="s1", agent_name="coder")
+
+        async def events() -> AsyncGenerator[dict[str, Any], None]:
+            yield {"event": "token", "data": {"content": "hi"}}
+            _busy_turn_step(0.02)
+            timing.finish("done")
+            yield {"event": "done", "data": {}}
+
+        relayed = [e async for e in profile_turn(events(), info, store, timing, 0.001)]
+
+        assert [e["event"] for e in relayed] == ["token", "done"]
+        stored = store.get(info.id)
+        assert stored is not None
+        assert (stored.agent_name, stored.provider, stored.model, stored.status) == (
+            "coder",
+            "bedrock",
+            "claude",
+            "done",
+        )
+        assert stored.samples > 0
+
+
+@pytest.fixture
+def profile_store(tmp_path: Path) -> Iterator[ProfileStore]:
+    store = ProfileStore(tmp_path)
+    set_profile_store(store)
+    yield store
+    set_profile_store(None)
+
+
+def _client(settings: Settings) -> TestClient:
+    app = FastAPI()
+    app.include_router(profiles.router)
+    app.dependency_overrides[profiles.get_settings_dep] = lambda: settings
+    return TestClient(app)
+
+
+class TestProfileRoutes:
+    def test_disabled_returns_404(self) -> None:
+        response = _client(Settings(COGNITION_PROFILING_ENABLED=False)).get("/profiles")
+        assert response.status_code == 404
+
+    def test_refused_without_configured_token(self, profile_store: ProfileStore) -> None:
+        client = _client(_settings())
+
+        assert client.get("/profiles").status_code == 403
+        assert client.get("/profiles", headers={PROFILE_HEADER: "1"}).status_code == 403
+
+    def test_token_required_then_list_and_download(self, profile_store: ProfileStore) -> None:
+        info = ProfileInfo(id=new_profile_id(), session_id="s1", agent_name="coder")
+        profile_store.save(info, {"$schema": "speedscope", "profiles": []})
+        client = _client(_settings(COGNITION_PROFILING_TOKEN="s3cret"))
+
+        assert client.get("/profiles").status_code == 403
+
+        headers = {PROFILE_HEADER: "s3cret"}
+        listed = client.get("/profiles", headers=headers).json()
+        assert [p["id"] for p in listed["profiles"]] == [info.id]
+        assert (
+            client.get("/profiles", params={"session_id": "other"}, headers=headers).json()["total"]
+            == 0
+        )
+
+        download = client.get(f"/profiles/{info.id}", headers=headers)
+        assert download.status_code == 200
+        assert download.json()["$schema"] == "speedscope"
+        assert client.get(f"/profiles/{'0' * 32}", headers=headers).status_code == 404
@@ -0,0 +1,94 @@
+"""Unit tests for prompt-prefix cache markers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from deepagents.middleware._utils import append_to_system_message
+from langchain.agents.middleware.types import ModelRequest
+from langchain_aws import ChatBedrock, ChatBedrockConverse
+from langchain_aws.chat_models.bedrock import _format_anthropic_messages
+from langchain_aws.chat_models.bedrock_converse import _messages_to_bedrock
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from server.app.agent.middleware import PromptCacheMiddleware, prompt_cache_style
+from server.app.llm.mock import MockLLM
+
+
+def _bedrock(model_id: str) -> ChatBedrock:
+    return ChatBedrock(model=model_id, region="us-east-1")
+
+
+async def _marked_request(
+    model: Any, system: SystemMessage = SystemMessage("You are Cognition.")
+) -> ModelRequest:
+    seen: list[ModelRequest] = []
+
+    async def handler(request: ModelRequest) -> str:
+        seen.append(request)
+        return "ok"
+
+    request = ModelRequest(
+        model=model,
+        messages=[HumanMessage("hi")],
+        system_message=system,
+        model_settings={"max_tokens": 100},
+    )
+    assert await PromptCacheMiddleware().awrap_model_call(request, handler) == "ok"
+    return seen[0]
+
+
+class TestPromptCacheStyle:
+    @pytest.mark.parametrize(
+        ("model_id", "expected"),
+        [
+            ("anthropic.claude-3-5-sonnet-20240620-v1:0", "cache_control"),
+            ("us.amazon.nova-pro-v1:0", "cache_point"),
+            ("meta.llama3-70b-instruct-v1:0", None),
+        ],
+    )
+    def test_bedrock_models(self, model_id: str, expected: str | None) -> None:
+        assert prompt_cache_style(_bedrock(model_id)) == expected
+
+    def test_converse_and_other_providers(self) -> None:
+        converse = ChatBedrockConverse(
+            model="us.anthropic.claude-sonnet-4-20250514-v1:0", region_name="us-east-1"
+        )
+
+        assert prompt_cache_style(converse) == "cache_point"
+        assert prompt_cache_style(MockLLM()) is None
+
+
+class TestPromptCacheMiddleware:
+    async def test_marks_claude_on_invoke_api_before_memory(self) -> None:
+        request = await _marked_request(_bedrock("anthropic.claude-3-5-sonnet-20240620-v1:0"))
+        assert request.model_settings == {"max_tokens": 100, "cache_control": {"type": "ephemeral"}}
+        assert request.system_message is not None
+
+        # Memory is appended further down the stack, after the marker.
+        with_memory = append_to_system_message(request.system_message, "<agent_memory>")
+        system, _ = _format_anthropic_messages([with_memory, HumanMessage("hi")])
+
+        assert system == [
+            {"type": "text", "text": "You are Cognition.", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "\n\n<agent_memory>"},
+        ]
+
+    async def test_adds_converse_cache_point_once(self) -> None:
+        model = _bedrock("us.amazon.nova-pro-v1:0")
+        request = await _marked_request(model)
+        assert request.system_message is not None
+        # A subagent stack may run the middleware on an already marked prompt.
+        request = await _marked_request(model, request.system_message)
+        assert request.system_message is not None
+
+        _, system = _messages_to_bedrock([request.system_message, HumanMessage("hi")])
+
+        assert system == [{"text": "You are Cognition."}, {"cachePoint": {"type": "default"}}]
+
+    async def test_leaves_unsupported_models_alone(self) -> None:
+        request = await _marked_request(MockLLM())
+
+        assert request.model_settings == {"max_tokens": 100}
+        assert request.system_message == SystemMessage("You are Cognition.")
@@ -25,6 +25,7 @@ class _MockProviderConfig:
         base_url: str | None = "https://openrouter.ai/api/v1",
         region: str | None = None,
         role_arn: str | None = None,
+        extra: dict[str, Any] | None = None,
     ) -> None:
         self.id = id
         self.provider = provider
@@ -37,6 +38,7 @@ class _MockProviderConfig:
         self.base_url = base_url
         self.region = region
         self.role_arn = role_arn
+        self.extra = extra or {}
 
 
 def _make_resolver(store: Any = None) -> RuntimeResolver:
@@ -254,6 +256,7 @@ class TestBuildModel:
             resolver.build_model("openai", "gpt-4o")
             assert mock_init.call_args[0][0] == "gpt-4o"
             assert mock_init.call_args.kwargs["model_provider"] == "openai"
+            assert mock_init.call_args.kwargs["stream_usage"] is True
 
     def test_openai_compatible_raises_without_base_url(self) -> None:
         from server.app.exceptions import LLMProviderConfigError
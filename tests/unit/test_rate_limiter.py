@@ -7,7 +7,17 @@ import asyncio
 import pytest
 
 from server.app.exceptions import RateLimitError
-from server.app.rate_limiter import RateLimitConfig, RateLimiter, TokenBucket
+from server.app.rate_limiter import (
+    InMemoryRateLimiterBackend,
+    LeasingRateLimiterBackend,
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterBackend,
+    RateLimitRule,
+    TokenBucket,
+    gcra,
+)
+from server.app.storage.rate_limit_store import SqliteRateLimiterBackend
 
 
 class TestTokenBucket:
@@ -230,3 +240,152 @@ class TestRateLimiterEdgeCases:
         """Test rate limiting with very long key."""
         long_key = "x" * 1000
         await started_limiter.check_rate_limit(long_key)
+
+
+class TestGcra:
+    """Test the GCRA step function."""
+
+    def test_fractional_accrual_is_not_truncated(self):
+        """Half an interval after exhausting the burst, half a unit is available."""
+        rule = RateLimitRule(limit=60, period_seconds=60, burst=1)  # 1 unit/s
+        tat, decision = gcra(None, 0.0, rule)
+        assert decision.allowed
+
+        _, decision = gcra(tat, 0.5, rule)
+        assert not decision.allowed
+        assert decision.retry_after == pytest.approx(0.5)
+
+        _, decision = gcra(tat, 0.5, rule, cost=0.5)
+        assert decision.allowed
+
+    def test_denied_request_does_not_consume(self):
+        rule = RateLimitRule(limit=60, burst=1)
+        tat, _ = gcra(None, 0.0, rule)
+        new_tat, decision = gcra(tat, 0.0, rule)
+        assert not decision.allowed
+        assert new_tat == tat
+
+    def test_forced_usage_puts_key_in_debt(self):
+        rule = RateLimitRule(limit=100, period_seconds=60, burst=100)
+        tat, decision = gcra(None, 0.0, rule, cost=250, force=True)
+        assert decision.allowed
+
+        _, decision = gcra(tat, 0.0, rule, cost=0)
+        assert not decision.allowed
+        # 150 units over the burst at 100/min takes 90 seconds to repay.
+        assert decision.retry_after == pytest.approx(90.0)
+
+
+class _CountingBackend(InMemoryRateLimiterBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def acquire(self, key, rule, cost=1.0, force=False):
+        self.calls += 1
+        return await super().acquire(key, rule, cost, force)
+
+
+class TestRateLimiterBackends:
+    """Test backend implementations and the leasing layer."""
+
+    async def test_in_memory_backend_satisfies_protocol(self):
+        assert isinstance(InMemoryRateLimiterBackend(), RateLimiterBackend)
+
+    async def test_in_memory_prune_drops_recovered_keys(self):
+        backend = InMemoryRateLimiterBackend()
+        await backend.acquire("fast", RateLimitRule(limit=600_000, burst=1))
+        await backend.acquire("slow", RateLimitRule(limit=1, burst=1))
+        await asyncio.sleep(0.01)
+
+        assert await backend.prune() == 1
+        assert len(backend) == 1
+
+    async def test_leasing_serves_from_local_lease(self):
+        inner = _CountingBackend()
+        backend = LeasingRateLimiterBackend(inner, lease_size=5, lease_ttl_seconds=60)
+        rule = RateLimitRule(limit=60, burst=10)
+
+        for _ in range(10):
+            assert (await backend.acquire("k", rule)).allowed
+        assert not (await backend.acquire("k", rule)).allowed
+        assert inner.calls == 4  # two leases of 5, then a denied lease and single unit
+
+    async def test_leasing_falls_back_to_single_unit(self):
+        inner = _CountingBackend()
+        backend = LeasingRateLimiterBackend(inner, lease_size=5, lease_ttl_seconds=60)
+        rule = RateLimitRule(limit=60, burst=3)
+
+        # The lease is capped at the burst, so all three units are admitted.
+        for _ in range(3):
+            assert (await backend.acquire("k", rule)).allowed
+        assert not (await backend.acquire("k", rule)).allowed
+
+    async def test_sqlite_backend_is_shared_between_instances(self, tmp_path):
+        db_path = str(tmp_path / "state.db")
+        replica_a = SqliteRateLimiterBackend(db_path)
+        replica_b = SqliteRateLimiterBackend(db_path)
+        rule = RateLimitRule(limit=60, burst=3)
+        try:
+            results = [
+                (await backend.acquire("tenant", rule)).allowed
+                for backend in (replica_a, replica_b, replica_a, replica_b)
+            ]
+            assert results == [True, True, True, False]
+            assert (await replica_b.acquire("other", rule)).allowed
+        finally:
+            await replica_a.close()
+            await replica_b.close()
+
+    async def test_sqlite_backend_concurrent_checks_do_not_over_admit(self, tmp_path):
+        backend = SqliteRateLimiterBackend(str(tmp_path / "state.db"))
+        rule = RateLimitRule(limit=60, burst=5)
+        try:
+            decisions = await asyncio.gather(
+                *(backend.acquire(key, rule) for key in ["a", "b"] * 20)
+            )
+            assert sum(d.allowed for d in decisions) == 10
+            assert await backend.prune() == 0
+        finally:
+            await backend.close()
+
+    async def test_sqlite_backend_rejects_cost_above_burst(self, tmp_path):
+        backend = SqliteRateLimiterBackend(str(tmp_path / "state.db"))
+        try:
+            assert not (await backend.acquire("k", RateLimitRule(limit=60, burst=2), 3)).allowed
+        finally:
+            await backend.close()
+
+
+class TestScopeQuotas:
+    """Test per-scope request quotas and token budgets."""
+
+    async def test_scope_request_quota_spans_sessions(self):
+        limiter = RateLimiter(
+            RateLimitConfig(requests_per_minute=600, burst_size=100, scope_requests_per_minute=2)
+        )
+        scope = {"user": "alice", "project": "p"}
+
+        await limiter.check_scope_quota(scope)
+        await limiter.check_scope_quota({"project": "p", "user": "alice"})
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.check_scope_quota(scope)
+        assert exc_info.value.details["retry_after_seconds"] > 0
+
+        await limiter.check_scope_quota({"user": "bob"})
+
+    async def test_token_budget_blocks_after_usage(self):
+        limiter = RateLimiter(RateLimitConfig(scope_tokens_per_minute=1000))
+        scope = {"user": "alice"}
+
+        await limiter.check_scope_quota(scope)
+        await limiter.record_token_usage(scope, 1500)
+        with pytest.raises(RateLimitError):
+            await limiter.check_scope_quota(scope)
+
+    async def test_quotas_disabled_by_default(self):
+        limiter = RateLimiter()
+        for _ in range(100):
+            await limiter.check_scope_quota({"user": "alice"})
+        await limiter.record_token_usage({"user": "alice"}, 10**9)
+        await limiter.check_scope_quota({"user": "alice"})
@@ -119,6 +119,59 @@ class TestSessionEndpoints:
         response = client.get("/sessions/non-existent-id")
         assert response.status_code == 404
 
+    def test_session_events_replays_turn_after_last_event_id(self):
+        """A client can reattach to a session's turn stream with Last-Event-ID."""
+        from server.app.api.sse import open_session_event_log
+
+        session_id = client.post("/sessions", json={"title": "events-session"}).json()["id"]
+        assert client.get(f"/sessions/{session_id}/events").status_code == 404
+
+        log = open_session_event_log(session_id)
+        log.append("1-a", "token", {"content": "Hello"})
+        log.append("2-b", "token", {"content": " world"})
+        log.append("3-c", "done", {})
+        log.close()
+
+        response = client.get(f"/sessions/{session_id}/events", headers={"Last-Event-ID": "1-a"})
+
+        assert response.status_code == 200
+        body = response.text
+        assert "event: reconnected" in body
+        assert '"content": "Hello"' not in body
+        assert body.index("id: 2-b") < body.index("id: 3-c")
+
+    def test_get_session_usage(self):
+        """Session usage is served from the usage ledger rollups."""
+        import asyncio
+
+        from server.app.usage import InMemoryUsageLedger, TokenUsage, UsageRecord, set_usage_ledger
+
+        session_id = client.post("/sessions", json={"title": "usage-session"}).json()["id"]
+        ledger = InMemoryUsageLedger()
+        record = UsageRecord(
+            session_id=session_id,
+            scope="scope:",
+            provider="openai",
+            model="gpt-4o",
+            usage=TokenUsage(input_tokens=900, output_tokens=100, cache_read_tokens=500),
+            cost=0.004,
+        )
+        asyncio.run(ledger.record(record))
+        set_usage_ledger(ledger)
+        try:
+            response = client.get(f"/sessions/{session_id}/usage")
+            scope_response = client.get("/usage")
+        finally:
+            set_usage_ledger(None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["session_id"] == session_id
+        assert (data["input_tokens"], data["cache_read_tokens"], data["turns"]) == (900, 500, 1)
+        assert data["models"][0]["model"] == "gpt-4o"
+        assert scope_response.json()["estimated_cost"] == 0.004
+        assert client.get("/sessions/non-existent-id/usage").status_code == 404
+
     def test_update_session(self):
         """Test updating a session."""
         # Create a session
@@ -268,6 +321,25 @@ class TestMessageEndpoints:
         assert "text/event-stream" in response.headers.get("content-type", "")
         assert mock_callback.await_count == 1
 
+    def test_send_message_reads_profile_token_only_from_header(self):
+        """Test the profiling token is not taken from the query string."""
+        session_resp = client.post("/sessions", json={"title": "profile-test"})
+        session_id = session_resp.json()["id"]
+
+        with patch("server.app.api.routes.messages.profile_trigger", return_value=None) as trigger:
+            client.post(
+                f"/sessions/{session_id}/messages?profile=s3cret",
+                json={"content": "Hello, world!"},
+                headers={"Accept": "text/event-stream"},
+            )
+            client.post(
+                f"/sessions/{session_id}/messages",
+                json={"content": "Hello, world!"},
+                headers={"Accept": "text/event-stream", "X-Cognition-Profile": "s3cret"},
+            )
+
+        assert [call.args[1] for call in trigger.call_args_list] == [None, "s3cret"]
+
 
 class TestConfigEndpoints:
     """Test config API endpoints."""
@@ -0,0 +1,190 @@
+"""Unit tests for HITL resume through the shared session agent manager."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from server.app.agent.runtime import DoneEvent, InterruptEvent, TokenEvent, UsageEvent
+from server.app.api.models import SessionResumeRequest
+from server.app.api.routes.messages import TurnOutcome, persist_assistant_reply
+from server.app.api.routes.sessions import resume_session
+from server.app.api.scoping import SessionScope
+from server.app.llm.deep_agent_service import SessionAgentManager
+from server.app.models import Session, SessionConfig, SessionStatus
+from server.app.settings import Settings
+from server.app.usage import InMemoryUsageLedger, set_usage_ledger
+
+
+def _session() -> Session:
+    return Session(
+        id="sess-resume",
+        workspace_path="/tmp/ws",
+        title="Resume",
+        thread_id="thread-resume",
+        status=SessionStatus.WAITING_FOR_APPROVAL,
+        config=SessionConfig(provider="mock", model="mock-model"),
+        created_at="2026-01-01T00:00:00",
+        updated_at="2026-01-01T00:00:00",
+    )
+
+
+async def _events(*events: Any) -> AsyncGenerator[Any, None]:
+    for event in events:
+        yield event
+
+
+def _storage(session: Session) -> MagicMock:
+    storage = MagicMock()
+    storage.get_session = AsyncMock(return_value=session)
+    storage.get_checkpointer = AsyncMock(return_value=MagicMock())
+    storage.get_store = AsyncMock(return_value=MagicMock())
+    return storage
+
+
+async def _resume(manager: SessionAgentManager, session: Session, *events: Any) -> list[Any]:
+    runtime = MagicMock()
+    runtime.astream_resume_events = MagicMock(return_value=_events(*events))
+    service = manager.get_or_register(session.id, session.workspace_path)
+    registered: list[Any] = []
+    manager.register_runtime = MagicMock(side_effect=lambda sid, rt: registered.append(rt))
+
+    with (
+        patch("server.app.llm.deep_agent_service.DeepAgentRuntime", return_value=runtime),
+        patch(
+            "server.app.llm.deep_agent_service.DeepAgentStreamingService._resolve_model",
+            new_callable=AsyncMock,
+            return_value=(MagicMock(), "mock", "mock-model", 100),
+        ),
+        patch(
+            "server.app.llm.deep_agent_service.create_cognition_agent",
+            new_callable=AsyncMock,
+            return_value=MagicMock(sandbox_backend=None),
+        ),
+        patch("server.app.llm.deep_agent_service.create_storage_backend") as create_backend,
+    ):
+        collected = [
+            event
+            async for event in service.resume_response(
+                session_id=session.id,
+                thread_id=session.thread_id,
+                project_path=session.workspace_path,
+                decision="approve",
+                tool_name="execute",
+                manager=manager,
+            )
+        ]
+        create_backend.assert_not_called()
+
+    assert registered == [runtime]
+    return collected
+
+
+class TestResumeResponse:
+    @pytest.mark.asyncio
+    async def test_uses_shared_backend_and_registers_runtime(self):
+        session = _session()
+        storage = _storage(session)
+        manager = SessionAgentManager(Settings(), storage_backend=storage)
+
+        collected = await _resume(manager, session, TokenEvent(content="done"), DoneEvent())
+
+        assert manager.get_service(session.id).storage_backend is storage
+        assert [type(e) for e in collected] == [TokenEvent, UsageEvent, DoneEvent]
+        assert manager.get_runtime(session.id) is None
+
+    @pytest.mark.asyncio
+    async def test_further_interrupt_stops_the_turn(self):
+        session = _session()
+        manager = SessionAgentManager(Settings(), storage_backend=_storage(session))
+        interrupt = InterruptEvent(tool_call_id="tc-2", tool_name="write_file", args={})
+
+        collected = await _resume(manager, session, interrupt, TokenEvent(content="late"))
+
+        assert collected == [interrupt]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_turn_is_still_recorded_in_usage_ledger(self):
+        session = _session()
+        manager = SessionAgentManager(Settings(), storage_backend=_storage(session))
+        interrupt = InterruptEvent(tool_call_id="tc-2", tool_name="write_file", args={})
+        usage = UsageEvent(input_tokens=120, output_tokens=30, model_calls=1)
+        ledger = InMemoryUsageLedger()
+        set_usage_ledger(ledger)
+        try:
+            collected = await _resume(manager, session, usage, interrupt)
+        finally:
+            set_usage_ledger(None)
+
+        assert collected == [interrupt]
+        [record] = ledger.records
+        assert (record.session_id, record.scope, record.model) == (
+            "sess-resume",
+            "scope:",
+            "mock-model",
+        )
+        assert record.usage.total_tokens == 150
+
+
+class TestResumeRoute:
+    @pytest.mark.asyncio
+    async def test_failed_resume_is_not_marked_active(self):
+        session = _session()
+        store = _storage(session)
+        store.update_session = AsyncMock()
+        manager = MagicMock()
+
+        async def failed_turn(
+            events: Any, session_id: str, store: Any, outcome: TurnOutcome
+        ) -> AsyncGenerator[dict[str, Any], None]:
+            outcome.error = {"message": "provider down"}
+            return
+            yield
+
+        request = SessionResumeRequest(decision="approve", tool_call_id="tc-1", tool_name="execute")
+        http_request = MagicMock(headers={"accept": "application/json"})
+        with (
+            patch("server.app.api.routes.sessions.render_agent_events"),
+            patch("server.app.api.routes.sessions.persist_assistant_reply", failed_turn),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await resume_session(
+                session.id,
+                request,
+                http_request,
+                settings=Settings(),
+                scope=SessionScope({}),
+                store=store,
+                agent_manager=manager,
+            )
+
+        assert exc_info.value.status_code == 500
+        store.update_session.assert_not_awaited()
+
+
+class TestPersistAssistantReply:
+    @pytest.mark.asyncio
+    async def test_persists_reply_from_done_event(self):
+        store = MagicMock()
+        store.create_message = AsyncMock()
+        store.get_messages_by_session = AsyncMock(return_value=([MagicMock()], 1))
+        store.update_message_count = AsyncMock()
+        outcome = TurnOutcome()
+        token = {"event": "token", "data": {"content": "hi"}}
+        done = {"event": "done", "data": {"assistant_data": {"content": "hi"}}}
+
+        relayed = [
+            chunk
+            async for chunk in persist_assistant_reply(
+                _events(token, done), "sess-resume", store, outcome
+            )
+        ]
+
+        assert len(relayed) == 2
+        assert outcome.status == "done"
+        store.create_message.assert_awaited_once()
+        assert store.create_message.await_args.kwargs["content"] == "hi"
@@ -0,0 +1,108 @@
+"""Unit tests for per-session sandbox handle reuse."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from server.app.agent.sandbox_backend import CognitionDockerSandboxBackend
+from server.app.agent.sandbox_registry import SandboxRegistry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _factory(created: list[Any]) -> Any:
+    def make() -> Any:
+        backend = MagicMock()
+        backend.health_check.return_value = True
+        created.append(backend)
+        return backend
+
+    return make
+
+
+class TestSandboxRegistry:
+    @pytest.mark.asyncio
+    async def test_reuses_handle_across_turns(self):
+        registry = SandboxRegistry(clock=FakeClock())
+        created: list[Any] = []
+
+        first = await registry.acquire("cognition-s1", _factory(created))
+        second = await registry.acquire("cognition-s1", _factory(created))
+
+        assert first is second
+        assert len(created) == 1
+
+    @pytest.mark.asyncio
+    async def test_separate_handles_per_session(self):
+        registry = SandboxRegistry(clock=FakeClock())
+        created: list[Any] = []
+
+        a = await registry.acquire("cognition-a", _factory(created))
+        b = await registry.acquire("cognition-b", _factory(created))
+
+        assert a is not b
+        assert len(registry) == 2
+
+    @pytest.mark.asyncio
+    async def test_health_check_is_rate_limited(self):
+        clock = FakeClock()
+        registry = SandboxRegistry(health_check_interval=30.0, clock=clock)
+        created: list[Any] = []
+        backend = await registry.acquire("s", _factory(created))
+
+        clock.now = 10.0
+        await registry.acquire("s", _factory(created))
+        backend.health_check.assert_not_called()
+
+        clock.now = 31.0
+        await registry.acquire("s", _factory(created))
+        backend.health_check.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_handle_is_reset_in_place(self):
+        clock = FakeClock()
+        registry = SandboxRegistry(health_check_interval=0.0, clock=clock)
+        created: list[Any] = []
+        backend = await registry.acquire("s", _factory(created))
+        backend.health_check.return_value = False
+
+        again = await registry.acquire("s", _factory(created))
+
+        assert again is backend
+        backend.terminate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_discard_forgets_handle(self):
+        registry = SandboxRegistry(clock=FakeClock())
+        created: list[Any] = []
+        backend = await registry.acquire("s", _factory(created))
+
+        assert registry.discard(backend) is True
+        assert registry.get("s") is None
+        assert await registry.acquire("s", _factory(created)) is not backend
+
+
+class TestDockerHealthCheck:
+    def test_healthy_before_container_starts(self, tmp_path):
+        assert CognitionDockerSandboxBackend(root_dir=tmp_path).health_check() is True
+
+    def test_dead_container_is_unhealthy_and_reset(self, tmp_path):
+        backend = CognitionDockerSandboxBackend(root_dir=tmp_path)
+        container = MagicMock(status="exited")
+        docker_backend = backend._get_docker_backend()
+        docker_backend._container = container
+
+        assert backend.health_check() is False
+        backend.terminate()
+
+        container.remove.assert_called_once_with(force=True)
+        assert backend._docker_backend is None
@@ -0,0 +1,184 @@
+"""Unit tests for the K8s sandbox runtime server (deploy/sandbox/runtime_server.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import io
+import json
+import tarfile
+import time
+from pathlib import Path
+from types import ModuleType
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+_SERVER_PATH = Path(__file__).resolve().parents[2] / "deploy" / "sandbox" / "runtime_server.py"
+
+
+@pytest.fixture
+def runtime(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("sandbox_runtime_server", _SERVER_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "WORKSPACE", str(tmp_path))
+    return module
+
+
+@pytest.fixture
+def client(runtime: ModuleType) -> TestClient:
+    return TestClient(runtime.app)
+
+
+def _tar(files: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buf.getvalue()
+
+
+class TestBatchTransfer:
+    def test_upload_batch_writes_each_member(self, client: TestClient, tmp_path: Path):
+        absolute = str(tmp_path / "abs" / "a.py")
+        response = client.post(
+            "/upload/batch",
+            content=_tar({absolute: b"a", "nested/b.txt": b"b"}),
+            headers={"Content-Type": "application/x-tar"},
+        )
+
+        assert response.status_code == 200
+        assert [r["error"] for r in response.json()["results"]] == [None, None]
+        assert Path(absolute).read_bytes() == b"a"
+        assert (tmp_path / "nested" / "b.txt").read_bytes() == b"b"
+
+    def test_upload_batch_spooled_to_disk(
+        self, runtime: ModuleType, client: TestClient, tmp_path: Path
+    ):
+        runtime.SPOOL_MAX_BYTES = 1024
+        content = bytes(range(256)) * 64
+
+        response = client.post("/upload/batch", content=_tar({"big.bin": content}))
+
+        assert response.status_code == 200
+        assert (tmp_path / "big.bin").read_bytes() == content
+
+    def test_upload_batch_rejects_invalid_tar(self, client: TestClient):
+        response = client.post("/upload/batch", content=b"not a tar" * 100)
+        assert response.status_code == 400
+
+    def test_download_batch_streams_files_in_chunks(
+        self, runtime: ModuleType, client: TestClient, tmp_path: Path
+    ):
+        runtime.CHUNK_SIZE = 100
+        (tmp_path / "big.bin").write_bytes(bytes(range(256)) * 10)
+        (tmp_path / "dir").mkdir()
+
+        response = client.post("/download/batch", json={"paths": ["big.bin", "dir", "gone"]})
+
+        assert response.status_code == 200
+        assert json.loads(response.headers["X-File-Errors"]) == {
+            "dir": "is_directory",
+            "gone": "file_not_found",
+        }
+        with tarfile.open(fileobj=io.BytesIO(response.content), mode="r:") as tar:
+            data = tar.extractfile("big.bin").read()  # type: ignore[union-attr]
+        assert data == bytes(range(256)) * 10
+
+    def test_checksums(self, client: TestClient, tmp_path: Path):
+        (tmp_path / "a.txt").write_bytes(b"hello")
+
+        response = client.post("/checksums", json={"paths": ["a.txt", "missing.txt"]})
+
+        assert response.json()["checksums"] == {
+            "a.txt": hashlib.sha256(b"hello").hexdigest(),
+            "missing.txt": None,
+        }
+
+
+def _gone(pid: int) -> bool:
+    # Reaped, or a zombie nobody has collected yet: either way no longer running.
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().split(") ")[1].startswith("Z")
+    except (FileNotFoundError, IndexError):
+        return True
+
+
+class TestExecute:
+    def test_returns_output_and_exit_code(self, client: TestClient, tmp_path: Path):
+        response = client.post("/execute", json={"command": "pwd; echo oops >&2; exit 3"})
+
+        assert response.json() == {"stdout": f"{tmp_path}\n", "stderr": "oops\n", "exit_code": 3}
+
+    def test_timeout_kills_process_group(self, client: TestClient):
+        started = time.monotonic()
+        response = client.post(
+            "/execute", json={"command": "sleep 30 & echo $!; wait", "timeout": 0.5}
+        )
+
+        body = response.json()
+        assert time.monotonic() - started < 10
+        assert body["exit_code"] == 124
+        assert "timed out" in body["stderr"]
+        background = int(body["stdout"])
+        deadline = time.monotonic() + 5
+        while not _gone(background) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert _gone(background)
+
+    def test_output_is_capped(self, runtime: ModuleType, client: TestClient):
+        runtime.MAX_OUTPUT_BYTES = 100
+
+        response = client.post("/execute", json={"command": "head -c 1000 /dev/zero | tr '\\0' a"})
+
+        stdout = response.json()["stdout"]
+        assert stdout.startswith("a" * 100 + "\n[output truncated: 900 bytes omitted]")
+
+    def test_failed_spawn_is_not_counted_as_running(
+        self, runtime: ModuleType, client: TestClient, tmp_path: Path
+    ):
+        runtime.WORKSPACE = str(tmp_path / "missing")
+
+        response = client.post("/execute", json={"command": "true"})
+
+        assert response.json()["exit_code"] == 1
+        assert client.get("/").json()["executions"]["running"] == 0
+
+    def test_stream_emits_sse_events(self, client: TestClient):
+        response = client.post("/execute/stream", json={"command": "echo hi; echo err >&2; exit 2"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("data: ", 1)[1]))
+            for block in response.text.strip().split("\n\n")
+        ]
+        assert ("stdout", {"data": "hi\n"}) in events
+        assert ("stderr", {"data": "err\n"}) in events
+        assert events[-1] == (
+            "exit",
+            {"exit_code": 2, "timed_out": False, "omitted_bytes": {"stdout": 0, "stderr": 0}},
+        )
+
+    @pytest.mark.asyncio
+    async def test_health_answers_while_commands_queue(self, runtime: ModuleType):
+        runtime._slots = asyncio.Semaphore(1)
+        transport = httpx.ASGITransport(app=runtime.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sandbox") as http:
+            started = time.monotonic()
+            runs = [
+                asyncio.create_task(http.post("/execute", json={"command": "sleep 0.4"}))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.1)
+            health = await http.get("/")
+            results = await asyncio.gather(*runs)
+
+        assert health.json()["executions"] == {"running": 1, "limit": runtime.MAX_CONCURRENCY}
+        assert time.monotonic() - started >= 0.8
+        assert [r.json()["exit_code"] for r in results] == [0, 0]
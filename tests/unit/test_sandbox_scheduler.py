@@ -0,0 +1,139 @@
+"""Unit tests for the sandbox operation scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from server.app.agent.sandbox_backend import CognitionLocalSandboxBackend
+from server.app.agent.sandbox_scheduler import (
+    SandboxScheduler,
+    get_sandbox_scheduler,
+    set_sandbox_scheduler,
+)
+
+
+class _Tracker:
+    """Blocking operation recording the peak number of concurrent calls."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value: int, seconds: float = 0.05) -> int:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(seconds)
+        with self._lock:
+            self.running -= 1
+        return value
+
+
+@pytest.fixture
+def scheduler() -> Iterator[SandboxScheduler]:
+    scheduler = SandboxScheduler(max_concurrent=4, max_per_session=2)
+    set_sandbox_scheduler(scheduler)
+    yield scheduler
+    set_sandbox_scheduler(None)
+
+
+class TestSandboxScheduler:
+    async def test_runs_operations_concurrently_and_keeps_order(
+        self, scheduler: SandboxScheduler
+    ) -> None:
+        op = _Tracker()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(scheduler.run("s1", "read", op, i, 0.1) for i in range(2)),
+            *(scheduler.run("s2", "read", op, i, 0.1) for i in range(2, 4)),
+        )
+
+        assert results == [0, 1, 2, 3]
+        assert op.peak == 4
+        assert time.perf_counter() - started < 0.35
+
+    async def test_per_session_limit(self, scheduler: SandboxScheduler) -> None:
+        op = _Tracker()
+        calls = [scheduler.run("s1", "grep", op, i) for i in range(6)]
+
+        assert await asyncio.gather(*calls) == list(range(6))
+        assert op.peak == 2
+        assert scheduler.in_flight("s1") == 0
+
+    async def test_global_limit(self) -> None:
+        scheduler = SandboxScheduler(max_concurrent=2, max_per_session=2)
+        op = _Tracker()
+        try:
+            await asyncio.gather(*(scheduler.run(f"s{i}", "ls", op, i) for i in range(5)))
+        finally:
+            scheduler.shutdown()
+
+        assert op.peak == 2
+
+    async def test_records_queue_wait(self) -> None:
+        scheduler = SandboxScheduler(max_concurrent=1, max_per_session=1)
+        op = _Tracker()
+        with patch("server.app.agent.sandbox_scheduler.SANDBOX_QUEUE_WAIT") as metric:
+            await asyncio.gather(*(scheduler.run("s1", "execute", op, i) for i in range(2)))
+        scheduler.shutdown()
+
+        metric.labels.assert_called_with(operation="execute")
+        waits = [call.args[0] for call in metric.labels.return_value.observe.call_args_list]
+        assert len(waits) == 2
+        assert max(waits) >= 0.04
+
+    async def test_cancelled_call_keeps_its_slot_until_the_worker_finishes(self) -> None:
+        scheduler = SandboxScheduler(max_concurrent=1, max_per_session=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking() -> str:
+            started.set()
+            release.wait(5)
+            return "first"
+
+        first = asyncio.create_task(scheduler.run("s1", "execute", blocking))
+        await asyncio.to_thread(started.wait, 5)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        second = asyncio.create_task(scheduler.run("s1", "read", lambda: "second"))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+        assert scheduler.in_flight("s1") == 2
+
+        release.set()
+        assert await asyncio.wait_for(second, 5) == "second"
+        await asyncio.sleep(0)
+        assert scheduler.in_flight("s1") == 0
+        scheduler.shutdown()
+
+
+async def test_backend_async_methods_use_scheduler(
+    tmp_path: Path, scheduler: SandboxScheduler
+) -> None:
+    backend = CognitionLocalSandboxBackend(root_dir=tmp_path, sandbox_id="s1")
+    notes = str(tmp_path / "notes.txt")
+    assert get_sandbox_scheduler() is scheduler
+
+    with patch.object(scheduler, "run", wraps=scheduler.run) as run:
+        write = await backend.awrite(notes, "hello")
+        read = await backend.aread(notes)
+        result = await backend.aexecute("echo hi")
+
+    assert write.error is None
+    assert "hello" in str(read)
+    assert result.output.strip() == "hi"
+    assert [(c.args[0], c.args[1]) for c in run.call_args_list] == [
+        ("s1", "write"),
+        ("s1", "read"),
+        ("s1", "execute"),
+    ]
@@ -24,7 +24,10 @@ class TestSchemaDefinitions:
         assert "messages" in table_names
         assert "config_entities" in table_names
         assert "config_changes" in table_names
-        assert len(table_names) == 4
+        assert "rate_limits" in table_names
+        assert "usage_events" in table_names
+        assert "usage_rollups" in table_names
+        assert len(table_names) == 7
 
     def test_sessions_table_columns(self) -> None:
         """Test sessions table has expected columns."""
@@ -0,0 +1,145 @@
+"""Unit tests for the scripted mock provider used for load testing."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from pydantic import ValidationError
+
+from server.app.agent.resolver import RuntimeResolver
+from server.app.exceptions import LLMProviderConfigError, LLMRateLimitError
+from server.app.llm.mock import Distribution, LatencyProfile, ScriptedMockLLM
+from server.app.storage.config_models import ProviderConfig
+
+
+def _model(**profile: Any) -> ScriptedMockLLM:
+    return ScriptedMockLLM(latency_profile=LatencyProfile.model_validate(profile))
+
+
+async def _stream(model: ScriptedMockLLM, messages: list[Any]) -> list[AIMessageChunk]:
+    return [chunk async for chunk in model.astream(messages)]
+
+
+class TestDistribution:
+    def test_number_is_constant_shorthand(self) -> None:
+        assert Distribution.model_validate(25).sample(random.Random(0)) == 25
+
+    def test_samples_are_clamped(self) -> None:
+        dist = Distribution(distribution="normal", mean=100, stddev=500, min=10, max=150)
+        rng = random.Random(0)
+
+        assert all(10 <= dist.sample(rng) <= 150 for _ in range(200))
+
+    def test_uniform_requires_bounds(self) -> None:
+        with pytest.raises(ValidationError, match="require min and max"):
+            Distribution(distribution="uniform", max=5)
+
+
+class TestScriptedMockLLM:
+    async def test_script_steps_follow_the_turn(self) -> None:
+        model = _model(
+            script=[
+                {
+                    "tool_calls": [
+                        {"name": "ls", "args": {"path": "/"}},
+                        {"name": "read_file", "args": {"path": "/a.txt"}},
+                    ]
+                },
+                {"text": "All done here."},
+            ]
+        )
+        human = HumanMessage("go")
+
+        first = await model.ainvoke([human])
+        assert [c["name"] for c in first.tool_calls] == ["ls", "read_file"]
+
+        results = [ToolMessage("ok", tool_call_id=c["id"]) for c in first.tool_calls]
+        chunks = await _stream(model, [human, first, *results])
+        assert [c.content for c in chunks if c.content] == ["All ", "done ", "here."]
+        usage = [c.usage_metadata for c in chunks if c.usage_metadata]
+        assert [u["output_tokens"] for u in usage] == [3]
+
+    async def test_generated_replies_are_deterministic_on_request(self) -> None:
+        profile = {
+            "seed": 7,
+            "deterministic": True,
+            "response_tokens": {"distribution": "uniform", "min": 5, "max": 40},
+        }
+        messages = [HumanMessage("summarise the repo")]
+
+        first = await _model(**profile).ainvoke(messages)
+        second = await _model(**profile).ainvoke(messages)
+        other_seed = await _model(**{**profile, "seed": 8}).ainvoke(messages)
+
+        assert first.content == second.content
+        assert first.content != other_seed.content
+
+    async def test_identical_calls_draw_independently_by_default(self) -> None:
+        model = _model(seed=7, response_tokens={"distribution": "uniform", "min": 5, "max": 40})
+        messages = [HumanMessage("summarise the repo")]
+
+        replies = {(await model.ainvoke(messages)).content for _ in range(4)}
+
+        assert len(replies) > 1
+
+    async def test_subagents_follow_their_own_script(self) -> None:
+        model = _model(
+            script=[{"tool_calls": [{"name": "task", "args": {"description": "dig"}}]}],
+            subagent_script=[{"text": "Found it."}],
+        )
+        messages = [HumanMessage("go")]
+
+        main = await model.bind_tools([_tool("task"), _tool("ls")]).ainvoke(messages)
+        sub = await model.bind_tools([_tool("ls")]).ainvoke(messages)
+
+        assert isinstance(main, AIMessage)
+        assert main.tool_calls[0]["name"] == "task"
+        assert sub.content == "Found it."
+
+    async def test_injected_error_after_tokens(self) -> None:
+        model = _model(
+            error_rate=1.0,
+            error_kind="rate_limit",
+            error_after_tokens=2,
+            script=[{"text": "one two three four"}],
+        )
+        received: list[str] = []
+
+        with pytest.raises(LLMRateLimitError):
+            async for chunk in model.astream([HumanMessage("go")]):
+                received.append(str(chunk.content))
+
+        assert received == ["one ", "two "]
+
+
+def _tool(name: str) -> dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {"name": name, "description": name, "parameters": {"type": "object"}},
+    }
+
+
+class TestScriptedMockProviderConfig:
+    def test_provider_config_validates_profile(self) -> None:
+        ProviderConfig(id="load", provider="scripted_mock", model="p50", extra={"ttft_ms": 400})
+
+        with pytest.raises(ValidationError):
+            ProviderConfig(id="load", provider="scripted_mock", model="p50", extra={"ttft": 400})
+
+    def test_resolver_builds_model_from_extra(self) -> None:
+        resolver = RuntimeResolver(config_store=None, settings=MagicMock())
+
+        model = resolver.build_model(
+            "scripted_mock", "p50", extra={"ttft_ms": 400, "chunk_tokens": 3}
+        )
+
+        assert isinstance(model, ScriptedMockLLM)
+        assert model.model_name == "p50"
+        assert model.latency_profile.chunk_tokens == 3
+
+        with pytest.raises(LLMProviderConfigError):
+            resolver.build_model("scripted_mock", "p50", extra={"chunk_tokens": 0})
@@ -0,0 +1,270 @@
+"""Unit tests for SessionAgentManager idle eviction, LRU cap and sandbox cleanup."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from server.app.agent.cognition_agent import CognitionAgentResult
+from server.app.llm.deep_agent_service import (
+    DeepAgentStreamingService,
+    PreparedAgent,
+    SessionAgentManager,
+    StreamAccumulator,
+)
+from server.app.settings import Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _manager(clock: FakeClock, ttl: float = 60.0, max_live: int = 0) -> SessionAgentManager:
+    settings = Settings(
+        COGNITION_AGENT_SESSION_IDLE_TTL_SECONDS=ttl,
+        COGNITION_AGENT_SESSION_MAX_LIVE=max_live,
+    )
+    return SessionAgentManager(settings, storage_backend=MagicMock(), clock=clock)
+
+
+class TestIdleEviction:
+    def test_sweep_evicts_only_idle_sessions(self):
+        clock = FakeClock()
+        manager = _manager(clock)
+        manager.register_session("old", "/p")
+        clock.now += 30
+        manager.register_session("recent", "/p")
+        clock.now += 40
+
+        assert manager.sweep() == 1
+        assert manager.get_service("old") is None
+        assert manager.get_service("recent") is not None
+        assert manager.stats().evicted == 1
+
+    def test_active_turn_is_not_evicted(self):
+        clock = FakeClock()
+        manager = _manager(clock)
+        manager.register_session("busy", "/p")
+        manager.register_runtime("busy", MagicMock())
+        clock.now += 600
+
+        assert manager.sweep() == 0
+        stats = manager.stats()
+        assert (stats.live, stats.active, stats.idle) == (1, 1, 0)
+
+    def test_idle_time_counts_from_end_of_turn(self):
+        clock = FakeClock()
+        manager = _manager(clock)
+        manager.register_session("s", "/p")
+        manager.register_runtime("s", MagicMock())
+        clock.now += 300
+        manager.unregister_runtime("s")
+        clock.now += 30
+
+        assert manager.sweep() == 0
+
+    def test_zero_ttl_disables_eviction(self):
+        clock = FakeClock()
+        manager = _manager(clock, ttl=0)
+        manager.register_session("s", "/p")
+        clock.now += 10_000
+
+        assert manager.sweep() == 0
+
+
+class TestMaxLive:
+    def test_evicts_least_recently_used(self):
+        clock = FakeClock()
+        manager = _manager(clock, ttl=0, max_live=2)
+        manager.register_session("a", "/p")
+        manager.register_session("b", "/p")
+        manager.get_service("a")
+        manager.register_session("c", "/p")
+
+        assert manager.get_service("b") is None
+        assert manager.get_service("a") is not None
+        assert manager.get_service("c") is not None
+        assert manager.stats().evicted == 1
+
+    def test_skips_sessions_mid_turn(self):
+        clock = FakeClock()
+        manager = _manager(clock, ttl=0, max_live=1)
+        manager.register_session("busy", "/p")
+        manager.register_runtime("busy", MagicMock())
+        manager.register_session("new", "/p")
+
+        assert manager.get_service("busy") is not None
+        assert manager.stats().live == 2
+
+
+class TestSandboxTermination:
+    def test_terminates_synchronously_without_event_loop(self):
+        manager = _manager(FakeClock())
+        sandbox = MagicMock()
+        manager.register_session("s", "/p")
+        manager.register_sandbox_backend("s", sandbox)
+
+        manager.unregister_session("s")
+
+        sandbox.terminate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_terminates_off_the_event_loop(self):
+        manager = _manager(FakeClock())
+        caller: list[threading.Thread] = []
+        sandbox = MagicMock()
+        sandbox.terminate.side_effect = lambda: caller.append(threading.current_thread())
+        manager.register_session("s", "/p")
+        manager.register_sandbox_backend("s", sandbox)
+
+        manager.unregister_session("s")
+        await manager.aclose()
+
+        assert caller and caller[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_aclose_terminates_every_sandbox(self):
+        manager = _manager(FakeClock())
+        sandboxes = [MagicMock(), MagicMock()]
+        for i, sandbox in enumerate(sandboxes):
+            manager.register_session(f"s{i}", "/p")
+            manager.register_sandbox_backend(f"s{i}", sandbox)
+
+        await manager.aclose()
+
+        for sandbox in sandboxes:
+            sandbox.terminate.assert_called_once()
+        assert manager.stats().live == 0
+
+    def test_unregister_drops_graphs_bound_to_the_sandbox(self):
+        manager = _manager(FakeClock())
+        sandbox = MagicMock()
+        manager.register_session("s", "/p")
+        manager.register_sandbox_backend("s", sandbox)
+
+        with patch(
+            "server.app.llm.deep_agent_service.invalidate_agent_cache_for_sandbox"
+        ) as invalidate:
+            manager.unregister_session("s")
+
+        invalidate.assert_called_once_with(sandbox)
+
+    def test_eviction_drops_the_workspace_graphs(self):
+        clock = FakeClock()
+        manager = _manager(clock)
+        manager.register_session("s", "/ws/s")
+        clock.now += 120
+
+        with patch(
+            "server.app.llm.deep_agent_service.invalidate_agent_cache_for_workspace"
+        ) as invalidate:
+            assert manager.sweep() == 1
+
+        invalidate.assert_called_once_with("/ws/s")
+
+    @pytest.mark.asyncio
+    async def test_preclaim_for_removed_session_is_terminated(self):
+        manager = _manager(FakeClock())
+        sandbox = MagicMock()
+        claim: asyncio.Future[object] = asyncio.get_running_loop().create_future()
+        manager.register_session("s", "/p")
+
+        with patch(
+            "server.app.llm.deep_agent_service.start_sandbox_preclaim",
+            return_value=claim,
+        ):
+            manager.preclaim_sandbox("s", "/p")
+        manager.unregister_session("s")
+        claim.set_result(sandbox)
+        await asyncio.sleep(0)
+        await manager.aclose()
+
+        sandbox.terminate.assert_called_once()
+        assert manager.stats().sandboxes == 0
+
+    @pytest.mark.asyncio
+    async def test_turn_for_session_evicted_during_prepare_re_registers_it(self):
+        clock = FakeClock()
+        manager = _manager(clock)
+        sandbox = MagicMock()
+        service = manager.register_session("s", "/p")
+        manager.unregister_session("s")
+        prepared = PreparedAgent(
+            agent=CognitionAgentResult(agent=MagicMock(), sandbox_backend=sandbox),
+            checkpointer=None,
+            invocation_context=None,
+            provider="mock",
+            model_id="mock",
+            recursion_limit=10,
+        )
+
+        async def no_events(runtime: object) -> AsyncIterator[object]:
+            return
+            yield
+
+        with (
+            patch.object(service, "_price_usage"),
+            patch.object(service, "_record_usage"),
+        ):
+            async for _ in service._run_turn(
+                prepared,
+                session_id="s",
+                project_path="/p",
+                thread_id="t",
+                manager=manager,
+                acc=StreamAccumulator(),
+                start=no_events,
+            ):
+                pass
+
+        assert manager.get_project_path("s") == "/p"
+        assert manager.stats().sandboxes == 1
+        clock.now += 120
+        assert manager.sweep() == 1
+        assert manager.stats().sandboxes == 0
+        await manager.aclose()
+        sandbox.terminate.assert_called_once()
+
+    def test_replaced_sandbox_is_terminated(self):
+        manager = _manager(FakeClock())
+        old, new = MagicMock(), MagicMock()
+        manager.register_session("s", "/p")
+        manager.register_sandbox_backend("s", old)
+
+        manager.register_sandbox_backend("s", new)
+
+        old.terminate.assert_called_once()
+        new.terminate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_warmup_does_not_register_the_session(self):
+        manager = _manager(FakeClock(), max_live=1)
+        manager.register_session("live", "/p")
+        sandbox = MagicMock()
+        built = CognitionAgentResult(agent=MagicMock(), sandbox_backend=sandbox, fingerprint="fp")
+
+        with patch.object(DeepAgentStreamingService, "warm_graph", return_value=built):
+            assert await manager.warm_graph("stale", "/stale") == "fp"
+
+        assert manager.get_project_path("stale") is None
+        assert manager.get_service("live") is not None
+        assert manager.stats().sandboxes == 0
+
+    def test_terminate_failure_is_swallowed(self):
+        manager = _manager(FakeClock())
+        sandbox = MagicMock()
+        sandbox.terminate.side_effect = RuntimeError("api down")
+        manager.register_session("s", "/p")
+        manager.register_sandbox_backend("s", sandbox)
+
+        manager.unregister_session("s")
+
+        assert manager.get_service("s") is None
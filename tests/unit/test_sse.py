@@ -14,9 +14,12 @@ from fastapi import Request
 from server.app.api.sse import (
     EventBuffer,
     EventBuilder,
+    SessionEventLog,
     SSEEvent,
     SSEStream,
     get_last_event_id,
+    get_session_event_log,
+    open_session_event_log,
 )
 from server.app.settings import Settings
 
@@ -339,6 +342,69 @@ class TestSSEStream:
         assert len(events) < 100
 
 
+class TestSessionEventLog:
+    """Tests for per-session turn logs that clients can reattach to."""
+
+    @pytest.mark.asyncio
+    async def test_follow_replays_after_id_then_tails_until_closed(self) -> None:
+        log = SessionEventLog()
+        log.append("e1", "token", {"content": "1"})
+        log.append("e2", "token", {"content": "2"})
+
+        async def produce_more() -> None:
+            await asyncio.sleep(0.01)
+            log.append("e3", "done", {})
+            log.close()
+
+        producer = asyncio.create_task(produce_more())
+        seen = [e.event_id async for e in log.follow("e1", idle_timeout=1.0) if e is not None]
+        await producer
+
+        assert seen == ["e2", "e3"]
+
+    @pytest.mark.asyncio
+    async def test_follow_from_evicted_id_replays_retained_events(self) -> None:
+        log = SessionEventLog(max_size=2)
+        for i in range(4):
+            log.append(f"e{i}", "token", {"content": str(i)})
+        log.close()
+
+        seen = [e.event_id async for e in log.follow("e0", idle_timeout=1.0) if e is not None]
+
+        assert seen == ["e2", "e3"]
+
+    @pytest.mark.asyncio
+    async def test_turn_outlives_client_disconnect(self) -> None:
+        stream = SSEStream()
+        log = SessionEventLog()
+
+        async def mock_stream():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield {"event": "token", "data": {"content": str(i)}}
+
+        mock_request = MagicMock(spec=Request)
+        mock_request.is_disconnected = AsyncMock(return_value=True)
+
+        events = [
+            e async for e in stream.event_generator(mock_stream(), mock_request, event_log=log)
+        ]
+        assert events == ["retry: 3000\n\n"]
+
+        await asyncio.wait_for(log._producer, timeout=1.0)  # type: ignore[arg-type]
+        assert log.closed
+        replay = [e.data["content"] async for e in log.follow(None, 1.0) if e is not None]
+        assert replay == ["0", "1", "2"]
+
+    def test_session_logs_expire_after_retention(self) -> None:
+        log = open_session_event_log("sess-expire")
+        assert get_session_event_log("sess-expire") is log
+
+        log.close()
+        log.closed_at = 0.0  # finished long ago
+        assert get_session_event_log("sess-expire") is None
+
+
 class TestEventBuilder:
     """Tests for EventBuilder utility class."""
 
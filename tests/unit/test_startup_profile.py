@@ -0,0 +1,45 @@
+"""Unit tests for deferred imports and startup profiling."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+from server.app.startup_profile import parse_importtime, preload_deferred_modules
+
+
+def test_server_import_defers_heavy_subsystems():
+    code = (
+        "import json, sys\n"
+        "import server.app.main\n"
+        "heavy = ['deepagents', 'mcp', 'langchain.chat_models', 'watchdog',\n"
+        "         'opentelemetry.exporter.otlp.proto.grpc.trace_exporter']\n"
+        "print(json.dumps([m for m in heavy if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_parse_importtime():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   json.decoder",
+            "import time:       300 |        420 | json",
+            "unrelated line",
+        ]
+    )
+    timings = parse_importtime(output)
+
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("json.decoder", 120, 120, 1),
+        ("json", 300, 420, 0),
+    ]
+
+
+async def test_preload_skips_missing_modules():
+    await preload_deferred_modules(["json", "definitely_not_a_module_xyz"])
+    assert "json" in sys.modules
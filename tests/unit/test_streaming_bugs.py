@@ -267,14 +267,15 @@ class TestContentNotDoubled:
 
     @pytest.mark.asyncio
     async def test_usage_event_output_tokens_not_doubled(self):
-        """output_tokens in UsageEvent must count each token once, not twice."""
+        """output_tokens in UsageEvent must count each reported token once, not twice."""
         from server.app.llm.deep_agent_service import DeepAgentStreamingService
 
-        # Two single-word tokens → output_tokens should be 2, not 4
+        # Provider reports 2 output tokens → output_tokens should be 2, not 4
         session = _make_session()
         mock_runtime = _make_mock_runtime(
             TokenEvent(content="Hello"),
             TokenEvent(content="World"),
+            UsageEvent(input_tokens=5, output_tokens=2, model_calls=1),
             DoneEvent(),
         )
         service = DeepAgentStreamingService(_make_settings())
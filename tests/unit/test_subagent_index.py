@@ -0,0 +1,144 @@
+"""Unit tests for the shared subagent spec index."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from server.app.agent.cognition_agent import RuntimeContext
+from server.app.agent.definition import AgentDefinition
+from server.app.agent.subagent_index import SubagentSpecIndex, hash_subagent_specs
+from server.app.settings import Settings
+from server.app.storage.config_registry import MemoryConfigRegistry
+from server.app.storage.config_store import DefaultConfigStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> DefaultConfigStore:
+    return DefaultConfigStore(MemoryConfigRegistry(), workspace_path=tmp_path)
+
+
+async def _add_agent(store: DefaultConfigStore, name: str, prompt: str) -> None:
+    await store.upsert_agent(name, {}, {"name": name, "system_prompt": prompt}, "api")
+
+
+class TestSubagentSpecIndex:
+    async def test_excludes_primary_agent(self, store: DefaultConfigStore, tmp_path: Path):
+        index = SubagentSpecIndex()
+        spec_set = await index.get_spec_set(store, "default", str(tmp_path))
+
+        names = [spec["name"] for spec in spec_set.specs]
+        assert "default" not in names
+        assert "readonly" in names
+
+    async def test_specs_built_once_across_turns(self, store: DefaultConfigStore, tmp_path: Path):
+        index = SubagentSpecIndex()
+
+        with patch.object(
+            AgentDefinition, "to_subagent", autospec=True, side_effect=AgentDefinition.to_subagent
+        ) as to_subagent:
+            first = await index.get_spec_set(store, "default", str(tmp_path))
+            calls_after_first = to_subagent.call_count
+            second = await index.get_spec_set(store, "default", str(tmp_path))
+            # A different primary reuses the per-agent specs already built.
+            await index.get_spec_set(store, "readonly", str(tmp_path))
+
+        assert calls_after_first == len(first.specs)
+        assert to_subagent.call_count == calls_after_first + 1  # only "default" newly built
+        assert second is first
+
+    async def test_agent_change_rebuilds_only_that_spec(
+        self, store: DefaultConfigStore, tmp_path: Path
+    ):
+        index = SubagentSpecIndex()
+        store.subscribe_agent_changes(index.on_agent_change)
+        await _add_agent(store, "helper", "v1")
+        first = await index.get_spec_set(store, "default", str(tmp_path))
+
+        with patch.object(
+            AgentDefinition, "to_subagent", autospec=True, side_effect=AgentDefinition.to_subagent
+        ) as to_subagent:
+            await _add_agent(store, "helper", "v2")
+            second = await index.get_spec_set(store, "default", str(tmp_path))
+
+        assert [call.args[0].name for call in to_subagent.call_args_list] == ["helper"]
+        assert second.spec_hash != first.spec_hash
+        assert second.version > first.version
+        helper = next(spec for spec in second.specs if spec["name"] == "helper")
+        assert helper["system_prompt"] == "v2"
+
+    async def test_detects_replaced_definition_without_notification(
+        self, store: DefaultConfigStore, tmp_path: Path
+    ):
+        index = SubagentSpecIndex()
+        await _add_agent(store, "helper", "v1")
+        first = await index.get_spec_set(store, "default", str(tmp_path))
+
+        await _add_agent(store, "helper", "v2")
+        second = await index.get_spec_set(store, "default", str(tmp_path))
+
+        assert second.spec_hash != first.spec_hash
+
+    async def test_spec_sets_cached_per_scope(self, store: DefaultConfigStore, tmp_path: Path):
+        index = SubagentSpecIndex()
+        a = await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "a"})
+        b = await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "b"})
+
+        assert a.spec_hash == b.spec_hash
+        assert index.stats()["sets"] == 2
+
+    async def test_spec_sets_are_bounded_lru(self, store: DefaultConfigStore, tmp_path: Path):
+        index = SubagentSpecIndex(max_sets=2)
+        first = await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "a"})
+        await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "b"})
+        assert (
+            await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "a"}) is first
+        )
+        await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "c"})
+
+        assert index.stats()["sets"] == 2
+        # "a" was used more recently than "b", so "b" was evicted.
+        assert (
+            await index.get_spec_set(store, "default", str(tmp_path), scope={"user": "a"}) is first
+        )
+
+    async def test_agent_change_clears_spec_sets(self, store: DefaultConfigStore, tmp_path: Path):
+        index = SubagentSpecIndex()
+        store.subscribe_agent_changes(index.on_agent_change)
+        for user in ("a", "b"):
+            await index.get_spec_set(store, "default", str(tmp_path), scope={"user": user})
+
+        await _add_agent(store, "helper", "v1")
+
+        assert index.stats()["sets"] == 0
+
+
+class TestRuntimeContextSpecHash:
+    def _ctx(self, tmp_path: Path, subagents: list[dict[str, str]]) -> RuntimeContext:
+        return RuntimeContext.from_params(
+            project_path=tmp_path,
+            model="m",
+            store=None,
+            system_prompt=None,
+            memory=None,
+            skills=None,
+            subagents=subagents,
+            interrupt_on=None,
+            response_format=None,
+            tool_token_limit_before_evict=None,
+            middleware=None,
+            tools=None,
+            settings=Settings(),
+            scope=None,
+        )
+
+    def test_same_count_different_content_gives_different_keys(self, tmp_path: Path):
+        a = self._ctx(tmp_path, [{"name": "x", "system_prompt": "one"}])
+        b = self._ctx(tmp_path, [{"name": "x", "system_prompt": "two"}])
+        assert a != b
+
+    def test_hash_matches_index_hash(self, tmp_path: Path):
+        specs = [{"name": "x", "system_prompt": "one"}]
+        assert self._ctx(tmp_path, specs).subagent_spec_hash == hash_subagent_specs(specs)
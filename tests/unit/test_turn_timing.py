@@ -0,0 +1,166 @@
+"""Unit tests for per-turn phase timing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from server.app.agent.middleware import CognitionObservabilityMiddleware
+from server.app.agent.runtime import DoneEvent, TokenEvent
+from server.app.api.sse import EventBuilder
+from server.app.models import Session, SessionConfig, SessionStatus
+from server.app.observability.turn_timing import (
+    TurnTiming,
+    current_turn_timing,
+    reset_turn_timing,
+    set_turn_timing,
+    turn_phase,
+)
+
+
+class TestTurnTiming:
+    def test_phases_accumulate_and_summarise(self) -> None:
+        timing = TurnTiming(session_id="s1")
+        timing.record_phase("session_load", 0.002)
+        timing.record_phase("session_load", 0.001)
+        timing.record_tool("ls", 0.010)
+        timing.record_tool("ls", 0.030)
+        timing.graph_cache_hit = True
+
+        summary = timing.finish("done")
+
+        assert summary["phases"] == {"session_load": 3.0}
+        assert summary["tools"] == {"ls": {"count": 2, "total_ms": 40.0, "max_ms": 30.0}}
+        assert summary["graph_cache_hit"] is True
+        assert summary["ttft_ms"] is None
+        assert timing.span_attributes()["cognition.turn.phase.session_load_ms"] == 3.0
+
+    def test_tokens_set_ttft_and_gaps(self) -> None:
+        timing = TurnTiming()
+        for _ in range(3):
+            timing.mark_token()
+
+        summary = timing.summary()
+
+        assert summary["ttft_ms"] is not None
+        assert summary["ttft_ms"] <= summary["total_ms"]
+        assert set(summary["inter_token_ms"]) == {"mean", "max"}
+
+    def test_finish_is_idempotent(self) -> None:
+        timing = TurnTiming()
+        first = timing.finish("interrupted")
+        timing.record_phase("persistence", 0.005)
+
+        assert timing.finish("error")["total_ms"] == first["total_ms"]
+        assert timing.status == "interrupted"
+        assert timing.phases["persistence"] == 0.005
+
+
+class TestCurrentTurn:
+    def test_turn_phase_is_noop_outside_a_turn(self) -> None:
+        assert current_turn_timing() is None
+        with turn_phase("graph_compile"):
+            pass
+
+    async def test_child_tasks_record_into_current_turn(self) -> None:
+        timing = TurnTiming()
+        token = set_turn_timing(timing)
+        try:
+
+            async def build() -> None:
+                with turn_phase("graph_compile"):
+                    await asyncio.sleep(0)
+
+            await asyncio.create_task(build())
+        finally:
+            reset_turn_timing(token)
+
+        assert "graph_compile" in timing.phases
+        assert current_turn_timing() is None
+
+    async def test_tool_middleware_records_execution_time(self) -> None:
+        timing = TurnTiming()
+        request = MagicMock()
+        request.tool_call = {"name": "read_file"}
+        token = set_turn_timing(timing)
+        try:
+            await CognitionObservabilityMiddleware().awrap_tool_call(
+                request, AsyncMock(return_value="ok")
+            )
+        finally:
+            reset_turn_timing(token)
+
+        assert timing.tools["read_file"].count == 1
+
+
+def test_done_event_carries_timing() -> None:
+    event = EventBuilder.done(message_id="m1", timing={"total_ms": 12.5})
+    assert event["data"] == {"message_id": "m1", "timing": {"total_ms": 12.5}}
+
+
+async def _events(*events: Any) -> AsyncGenerator[Any, None]:
+    for event in events:
+        yield event
+
+
+async def test_stream_response_attaches_phase_summary_to_done() -> None:
+    from server.app.llm.deep_agent_service import DeepAgentStreamingService
+    from server.app.settings import Settings
+
+    session = Session(
+        id="s1",
+        workspace_path="/tmp/ws",
+        title=None,
+        thread_id="t1",
+        status=SessionStatus.ACTIVE,
+        config=SessionConfig(provider="mock", model="mock-model"),
+        created_at="2026-01-01T00:00:00",
+        updated_at="2026-01-01T00:00:00",
+    )
+    runtime = MagicMock()
+    runtime.astream_events = MagicMock(
+        return_value=_events(TokenEvent(content="he"), TokenEvent(content="llo"))
+    )
+    service = DeepAgentStreamingService(MagicMock(spec=Settings))
+    service.storage_backend = MagicMock()
+    service.storage_backend.get_session = AsyncMock(return_value=session)
+    service.storage_backend.get_checkpointer = AsyncMock(return_value=MagicMock())
+    service.storage_backend.get_store = AsyncMock(return_value=MagicMock())
+    timing = TurnTiming(session_id="s1")
+
+    with (
+        patch("server.app.llm.deep_agent_service.DeepAgentRuntime", return_value=runtime),
+        patch(
+            "server.app.llm.deep_agent_service.DeepAgentStreamingService._resolve_model",
+            new_callable=AsyncMock,
+            return_value=(MagicMock(), "mock", "mock-model", 100),
+        ),
+        patch(
+            "server.app.llm.deep_agent_service.create_cognition_agent",
+            new_callable=AsyncMock,
+            return_value=MagicMock(),
+        ),
+    ):
+        events = [
+            event
+            async for event in service.stream_response(
+                session_id="s1",
+                thread_id="t1",
+                project_path="/tmp/ws",
+                content="hi",
+                timing=timing,
+            )
+        ]
+
+    done = events[-1]
+    assert isinstance(done, DoneEvent)
+    assert done.timing is not None
+    assert {"session_load", "agent_config", "model_build", "tool_build"} <= set(
+        done.timing["phases"]
+    )
+    assert done.timing["ttft_ms"] is not None
+    assert timing.status == "done"
+    assert (timing.provider, timing.model) == ("mock", "mock-model")
+    assert current_turn_timing() is None
@@ -0,0 +1,264 @@
+"""Unit tests for token usage accounting and the usage ledger."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from server.app.agent.runtime import UsageEvent, _usage_from_message
+from server.app.llm.deep_agent_service import DeepAgentStreamingService, StreamAccumulator
+from server.app.llm.model_catalog import CatalogModel
+from server.app.storage.usage_store import SqliteUsageLedger
+from server.app.usage import (
+    InMemoryUsageLedger,
+    TokenUsage,
+    UsageRecord,
+    estimate_tokens,
+    price_usage,
+)
+
+
+def _catalog_model(
+    input_cost: float = 3.0,
+    cache_read_cost: float | None = None,
+    cache_write_cost: float | None = None,
+) -> CatalogModel:
+    return CatalogModel(
+        id="claude-sonnet-4-6",
+        name="Claude Sonnet 4.6",
+        provider_slug="anthropic",
+        family="claude-sonnet",
+        tool_call=True,
+        reasoning=True,
+        context_window=200000,
+        output_limit=64000,
+        input_cost=input_cost,
+        output_cost=15.0,
+        cache_read_cost=cache_read_cost,
+        cache_write_cost=cache_write_cost,
+    )
+
+
+def _record(session_id: str = "s1", scope: str = "scope:user=alice", **usage: int) -> UsageRecord:
+    return UsageRecord(
+        session_id=session_id,
+        scope=scope,
+        provider="anthropic",
+        model="claude-sonnet-4-6",
+        usage=TokenUsage(**usage),
+        cost=0.5,
+    )
+
+
+class TestTokenUsage:
+    def test_from_metadata_reads_cache_details(self):
+        usage = TokenUsage.from_metadata(
+            {
+                "input_tokens": 1200,
+                "output_tokens": 80,
+                "total_tokens": 1280,
+                "input_token_details": {"cache_read": 1000, "cache_creation": 150},
+            }
+        )
+
+        assert usage == TokenUsage(
+            input_tokens=1200, output_tokens=80, cache_read_tokens=1000, cache_write_tokens=150
+        )
+        assert usage.total_tokens == 1280
+
+    def test_add_sums_every_field(self):
+        usage = TokenUsage(input_tokens=1, output_tokens=2, model_calls=1)
+        usage.add(TokenUsage(input_tokens=10, cache_read_tokens=5, model_calls=1))
+
+        assert usage == TokenUsage(
+            input_tokens=11, output_tokens=2, cache_read_tokens=5, model_calls=2
+        )
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestPriceUsage:
+    def test_prices_cached_tokens_at_cache_rates(self):
+        model = _catalog_model(cache_read_cost=0.3, cache_write_cost=3.75)
+        usage = TokenUsage(
+            input_tokens=1_000_000,
+            output_tokens=100_000,
+            cache_read_tokens=600_000,
+            cache_write_tokens=200_000,
+        )
+
+        # 200k uncached * 3 + 600k * 0.3 + 200k * 3.75 + 100k * 15, per million
+        assert price_usage(usage, model) == pytest.approx(0.6 + 0.18 + 0.75 + 1.5)
+
+    def test_cached_tokens_fall_back_to_input_rate(self):
+        usage = TokenUsage(input_tokens=1_000_000, cache_read_tokens=500_000)
+
+        assert price_usage(usage, _catalog_model()) == pytest.approx(3.0)
+
+    def test_unknown_model_is_free(self):
+        assert price_usage(TokenUsage(input_tokens=1000), None) == 0.0
+
+
+class TestUsageFromMessage:
+    def test_split_report_counts_one_model_call(self):
+        reported: set[str] = set()
+        metadata = {"ls_model_name": "claude-sonnet-4-6"}
+        first = AIMessageChunk(
+            content="",
+            id="run-1",
+            usage_metadata={"input_tokens": 900, "output_tokens": 0, "total_tokens": 900},
+        )
+        last = AIMessageChunk(
+            content="",
+            id="run-1",
+            usage_metadata={"input_tokens": 0, "output_tokens": 40, "total_tokens": 40},
+        )
+
+        events = [_usage_from_message(m, metadata, reported) for m in (first, last)]
+
+        assert [e.model_calls for e in events if e] == [1, 0]
+        assert sum(e.input_tokens + e.output_tokens for e in events if e) == 940
+        assert all(e is not None and e.model == "claude-sonnet-4-6" for e in events)
+
+    def test_bedrock_invoke_cache_tokens_are_added_to_input(self):
+        usage_metadata = {
+            "input_tokens": 200,
+            "output_tokens": 40,
+            "total_tokens": 240,
+            "input_token_details": {"cache_read": 3000, "cache_creation": 500},
+        }
+        bedrock = AIMessageChunk(
+            content="",
+            id="run-3",
+            usage_metadata=usage_metadata,
+            response_metadata={"model_provider": "bedrock"},
+        )
+        converse = AIMessageChunk(
+            content="",
+            id="run-4",
+            usage_metadata={**usage_metadata, "input_tokens": 3700},
+            response_metadata={"model_provider": "bedrock_converse"},
+        )
+
+        events = [_usage_from_message(m, {}, set()) for m in (bedrock, converse)]
+
+        assert [(e.input_tokens, e.cache_read_tokens) for e in events if e] == [
+            (3700, 3000),
+            (3700, 3000),
+        ]
+
+    def test_message_without_usage_yields_nothing(self):
+        assert _usage_from_message(AIMessageChunk(content="hi", id="run-2"), {}, set()) is None
+
+
+class TestTurnPricing:
+    def _prepared(self, provider: str = "anthropic", model_id: str = "claude-sonnet-4-6"):
+        return MagicMock(provider=provider, model_id=model_id)
+
+    def test_prices_each_reporting_model_from_catalog(self):
+        service = DeepAgentStreamingService(MagicMock())
+        acc = StreamAccumulator(prompt="hello")
+        acc.record_usage(
+            UsageEvent(input_tokens=1_000_000, output_tokens=0, model_calls=1), "claude-sonnet-4-6"
+        )
+        acc.record_usage(
+            UsageEvent(
+                input_tokens=1_000_000, output_tokens=0, model_calls=1, model="claude-haiku"
+            ),
+            "claude-sonnet-4-6",
+        )
+        catalog = MagicMock()
+        catalog.lookup.side_effect = lambda provider, model_id: (
+            _catalog_model() if model_id == "claude-sonnet-4-6" else _catalog_model(input_cost=1.0)
+        )
+
+        with patch("server.app.llm.deep_agent_service.get_model_catalog", return_value=catalog):
+            event = service._price_usage(self._prepared(), acc)
+
+        assert event.input_tokens == 2_000_000
+        assert event.model_calls == 2
+        assert event.estimated_cost == pytest.approx(4.0)
+        assert event.estimated is False
+
+    def test_estimates_when_provider_reports_nothing(self):
+        service = DeepAgentStreamingService(MagicMock())
+        acc = StreamAccumulator(prompt="a" * 40)
+        acc.record_token("b" * 20)
+
+        with patch("server.app.llm.deep_agent_service.get_model_catalog") as get_catalog:
+            get_catalog.return_value.lookup.return_value = None
+            event = service._price_usage(self._prepared(provider="mock"), acc)
+
+        assert (event.input_tokens, event.output_tokens) == (10, 5)
+        assert event.estimated is True
+        assert event.estimated_cost == 0.0
+
+
+class TestUsageLedgers:
+    @pytest.mark.asyncio
+    async def test_in_memory_rollups_by_session_and_scope(self):
+        ledger = InMemoryUsageLedger()
+        await ledger.record(_record("s1", input_tokens=10, output_tokens=5, model_calls=1))
+        await ledger.record(_record("s2", input_tokens=20, output_tokens=1, model_calls=2))
+
+        [session] = await ledger.rollups("session", "s1")
+        [scope] = await ledger.rollups("scope", "scope:user=alice")
+
+        assert (session.usage.input_tokens, session.turns) == (10, 1)
+        assert scope.usage == TokenUsage(input_tokens=30, output_tokens=6, model_calls=3)
+        assert (scope.turns, scope.cost) == (2, 1.0)
+        assert await ledger.rollups("session", "missing") == []
+
+    @pytest.mark.asyncio
+    async def test_sqlite_ledger_is_shared_between_instances(self, tmp_path):
+        db_path = str(tmp_path / "state.db")
+        replica_a = SqliteUsageLedger(db_path)
+        replica_b = SqliteUsageLedger(db_path)
+        try:
+            await replica_a.record(
+                _record("s1", input_tokens=100, output_tokens=10, cache_read_tokens=60)
+            )
+            await replica_b.record(_record("s1", input_tokens=50, output_tokens=5))
+
+            [rollup] = await replica_a.rollups("session", "s1")
+            [scope] = await replica_b.rollups("scope", "scope:user=alice")
+        finally:
+            await replica_a.close()
+            await replica_b.close()
+
+        assert rollup.usage == TokenUsage(input_tokens=150, output_tokens=15, cache_read_tokens=60)
+        assert (rollup.turns, rollup.cost, rollup.model) == (2, 1.0, "claude-sonnet-4-6")
+        assert scope.usage.total_tokens == 165
+
+    @pytest.mark.asyncio
+    async def test_sqlite_ledger_rolls_back_a_failed_record(self, tmp_path):
+        db_path = str(tmp_path / "state.db")
+        ledger = SqliteUsageLedger(db_path)
+        try:
+            with (
+                patch(
+                    "server.app.storage.usage_store._rollup_params",
+                    side_effect=RuntimeError("boom"),
+                ),
+                pytest.raises(RuntimeError),
+            ):
+                await ledger.record(_record("s1", input_tokens=100))
+            await asyncio.gather(*(ledger.record(_record("s1", input_tokens=10)) for _ in range(5)))
+            [rollup] = await ledger.rollups("session", "s1")
+        finally:
+            await ledger.close()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            [(events,)] = conn.execute("SELECT count(*) FROM usage_events").fetchall()
+        finally:
+            conn.close()
+        assert events == 5
+        assert (rollup.usage.input_tokens, rollup.turns) == (50, 5)